@@ -71,6 +71,11 @@ class IECOREALEMBIC_API AlembicInput : public IECore::RefCounted
 		const std::string &name() const;
 		const std::string &fullName() const;
 		IECore::CompoundDataPtr metaData() const;
+		/// Returns true if AlembicInputs for different objects in the
+		/// archive may be used concurrently from multiple threads. This
+		/// is the case for Ogawa archives but not for HDF5 ones. A single
+		/// AlembicInput must never be used from several threads at once.
+		bool concurrentReadsSupported() const;
 		//@}
 		
 		//! @name Sampling and time
@@ -0,0 +1,147 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECOREALEMBIC_ALEMBICSCENE_H
+#define IECOREALEMBIC_ALEMBICSCENE_H
+
+#include "tbb/mutex.h"
+
+#include "IECore/SceneInterface.h"
+
+#include "IECoreAlembic/AlembicInput.h"
+#include "IECoreAlembic/TypeIds.h"
+#include "IECoreAlembic/Export.h"
+
+namespace IECoreAlembic
+{
+
+IE_CORE_FORWARDDECLARE( AlembicScene )
+
+/// A read-only SceneInterface implementation for Alembic archives, allowing
+/// them to be used anywhere a SceneInterface is expected - via SceneInterface::create(),
+/// SharedSceneInterfaces or as the target of a link in a LinkedScene. The ".abc"
+/// extension is registered with SceneInterface::create() when the IECoreAlembic
+/// library is loaded.
+///
+/// Each Alembic object is mapped to a location in the scene, with transforms
+/// stored on the locations for Alembic xforms and objects stored on the locations
+/// for Alembic geometry and cameras. The scene is built on top of AlembicInput,
+/// and the objects and bounds it reads are held in a ComputationCache shared by all
+/// the locations of an archive, so repeated queries don't traverse and convert the
+/// Alembic data again.
+///
+/// \threading It is safe to call the const methods from concurrent threads. Access
+/// to the archive itself is serialised, because neither AlembicInput nor the HDF5
+/// backend are thread-safe, but cached results are shared between all threads.
+class IECOREALEMBIC_API AlembicScene : public IECore::SceneInterface
+{
+
+	public :
+
+		IE_CORE_DECLARERUNTIMETYPEDEXTENSION( AlembicScene, AlembicSceneTypeId, IECore::SceneInterface );
+
+		/// Opens the archive, with the current location set to the root. Only
+		/// IndexedIO::Read is supported as an open mode.
+		AlembicScene( const std::string &fileName, IECore::IndexedIO::OpenMode mode = IECore::IndexedIO::Read );
+		virtual ~AlembicScene();
+
+		virtual std::string fileName() const;
+
+		virtual Name name() const;
+		virtual void path( Path &p ) const;
+
+		virtual Imath::Box3d readBound( double time ) const;
+		virtual void writeBound( const Imath::Box3d &bound, double time );
+
+		virtual IECore::ConstDataPtr readTransform( double time ) const;
+		virtual Imath::M44d readTransformAsMatrix( double time ) const;
+		virtual void writeTransform( const IECore::Data *transform, double time );
+
+		/// Alembic archives are not currently translated to have any attributes.
+		virtual bool hasAttribute( const Name &name ) const;
+		virtual void attributeNames( NameList &attrs ) const;
+		virtual IECore::ConstObjectPtr readAttribute( const Name &name, double time ) const;
+		virtual void writeAttribute( const Name &name, const IECore::Object *attribute, double time );
+
+		/// Alembic has no equivalent of tags, so these never find any.
+		virtual bool hasTag( const Name &name, int filter = SceneInterface::LocalTag ) const;
+		virtual void readTags( NameList &tags, int filter = SceneInterface::LocalTag ) const;
+		virtual void writeTags( const NameList &tags );
+
+		virtual bool hasObject() const;
+		/// The returned object is shared with the cache, and must not be modified.
+		virtual IECore::ConstObjectPtr readObject( double time ) const;
+		virtual IECore::PrimitiveVariableMap readObjectPrimitiveVariables( const std::vector<IECore::InternedString> &primVarNames, double time ) const;
+		virtual void writeObject( const IECore::Object *object, double time );
+
+		virtual bool hasChild( const Name &name ) const;
+		virtual void childNames( NameList &childNames ) const;
+		virtual IECore::SceneInterfacePtr child( const Name &name, MissingBehaviour missingBehaviour = SceneInterface::ThrowIfMissing );
+		virtual IECore::ConstSceneInterfacePtr child( const Name &name, MissingBehaviour missingBehaviour = SceneInterface::ThrowIfMissing ) const;
+		virtual IECore::SceneInterfacePtr createChild( const Name &name );
+		virtual IECore::SceneInterfacePtr scene( const Path &path, MissingBehaviour missingBehaviour = SceneInterface::ThrowIfMissing );
+		virtual IECore::ConstSceneInterfacePtr scene( const Path &path, MissingBehaviour missingBehaviour = SceneInterface::ThrowIfMissing ) const;
+
+		virtual void hash( HashType hashType, double time, IECore::MurmurHash &h ) const;
+
+	private :
+
+		IE_CORE_FORWARDDECLARE( SharedData );
+
+		AlembicScene( SharedDataPtr sharedData, const Path &path, AlembicInputPtr input );
+
+		tbb::mutex &inputMutex() const;
+		void appendSampleInterval( double time, IECore::MurmurHash &h ) const;
+		Imath::Box3d computeBound( double time ) const;
+
+		struct CacheKey;
+		static IECore::MurmurHash cacheKeyHash( const CacheKey &key );
+		static IECore::ConstObjectPtr cacheKeyCompute( const CacheKey &key );
+
+		SharedDataPtr m_sharedData;
+		Path m_path;
+		AlembicInputPtr m_input;
+		// Guards m_input when the archive supports concurrent reads.
+		// See inputMutex().
+		mutable tbb::mutex m_inputMutex;
+
+		bool m_hasObject;
+		bool m_hasTransform;
+		bool m_hasStoredBound;
+
+};
+
+} // namespace IECoreAlembic
+
+#endif // IECOREALEMBIC_ALEMBICSCENE_H
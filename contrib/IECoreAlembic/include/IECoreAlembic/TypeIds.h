@@ -46,6 +46,7 @@ enum TypeId
 	FromAlembicSubDConverterTypeId = 112003,
 	FromAlembicGeomBaseConverterTypeId = 112004,
 	FromAlembicCameraConverterTypeId = 112005,
+	AlembicSceneTypeId = 112006,
 	
 	LastCoreAlembicTypeId = 112999,
 };
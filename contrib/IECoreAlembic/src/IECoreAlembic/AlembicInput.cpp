@@ -61,11 +61,12 @@ using namespace IECore;
 struct AlembicInput::DataMembers
 {
 	DataMembers()
-		: numSamples( -1 )
+		: numSamples( -1 ), concurrentReadsSupported( false )
 	{
 	}
 	
 	boost::shared_ptr<IArchive> archive;
+	bool concurrentReadsSupported;
 	IObject object;
 	int numSamples;
 	TimeSamplingPtr timeSampling;
@@ -77,13 +78,16 @@ AlembicInput::AlembicInput( const std::string &fileName )
 	
 #ifdef IECOREALEMBIC_WITH_OGAWA
 	Alembic::AbcCoreFactory::IFactory factory;
-	m_data->archive = boost::shared_ptr<IArchive>( new IArchive( factory.getArchive( fileName ) ) );
+	Alembic::AbcCoreFactory::IFactory::CoreType coreType;
+	m_data->archive = boost::shared_ptr<IArchive>( new IArchive( factory.getArchive( fileName, coreType ) ) );
 	if( !m_data->archive->valid() )
 	{
 		// even though the default policy for IFactory is kThrowPolicy, this appears not to
 		// be applied when it fails to load an archive - instead it returns an invalid archive.
 		throw IECore::Exception( boost::str( boost::format( "Unable to open file \"%s\"" ) % fileName ) );
 	}
+	// Ogawa archives may be read from several threads at once, HDF5 ones may not.
+	m_data->concurrentReadsSupported = coreType == Alembic::AbcCoreFactory::IFactory::kOgawa;
 #else
 	m_data->archive = boost::shared_ptr<IArchive>( new IArchive( ::Alembic::AbcCoreHDF5::ReadArchive(), fileName ) );
 #endif
@@ -122,6 +126,11 @@ IECore::CompoundDataPtr AlembicInput::metaData() const
 	return resultData;
 }
 
+bool AlembicInput::concurrentReadsSupported() const
+{
+	return m_data->concurrentReadsSupported;
+}
+
 size_t AlembicInput::numSamples() const
 {
 	if( m_data->numSamples != -1 )
@@ -423,6 +432,7 @@ AlembicInputPtr AlembicInput::child( size_t index ) const
 	AlembicInputPtr result = new AlembicInput();
 	result->m_data = boost::shared_ptr<DataMembers>( new DataMembers );
 	result->m_data->archive = this->m_data->archive;
+	result->m_data->concurrentReadsSupported = this->m_data->concurrentReadsSupported;
 	/// \todo this is documented as not being the best way of doing things in
 	/// the alembic documentation. I'm not sure what would be better though,
 	/// and it appears to work fine so far.
@@ -453,6 +463,7 @@ AlembicInputPtr AlembicInput::child( const std::string &name ) const
 	AlembicInputPtr result = new AlembicInput();
 	result->m_data = boost::shared_ptr<DataMembers>( new DataMembers );
 	result->m_data->archive = m_data->archive;
+	result->m_data->concurrentReadsSupported = m_data->concurrentReadsSupported;
 	result->m_data->object = c;
 	return result;
 }
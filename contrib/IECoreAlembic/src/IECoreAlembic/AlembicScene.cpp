@@ -0,0 +1,510 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include <algorithm>
+
+#include "tbb/mutex.h"
+
+#include "OpenEXR/ImathBoxAlgo.h"
+#include "OpenEXR/ImathFun.h"
+
+#include "IECore/ComputationCache.h"
+#include "IECore/SimpleTypedData.h"
+#include "IECore/Primitive.h"
+#include "IECore/ObjectInterpolator.h"
+
+#include "IECoreAlembic/AlembicScene.h"
+#include "IECoreAlembic/FromAlembicXFormConverter.h"
+
+using namespace Imath;
+using namespace IECore;
+using namespace IECoreAlembic;
+
+IE_CORE_DEFINERUNTIMETYPED( AlembicScene );
+
+static SceneInterface::FileFormatDescription<AlembicScene> registrar( ".abc", IndexedIO::Read );
+
+//////////////////////////////////////////////////////////////////////////
+// Cache keys and shared data
+//////////////////////////////////////////////////////////////////////////
+
+struct AlembicScene::CacheKey
+{
+	CacheKey( const AlembicScene *scene, HashType hashType, double time )
+		:	scene( scene ), hashType( hashType ), time( time )
+	{
+	}
+
+	const AlembicScene *scene;
+	HashType hashType;
+	double time;
+};
+
+// Data shared by all the locations of an archive.
+class AlembicScene::SharedData : public RefCounted
+{
+
+	public :
+
+		typedef tbb::mutex Mutex;
+		typedef ComputationCache<CacheKey> Cache;
+
+		SharedData( const std::string &fileName )
+			:	fileName( fileName ), root( new AlembicInput( fileName ) ), cache( new Cache( &AlembicScene::cacheKeyCompute, &AlembicScene::cacheKeyHash ) )
+		{
+		}
+
+		const std::string fileName;
+		// Must be held while using the root AlembicInput, or any of the
+		// AlembicInputs for archives which don't support concurrent reads.
+		Mutex mutex;
+		AlembicInputPtr root;
+		// Holds the objects and bounds read from the archive.
+		Cache::Ptr cache;
+
+};
+
+MurmurHash AlembicScene::cacheKeyHash( const CacheKey &key )
+{
+	MurmurHash h;
+	key.scene->hash( key.hashType, key.time, h );
+	return h;
+}
+
+ConstObjectPtr AlembicScene::cacheKeyCompute( const CacheKey &key )
+{
+	switch( key.hashType )
+	{
+		case ObjectHash :
+		{
+			// We hold the lock only while reading the samples, so that
+			// the interpolation doesn't block other threads.
+			size_t floorIndex, ceilIndex;
+			double x;
+			ObjectPtr floorObject, ceilObject;
+			{
+				SharedData::Mutex::scoped_lock lock( key.scene->inputMutex() );
+				x = key.scene->m_input->sampleIntervalAtTime( key.time, floorIndex, ceilIndex );
+				floorObject = key.scene->m_input->objectAtSample( floorIndex );
+				if( floorObject && ceilIndex != floorIndex )
+				{
+					ceilObject = key.scene->m_input->objectAtSample( ceilIndex );
+				}
+			}
+			if( !ceilObject )
+			{
+				return floorObject;
+			}
+			return linearObjectInterpolation( floorObject.get(), ceilObject.get(), x );
+		}
+		case BoundHash :
+			return new Box3dData( key.scene->computeBound( key.time ) );
+		default :
+			throw Exception( "IECoreAlembic::AlembicScene : Unexpected cache key" );
+	}
+}
+
+//////////////////////////////////////////////////////////////////////////
+// AlembicScene
+//////////////////////////////////////////////////////////////////////////
+
+AlembicScene::AlembicScene( const std::string &fileName, IndexedIO::OpenMode mode )
+	:	m_hasObject( false ), m_hasTransform( false )
+{
+	if( mode & ( IndexedIO::Write | IndexedIO::Append ) )
+	{
+		throw InvalidArgumentException( "IECoreAlembic::AlembicScene only supports IndexedIO::Read" );
+	}
+
+	m_sharedData = new SharedData( fileName );
+	m_input = m_sharedData->root;
+	m_hasStoredBound = m_input->hasStoredBound();
+}
+
+AlembicScene::AlembicScene( SharedDataPtr sharedData, const Path &path, AlembicInputPtr input )
+	:	m_sharedData( sharedData ), m_path( path ), m_input( input ), m_hasObject( false ), m_hasTransform( false )
+{
+	SharedData::Mutex::scoped_lock lock( inputMutex() );
+
+	if( m_path.size() )
+	{
+		// the root can't have a transform or an object, but anything
+		// else may have either, depending on the type of converter
+		// available for it.
+		ToCoreConverterPtr converter = m_input->converter();
+		m_hasTransform = runTimeCast<FromAlembicXFormConverter>( converter.get() ) != 0;
+		m_hasObject = converter && !m_hasTransform;
+	}
+	m_hasStoredBound = m_input->hasStoredBound();
+}
+
+AlembicScene::~AlembicScene()
+{
+}
+
+std::string AlembicScene::fileName() const
+{
+	return m_sharedData->fileName;
+}
+
+SceneInterface::Name AlembicScene::name() const
+{
+	if( m_path.empty() )
+	{
+		return SceneInterface::rootName;
+	}
+	return m_path.back();
+}
+
+void AlembicScene::path( Path &p ) const
+{
+	p = m_path;
+}
+
+Imath::Box3d AlembicScene::readBound( double time ) const
+{
+	ConstObjectPtr bound = m_sharedData->cache->get( CacheKey( this, BoundHash, time ) );
+	return boost::static_pointer_cast<const Box3dData>( bound )->readable();
+}
+
+void AlembicScene::writeBound( const Imath::Box3d &bound, double time )
+{
+	throw Exception( "IECoreAlembic::AlembicScene is read-only" );
+}
+
+ConstDataPtr AlembicScene::readTransform( double time ) const
+{
+	return new M44dData( readTransformAsMatrix( time ) );
+}
+
+Imath::M44d AlembicScene::readTransformAsMatrix( double time ) const
+{
+	if( !m_hasTransform )
+	{
+		return M44d();
+	}
+
+	SharedData::Mutex::scoped_lock lock( inputMutex() );
+	return m_input->transformAtTime( time );
+}
+
+void AlembicScene::writeTransform( const Data *transform, double time )
+{
+	throw Exception( "IECoreAlembic::AlembicScene is read-only" );
+}
+
+bool AlembicScene::hasAttribute( const Name &name ) const
+{
+	return false;
+}
+
+void AlembicScene::attributeNames( NameList &attrs ) const
+{
+	attrs.clear();
+}
+
+ConstObjectPtr AlembicScene::readAttribute( const Name &name, double time ) const
+{
+	throw Exception( "IECoreAlembic::AlembicScene : No attribute named \"" + name.string() + "\"" );
+}
+
+void AlembicScene::writeAttribute( const Name &name, const Object *attribute, double time )
+{
+	throw Exception( "IECoreAlembic::AlembicScene is read-only" );
+}
+
+bool AlembicScene::hasTag( const Name &name, int filter ) const
+{
+	return false;
+}
+
+void AlembicScene::readTags( NameList &tags, int filter ) const
+{
+	tags.clear();
+}
+
+void AlembicScene::writeTags( const NameList &tags )
+{
+	throw Exception( "IECoreAlembic::AlembicScene is read-only" );
+}
+
+bool AlembicScene::hasObject() const
+{
+	return m_hasObject;
+}
+
+ConstObjectPtr AlembicScene::readObject( double time ) const
+{
+	if( !m_hasObject )
+	{
+		std::string p;
+		pathToString( m_path, p );
+		throw Exception( "IECoreAlembic::AlembicScene : No object stored at \"" + p + "\"" );
+	}
+
+	return m_sharedData->cache->get( CacheKey( this, ObjectHash, time ) );
+}
+
+PrimitiveVariableMap AlembicScene::readObjectPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
+{
+	ConstPrimitivePtr primitive = runTimeCast<const Primitive>( readObject( time ) );
+	if( !primitive )
+	{
+		throw Exception( "Object does not have primitive variables!" );
+	}
+
+	PrimitiveVariableMap result;
+	for( std::vector<InternedString>::const_iterator it = primVarNames.begin(), eIt = primVarNames.end(); it != eIt; ++it )
+	{
+		PrimitiveVariableMap::const_iterator pIt = primitive->variables.find( *it );
+		if( pIt == primitive->variables.end() )
+		{
+			continue;
+		}
+		// the primitive belongs to the cache, so we must return copies
+		// of its data. these are cheap until they are modified.
+		PrimitiveVariable &p = result[*it];
+		p.interpolation = pIt->second.interpolation;
+		if( pIt->second.data )
+		{
+			p.data = pIt->second.data->copy();
+		}
+	}
+	return result;
+}
+
+void AlembicScene::writeObject( const Object *object, double time )
+{
+	throw Exception( "IECoreAlembic::AlembicScene is read-only" );
+}
+
+bool AlembicScene::hasChild( const Name &name ) const
+{
+	NameList names;
+	childNames( names );
+	return std::find( names.begin(), names.end(), name ) != names.end();
+}
+
+void AlembicScene::childNames( NameList &childNames ) const
+{
+	ConstStringVectorDataPtr names;
+	{
+		SharedData::Mutex::scoped_lock lock( inputMutex() );
+		names = m_input->childNames();
+	}
+
+	const std::vector<std::string> &n = names->readable();
+	childNames.clear();
+	childNames.reserve( n.size() );
+	for( std::vector<std::string>::const_iterator it = n.begin(), eIt = n.end(); it != eIt; ++it )
+	{
+		childNames.push_back( *it );
+	}
+}
+
+SceneInterfacePtr AlembicScene::child( const Name &name, MissingBehaviour missingBehaviour )
+{
+	return boost::const_pointer_cast<SceneInterface>( static_cast<const AlembicScene *>( this )->child( name, missingBehaviour ) );
+}
+
+ConstSceneInterfacePtr AlembicScene::child( const Name &name, MissingBehaviour missingBehaviour ) const
+{
+	AlembicInputPtr childInput;
+	{
+		SharedData::Mutex::scoped_lock lock( inputMutex() );
+		ConstStringVectorDataPtr names = m_input->childNames();
+		const std::vector<std::string> &n = names->readable();
+		if( std::find( n.begin(), n.end(), name.string() ) != n.end() )
+		{
+			childInput = m_input->child( name.string() );
+		}
+	}
+
+	if( !childInput )
+	{
+		switch( missingBehaviour )
+		{
+			case SceneInterface::NullIfMissing :
+				return 0;
+			case SceneInterface::CreateIfMissing :
+				throw Exception( "IECoreAlembic::AlembicScene is read-only" );
+			default :
+			{
+				std::string p;
+				pathToString( m_path, p );
+				throw Exception( "IECoreAlembic::AlembicScene : Location \"" + p + "\" has no child named \"" + name.string() + "\"" );
+			}
+		}
+	}
+
+	Path childPath( m_path );
+	childPath.push_back( name );
+	return new AlembicScene( m_sharedData, childPath, childInput );
+}
+
+SceneInterfacePtr AlembicScene::createChild( const Name &name )
+{
+	throw Exception( "IECoreAlembic::AlembicScene is read-only" );
+}
+
+SceneInterfacePtr AlembicScene::scene( const Path &path, MissingBehaviour missingBehaviour )
+{
+	return boost::const_pointer_cast<SceneInterface>( static_cast<const AlembicScene *>( this )->scene( path, missingBehaviour ) );
+}
+
+ConstSceneInterfacePtr AlembicScene::scene( const Path &path, MissingBehaviour missingBehaviour ) const
+{
+	ConstSceneInterfacePtr result = new AlembicScene( m_sharedData, Path(), m_sharedData->root );
+	for( Path::const_iterator it = path.begin(), eIt = path.end(); it != eIt; ++it )
+	{
+		result = result->child( *it, missingBehaviour );
+		if( !result )
+		{
+			return 0;
+		}
+	}
+	return result;
+}
+
+void AlembicScene::hash( HashType hashType, double time, MurmurHash &h ) const
+{
+	SceneInterface::hash( hashType, time, h );
+
+	h.append( (unsigned char)hashType );
+
+	switch( hashType )
+	{
+		case TransformHash :
+
+			if( !m_hasTransform )
+			{
+				// return a simple hash for the identity transform (which does not include the scene location).
+				return;
+			}
+			appendSampleInterval( time, h );
+			break;
+
+		case AttributesHash :
+
+			// we never have any attributes, so the hash doesn't depend on the scene location.
+			return;
+
+		case BoundHash :
+
+			if( m_hasStoredBound )
+			{
+				appendSampleInterval( time, h );
+			}
+			else
+			{
+				// the bound is computed from the descendants, which may be animated.
+				h.append( time );
+			}
+			break;
+
+		case ObjectHash :
+
+			if( !m_hasObject )
+			{
+				// return a simple hash for no object (which does not include the scene location).
+				return;
+			}
+			appendSampleInterval( time, h );
+			break;
+
+		case ChildNamesHash :
+
+			// child names do not depend on time.
+			break;
+
+		case HierarchyHash :
+
+			// we have no cheap way of knowing whether or not the descendants are animated.
+			h.append( time );
+			break;
+	}
+
+	// the hash computed so far is not based on the contents of the file,
+	// so we add the file and the location to identify them.
+	std::string p;
+	pathToString( m_path, p );
+	h.append( m_sharedData->fileName );
+	h.append( p );
+}
+
+tbb::mutex &AlembicScene::inputMutex() const
+{
+	// HDF5 isn't threadsafe, so all locations of such archives share
+	// the archive-wide mutex. Ogawa archives may be read concurrently,
+	// so we need only serialise access to our own AlembicInput, which
+	// computes its sampling lazily. The root input is shared between
+	// all the root locations, so it always uses the archive-wide mutex.
+	if( m_input->concurrentReadsSupported() && m_input != m_sharedData->root )
+	{
+		return m_inputMutex;
+	}
+	return m_sharedData->mutex;
+}
+
+void AlembicScene::appendSampleInterval( double time, MurmurHash &h ) const
+{
+	size_t floorIndex, ceilIndex;
+	double x;
+	{
+		SharedData::Mutex::scoped_lock lock( inputMutex() );
+		x = m_input->sampleIntervalAtTime( time, floorIndex, ceilIndex );
+	}
+	h.append( lerp( (double)floorIndex, (double)ceilIndex, x ) );
+}
+
+Imath::Box3d AlembicScene::computeBound( double time ) const
+{
+	if( m_hasStoredBound )
+	{
+		SharedData::Mutex::scoped_lock lock( inputMutex() );
+		return m_input->boundAtTime( time );
+	}
+
+	// AlembicInput::boundAtTime() would traverse the descendants for us, but
+	// by going via readBound() instead, their bounds are cached too.
+	Box3d result;
+	NameList names;
+	childNames( names );
+	for( NameList::const_iterator it = names.begin(), eIt = names.end(); it != eIt; ++it )
+	{
+		ConstSceneInterfacePtr c = child( *it );
+		result.extendBy( Imath::transform( c->readBound( time ), c->readTransformAsMatrix( time ) ) );
+	}
+	return result;
+}
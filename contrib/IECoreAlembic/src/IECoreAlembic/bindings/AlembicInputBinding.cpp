@@ -74,6 +74,7 @@ void IECoreAlembicBindings::bindAlembicInput()
 		.def( "name", &AlembicInput::name, return_value_policy<copy_const_reference>() )
 		.def( "fullName", &AlembicInput::fullName, return_value_policy<copy_const_reference>() )
 		.def( "metaData", &AlembicInput::metaData )
+		.def( "concurrentReadsSupported", &AlembicInput::concurrentReadsSupported )
 		.def( "numSamples", &AlembicInput::numSamples )
 		.def( "timeAtSample", &AlembicInput::timeAtSample )
 		.def( "sampleIntervalAtTime", &sampleIntervalAtTime )
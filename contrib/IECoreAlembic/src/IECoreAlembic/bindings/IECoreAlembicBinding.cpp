@@ -35,6 +35,7 @@
 #include <boost/python.hpp>
 
 #include "IECoreAlembic/bindings/AlembicInputBinding.h"
+#include "IECoreAlembic/bindings/AlembicSceneBinding.h"
 
 using namespace IECoreAlembicBindings;
 using namespace boost::python;
@@ -43,5 +44,6 @@ BOOST_PYTHON_MODULE( _IECoreAlembic )
 {
 
 	bindAlembicInput();
+	bindAlembicScene();
 
 }
@@ -462,5 +462,15 @@ class AlembicInputTest( unittest.TestCase ) :
 		self.assertEqual( m.numChildren(), 0 )
 		self.assertEqual( m.childNames(), IECore.StringVectorData() )
 
+	def testConcurrentReadsSupported( self ) :
+
+		a = IECoreAlembic.AlembicInput( os.path.dirname( __file__ ) + "/data/cube.abc" )
+		self.assertFalse( a.concurrentReadsSupported() )
+		self.assertFalse( a.child( "group1" ).concurrentReadsSupported() )
+
+		a = IECoreAlembic.AlembicInput( os.path.dirname( __file__ ) + "/data/sphereWithShadingGroups.abc" )
+		self.assertTrue( a.concurrentReadsSupported() )
+		self.assertTrue( a.child( "pSphere1" ).concurrentReadsSupported() )
+
 if __name__ == "__main__":
     unittest.main()
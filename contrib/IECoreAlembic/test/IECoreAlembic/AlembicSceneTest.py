@@ -0,0 +1,191 @@
+##########################################################################
+#
+#  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import threading
+import unittest
+
+import IECore
+import IECoreAlembic
+
+class AlembicSceneTest( unittest.TestCase ) :
+
+	def testConstructor( self ) :
+
+		fileName = os.path.dirname( __file__ ) + "/data/cube.abc"
+
+		s = IECoreAlembic.AlembicScene( fileName )
+		self.assertEqual( s.fileName(), fileName )
+		self.assertEqual( s.name(), "/" )
+		self.assertEqual( s.path(), [] )
+
+		self.assertRaises( Exception, IECoreAlembic.AlembicScene, "iDontExist.abc" )
+		self.assertRaises( Exception, IECoreAlembic.AlembicScene, fileName, IECore.IndexedIO.OpenMode.Write )
+
+	def testCreate( self ) :
+
+		self.failUnless( "abc" in IECore.SceneInterface.supportedExtensions( IECore.IndexedIO.OpenMode.Read ) )
+		self.failIf( "abc" in IECore.SceneInterface.supportedExtensions( IECore.IndexedIO.OpenMode.Write ) )
+
+		s = IECore.SceneInterface.create( os.path.dirname( __file__ ) + "/data/cube.abc", IECore.IndexedIO.OpenMode.Read )
+		self.failUnless( isinstance( s, IECoreAlembic.AlembicScene ) )
+
+	def testHierarchy( self ) :
+
+		s = IECoreAlembic.AlembicScene( os.path.dirname( __file__ ) + "/data/cube.abc" )
+		self.assertEqual( s.childNames(), [ "group1" ] )
+		self.failUnless( s.hasChild( "group1" ) )
+		self.failIf( s.hasChild( "iDontExist" ) )
+
+		g = s.child( "group1" )
+		self.assertEqual( g.name(), "group1" )
+		self.assertEqual( g.path(), [ "group1" ] )
+		self.assertEqual( g.childNames(), [ "pCube1" ] )
+
+		c = g.child( "pCube1" )
+		self.assertEqual( c.childNames(), [ "pCubeShape1" ] )
+
+		cs = c.child( "pCubeShape1" )
+		self.assertEqual( cs.path(), [ "group1", "pCube1", "pCubeShape1" ] )
+		self.assertEqual( cs.childNames(), [] )
+
+		self.assertRaises( Exception, cs.child, "iDontExist" )
+		self.assertEqual( cs.child( "iDontExist", IECore.SceneInterface.MissingBehaviour.NullIfMissing ), None )
+		self.assertRaises( Exception, cs.child, "iDontExist", IECore.SceneInterface.MissingBehaviour.CreateIfMissing )
+		self.assertRaises( Exception, cs.createChild, "iDontExist" )
+
+		self.assertEqual( s.scene( [ "group1", "pCube1", "pCubeShape1" ] ).path(), cs.path() )
+		self.assertEqual( cs.scene( [] ).path(), [] )
+		self.assertEqual( s.scene( [ "group1", "iDontExist" ], IECore.SceneInterface.MissingBehaviour.NullIfMissing ), None )
+
+	def testTransformAndObject( self ) :
+
+		s = IECoreAlembic.AlembicScene( os.path.dirname( __file__ ) + "/data/cube.abc" )
+		g = s.child( "group1" )
+		c = g.child( "pCube1" )
+		cs = c.child( "pCubeShape1" )
+
+		self.assertEqual( s.readTransformAsMatrix( 0 ), IECore.M44d() )
+		self.assertEqual( g.readTransformAsMatrix( 0 ), IECore.M44d.createScaled( IECore.V3d( 2 ) ) * IECore.M44d.createTranslated( IECore.V3d( 2, 0, 0 ) ) )
+		self.assertEqual( c.readTransform( 0 ), IECore.M44dData( IECore.M44d.createTranslated( IECore.V3d( -1, 0, 0 ) ) ) )
+		self.assertEqual( cs.readTransformAsMatrix( 0 ), IECore.M44d() )
+
+		self.failIf( s.hasObject() )
+		self.failIf( g.hasObject() )
+		self.failIf( c.hasObject() )
+		self.failUnless( cs.hasObject() )
+		self.assertRaises( Exception, g.readObject, 0 )
+
+		m = cs.readObject( 0 )
+		self.failUnless( isinstance( m, IECore.MeshPrimitive ) )
+		self.assertEqual( m, IECoreAlembic.AlembicInput( s.fileName() ).child( "group1" ).child( "pCube1" ).child( "pCubeShape1" ).objectAtTime( 0 ) )
+
+		# the object is cached by hash, which is shared by all the scenes
+		# for the same location, so repeated reads give the same result.
+		# we can't check the cached instance itself, because the python
+		# binding returns a copy.
+		cs2 = s.scene( cs.path() )
+		self.assertEqual( cs2.hash( IECore.SceneInterface.HashType.ObjectHash, 0 ), cs.hash( IECore.SceneInterface.HashType.ObjectHash, 0 ) )
+		self.assertEqual( cs2.readObject( 0 ), m )
+		self.assertEqual( cs.readObject( 0 ), m )
+
+		p = cs.readObjectPrimitiveVariables( [ "P", "iDontExist" ], 0 )
+		self.assertEqual( p.keys(), [ "P" ] )
+		self.assertEqual( p["P"].data, m["P"].data )
+
+	def testBound( self ) :
+
+		s = IECoreAlembic.AlembicScene( os.path.dirname( __file__ ) + "/data/cube.abc" )
+		self.assertEqual( s.readBound( 0 ), IECore.Box3d( IECore.V3d( -2 ), IECore.V3d( 2 ) ) )
+
+		cs = s.scene( [ "group1", "pCube1", "pCubeShape1" ] )
+		self.assertEqual( cs.readBound( 0 ), IECore.Box3d( IECore.V3d( -1 ), IECore.V3d( 1 ) ) )
+
+		# bounds which aren't stored are computed from the descendants
+		fileName = os.path.dirname( __file__ ) + "/data/noTopLevelStoredBounds.abc"
+		s = IECoreAlembic.AlembicScene( fileName )
+		self.assertEqual( s.readBound( 0 ), IECoreAlembic.AlembicInput( fileName ).boundAtTime( 0 ) )
+
+	def testAnimation( self ) :
+
+		fileName = os.path.dirname( __file__ ) + "/data/animatedCube.abc"
+		a = IECoreAlembic.AlembicInput( fileName ).child( "pCube1" )
+		s = IECoreAlembic.AlembicScene( fileName ).child( "pCube1" )
+
+		for time in ( 1 / 24.0, 1.5 / 24.0, 3 / 24.0, 10 / 24.0 ) :
+			self.assertEqual( s.readTransformAsMatrix( time ), a.transformAtTime( time ) )
+			self.assertEqual( s.child( "pCubeShape1" ).readBound( time ), a.child( "pCubeShape1" ).boundAtTime( time ) )
+			self.assertEqual( s.child( "pCubeShape1" ).readObject( time ), a.child( "pCubeShape1" ).objectAtTime( time ) )
+
+	def testHash( self ) :
+
+		s = IECoreAlembic.AlembicScene( os.path.dirname( __file__ ) + "/data/animatedCube.abc" )
+		m = s.scene( [ "pCube1", "pCubeShape1" ] )
+
+		# times which map to the same sample have the same hash
+		self.assertEqual( m.hash( IECore.SceneInterface.HashType.ObjectHash, 1 / 24.0 ), m.hash( IECore.SceneInterface.HashType.ObjectHash, 1 / 24.0 + 0.00001 ) )
+		self.assertNotEqual( m.hash( IECore.SceneInterface.HashType.ObjectHash, 1 / 24.0 ), m.hash( IECore.SceneInterface.HashType.ObjectHash, 2 / 24.0 ) )
+
+		# locations without objects or transforms share the same hash
+		self.assertEqual( s.hash( IECore.SceneInterface.HashType.ObjectHash, 0 ), s.child( "pCube1" ).hash( IECore.SceneInterface.HashType.ObjectHash, 0 ) )
+		self.assertEqual( s.hash( IECore.SceneInterface.HashType.TransformHash, 0 ), m.hash( IECore.SceneInterface.HashType.TransformHash, 0 ) )
+
+	def testConcurrentReads( self ) :
+
+		fileName = os.path.dirname( __file__ ) + "/data/animatedCube.abc"
+
+		def walk( scene, time, result ) :
+			result.append( ( scene.path(), scene.readBound( time ), scene.readTransformAsMatrix( time ), scene.readObject( time ) if scene.hasObject() else None ) )
+			for childName in scene.childNames() :
+				walk( scene.child( childName ), time, result )
+
+		times = [ ( i + 1 ) / 48.0 for i in range( 0, 20 ) ]
+		expected = []
+		for time in times :
+			result = []
+			walk( IECoreAlembic.AlembicScene( fileName ), time, result )
+			expected.append( result )
+
+		s = IECoreAlembic.AlembicScene( fileName )
+		results = [ [] for time in times ]
+		threads = [ threading.Thread( target = walk, args = ( s, time, result ) ) for time, result in zip( times, results ) ]
+		for t in threads :
+			t.start()
+		for t in threads :
+			t.join()
+
+		self.assertEqual( results, expected )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -42,6 +42,7 @@ warnings.simplefilter( "error", DeprecationWarning )
 
 from AlembicInputTest import AlembicInputTest
 from ABCToMDCTest import ABCToMDCTest
+from AlembicSceneTest import AlembicSceneTest
 
 unittest.TestProgram(
 	testRunner = unittest.TextTestRunner(
@@ -56,6 +56,7 @@ class IECORE_API AlexaLogcToLinearOp : public ChannelOp
 	protected :
 
 		virtual void modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels );
+		virtual bool channelsAreIndependent() const;
 
 		struct Converter;
 
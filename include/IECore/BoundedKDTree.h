@@ -72,7 +72,7 @@ class BoundedKDTree
 		/// must remain valid and unchanged as long as the tree is in use.
 		/// This method can be called again to rebuild the tree at any time.
 		/// \threading This can't be called while other threads are
-		/// making queries.
+		/// making queries. Large trees are built using multiple threads.
 		void init( BoundIterator first, BoundIterator last, int maxLeafSize=4 );
 
 		/// Populates the passed vector of iterators with the bounds which intersect "b". Returns the number of bounds found.
@@ -103,10 +103,11 @@ class BoundedKDTree
 		typedef typename Permutation::const_iterator PermutationConstIterator;
 
 		class AxisSort;
+		class BuildTask;
 
 		unsigned char majorAxis( PermutationConstIterator permFirst, PermutationConstIterator permLast );
+		/// Builds the subtree rooted at nodeIndex, including the bounds of its nodes.
 		void build( NodeIndex nodeIndex, PermutationIterator permFirst, PermutationIterator permLast );
-		void bound( NodeIndex nodeIndex );
 
 		template<typename S>
 		void intersectingBoundsWalk( NodeIndex nodeIndex, const S &p, std::vector<BoundIterator> &bounds ) const;
@@ -35,8 +35,11 @@
 #include <algorithm>
 #include <cassert>
 
+#include "tbb/parallel_invoke.h"
+
 #include "IECore/VectorTraits.h"
 #include "IECore/VectorOps.h"
+#include "IECore/TaskIsolation.h"
 #include "IECore/BoxOps.h"
 
 namespace IECore
@@ -60,6 +63,27 @@ class BoundedKDTree<BoundIterator>::AxisSort
 		const unsigned int m_axis;
 };
 
+template<class BoundIterator>
+class BoundedKDTree<BoundIterator>::BuildTask
+{
+	public :
+		BuildTask( BoundedKDTree *tree, NodeIndex nodeIndex, PermutationIterator permFirst, PermutationIterator permLast )
+			:	m_tree( tree ), m_nodeIndex( nodeIndex ), m_permFirst( permFirst ), m_permLast( permLast )
+		{
+		}
+
+		void operator()() const
+		{
+			m_tree->build( m_nodeIndex, m_permFirst, m_permLast );
+		}
+
+	private :
+		BoundedKDTree *m_tree;
+		NodeIndex m_nodeIndex;
+		PermutationIterator m_permFirst;
+		PermutationIterator m_permLast;
+};
+
 
 template<class BoundIterator>
 BoundedKDTree<BoundIterator>::Node::Node() : m_cutAxisAndLeaf(0)
@@ -168,51 +192,19 @@ unsigned char BoundedKDTree<BoundIterator>::majorAxis( PermutationConstIterator
 	return major;
 }
 
-template<class BoundIterator>
-void BoundedKDTree<BoundIterator>::bound( NodeIndex nodeIndex  )
-{
-	assert( nodeIndex < m_nodes.size() );
-
-	Node &node = m_nodes[nodeIndex];
-
-	assert( BoxTraits<Bound>::isEmpty( node.bound() ) );
-
-	if( node.isLeaf() )
-	{
-		BoundIterator *permLast = node.permLast();
-		for( BoundIterator *perm = node.permFirst(); perm!=permLast; perm++ )
-		{
-			boxExtend( node.bound(), **perm );
-		}
-	}
-	else
-	{
-		assert( node.isBranch() );
-
-		assert( lowChildIndex( nodeIndex ) < m_nodes.size() );
-		assert( highChildIndex( nodeIndex ) < m_nodes.size() );
-
-		bound( lowChildIndex( nodeIndex ) );
-		bound( highChildIndex( nodeIndex ) );
-		boxExtend( node.bound(), m_nodes[lowChildIndex( nodeIndex )].bound() );
-		boxExtend( node.bound(), m_nodes[highChildIndex( nodeIndex )].bound() );
-	}
-}
-
-
 template<class BoundIterator>
 void BoundedKDTree<BoundIterator>::build( NodeIndex nodeIndex, PermutationIterator permFirst, PermutationIterator permLast )
 {
-	// make room for the new node
-	if( nodeIndex>=m_nodes.size() )
-	{
-		m_nodes.resize( nodeIndex+1 );
-	}
+	// below this many bounds it's quicker to build the subtrees serially
+	// than to spawn tasks for them.
+	const typename Permutation::difference_type parallelThreshold = 10000;
 
 	assert( nodeIndex < m_nodes.size() );
 
 	Node &node = m_nodes[nodeIndex];
 
+	assert( BoxTraits<Bound>::isEmpty( node.bound() ) );
+
 	if( permLast - permFirst > m_maxLeafSize )
 	{
 		unsigned int cutAxis = majorAxis( permFirst, permLast );
@@ -222,13 +214,30 @@ void BoundedKDTree<BoundIterator>::build( NodeIndex nodeIndex, PermutationIterat
 		// insert node
 		node.makeBranch( cutAxis );
 
-		build( lowChildIndex( nodeIndex ), permFirst, permMid );
-		build( highChildIndex( nodeIndex ), permMid, permLast );
+		if( permLast - permFirst > parallelThreshold )
+		{
+			tbb::parallel_invoke(
+				BuildTask( this, lowChildIndex( nodeIndex ), permFirst, permMid ),
+				BuildTask( this, highChildIndex( nodeIndex ), permMid, permLast )
+			);
+		}
+		else
+		{
+			build( lowChildIndex( nodeIndex ), permFirst, permMid );
+			build( highChildIndex( nodeIndex ), permMid, permLast );
+		}
+
+		boxExtend( node.bound(), m_nodes[lowChildIndex( nodeIndex )].bound() );
+		boxExtend( node.bound(), m_nodes[highChildIndex( nodeIndex )].bound() );
 	}
 	else
 	{
 		// leaf node
 		node.makeLeaf( permFirst, permLast );
+		for( PermutationIterator perm = permFirst; perm != permLast; perm++ )
+		{
+			boxExtend( node.bound(), **perm );
+		}
 	}
 }
 
@@ -256,9 +265,21 @@ void BoundedKDTree<BoundIterator>::init( BoundIterator first, BoundIterator last
 		m_perm[i++] = it;
 	}
 
-	/// \todo Can we reserve() enough space for m_nodes before doing this?
-	build( rootIndex(), m_perm.begin(), m_perm.end() );
-	bound( rootIndex() );
+	// the shape of the tree depends only on the number of bounds, and the
+	// deepest and highest numbered node is found by always following the
+	// high child, which gets the larger half of the bounds. sizing m_nodes
+	// up front means that build() can fill in subtrees concurrently.
+	NodeIndex maxIndex = rootIndex();
+	for( typename Permutation::difference_type n = m_perm.size(); n > m_maxLeafSize; n -= n / 2 )
+	{
+		maxIndex = highChildIndex( maxIndex );
+	}
+	m_nodes.clear();
+	m_nodes.resize( maxIndex + 1 );
+
+	// isolated, because callers such as the primitive evaluators build the tree
+	// while holding a lock.
+	isolateTasks( BuildTask( this, rootIndex(), m_perm.begin(), m_perm.end() ) );
 }
 
 template<class BoundIterator>
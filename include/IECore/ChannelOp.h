@@ -68,17 +68,36 @@ class IECORE_API ChannelOp : public ImagePrimitiveOp
 		/// 	* the channels contain the appropriate number of elements for the dataWindow.
 		///		* the channels are all of type FloatVectorData.
 		///		* the dataWindow is not empty.
+		/// When channelsAreIndependent() returns true, this is called concurrently from several
+		/// threads, each passing a ChannelVector containing a single channel.
 		/// \todo ChannelVector doesn't contain any indicator as to which channel is which, so why not just pass a single channel at a time? As
 		/// things are right now, every derived class is iterating over the channels vector - there's not much else they can do - so it would
-		/// make sense to move that step to the base class. If we pass a single channel at a time then we could also thread the computation of
-		/// the different channels.
+		/// make sense to move that step to the base class.
 		virtual void modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels ) = 0;
+		/// May be implemented to return true by derived classes which modify each channel without reference
+		/// to the others, allowing the channels to be processed in parallel. Such classes must implement
+		/// modifyChannels() in a threadsafe manner - typically by only reading from parameter values and
+		/// member data. The default implementation returns false, so that all channels are passed to a single
+		/// call to modifyChannels().
+		virtual bool channelsAreIndependent() const;
+		/// Called once per operation before modifyChannels(). This is an opportunity to
+		/// perform any preprocessing shared by all channels, so that it isn't repeated
+		/// by each of the concurrent calls made when channelsAreIndependent() returns true.
+		/// The default implementation does nothing.
+		virtual void begin( const CompoundObject *operands );
+		/// Called once per operation, after all calls to modifyChannels() have been made.
+		/// This is an opportunity to perform any cleanup necessary. The default
+		/// implementation does nothing.
+		virtual void end();
 
 	private :
 
-		/// Implemented to call modifyChannels().
+		/// Implemented to call begin(), modifyChannels() and end().
 		virtual void modifyTypedPrimitive( ImagePrimitive *image, const CompoundObject *operands );
 
+		class ModifyChannels;
+		friend class ModifyChannels;
+
 		StringVectorParameterPtr m_channelNamesParameter;
 
 };
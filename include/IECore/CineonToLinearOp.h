@@ -68,6 +68,7 @@ class IECORE_API CineonToLinearOp : public ChannelOp
 	protected :
 
 		virtual void modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels );
+		virtual bool channelsAreIndependent() const;
 
 		FloatParameterPtr m_filmGamma;
 		IntParameterPtr m_refWhiteVal;
@@ -74,6 +74,7 @@ class IECORE_API ClampOp : public ChannelOp
 	protected :
 
 		virtual void modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels );
+		virtual bool channelsAreIndependent() const;
 
 };
 
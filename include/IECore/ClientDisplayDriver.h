@@ -46,9 +46,16 @@ namespace IECore
 
 
 /// Connects to a DisplayDriverServer and forwards the image to the server using socket messages.
-/// This client class works synchronously.
+/// Buckets passed to imageData() are queued and sent by a background thread, so the renderer doesn't
+/// wait on the network. If the queue fills up, imageData() blocks until there is room, and imageClose()
+/// waits until everything has been sent. Send errors are reported by the next call to imageData() or imageClose().
 /// It forwards all parameters to the server and also includes one called "clientPID" to help grouping AOVs from the same render.
 /// You must set the parameter 'remoteDisplayType' with a registered display driver to be instantiated in the server side.
+/// When the server supports it, buckets are sent as raw pixel data rather than being serialised with IndexedIO.
+/// In this case the optional StringData parameter "imageDataFormat" may be set to "half" to halve the amount
+/// of data sent, at the expense of precision. The default is "float". The optional StringData parameter
+/// "imageDataCompression" may be set to "gzip", or to "lz4" or "zstd" if IECore was built with them, to compress
+/// the buckets before sending. The default is "none".
 /// \ingroup renderingGroup
 class IECORE_API ClientDisplayDriver : public DisplayDriver
 {
@@ -99,6 +99,12 @@ class IECORE_API CompoundParameter : public Parameter
 		virtual Object *getValue();
 		/// As above.
 		virtual const Object *getValue() const;
+		/// Implemented to hash the values of the child parameters directly, without
+		/// updating the value returned by getValue(). For valid values the result is
+		/// the same as the hash of getValue().
+		/// \threading Unlike getValue(), this may be called from multiple concurrent threads.
+		virtual void hash( MurmurHash &h ) const;
+		using Parameter::hash;
 		//@}
 
 		//! @name Child Parameter access
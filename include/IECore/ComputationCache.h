@@ -37,8 +37,13 @@
 
 #include "boost/function.hpp"
 
+#include "tbb/concurrent_hash_map.h"
+#include "tbb/mutex.h"
+
 #include "IECore/LRUCache.h"
+#include "IECore/TaskIsolation.h"
 #include "IECore/ObjectPool.h"
+#include "IECore/DiskObjectCache.h"
 
 namespace IECore
 {
@@ -46,6 +51,17 @@ namespace IECore
 /// LRUCache for generic computation that results on Object derived classes. It uses ObjectPool for the storage and retrieval of 
 /// the computation results, and internally it only holds a map of computationHash to objectHash. The get functions will return the resulting 
 /// Object, which should be copied prior to modification. The retrieve function will only query the cache and not force computation.
+///
+/// An optional DiskObjectCache may be provided as a second level cache. Computation results are then saved to
+/// disk, indexed by the computation hash, and are loaded from there in preference to being recomputed, even by
+/// subsequent processes. The disk cache is only consulted when computation would otherwise be necessary.
+///
+/// \threading It is safe to call the methods of ComputationCache from concurrent threads. When several threads
+/// request the same missing computation at once, only one of them calls the compute function, and the others block
+/// until the result is available. If the compute function throws, all the waiting threads throw an Exception with the
+/// same description.
+/// When built against TBB 2018 or later, the compute function is run in an isolated TBB task region, so it may
+/// itself use TBB. See isolateTasks().
 template< typename T >
 class ComputationCache : public RefCounted
 {
@@ -62,7 +78,8 @@ class ComputationCache : public RefCounted
 		/// \param hashFn Functor that should compute a unique hash from the templated parameters identifying the computation result.
 		/// \param maxResults Limits the number of computation results this cache will hold.
 		/// \param objectPool Allows overriding the ObjectPool instance to be used for holding the resulting computed objects.
-		ComputationCache( ComputeFn computeFn, HashFn hashFn, size_t maxResults = 10000, ObjectPoolPtr objectPool = ObjectPool::defaultObjectPool() );
+		/// \param diskCache Optional persistent cache used to store computation results between processes.
+		ComputationCache( ComputeFn computeFn, HashFn hashFn, size_t maxResults = 10000, ObjectPoolPtr objectPool = ObjectPool::defaultObjectPool(), DiskObjectCachePtr diskCache = 0 );
 
 		virtual ~ComputationCache();
 
@@ -101,6 +118,9 @@ class ComputationCache : public RefCounted
 		/// Returns the ObjectPool object used by this computation cache.
 		ObjectPool *objectPool() const;
 
+		/// Returns the DiskObjectCache used by this computation cache, or NULL if there isn't one.
+		DiskObjectCache *diskCache() const;
+
 	private :
 
 		ComputeFn m_computeFn;
@@ -110,8 +130,37 @@ class ComputationCache : public RefCounted
 		Cache m_cache;
 
 		ObjectPoolPtr m_objectPool;
+		DiskObjectCachePtr m_diskCache;
 
 		static MurmurHash cacheGetter( const MurmurHash &h, size_t &cost );
+
+		// Computes the result and stores it in the object pool, registering the hash of the result
+		// with the computation hash. Only one thread performs any given computation at a time -
+		// other threads requesting it concurrently wait for the result instead.
+		ConstObjectPtr compute( const T &args, const MurmurHash &computationHash );
+
+		// Represents a computation currently being performed by one thread,
+		// and waited upon by any others which require the same result. The
+		// mutex is held by the computing thread until the result is available.
+		struct InFlightComputation : public RefCounted
+		{
+			InFlightComputation() : failed( false ) {}
+
+			typedef tbb::mutex Mutex;
+			Mutex mutex;
+			ConstObjectPtr result;
+			bool failed;
+			std::string error;
+		};
+		typedef boost::intrusive_ptr<InFlightComputation> InFlightComputationPtr;
+
+		typedef tbb::concurrent_hash_map<MurmurHash, InFlightComputationPtr> InFlightComputations;
+		InFlightComputations m_inFlightComputations;
+
+		void finishComputation( const MurmurHash &computationHash, InFlightComputation *computation );
+
+		// Functor for calling m_computeFn within isolateTasks().
+		struct ComputeTask;
 };
 
 
@@ -41,8 +41,8 @@ namespace IECore
 {
 
 template< typename T >
-ComputationCache<T>::ComputationCache( ComputeFn computeFn, HashFn hashFn, size_t maxResults, ObjectPoolPtr objectPool ) : 
-	m_computeFn(computeFn), m_hashFn(hashFn), m_cache( &ComputationCache<T>::cacheGetter, maxResults), m_objectPool(objectPool)
+ComputationCache<T>::ComputationCache( ComputeFn computeFn, HashFn hashFn, size_t maxResults, ObjectPoolPtr objectPool, DiskObjectCachePtr diskCache ) : 
+	m_computeFn(computeFn), m_hashFn(hashFn), m_cache( &ComputationCache<T>::cacheGetter, maxResults), m_objectPool(objectPool), m_diskCache(diskCache)
 {
 }
 
@@ -100,12 +100,7 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 		{
 			return 0;
 		}
-		obj = m_computeFn(args);
-		if ( obj )
-		{
-			m_cache.set( computationHash, obj->hash(), 1 );
-			obj = m_objectPool->store( obj.get(), ObjectPool::StoreReference );
-		}
+		obj = compute( args, computationHash );
 	}
 	else
 	{
@@ -121,21 +116,146 @@ ConstObjectPtr ComputationCache<T>::get( const T &args, ComputationCache::Missin
 			{
 				return 0;
 			}
-			obj = m_computeFn(args);
+			obj = compute( args, computationHash );
+		}
+	}
+	return obj;
+}
+
+template< typename T >
+struct ComputationCache<T>::ComputeTask
+{
+
+	ComputeTask( const ComputeFn &computeFn, const T &args, ConstObjectPtr &result )
+		:	m_computeFn( computeFn ), m_args( args ), m_result( result )
+	{
+	}
+
+	void operator()() const
+	{
+		m_result = m_computeFn( m_args );
+	}
+
+	const ComputeFn &m_computeFn;
+	const T &m_args;
+	ConstObjectPtr &m_result;
+
+};
+
+template< typename T >
+ConstObjectPtr ComputationCache<T>::compute( const T &args, const MurmurHash &computationHash )
+{
+	InFlightComputationPtr computation;
+	bool computing = false;
+	{
+		typename InFlightComputations::accessor a;
+		if( m_inFlightComputations.insert( a, computationHash ) )
+		{
+			// we're the first thread to want this result, so
+			// we're responsible for computing it.
+			a->second = new InFlightComputation;
+			a->second->mutex.lock();
+			computing = true;
+		}
+		computation = a->second;
+	}
+
+	if( !computing )
+	{
+		// another thread is computing the result - wait for it
+		// to release the mutex, and then use whatever it got.
+		typename InFlightComputation::Mutex::scoped_lock lock( computation->mutex );
+		if( computation->failed )
+		{
+			throw Exception( computation->error );
+		}
+		return computation->result;
+	}
+
+	try
+	{
+		// another thread may have completed the computation
+		// since our caller last checked the cache.
+		ConstObjectPtr obj(0);
+		MurmurHash objectHash = m_cache.get( computationHash );
+		if ( objectHash != MurmurHash() )
+		{
+			obj = m_objectPool->retrieve( objectHash );
+		}
+
+		if ( !obj )
+		{
+			bool computed = false;
+			if ( m_diskCache )
+			{
+				obj = m_diskCache->retrieve( computationHash );
+			}
+			if ( !obj )
+			{
+				// The compute function may wait on TBB tasks of its own. Isolation
+				// prevents this thread from stealing an outer task which waits on
+				// this same computation, and so deadlocking on our own mutex.
+				isolateTasks( ComputeTask( m_computeFn, args, obj ) );
+				computed = true;
+			}
+
 			if ( obj )
 			{
+				if ( computed && m_diskCache )
+				{
+					try
+					{
+						m_diskCache->store( computationHash, obj.get() );
+					}
+					catch( const std::exception &e )
+					{
+						// failing to store to disk isn't fatal - we still have the result.
+						msg( Msg::Warning, "ComputationCache::get", e.what() );
+					}
+				}
+
 				obj = m_objectPool->store( obj.get(), ObjectPool::StoreReference );
 				MurmurHash h = obj->hash();
 				if ( h != objectHash )
 				{
-					/// the computation returned a different object for some reason, so we have to update the hash
-					m_cache.set( computationHash, h, 1 );	
-					msg( Msg::Warning, "ComputationCache::get", "Inconsistent hash detected." );
+					/// either this is a new computation, or the computation returned a different
+					/// object for some reason, so we have to update the hash
+					m_cache.set( computationHash, h, 1 );
+					if ( computed && objectHash != MurmurHash() )
+					{
+						msg( Msg::Warning, "ComputationCache::get", "Inconsistent hash detected." );
+					}
 				}
 			}
 		}
+		computation->result = obj;
 	}
-	return obj;
+	catch( const std::exception &e )
+	{
+		computation->failed = true;
+		computation->error = e.what();
+		finishComputation( computationHash, computation.get() );
+		throw;
+	}
+	catch( ... )
+	{
+		computation->failed = true;
+		computation->error = "Unknown error";
+		finishComputation( computationHash, computation.get() );
+		throw;
+	}
+
+	finishComputation( computationHash, computation.get() );
+	return computation->result;
+}
+
+template< typename T >
+void ComputationCache<T>::finishComputation( const MurmurHash &computationHash, InFlightComputation *computation )
+{
+	// remove the computation from the map before releasing the waiting
+	// threads, so that subsequent requests consult the cache again.
+	m_inFlightComputations.erase( computationHash );
+	computation->mutex.unlock();
 }
 
 template< typename T >
@@ -162,6 +282,12 @@ ObjectPool *ComputationCache<T>::objectPool() const
 	return m_objectPool.get();
 }
 
+template< typename T >
+DiskObjectCache *ComputationCache<T>::diskCache() const
+{
+	return m_diskCache.get();
+}
+
 } // namespace IECore
 
 #endif // IECORE_COMPUTATIONCACHE_H
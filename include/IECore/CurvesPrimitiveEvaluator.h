@@ -163,7 +163,14 @@ class IECORE_API CurvesPrimitiveEvaluator : public PrimitiveEvaluator
 		//@}
 
 	protected :
-		
+
+		/// Curves results have no normals, so only the points and uvs
+		/// are stored by the batch queries.
+		virtual PrimitiveEvaluator::ResultArraysPtr createResultArrays( size_t size ) const;
+		/// Builds the tree used by closestPoint(), so that it isn't built by
+		/// whichever task of the batch query happens to get there first.
+		virtual void prepareClosestPoints() const;
+
 		/// \todo It would be much better if PrimitiveEvaluator::Description didn't require these create()
 		/// functions and instead just called the constructors that have to exist anyway.
 		static PrimitiveEvaluatorPtr create( ConstPrimitivePtr primitive );
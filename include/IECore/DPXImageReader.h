@@ -73,18 +73,17 @@ class IECORE_API DPXImageReader : public ImageReader
 		// filename associator
 		static const ReaderDescription<DPXImageReader> m_readerDescription;
 
-		/// Opens the file, if necessary, and fills the buffer. Throws an IOException if an error occurs.
-		/// Tries to open the file, returning true on success and false on failure. On success,
+		/// Tries to open the file and read the header, returning true on success and false on failure. On success,
 		/// the member data derived from the Cineons's header will be valid.
 		/// If throwOnFailure is true then a descriptive Exception is thrown rather than false being returned.
 		bool open( bool throwOnFailure = false );
 
-		/// DPX image memory buffer - cineon image data is typically found in pixel-interlaced
-		/// format, so we will make one I/O pass and cache the image in memory while striping
-		/// off channels / planes
-		std::vector<unsigned int> m_buffer;
+		/// Reads a block of scanlines from the file. Cineon image data is typically found in pixel-interlaced
+		/// format, so the blocks are shared by all channels via the tile cache. This may be called
+		/// concurrently from several threads.
+		virtual ConstCharVectorDataPtr decodeTile( const std::string &tileSet, int tileIndex );
 
-		/// the filename in effect when we filled the buffer last.
+		/// the filename in effect when we read the header last.
 		std::string m_bufferFileName;
 		unsigned int m_bufferWidth, m_bufferHeight;
 		bool m_reverseBytes;
@@ -97,6 +96,9 @@ class IECORE_API DPXImageReader : public ImageReader
 		template<typename V>
 		DataPtr readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow );
 
+		template<typename V>
+		struct ReadRows;
+
 };
 
 IE_CORE_DECLAREPTR(DPXImageReader);
@@ -0,0 +1,176 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_DEEPIMAGE_H
+#define IECORE_DEEPIMAGE_H
+
+#include <string>
+#include <vector>
+
+#include "OpenEXR/ImathBox.h"
+
+#include "IECore/Export.h"
+#include "IECore/DeepPixel.h"
+#include "IECore/VectorTypedData.h"
+
+namespace IECore
+{
+
+IE_CORE_FORWARDDECLARE( DeepImage )
+
+/// A DeepImage holds the deep samples for a rectangular window of pixels. Unlike
+/// DeepPixel, which stores each pixel separately, the samples for all pixels are
+/// stored in a few contiguous arrays - one for the depths and one for each channel.
+/// The channel names are shared by all pixels, and may also be shared between
+/// DeepImages. This makes DeepImage suitable for reading and writing large numbers
+/// of pixels at once, as in DeepImageReader::readRegion() and DeepImageWriter::writeRegion().
+///
+/// As with DeepPixel, all channels are stored as floats and depth isn't considered
+/// to be a channel. The samples of each pixel are stored in the order they were
+/// provided, which needn't be sorted by depth. Call sortSamples() before using
+/// composite(), which expects the samples to be sorted.
+/// \ingroup deepCompositingGroup
+class IECORE_API DeepImage : public RefCounted
+{
+
+	public :
+
+		IE_CORE_DECLAREMEMBERPTR( DeepImage );
+
+		/// Constructs a DeepImage for the pixels in window, with no samples
+		/// in any pixel. The window uses the same coordinate system as
+		/// DeepImageReader::readPixel().
+		DeepImage( ConstStringVectorDataPtr channelNames, const Imath::Box2i &window );
+
+		virtual ~DeepImage();
+
+		//! @name Channels
+		//////////////////////////////////////////////////////////////////////////////
+		//@{
+		/// Returns the names of all channels.
+		const std::vector<std::string> &channelNames() const;
+		/// Returns the channel names without copying them, so that they may be
+		/// shared with other DeepImages.
+		const StringVectorData *channelNamesData() const;
+		/// Returns the number of channels.
+		unsigned numChannels() const;
+		/// Get the index for the named channel, or -1 if it doesn't exist.
+		int channelIndex( const std::string &name ) const;
+		//@}
+
+		//! @name Pixels
+		/// Pixels are indexed in scanline order, starting at the top left
+		/// of the window.
+		//////////////////////////////////////////////////////////////////////////////
+		//@{
+		/// Returns the window of pixels held by the DeepImage.
+		const Imath::Box2i &window() const;
+		/// Returns the number of pixels within the window.
+		size_t numPixels() const;
+		/// Returns the index of the pixel at x, y, which must lie within the window.
+		size_t pixelIndex( int x, int y ) const;
+		//@}
+
+		//! @name Samples
+		/// The samples of pixel p are stored at indices sampleOffset( p ) to
+		/// sampleOffset( p ) + numSamples( p ) - 1 in the depths() and channelData()
+		/// arrays.
+		//////////////////////////////////////////////////////////////////////////////
+		//@{
+		/// Returns the total number of samples in all pixels.
+		size_t numSamples() const;
+		/// Returns the number of samples in the specified pixel.
+		unsigned numSamples( size_t pixelIndex ) const;
+		/// Returns the index of the first sample for the specified pixel.
+		size_t sampleOffset( size_t pixelIndex ) const;
+		/// Sets the number of samples for every pixel, given an array of numPixels()
+		/// counts. The sample arrays are reallocated, and all depths and channel
+		/// values are reset to 0.
+		void setSampleCounts( const unsigned *sampleCounts );
+		/// Sorts the samples of every pixel by depth, nearest first. The sort is
+		/// stable, so samples at the same depth retain their relative order.
+		void sortSamples();
+		/// Returns the depths of all samples.
+		float *depths();
+		const float *depths() const;
+		/// Returns the values of all samples for the specified channel.
+		float *channelData( unsigned channelIndex );
+		const float *channelData( unsigned channelIndex ) const;
+		//@}
+
+		//! @name Conversion
+		//////////////////////////////////////////////////////////////////////////////
+		//@{
+		/// Returns a new DeepPixel containing the samples for the pixel at x, y,
+		/// or 0 if it has no samples.
+		DeepPixelPtr pixel( int x, int y ) const;
+		/// Returns a new DeepImage containing the pixels within window, which
+		/// must lie within the window of this image. The channel names are shared
+		/// with the new image.
+		DeepImagePtr crop( const Imath::Box2i &window ) const;
+		/// Composites the samples of the specified pixel into a single flat value per
+		/// channel, using the same rules as DeepPixel::composite(). The samples must
+		/// have been sorted using sortSamples(). Result must have room for numChannels()
+		/// values, which are all set to 0 if the pixel has no samples.
+		void composite( size_t pixelIndex, float *result ) const;
+		/// Returns a new DeepImage in which the samples of each pixel are the combined
+		/// samples of that pixel in all the images, sorted by depth. All images must have
+		/// the same window. Channels are matched by name, and the result has every channel
+		/// present in any of the images - samples from an image without a particular
+		/// channel have a value of 0 for it.
+		static DeepImagePtr merge( const std::vector<const DeepImage *> &images );
+		//@}
+
+	private :
+
+		class DepthComparison;
+
+		ConstStringVectorDataPtr m_channelNames;
+		Imath::Box2i m_window;
+		size_t m_width;
+
+		// numPixels() + 1 entries, so that the samples of pixel p
+		// are in the range [ m_sampleOffsets[p], m_sampleOffsets[p+1] ).
+		std::vector<size_t> m_sampleOffsets;
+		std::vector<float> m_depths;
+		// The values for each channel, one channel after another.
+		std::vector<float> m_channelData;
+
+};
+
+IE_CORE_DECLAREPTR( DeepImage );
+
+} // namespace IECore
+
+#endif // IECORE_DEEPIMAGE_H
@@ -0,0 +1,82 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_DEEPIMAGEMERGEOP_H
+#define IECORE_DEEPIMAGEMERGEOP_H
+
+#include "IECore/Export.h"
+#include "IECore/Op.h"
+#include "IECore/VectorTypedParameter.h"
+
+namespace IECore
+{
+
+IE_CORE_FORWARDDECLARE( FileNameParameter );
+
+/// The DeepImageMergeOp combines the samples of several deep image files, sorting
+/// the samples of each pixel by depth, and returns the result composited into a flat
+/// ImagePrimitive. The merged deep samples may optionally be written to another deep
+/// image file at the same time. All input files must have the same data window.
+///
+/// The files are streamed a few scanlines at a time, so only a small part of the deep
+/// data is held in memory at once. Reading and writing happen serially, but the merging
+/// and compositing of the scanlines is performed in parallel, in a task arena limited to
+/// the number of threads given by getImageIOThreads().
+/// \ingroup deepCompositingGroup
+/// \ingroup ioGroup
+class IECORE_API DeepImageMergeOp : public Op
+{
+	public:
+
+		IE_CORE_DECLARERUNTIMETYPED( DeepImageMergeOp, Op );
+
+		DeepImageMergeOp();
+		virtual ~DeepImageMergeOp();
+
+	protected :
+
+		virtual ObjectPtr doOperation( const CompoundObject *operands );
+
+	private :
+
+		StringVectorParameterPtr m_inputFilesParameter;
+		FileNameParameterPtr m_outputFileParameter;
+
+};
+
+IE_CORE_DECLAREPTR( DeepImageMergeOp );
+
+} // namespace IECore
+
+#endif // IECORE_DEEPIMAGEMERGEOP_H
@@ -39,6 +39,7 @@
 #include "OpenEXR/ImathMatrix.h"
 
 #include "IECore/Export.h"
+#include "IECore/DeepImage.h"
 #include "IECore/DeepPixel.h"
 #include "IECore/Reader.h"
 
@@ -84,6 +85,13 @@ class IECORE_API DeepImageReader : public Reader
 		/// be specified as if the origin is in the upper left corner of the displayWindow.
 		/// It is up to the derived classes to account for that fact if necessary.
 		DeepPixelPtr readPixel( int x, int y );
+		
+		/// Reads all the pixels within the specified region, which must lie within the
+		/// dataWindow. This is much more efficient than calling readPixel() for each
+		/// pixel, so should be preferred when reading many pixels. As with readPixel(),
+		/// the region is specified as if the origin is in the upper left corner of
+		/// the displayWindow.
+		DeepImagePtr readRegion( const Imath::Box2i &region );
 
 	protected :
 
@@ -97,6 +105,12 @@ class IECORE_API DeepImageReader : public Reader
 		/// upper left corner of the displayWindow. It is up to the derived classes to account
 		/// for that fact if necessary.
 		virtual DeepPixelPtr doReadPixel( int x, int y ) = 0;
+		
+		/// Reads the specified region. This is called by the public readRegion() method,
+		/// which guarantees that the region lies within the dataWindow. The default
+		/// implementation calls doReadPixel() for each pixel, so derived classes should
+		/// reimplement it to read the samples directly if they can.
+		virtual DeepImagePtr doReadRegion( const Imath::Box2i &region );
 
 };
 
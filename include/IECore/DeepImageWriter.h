@@ -36,6 +36,7 @@
 #define IECORE_DEEPIMAGEWRITER_H
 
 #include "IECore/Export.h"
+#include "IECore/DeepImage.h"
 #include "IECore/DeepPixel.h"
 #include "IECore/Parameterised.h"
 #include "IECore/SimpleTypedParameter.h"
@@ -95,6 +96,14 @@ class IECORE_API DeepImageWriter : public Parameterised
 		/// as if the origin is in the upper left corner of the displayWindow. It is up to
 		/// the derived classes to account for that fact if necessary.
 		void writePixel( int x, int y, const DeepPixel *pixel );
+		
+		/// Writes all the pixels in the window of the DeepImage. Pixels without samples
+		/// are skipped, as they are by writePixel(). This is much more efficient than
+		/// calling writePixel() for each pixel, so should be preferred when writing many
+		/// pixels. The DeepImage must have the same number of channels as specified by
+		/// channelNamesParameter(), and its window is interpreted in the same way as the
+		/// coordinates passed to writePixel().
+		void writeRegion( const DeepImage *image );
 
 		/// Fills the passed vector with all the extensions for which a DeepImageWriter is
 		/// available. Extensions are of the form "exr" - ie without a preceding '.'.
@@ -117,6 +126,13 @@ class IECORE_API DeepImageWriter : public Parameterised
 		/// account for that fact if necessary.
 		virtual void doWritePixel( int x, int y, const DeepPixel *pixel ) = 0;
 		
+		/// Writes all the pixels in a DeepImage. This is called by the public writeRegion()
+		/// method, which guarantees that the image is valid and has the correct number of
+		/// channels. The default implementation calls doWritePixel() for each pixel with
+		/// samples, so derived classes should reimplement it to write the samples directly
+		/// if they can.
+		virtual void doWriteRegion( const DeepImage *image );
+		
 		/// Definition of a function which can create a DeepImageWriter when given a fileName.
 		typedef DeepImageWriterPtr (*CreatorFn)( const std::string &fileName );
 		/// Definition of a function to answer the question can this file be opened for writing?
@@ -0,0 +1,123 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_DISKOBJECTCACHE_H
+#define IECORE_DISKOBJECTCACHE_H
+
+#include "tbb/atomic.h"
+#include "tbb/mutex.h"
+
+#include "IECore/Export.h"
+#include "IECore/Object.h"
+#include "IECore/MurmurHash.h"
+
+namespace IECore
+{
+
+IE_CORE_FORWARDDECLARE( DiskObjectCache );
+
+/// The DiskObjectCache class implements a persistent cache of Object instances, stored in files
+/// within a directory and indexed by MurmurHash. It is intended for use as a second level cache behind
+/// the in-memory caches such as ComputationCache, so that expensive results may be reused by subsequent
+/// processes rather than being recomputed.
+///
+/// Each object is saved to its own FileIndexedIO file. Files are written to a temporary location and then
+/// renamed into place, so the same directory may be shared safely by several processes at once. The total
+/// size of the files is limited, and when the limit is exceeded the least recently used files are removed
+/// first, regardless of which process wrote them.
+///
+/// \threading It is safe to call the methods of DiskObjectCache from concurrent threads.
+/// \ingroup utilityGroup
+class IECORE_API DiskObjectCache : public RefCounted
+{
+	public:
+
+		IE_CORE_DECLAREMEMBERPTR( DiskObjectCache );
+
+		/// Creates a cache using the specified directory, which will be created
+		/// if it doesn't already exist. Existing files in the directory are reused.
+		DiskObjectCache( const std::string &directory, size_t maxDiskUsage );
+		virtual ~DiskObjectCache();
+
+		/// Returns the directory used to store the cached objects.
+		const std::string &directory() const;
+
+		/// Retrieves the Object with the given hash, or NULL if it is not in the cache.
+		ConstObjectPtr retrieve( const MurmurHash &hash ) const;
+
+		/// Saves the object to the cache with the given hash, replacing any existing
+		/// entry. Throws an IOException if the object can't be written.
+		void store( const MurmurHash &hash, const Object *obj );
+
+		/// Returns true if an object with the given hash is in the cache. Note that
+		/// this function doesn't garantee that retrieve() will succeed, since the
+		/// object may be removed by another thread or process in the meantime.
+		bool contains( const MurmurHash &hash ) const;
+
+		/// Erases the Object with the given hash if it is held in the cache. Returns whether any item was removed.
+		bool erase( const MurmurHash &hash );
+
+		/// Removes all the objects from the cache.
+		void clear();
+
+		/// Sets the maximum size in bytes of the files held in the cache, removing files if necessary.
+		void setMaxDiskUsage( size_t maxDiskUsage );
+
+		/// Returns the maximum size in bytes of the files held in the cache.
+		size_t getMaxDiskUsage() const;
+
+		/// Returns the total size in bytes of the files held in the cache, including
+		/// any written by other processes.
+		size_t diskUsage() const;
+
+	private:
+
+		std::string fileName( const MurmurHash &hash ) const;
+		// Removes the least recently used files until the disk usage
+		// is comfortably below the limit.
+		void limitDiskUsage();
+
+		std::string m_directory;
+		size_t m_maxDiskUsage;
+		// An estimate of the current disk usage, made by adding the size of
+		// each file we write to the size found in the last scan of the directory.
+		// When this exceeds the limit, we rescan the directory and remove files.
+		tbb::atomic<size_t> m_estimatedDiskUsage;
+		tbb::mutex m_limitMutex;
+
+};
+
+} // namespace IECore
+
+#endif // IECORE_DISKOBJECTCACHE_H
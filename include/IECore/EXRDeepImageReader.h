@@ -40,6 +40,7 @@
 #include "IECore/DeepImageReader.h"
 #include "IECore/LRUCache.h"
 #include "IECore/TypeIds.h"
+#include "IECore/VectorTypedData.h"
 
 namespace IECore
 {
@@ -70,6 +71,8 @@ class IECORE_API EXRDeepImageReader : public DeepImageReader
 	protected :
 
 		virtual DeepPixelPtr doReadPixel( int x, int y );
+		/// Reads the scanlines covering the region directly into the DeepImage.
+		virtual DeepImagePtr doReadRegion( const Imath::Box2i &region );
 
 	private :
 
@@ -101,7 +104,8 @@ class IECORE_API EXRDeepImageReader : public DeepImageReader
 		Imf::DeepScanLineInputFile *m_inputFile;
 		
 		int m_depthChannel;
-		std::vector<std::string> m_channelNames;
+		// Shared by all the DeepImages we read.
+		StringVectorDataPtr m_channelNames;
 		std::vector<Imf::PixelType> m_channelTypes;
 
 };
@@ -74,6 +74,9 @@ class IECORE_API EXRDeepImageWriter : public DeepImageWriter
 	protected :
 		
 		virtual void doWritePixel( int x, int y, const DeepPixel *pixel );
+		/// Writes full width regions directly from the DeepImage, falling back
+		/// to the DeepImageWriter implementation for anything else.
+		virtual void doWriteRegion( const DeepImage *image );
 		
 		Imf::Compression compression() const;
 
@@ -36,6 +36,7 @@
 #define IE_CORE_EXRIMAGEREADER_H
 
 #include "OpenEXR/ImfInputFile.h"
+#include "OpenEXR/ImfTiledInputFile.h"
 #include "OpenEXR/ImfChannelList.h"
 
 #include "IECore/Export.h"
@@ -74,17 +75,31 @@ class IECORE_API EXRImageReader : public ImageReader
 	private:
 
 		template<class T>
-		DataPtr readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow, const Imf::Channel *channel );
+		DataPtr readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow );
 
 		virtual DataPtr readChannel( const std::string &name, const Imath::Box2i &dataWindow, bool raw );
 
+		/// Decodes a tile from the channel named by tileSet. For scanline files
+		/// the tiles are blocks of full width scanlines, and for tiled files they
+		/// are the tiles of the file itself, indexed in row major order. Returns
+		/// an empty tile if the data is missing from an incomplete file.
+		virtual ConstCharVectorDataPtr decodeTile( const std::string &tileSet, int tileIndex );
+		/// As above, but throwing Iex::InputExc if the data is missing.
+		ConstCharVectorDataPtr decodeTileInternal( const std::string &tileSet, int tileIndex );
+		/// Decodes a range of tiles from a tiled file, returning them in row major order.
+		void decodeTiles( const std::string &channelName, int tx0, int tx1, int ty0, int ty1, std::vector<ConstCharVectorDataPtr> &tiles );
+		/// Decodes any uncached tiles in the specified range of a tiled file in a
+		/// single call to Imf::TiledInputFile::readTiles(), and stores them in the cache.
+		void prefetchTiles( const MurmurHash &fileHash, const std::string &channelName, int tx0, int tx1, int ty0, int ty1 );
+
 		static const ReaderDescription<EXRImageReader> g_readerDescription;
 
 		/// Tries to open the file, returning true on success and false on failure. On success,
-		/// m_header and m_inputFile will be valid. If throwOnFailure is true then a descriptive
+		/// m_inputFile will be valid, as will m_tiledInputFile for tiled files. If throwOnFailure is true then a descriptive
 		/// Exception is thrown rather than false being returned.
 		bool open( bool throwOnFailure = false );
 		Imf::InputFile *m_inputFile;
+		Imf::TiledInputFile *m_tiledInputFile;
 
 };
 
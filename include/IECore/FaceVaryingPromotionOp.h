@@ -72,6 +72,8 @@ class IECORE_API FaceVaryingPromotionOp : public MeshPrimitiveOp
 
 	protected :
 
+		/// Returns true if the copyInput parameter is on.
+		virtual bool resultCacheable( const CompoundObject *operands ) const;
 		virtual void modifyTypedPrimitive( MeshPrimitive *mesh, const CompoundObject *operands );
 
 	private :
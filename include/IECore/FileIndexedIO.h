@@ -42,6 +42,8 @@ namespace IECore
 {
 
 /// An implementation of StreamIndexedIO which operates within a single file on disk.
+/// Files opened in Read mode use positional reads (pread), so that concurrent reads
+/// from multiple threads neither lock nor seek a shared stream.
 /// \ingroup ioGroup
 class IECORE_API FileIndexedIO : public StreamIndexedIO
 {
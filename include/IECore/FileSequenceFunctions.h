@@ -39,6 +39,8 @@
 #include "IECore/FileSequence.h"
 #include "IECore/FrameList.h"
 
+#include <limits>
+
 namespace IECore
 {
 
@@ -55,9 +57,24 @@ IECORE_API void findSequences( const std::vector< std::string > &names, std::vec
 /// Generates all sequences with at least minSequenceSize elements residing in given directory in the form of a list of FileSequences.
 IECORE_API void ls( const std::string &path, std::vector< FileSequencePtr > &sequences, size_t minSequenceSize = 2 );
 
+/// As above, but if recurse is true also generates the sequences in all subdirectories up to maxDepth
+/// levels below path. The file names of these sequences are relative to path. Symbolic links to
+/// directories are only descended into if followLinks is true, and subdirectories which can't be read
+/// are ignored. Subdirectories are searched in parallel.
+IECORE_API void ls( const std::string &path, std::vector< FileSequencePtr > &sequences, size_t minSequenceSize, bool recurse, bool followLinks = false, size_t maxDepth = std::numeric_limits<size_t>::max() );
+
 /// Attempts to find a sequence matching the given sequence template (e.g. with at least one '#' character).
 IECORE_API void ls( const std::string &sequencePath, FileSequencePtr &sequence, size_t minSequenceSize = 2 );
 
+/// The directory listings made by ls() may be cached, to speed up repeated searches of large directories
+/// or of directories on network filesystems. A cached listing is only used if the modification time of the
+/// directory hasn't changed since it was made. The cache limit is specified as a total number of directory
+/// entries, and defaults to the value of the IECORE_LS_CACHE_ENTRIES environment variable, or to 0 if that
+/// isn't set. A limit of 0 disables the cache.
+IECORE_API size_t getLsCacheLimit();
+IECORE_API void setLsCacheLimit( size_t entries );
+IECORE_API void clearLsCache();
+
 /// Returns a FrameList instance that "best" represents the specified list of integer
 /// frame numbers. This function attempts to be intelligent and uses a CompoundFrameList
 /// of FrameRange objects to represent the specified frames compactly.
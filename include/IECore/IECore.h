@@ -70,6 +70,19 @@ IECORE_API bool withPNG();
 /// Returns true if IECore was built with Deep EXR support
 IECORE_API bool withDeepEXR();
 
+/// Returns the number of threads used to decode and encode images in the
+/// ImageReader and ImageWriter implementations. If setImageIOThreads() hasn't
+/// been called, this is the value of the IECORE_IMAGEIO_THREADS environment
+/// variable, or TBB's default number of threads if that isn't set. In the
+/// latter case the OpenEXR library's global thread pool is left untouched,
+/// so that a host application's own setting is respected.
+IECORE_API int getImageIOThreads();
+/// Sets the number of threads used for image I/O. This also sets the size
+/// of the OpenEXR library's global thread pool. A value of 1 disables
+/// threading entirely, and a value of 0 restores the default behaviour
+/// described above, along with the original size of the OpenEXR pool.
+IECORE_API void setImageIOThreads( int threads );
+
 }
 
 //! \mainpage
@@ -36,9 +36,11 @@
 #define IE_CORE_IMAGEREADER_H
 
 #include "IECore/Export.h"
+#include "IECore/MurmurHash.h"
 #include "IECore/Reader.h"
 #include "IECore/SimpleTypedParameter.h"
 #include "IECore/VectorTypedParameter.h"
+#include "IECore/VectorTypedData.h"
 
 namespace IECore
 {
@@ -122,6 +124,28 @@ class IECORE_API ImageReader : public Reader
 
 		//@}
 
+		//! @name Tile cache
+		/// Derived classes may decode images in tiles (or strips, or blocks
+		/// of scanlines) which are stored in a cache shared by all ImageReaders.
+		/// This means that only the tiles intersecting the requested dataWindow
+		/// need be decoded, and that repeatedly reading overlapping sections of
+		/// an image (when panning around it for instance) doesn't decode the same
+		/// data twice. Tiles are keyed on the file name, size and modification time,
+		/// so files which change on disk are reread automatically. The memory limit
+		/// defaults to the value of the IECORE_IMAGEREADER_TILECACHE_MEMORY environment
+		/// variable (in megabytes), or 256 megabytes if that isn't set.
+		//////////////////////////////////////////////////////////////
+		//@{
+		/// Returns the maximum memory used by the cache, in bytes.
+		static size_t getTileCacheMemoryLimit();
+		/// Sets the maximum memory used by the cache, in bytes.
+		static void setTileCacheMemoryLimit( size_t bytes );
+		/// Returns the memory currently used by the cache, in bytes.
+		static size_t tileCacheMemoryUsage();
+		/// Removes all tiles from the cache.
+		static void clearTileCache();
+		//@}
+
 	protected:
 
 		/// Fills the passed vector with the intersection of channelNames() and
@@ -141,8 +165,31 @@ class IECORE_API ImageReader : public Reader
 		/// invalid names or dataWindows which are not wholly within the dataWindow in the file.
 		virtual DataPtr readChannel( const std::string &name, const Imath::Box2i &dataWindow, bool raw ) = 0;
 
+		/// Returns a hash identifying the current contents of the file, to be passed
+		/// to the tile cache functions below. This queries the file system, so derived
+		/// classes should call it once per readChannel() rather than once per tile.
+		MurmurHash tileCacheFileHash() const;
+		/// Returns the tile with the specified index from the shared tile cache, calling
+		/// decodeTile() to load it if it isn't cached already. The tileSet distinguishes
+		/// between independent sets of tiles within the same file - for instance different
+		/// channels or TIFF directories. Derived classes may call this from readChannel()
+		/// to decode only the tiles intersecting the requested dataWindow.
+		ConstCharVectorDataPtr cachedTile( const MurmurHash &fileHash, const std::string &tileSet, int tileIndex );
+		/// Must be implemented by derived classes which use cachedTile(), to decode the
+		/// specified tile from the file. The data may be laid out in whatever way is
+		/// convenient for the derived class. The default implementation throws.
+		virtual ConstCharVectorDataPtr decodeTile( const std::string &tileSet, int tileIndex );
+		/// Returns true if the specified tile is in the cache.
+		bool tileCached( const MurmurHash &fileHash, const std::string &tileSet, int tileIndex );
+		/// Stores a tile in the cache. This allows derived classes which can decode
+		/// several tiles more efficiently than one at a time to populate the cache
+		/// in advance of calls to cachedTile().
+		void cacheTile( const MurmurHash &fileHash, const std::string &tileSet, int tileIndex, ConstCharVectorDataPtr tile );
+
 	private :
 
+		struct TileCache;
+
 		Box2iParameterPtr m_dataWindowParameter;
 		Box2iParameterPtr m_displayWindowParameter;
 		StringVectorParameterPtr m_channelNamesParameter;
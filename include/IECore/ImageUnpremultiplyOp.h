@@ -58,12 +58,21 @@ class IECORE_API ImageUnpremultiplyOp : public ChannelOp
 	protected :
 
 		virtual void modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels );
+		virtual bool channelsAreIndependent() const;
+		virtual void begin( const CompoundObject *operands );
+		virtual void end();
 
 		struct ToFloatVectorData;
 		struct UnpremultFn;
 
 		StringParameterPtr m_alphaChannelNameParameter;
 
+	private :
+
+		// the alpha channel converted to float, computed once in begin()
+		// and shared by all the calls to modifyChannels().
+		FloatVectorDataPtr m_alphaData;
+
 };
 
 IE_CORE_DECLAREPTR( ImageUnpremultiplyOp );
@@ -75,7 +75,7 @@ class KDTree
 		/// must remain valid and unchanged as long as the tree is in use.
 		/// This method can be called again to rebuild the tree at any time.
 		/// \threading This can't be called while other threads are
-		/// making queries.
+		/// making queries. Large trees are built using multiple threads.
 		void init( PointIterator first, PointIterator last, int maxLeafSize=4  );
 
 		/// Returns an iterator to the nearest neighbour to the point p.
@@ -128,6 +128,7 @@ class KDTree
 		typedef typename Permutation::const_iterator PermutationConstIterator;
 
 		class AxisSort;
+		class BuildTask;
 
 		unsigned char majorAxis( PermutationConstIterator permFirst, PermutationConstIterator permLast );
 		void build( NodeIndex nodeIndex, PermutationIterator permFirst, PermutationIterator permLast );
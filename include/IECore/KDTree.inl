@@ -33,8 +33,12 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include <algorithm>
+
+#include "tbb/parallel_invoke.h"
+
 #include "OpenEXR/ImathLimits.h"
 #include "IECore/VectorOps.h"
+#include "IECore/TaskIsolation.h"
 #include "IECore/BoxOps.h"
 
 namespace IECore
@@ -108,6 +112,27 @@ class KDTree<PointIterator>::AxisSort
 		const unsigned int m_axis;
 };
 
+template<class PointIterator>
+class KDTree<PointIterator>::BuildTask
+{
+	public :
+		BuildTask( KDTree *tree, NodeIndex nodeIndex, PermutationIterator permFirst, PermutationIterator permLast )
+			:	m_tree( tree ), m_nodeIndex( nodeIndex ), m_permFirst( permFirst ), m_permLast( permLast )
+		{
+		}
+
+		void operator()() const
+		{
+			m_tree->build( m_nodeIndex, m_permFirst, m_permLast );
+		}
+
+	private :
+		KDTree *m_tree;
+		NodeIndex m_nodeIndex;
+		PermutationIterator m_permFirst;
+		PermutationIterator m_permLast;
+};
+
 // initialisation
 
 template<class PointIterator>
@@ -133,8 +158,21 @@ void KDTree<PointIterator>::init( PointIterator first, PointIterator last, int m
 		m_perm[i++] = it;
 	}
 
-	/// \todo Can we reserve() enough space for m_nodes before doing this?
-	build( rootIndex(), m_perm.begin(), m_perm.end() );
+	// the shape of the tree depends only on the number of points, and the
+	// deepest and highest numbered node is found by always following the
+	// high child, which gets the larger half of the points. sizing m_nodes
+	// up front means that build() can fill in subtrees concurrently.
+	NodeIndex maxIndex = rootIndex();
+	for( typename Permutation::difference_type n = m_perm.size(); n > m_maxLeafSize; n -= n / 2 )
+	{
+		maxIndex = highChildIndex( maxIndex );
+	}
+	m_nodes.clear();
+	m_nodes.resize( maxIndex + 1 );
+
+	// isolated, because callers such as the primitive evaluators build the tree
+	// while holding a lock.
+	isolateTasks( BuildTask( this, rootIndex(), m_perm.begin(), m_perm.end() ) );
 }
 
 template<class PointIterator>
@@ -174,11 +212,9 @@ unsigned char KDTree<PointIterator>::majorAxis( PermutationConstIterator permFir
 template<class PointIterator>
 void KDTree<PointIterator>::build( NodeIndex nodeIndex, PermutationIterator permFirst, PermutationIterator permLast )
 {
-	// make room for the new node
-	if( nodeIndex>=m_nodes.size() )
-	{
-		m_nodes.resize( nodeIndex+1 );
-	}
+	// below this many points it's quicker to build the subtrees serially
+	// than to spawn tasks for them.
+	const typename Permutation::difference_type parallelThreshold = 10000;
 
 	if( permLast - permFirst > m_maxLeafSize )
 	{
@@ -189,8 +225,18 @@ void KDTree<PointIterator>::build( NodeIndex nodeIndex, PermutationIterator perm
 		// insert node
 		m_nodes[nodeIndex].makeBranch( cutAxis, cutValue );
 
-		build( lowChildIndex( nodeIndex ), permFirst, permMid );
-		build( highChildIndex( nodeIndex ), permMid, permLast );
+		if( permLast - permFirst > parallelThreshold )
+		{
+			tbb::parallel_invoke(
+				BuildTask( this, lowChildIndex( nodeIndex ), permFirst, permMid ),
+				BuildTask( this, highChildIndex( nodeIndex ), permMid, permLast )
+			);
+		}
+		else
+		{
+			build( lowChildIndex( nodeIndex ), permFirst, permMid );
+			build( highChildIndex( nodeIndex ), permMid, permLast );
+		}
 	}
 	else
 	{
@@ -35,12 +35,17 @@
 #ifndef IECORE_LRUCACHE_H
 #define IECORE_LRUCACHE_H
 
+#include <string>
+
 #include "tbb/spin_mutex.h"
+#include "tbb/mutex.h"
 #include "tbb/concurrent_unordered_map.h"
 
 #include "boost/noncopyable.hpp"
 #include "boost/function.hpp"
 
+#include "IECore/TaskIsolation.h"
+
 namespace IECore
 {
 
@@ -49,6 +54,11 @@ namespace IECore
 /// subsequent lookups. Each value has a cost associated with it, and the cache has
 /// a maximum total cost above which it will remove the least recently accessed items. 
 ///
+/// Recency is tracked approximately using the "second chance" (CLOCK) algorithm, so that
+/// cache hits need only mark an item as referenced rather than taking a global lock to
+/// move it within a list. When costs must be reduced, the oldest items which have not been
+/// referenced since they were last considered for removal are discarded first.
+///
 /// The Key type must have a tbb_hasher implementation.
 ///
 /// The Value type must be default constructible, copy constructible and assignable.
@@ -56,6 +66,13 @@ namespace IECore
 /// value. In practice this means that a smart pointer is the best choice of Value.
 ///
 /// \threading It is safe to call the methods of LRUCache from concurrent threads.
+/// When several threads request the same missing item at once, only one of them calls
+/// the GetterFunction, and the others block until the value is available. If the
+/// GetterFunction throws, the same error is reported to all the waiting threads, and
+/// to any subsequent get() for the item until it is erased. When built against TBB 2018
+/// or later, the GetterFunction is run in an isolated TBB task region, so it may use TBB
+/// itself without the calling thread stealing an unrelated task which waits on the same
+/// item. See isolateTasks().
 /// \ingroup utilityGroup
 template<typename Key, typename Value>
 class LRUCache : private boost::noncopyable
@@ -154,7 +171,7 @@ class LRUCache : private boost::noncopyable
 		// CacheEntry implementation - a single item of the cache.
 		struct CacheEntry
 		{
-			CacheEntry(); // status == New, previous == next == NULL
+			CacheEntry(); // status == New, previous == next == NULL, referenced == false
 			CacheEntry( const CacheEntry &other );
 			
 			Value value; // value for this item
@@ -175,22 +192,42 @@ class LRUCache : private boost::noncopyable
 			MapValue *next;
 			
 			char status; // status of this item
+			// Set when the item is accessed, and cleared when
+			// the item is given a second chance during cost
+			// limiting. This means that cache hits don't need
+			// to modify the list at all.
+			char referenced;
+			// Description of the error from m_getter,
+			// valid when status==Failed.
+			std::string error;
 			// Mutex - must be held before accessing any
 			// fields other than the list fields (previous
 			// and next). To access the list fields, m_listMutex
-			// must be held instead.
-			tbb::spin_mutex mutex;
+			// must be held instead. This is only ever held briefly,
+			// so we use a spin mutex to keep cache hits cheap.
+			typedef tbb::spin_mutex Mutex;
+			Mutex mutex;
+			// Held for the duration of a call to m_getter, so
+			// that other threads requesting the same item wait
+			// for the result rather than computing it again. We
+			// use a mutex which blocks rather than spins, since the
+			// wait may be lengthy. Must be acquired _before_ mutex,
+			// and is never acquired by cache hits.
+			typedef tbb::mutex GetterMutex;
+			GetterMutex getterMutex;
 		};
 
 		// Dummy MapValues to represent the start and end of our LRU list.
-		// Items are moved to the end when they are accessed, and removed
-		// from the start when we need to reduce costs.
+		// Items are added to the end when they are cached. When we need to
+		// reduce costs, items at the start are removed if they are unreferenced,
+		// or moved to the end and given a second chance if they are referenced.
 		MapValue m_listStart;
 		MapValue m_listEnd;
 	
 		// The list is inherently a serial data structure, so we must
 		// protect all accesses with this mutex. The mutex _must_ be held
-		// before the list fields of _any_ MapValue may be accessed.
+		// before the list fields of _any_ MapValue may be accessed. Note
+		// that it is not acquired at all by cache hits.
 		typedef tbb::spin_mutex ListMutex;
 		ListMutex m_listMutex;
 		
@@ -227,7 +264,9 @@ class LRUCache : private boost::noncopyable
 
 		// Either erases the item from the list, or moves it to
 		// the end, depending on whether or not it is cached.
-		// Caller must not hold any locks.
+		// Caller must not hold any locks. This is only required
+		// when the status of an item may have changed - cache
+		// hits just set CacheEntry::referenced instead.
 		void updateListPosition( MapValue *mapValue );
 
 		// If the item is in the list, erases it, otherwise
@@ -240,6 +279,9 @@ class LRUCache : private boost::noncopyable
 
 		static void nullRemovalCallback( const Key &key, const Value &value );
 
+		// Functor for calling m_getter within isolateTasks().
+		struct GetterTask;
+
 };
 
 } // namespace IECore
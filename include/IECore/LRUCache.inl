@@ -46,13 +46,13 @@ namespace IECore
 
 template<typename Key, typename Value>
 LRUCache<Key, Value>::CacheEntry::CacheEntry()
-	:	value(), cost( 0 ), previous( NULL ), next( NULL ), status( New ), mutex()
+	:	value(), cost( 0 ), previous( NULL ), next( NULL ), status( New ), referenced( false ), error(), mutex(), getterMutex()
 {
 }
 
 template<typename Key, typename Value>
 LRUCache<Key, Value>::CacheEntry::CacheEntry( const CacheEntry &other )
-	:	value( other.value ), cost( other.cost ), previous( other.previous ), next( other.next ), status( other.status ), mutex()
+	:	value( other.value ), cost( other.cost ), previous( other.previous ), next( other.next ), status( other.status ), referenced( other.referenced ), error( other.error ), mutex(), getterMutex()
 {
 }
 
@@ -130,60 +130,106 @@ typename LRUCache<Key, Value>::Cost LRUCache<Key, Value>::currentCost() const
 }
 
 template<typename Key, typename Value>
-Value LRUCache<Key, Value>::get( const Key& key )
+struct LRUCache<Key, Value>::GetterTask
 {
 
-	MapIterator it = m_map.insert( MapValue( key, CacheEntry() ) ).first;
+	GetterTask( const GetterFunction &getter, const Key &key, Value &value, Cost &cost )
+		:	m_getter( getter ), m_key( key ), m_value( value ), m_cost( cost )
+	{
+	}
+
+	void operator()() const
+	{
+		m_value = m_getter( m_key, m_cost );
+	}
+
+	const GetterFunction &m_getter;
+	const Key &m_key;
+	Value &m_value;
+	Cost &m_cost;
+
+};
+
+template<typename Key, typename Value>
+Value LRUCache<Key, Value>::get( const Key& key )
+{
+	// Try a find() first, to avoid constructing a CacheEntry
+	// for the insert() in the common case of a cache hit.
+	MapIterator it = m_map.find( key );
+	if( it == m_map.end() )
+	{
+		it = m_map.insert( MapValue( key, CacheEntry() ) ).first;
+	}
 	CacheEntry &cacheEntry = it->second;
-	tbb::spin_mutex::scoped_lock lock( cacheEntry.mutex );
-		
-	if( cacheEntry.status==New || cacheEntry.status==Erased || cacheEntry.status==TooCostly )
+	typename CacheEntry::Mutex::scoped_lock lock( cacheEntry.mutex );
+
+	if( cacheEntry.status==Cached )
 	{
-		assert( cacheEntry.value==Value() );
-		assert( cacheEntry.next == NULL && cacheEntry.previous == NULL );
-		
-		Value value = Value();
-		Cost cost = 0;
-		try
-		{
-			value = m_getter( key, cost );
-		}
-		catch( ... )
-		{
-			cacheEntry.status = Failed;
-			throw;
-		}
-		
-		assert( cacheEntry.status != Cached ); // this would indicate that another thread somehow
-		assert( cacheEntry.status != Failed ); // loaded the same thing as us, which is not the intention.
-		
-		setInternal( &*it, value, cost );
-		
-		assert( cacheEntry.status == Cached || cacheEntry.status == TooCostly );
-	
-		lock.release();
-		
-		/// \todo We might want to consider ways of avoiding having to manipulate the
-		/// list for cache hits, because we want this to be our fastest code path.
-		/// Adopting an approximate LRU heuristic like Second Chance would be one way
-		/// of doing this.
-		updateListPosition( &*it );
-		limitCost();
-	
-		return value;
+		// Fast path for cache hits - we just mark the entry
+		// as referenced, so that limitCost() will give it a
+		// second chance, and avoid m_listMutex entirely.
+		cacheEntry.referenced = true;
+		return cacheEntry.value;
 	}
-	else if( cacheEntry.status==Cached )
+	else if( cacheEntry.status==Failed )
 	{
-		Value result = cacheEntry.value;
-		lock.release();
-		updateListPosition( &*it );
-		return result;
+		throw Exception( "Previous attempt to get item failed : " + cacheEntry.error );
 	}
-	else
+
+	// Cache miss. We mustn't hold the spin mutex while calling m_getter,
+	// so we serialise calls for this item with the getter mutex instead,
+	// and then check that another thread hasn't got the value while we
+	// were waiting for it.
+	lock.release();
+	typename CacheEntry::GetterMutex::scoped_lock getterLock( cacheEntry.getterMutex );
+	lock.acquire( cacheEntry.mutex );
+	if( cacheEntry.status==Cached )
+	{
+		cacheEntry.referenced = true;
+		return cacheEntry.value;
+	}
+	else if( cacheEntry.status==Failed )
 	{
-		assert( cacheEntry.status==Failed );
-		throw Exception( "Previous attempt to get item failed." );
+		throw Exception( "Previous attempt to get item failed : " + cacheEntry.error );
 	}
+	lock.release();
+
+	Value value = Value();
+	Cost cost = 0;
+	try
+	{
+		// The getter may wait on TBB tasks of its own, and without isolation
+		// this thread could steal an outer task which calls get() for this
+		// same item, and then deadlock on the getter mutex we hold.
+		isolateTasks( GetterTask( m_getter, key, value, cost ) );
+	}
+	catch( const std::exception &e )
+	{
+		lock.acquire( cacheEntry.mutex );
+		cacheEntry.status = Failed;
+		cacheEntry.error = e.what();
+		throw;
+	}
+	catch( ... )
+	{
+		lock.acquire( cacheEntry.mutex );
+		cacheEntry.status = Failed;
+		cacheEntry.error = "Unknown error";
+		throw;
+	}
+
+	lock.acquire( cacheEntry.mutex );
+	setInternal( &*it, value, cost );
+
+	assert( cacheEntry.status == Cached || cacheEntry.status == TooCostly );
+
+	lock.release();
+	getterLock.release();
+
+	updateListPosition( &*it );
+	limitCost();
+
+	return value;
 }
 
 template<typename Key, typename Value>
@@ -191,7 +237,7 @@ bool LRUCache<Key, Value>::set( const Key &key, const Value &value, Cost cost )
 {
 	MapIterator it = m_map.insert( MapValue( key, CacheEntry() ) ).first;
 	CacheEntry &cacheEntry = it->second;
-	tbb::spin_mutex::scoped_lock lock( cacheEntry.mutex );
+	typename CacheEntry::Mutex::scoped_lock lock( cacheEntry.mutex );
 
 	const bool result = setInternal( &*it, value, cost );
 	
@@ -238,7 +284,7 @@ bool LRUCache<Key, Value>::cached( const Key &key ) const
 	{
 		return false;
 	}
-	tbb::spin_mutex::scoped_lock lock( it->second.mutex );
+	typename CacheEntry::Mutex::scoped_lock lock( it->second.mutex );
 	return it->second.status==Cached;
 }
 
@@ -259,12 +305,14 @@ template<typename Key, typename Value>
 bool LRUCache<Key, Value>::eraseInternal( MapValue *mapValue )
 {	
 	CacheEntry &cacheEntry = mapValue->second;
-	tbb::spin_mutex::scoped_lock lock( cacheEntry.mutex );
+	typename CacheEntry::Mutex::scoped_lock lock( cacheEntry.mutex );
 		
 	const Status originalStatus = (Status)cacheEntry.status;
 
 	listErase( mapValue );
 	cacheEntry.status = Erased;
+	cacheEntry.referenced = false;
+	cacheEntry.error.clear();
 	
 	if( originalStatus != Cached ) 
 	{
@@ -291,7 +339,24 @@ void LRUCache<Key, Value>::limitCost()
 	// because we hold m_listMutex.
 	while( m_currentCost > m_maxCost && m_listStart.second.next != &m_listEnd )
 	{
-		eraseInternal( m_listStart.second.next );
+		MapValue *mapValue = m_listStart.second.next;
+		
+		typename CacheEntry::Mutex::scoped_lock mapValueLock( mapValue->second.mutex );
+		if( mapValue->second.referenced )
+		{
+			// Item has been accessed since we last considered it,
+			// so give it a second chance by moving it to the end
+			// of the list.
+			mapValue->second.referenced = false;
+			mapValueLock.release();
+			listErase( mapValue );
+			listInsertAtEnd( mapValue );
+		}
+		else
+		{
+			mapValueLock.release();
+			eraseInternal( mapValue );
+		}
 	}
 }
 
@@ -302,7 +367,7 @@ void LRUCache<Key, Value>::updateListPosition( MapValue *mapValue )
 	
 	listErase( mapValue );
 	
-	tbb::spin_mutex::scoped_lock mapValueMutex( mapValue->second.mutex );
+	typename CacheEntry::Mutex::scoped_lock mapValueMutex( mapValue->second.mutex );
 	if( mapValue->second.status == Cached )
 	{
 		listInsertAtEnd( mapValue );
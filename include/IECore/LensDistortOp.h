@@ -80,7 +80,8 @@ class IECORE_API LensDistortOp : public IECore::WarpOp
 		IECore::ObjectParameterPtr m_lensParameter;
 		IECore::IntParameterPtr m_modeParameter;
 		Imath::Box2i m_distortedDataWindow;
-		IECore::FloatVectorDataPtr m_cachePtr;
+		Imath::Box2i m_displayWindow;
+
 };
 
 IE_CORE_DECLAREPTR( LensDistortOp );
@@ -103,6 +103,10 @@ class IECORE_API LensModel : public Parameterised
 		/// before subsequent calls to distort(), undistort() and bounds() or their results are undefined.
 		virtual void validate() = 0;
 
+		/// \threading Once validate() has been called, distort() and undistort() may be
+		/// called concurrently from multiple threads, so implementations must not modify
+		/// the model while computing their results.
+
 		/// Distorts a point in UV space of the range (0-1) where the lower left corner is 0,0.
 		/// Should be implemented by derived classes to return the distorted UV coordinate.
 		//! @param uv The undistorted point that will be distorted. Should be a 2D vector in pixel space.
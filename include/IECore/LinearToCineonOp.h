@@ -66,6 +66,7 @@ class IECORE_API LinearToCineonOp : public ChannelOp
 	protected :
 
 		virtual void modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels );
+		virtual bool channelsAreIndependent() const;
 
 		FloatParameterPtr m_filmGamma;
 		IntParameterPtr m_refWhiteVal;
@@ -64,6 +64,9 @@ class IECORE_API MeshNormalsOp : public MeshPrimitiveOp
 
 	protected:
 
+		/// Returns true when the input is copied, so that normals
+		/// needn't be recalculated for a mesh seen before.
+		virtual bool resultCacheable( const CompoundObject *operands ) const;
 		virtual void modifyTypedPrimitive( MeshPrimitive * mesh, const CompoundObject * operands );
 
 	private :
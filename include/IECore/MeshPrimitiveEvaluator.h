@@ -102,9 +102,23 @@ class IECORE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		};
 		IE_CORE_DECLAREPTR( Result );
 
+		/// Specifies the acceleration structure used to answer
+		/// intersectionPoint() and intersectionPoints() queries.
+		enum IntersectionAccelerator
+		{
+			/// Walks the BoundedKDTree returned by triangleBoundTree().
+			KDTreeAccelerator,
+			/// Walks a flattened bounding volume hierarchy in which triangles
+			/// are stored with precomputed edges, in groups which are tested
+			/// against the ray together. This takes longer to build and uses more
+			/// memory, but is considerably faster for large numbers of rays
+			/// against large meshes.
+			BVHAccelerator
+		};
+
 		static PrimitiveEvaluatorPtr create( ConstPrimitivePtr primitive );
 
-		MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh );
+		MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh, IntersectionAccelerator intersectionAccelerator = KDTreeAccelerator );
 
 		virtual ~MeshPrimitiveEvaluator();
 
@@ -140,6 +154,9 @@ class IECORE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		/// Returns a bounding box covering all the uv coordinates of the mesh.
 		const Imath::Box2f uvBound() const;
 
+		/// Returns the acceleration structure used for intersection queries.
+		IntersectionAccelerator intersectionAccelerator() const;
+
 		//! @name Internal KDTrees.
 		/// The MeshPrimitiveEvaluator uses internal KDTrees to perform many of
 		/// its queries. Const access is provided to these so that clients can use them
@@ -175,6 +192,11 @@ class IECORE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		
 	protected:
 
+		/// Adds "triangleIndex" (IntVectorData) and "barycentricCoordinates"
+		/// (V3fVectorData) arrays to the results of the batch queries.
+		class ResultArrays;
+		virtual PrimitiveEvaluator::ResultArraysPtr createResultArrays( size_t size ) const;
+
 		ConstMeshPrimitivePtr m_mesh;
 		ConstV3fVectorDataPtr m_verts;
 		const std::vector<int> *m_meshVertexIds;
@@ -185,6 +207,11 @@ class IECORE_API MeshPrimitiveEvaluator : public PrimitiveEvaluator
 		UVBoundVector m_uvTriangles;		
 		UVBoundTree *m_uvTree;
 
+		/// The flattened hierarchy used when intersectionAccelerator()
+		/// is BVHAccelerator, and 0 otherwise.
+		class BVH;
+		BVH *m_bvh;
+
 		bool pointAtUVWalk( UVBoundTree::NodeIndex nodeIndex, const Imath::V2f &targetUV, Result *result ) const;
 		void closestPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::V3f &p, float &closestDistanceSqrd, Result *result ) const;
 		bool intersectionPointWalk( TriangleBoundTree::NodeIndex nodeIndex, const Imath::Line3f &ray, float &maxDistSqrd, Result *result, bool &hit ) const;
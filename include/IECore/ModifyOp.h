@@ -49,6 +49,14 @@ namespace IECore
 /// and a parameter to disable the operation completely. It's a little
 /// bit naughty to modify it in place but it'll probably be quite handy
 /// at times.
+///
+/// Copying the input is cheap, because the Data it contains is copied
+/// lazily - the copy shares storage with the input until writable() is
+/// called on it. For a Primitive, this means that only the primitive
+/// variables the op actually writes to are duplicated. Derived classes
+/// should therefore use readable() wherever possible, and only call
+/// writable() on data they are sure to change. bytesCopied() can be used
+/// to check how much data an op really duplicated.
 class IECORE_API ModifyOp : public Op
 {
 	public :
@@ -67,6 +75,17 @@ class IECORE_API ModifyOp : public Op
 		BoolParameter *enableParameter();
 		const BoolParameter *enableParameter() const;
 
+		/// Returns the number of bytes of data held by the result of the last
+		/// operation which aren't shared with the input - that is, the data which
+		/// was copied by calls to writable(), or newly created by the op. This is
+		/// only measured when the copyInput parameter is on, and is 0 otherwise.
+		/// The value is stored on the op by doOperation(), so it is only meaningful
+		/// when a single thread is calling operate(). It is also not updated when
+		/// operate() returns a result from the Op result cache, as doOperation()
+		/// isn't called then - disable the cache with Op::setResultCacheLimit( 0 )
+		/// when measuring ops which implement resultCacheable().
+		size_t bytesCopied() const;
+
 	protected :
 
 		/// Implemented to call modify() - implement modify rather than this.
@@ -81,6 +100,7 @@ class IECORE_API ModifyOp : public Op
 		ParameterPtr m_inputParameter;
 		BoolParameterPtr m_copyParameter;
 		BoolParameterPtr m_enableParameter;
+		size_t m_bytesCopied;
 
 };
 
@@ -38,6 +38,7 @@
 #include <set>
 #include <map>
 #include <string>
+#include <vector>
 
 #include "boost/shared_ptr.hpp"
 #include "IECore/Export.h"
@@ -344,11 +345,22 @@ class IECORE_API Object : public RunTimeTyped
 				void accumulate( const void *ptr, size_t bytes );
 				/// Returns the total accumulated to date.
 				size_t total() const;
+				/// The blocks of memory passed to accumulate( ptr, bytes ),
+				/// as pairs of address and size. These may be shared with
+				/// other objects.
+				typedef std::vector<std::pair<const void *, size_t> > SharedBlocks;
+				/// Returns the shared blocks accumulated to date.
+				const SharedBlocks &sharedBlocks() const;
 			private :
 				std::set<const void *> m_accumulated;
+				SharedBlocks m_sharedBlocks;
 				size_t m_total;
 		};
 
+		/// The ObjectPool uses the MemoryAccumulator to avoid counting
+		/// memory shared between the objects it holds more than once.
+		friend class ObjectPool;
+
 		/// Must be implemented in all derived classes to specify the amount of memory they are
 		/// using. An implementation must add it's memory usage to the accumulator before calling
 		/// memoryUsage() on its base class.
@@ -35,6 +35,8 @@
 #ifndef IECORE_OBJECTPOOL_H
 #define IECORE_OBJECTPOOL_H
 
+#include <vector>
+
 #include "boost/shared_ptr.hpp"
 
 #include "IECore/Export.h"
@@ -55,6 +57,10 @@ IE_CORE_FORWARDDECLARE( ObjectPool );
 /// The ObjectPool class implements a cache of Object instances indexed by their own hash and limited by the memory consumption.
 /// The function defaultObjectPool() returns a singleton object that should be used by most of the operations, 
 /// so there will be one single place where the total memory used by IECore objects is defined. 
+///
+/// Objects in the pool frequently share data with each other - for instance two meshes may share the
+/// same lazily copied "P" primitive variable. The memory usage of the pool takes this into account,
+/// counting each shared block of data only once, for as long as any object in the pool refers to it.
 /// 
 /// \ingroup utilityGroup
 class IECORE_API ObjectPool : public RefCounted
@@ -78,7 +84,8 @@ class IECORE_API ObjectPool : public RefCounted
 		/// Get the maximum possible memory cost of all items held in the pool
 		size_t getMaxMemoryUsage() const;
 
-		/// Returns the current memory cost of items held in the pool
+		/// Returns the current memory cost of items held in the pool. Data
+		/// shared between several of the items is only counted once.
 		size_t memoryUsage() const;
 
 		/// Returns true if the object with the given hash is in the pool.
@@ -112,6 +119,10 @@ class IECORE_API ObjectPool : public RefCounted
 
 	private:
 
+		// Returns the memory used by obj, filling sharedBlocks with the blocks
+		// of data which may also be used by other objects.
+		static size_t objectMemoryUsage( const Object *obj, std::vector<std::pair<const void *, size_t> > &sharedBlocks );
+
 		struct MemberData;
 		boost::shared_ptr<MemberData> m_data;
 };
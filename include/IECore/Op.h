@@ -45,10 +45,29 @@ IE_CORE_FORWARDDECLARE( Object );
 IE_CORE_FORWARDDECLARE( Parameter );
 IE_CORE_FORWARDDECLARE( CompoundObject );
 
+class MurmurHash;
+
+template<typename T>
+class ComputationCache;
+
+/// \addtogroup environmentGroup
+///
+/// <b>IECORE_OP_RESULT_CACHE_ENTRIES</b><br>
+/// The number of results held by the Op result cache. See
+/// Op::getResultCacheLimit() for more information.
+
 /// The Op class defines a base class for objects which perform an operation
 /// based on some input parameters and returns a result derived from Object.
 /// Parameter objects are used to define both the format of the inputs and
 /// the result.
+///
+/// Ops whose results depend only on their operands may opt in to having those
+/// results cached, by implementing resultCacheable(). When the cache is enabled,
+/// operate() then returns a copy of any result previously computed for identical
+/// operands, rather than calling doOperation() again. The results are keyed by
+/// the type name of the Op and the hash of the operands, and are stored in the
+/// default ObjectPool by a ComputationCache. As the hashes of Data are themselves
+/// cached, repeated operations on the same inputs cost little more than a lookup.
 /// \ingroup coreGroup
 class IECORE_API Op : public Parameterised
 {
@@ -79,6 +98,19 @@ class IECORE_API Op : public Parameterised
 		/// value of this parameter is always the value last returned by operate.
 		const Parameter *resultParameter() const;
 
+		//! @name Result caching
+		/// The result cache is shared by all Ops.
+		//////////////////////////////////////////////////////////////
+		//@{
+		/// Returns the maximum number of results held in the cache. This defaults
+		/// to the value of the IECORE_OP_RESULT_CACHE_ENTRIES environment variable,
+		/// or to 0 if that isn't set. A limit of 0 disables the cache.
+		static size_t getResultCacheLimit();
+		static void setResultCacheLimit( size_t maxResults );
+		/// Removes all results from the cache.
+		static void clearResultCache();
+		//@}
+
 	protected :
 
 		/// Called by operate() to actually perform the operation. operands
@@ -88,10 +120,24 @@ class IECORE_API Op : public Parameterised
 		/// \todo This should be const.
 		virtual ObjectPtr doOperation( const CompoundObject *operands ) = 0;
 
+		/// May be implemented to return true if the result of doOperation() depends
+		/// only on the operands and the type of the Op, in which case the result may
+		/// be cached and reused by operate(). The result must not be modified after it
+		/// has been returned from doOperation() - in particular, an Op returning an
+		/// object that it modifies in place must not be cached. The default
+		/// implementation returns false.
+		virtual bool resultCacheable( const CompoundObject *operands ) const;
+
 	private :
 
 		ParameterPtr m_resultParameter;
 
+		struct Operation;
+		typedef ComputationCache<Operation> ResultCache;
+		static ResultCache &resultCache();
+		static ConstObjectPtr computeResult( const Operation &operation );
+		static MurmurHash operationHash( const Operation &operation );
+
 };
 
 IE_CORE_DECLAREPTR( Op );
@@ -41,6 +41,7 @@
 
 #include "IECore/Export.h"
 #include "IECore/Object.h"
+#include "IECore/MurmurHash.h"
 
 namespace IECore
 {
@@ -184,6 +185,14 @@ class IECORE_API Parameter : public RunTimeTyped
 		/// If the current value is one of the presets, then returns its
 		/// name, otherwise returns the empty string.
 		std::string getCurrentPresetName() const;
+		/// Returns a hash of the current value.
+		MurmurHash hash() const;
+		/// Appends a hash of the current value to h. The result must be the same
+		/// as getValue()->hash( h ), which is what the default implementation does,
+		/// but derived classes may reimplement it to avoid building a value just
+		/// to hash it. CompoundParameter does this, so unlike getValue() it is safe
+		/// to call hash() on a CompoundParameter from multiple concurrent threads.
+		virtual void hash( MurmurHash &h ) const;
 		//@}
 
 	private :
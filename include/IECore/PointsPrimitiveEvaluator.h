@@ -127,7 +127,14 @@ class IECORE_API PointsPrimitiveEvaluator : public PrimitiveEvaluator
 		//@}
 
 	protected :
-		
+
+		/// Points results have no normals or uvs, so only the points
+		/// are stored by the batch queries.
+		virtual PrimitiveEvaluator::ResultArraysPtr createResultArrays( size_t size ) const;
+		/// Builds the tree used by closestPoint(), so that it isn't built by
+		/// whichever task of the batch query happens to get there first.
+		virtual void prepareClosestPoints() const;
+
 		/// \todo It would be much better if PrimitiveEvaluator::Description didn't require these create()
 		/// functions and instead just called the constructors that have to exist anyway.
 		static PrimitiveEvaluatorPtr create( ConstPrimitivePtr primitive );
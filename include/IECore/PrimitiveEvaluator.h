@@ -43,6 +43,8 @@
 #include "IECore/Export.h"
 #include "IECore/RunTimeTyped.h"
 #include "IECore/Primitive.h"
+#include "IECore/CompoundData.h"
+#include "IECore/VectorTypedData.h"
 
 namespace IECore
 {
@@ -160,6 +162,29 @@ class IECORE_API PrimitiveEvaluator : public RunTimeTyped
 
 		//@}
 
+		//! @name Batch Query Functions
+		/// These perform the queries above for whole arrays of inputs at once, using multiple
+		/// threads, and return the results as a CompoundData containing an array for each
+		/// quantity. This always contains "success" (BoolVectorData) and "P" (V3fVectorData),
+		/// and for evaluators whose results support them, "N" (V3fVectorData) and "uv"
+		/// (V2fVectorData). Derived classes may provide further arrays specific to their
+		/// Result type. Elements for which the query failed have undefined values.
+		////////////////////////////////////////////////////////////////////////////////////////
+		//@{
+
+		/// Performs closestPoint() for each of the points.
+		CompoundDataPtr closestPoints( const V3fVectorData *points ) const;
+
+		/// Performs pointAtUV() for each of the uvs.
+		CompoundDataPtr pointsAtUV( const V2fVectorData *uvs ) const;
+
+		/// Performs intersectionPoint() for each ray. The directions must either have the same
+		/// length as the origins, or contain a single direction to be used for every ray.
+		CompoundDataPtr closestIntersectionPoints( const V3fVectorData *origins, const V3fVectorData *directions,
+			float maxDistance = Imath::limits<float>::max() ) const;
+
+		//@}
+
 		/// Throws an exception if the passed result type is not compatible with the current evaluator
 		virtual void validateResult( Result *result ) const =0;
 
@@ -174,8 +199,61 @@ class IECORE_API PrimitiveEvaluator : public RunTimeTyped
 			}
 		};
 
+	protected :
+
+		/// Stores the results of the batch queries. Derived classes may reimplement
+		/// createResultArrays() to return a subclass which stores additional data
+		/// from their own Result type.
+		class IECORE_API ResultArrays : public RefCounted
+		{
+			public :
+
+				IE_CORE_DECLAREMEMBERPTR( ResultArrays );
+
+				/// The normals and uvs are only stored if requested, so that
+				/// evaluators whose results don't support them can still use
+				/// this class.
+				ResultArrays( size_t size, bool normals = true, bool uvs = true );
+				virtual ~ResultArrays();
+
+				/// Stores a successful result for the query with the specified index.
+				/// \threading This is called concurrently for different indices.
+				virtual void set( size_t index, const Result *result );
+				/// Returns the arrays, not including the success flags.
+				virtual CompoundDataPtr arrays() const;
+
+			private :
+
+				V3fVectorDataPtr m_p;
+				V3fVectorDataPtr m_n;
+				V2fVectorDataPtr m_uv;
+				// we take pointers to the data up front, as it's not safe to call
+				// writable() concurrently.
+				Imath::V3f *m_pWritable;
+				Imath::V3f *m_nWritable;
+				Imath::V2f *m_uvWritable;
+
+		};
+		IE_CORE_DECLAREPTR( ResultArrays );
+
+		/// Returns an instance of ResultArrays suitable for storing the results
+		/// of batch queries on this evaluator. The default implementation stores
+		/// points, normals and uvs.
+		virtual ResultArraysPtr createResultArrays( size_t size ) const;
+		/// Called by closestPoints() before it starts its parallel loop, so
+		/// that derived classes can build any acceleration structures up front
+		/// rather than lazily from within the loop. The default implementation
+		/// does nothing.
+		virtual void prepareClosestPoints() const;
+
 	private:
 
+		template<typename Query>
+		class BatchQueryTask;
+
+		template<typename Query>
+		CompoundDataPtr batchQuery( size_t size, const Query &query ) const;
+
 		static void registerCreator( TypeId id, CreatorFn f );
 
 		typedef std::map< TypeId, CreatorFn > CreatorMap;
@@ -37,6 +37,7 @@
 
 #include "IECore/Export.h"
 #include "IECore/SampledSceneInterface.h"
+#include "IECore/CompoundData.h"
 
 namespace IECore
 {
@@ -48,7 +49,9 @@ IE_CORE_FORWARDDECLARE( SceneCache );
 /// When saving, it's important to keep the initial root SceneCache object alive until the very end.
 /// The destruction of the root scene will trigger the recursive computation of the bounding boxes for all the
 /// locations that no bounds were written. It will also store (without duplication) all the
-/// sample times used by objects, transforms, bounds and attributes.
+/// sample times used by objects, transforms, bounds and attributes. Sibling locations are
+/// processed in parallel at that point, and each completed location has its index compressed
+/// and written to the file straight away, to reduce the memory needed to write large scenes.
 /// \ingroup ioGroup
 class IECORE_API SceneCache : public SampledSceneInterface
 {
@@ -136,6 +139,29 @@ class IECORE_API SceneCache : public SampledSceneInterface
 
 		/// tells you if this scene cache is read only or writable:
 		bool readOnly() const;
+
+		/// Reads the bounds and transforms for this location and all its descendants at the specified
+		/// time, in a single call. This is much quicker than visiting each location in turn with child(),
+		/// readBound() and readTransformAsMatrix(), because sibling locations are read in parallel and
+		/// no SceneCache objects are created for them. The result is a CompoundData containing the
+		/// following members, with one element per location in depth first order, starting with this one :
+		///
+		/// "paths" : StringVectorData containing the full path of each location.
+		/// "parentIndices" : IntVectorData containing the index of the parent of each location, or -1 for this location.
+		/// "bounds" : Box3dVectorData containing the local bound of each location, as given by readBound().
+		/// "transforms" : M44dVectorData containing the local transform of each location, as given by readTransformAsMatrix().
+		///
+		/// Throws if the scene is being written.
+		CompoundDataPtr readHierarchy( double time ) const;
+
+		/// Schedules the object and transform samples required for reading this location and all
+		/// its descendants between startTime and endTime to be loaded in background threads, and
+		/// returns immediately. Subsequent calls to readObject() and readTransform() in that time
+		/// range will then find the samples already in memory, or will wait for the pending load
+		/// rather than repeating it. This is useful for playback, where the upcoming frames are
+		/// known in advance. Prefetched samples are subject to the usual cache memory limits, so
+		/// the range should be kept modest for large scenes. Throws if the scene is being written.
+		void prefetch( double startTime, double endTime ) const;
 		
 		// The attribute names used to mark animated topology and primitive variables
 		// when SceneCache objects are Primitives.
@@ -51,7 +51,10 @@ namespace IECore
 {
 /// Abstract base class implementation of IndexedIO which operates with a stream file handle.
 /// It handles data instancing transparently for compact file sizes.
-/// Read operations are thread safe on read-only opened files.
+/// Read operations are thread safe on read-only opened files. Write operations
+/// may be performed concurrently by multiple threads, provided that each thread
+/// works on a different directory - the hashing and compression of data happens
+/// in the calling threads, and only the final append to the file is serialised.
 /// \ingroup ioGroup
 class IECORE_API StreamIndexedIO : public IndexedIO
 {
@@ -59,6 +62,28 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 
 		IE_CORE_DECLARERUNTIMETYPED( StreamIndexedIO, IndexedIO );
 
+		/// Codecs which may be used to compress the blocks written to a file.
+		enum Codec
+		{
+			Uncompressed = 0,
+			Gzip,
+			LZ4,
+			Zstd
+		};
+
+		/// Specifies the codecs used by files subsequently created for writing. The index codec
+		/// compresses the main index and the subindexes, and the data codec compresses large numeric
+		/// arrays. The defaults ( Gzip, Uncompressed ) produce files which can be read by all previous
+		/// versions of the library - any other choice requires file format version 6. Files opened in
+		/// Append mode retain the format they were created with. LZ4 and Zstd are only available
+		/// if the library was built with them, and an exception is thrown when requesting a codec
+		/// which isn't available. The codecs are read once when each file is opened, so it is
+		/// safe to change them while other threads are writing files.
+		static void setCompression( Codec indexCodec, Codec dataCodec );
+		static void getCompression( Codec &indexCodec, Codec &dataCodec );
+		/// Returns true if the codec is supported by this build of the library.
+		static bool codecAvailable( Codec codec );
+
 		virtual ~StreamIndexedIO();
 
 		virtual IndexedIO::OpenMode openMode() const;
@@ -170,16 +195,20 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				Imf::Int64 tellg();
 				Imf::Int64 tellp();
 
+				/// Reads size bytes starting at the absolute position pos. Unlike seekg()/read()
+				/// this may be called concurrently from multiple threads without holding mutex().
+				/// The default implementation locks mutex() and seeks the shared stream, but derived
+				/// classes may override it to read without touching any shared state.
+				virtual void positionalRead( char *buffer, size_t size, size_t pos );
+
 				IndexedIO::OpenMode openMode() const;
 
-				// returns a read lock, when thread-safety is required.
+				// returns a lock, when thread-safety is required. It serialises the updates
+				// to the index and the writing of data blocks to the stream.
 				typedef tbb::recursive_mutex Mutex;
 				typedef Mutex::scoped_lock MutexLock;
 				Mutex & mutex();
 
-				// utility function that returns a temporary buffer for io operations (not thread safe).
-				char *ioBuffer( unsigned long size );
-
 				/// called after the main index is saved to disk, ready to close the file.
 				virtual void flush( size_t endPosition );
 
@@ -195,9 +224,6 @@ class IECORE_API StreamIndexedIO : public IndexedIO
 				IndexedIO::OpenMode m_openmode;
 				std::iostream *m_stream;
 				Mutex m_mutex;
-
-				unsigned long m_ioBufferLen;
-				char *m_ioBuffer;
 		};
 		IE_CORE_DECLAREPTR( StreamFile );
 
@@ -129,10 +129,19 @@ class IECORE_API TIFFImageReader : public ImageReader
 		unsigned int m_numDirectories;
 		bool m_haveDirectory;
 
-		std::vector<unsigned char> m_buffer;
-
-		// Reads the interlaced data from the current directory into the buffer
-		void readBuffer();
+		// Decodes a single tile (or strip) of interlaced data from the current directory.
+		// The tileSet is the index of the directory. This may be called concurrently
+		// from several threads, each of which uses its own handle on the file.
+		virtual ConstCharVectorDataPtr decodeTile( const std::string &tileSet, int tileIndex );
+		// Returns a handle on the file for use by decodeTile() in the calling thread,
+		// set to the current directory.
+		tiff *decodeHandle();
+		struct DecodeHandles;
+		DecodeHandles *m_decodeHandles;
+		// Returns the size in pixels of the tiles (or strips) in the current directory.
+		Imath::V2i tileSize();
+		// Returns the number of tiles (or strips) in the current directory.
+		int numTiles();
 
 		Imath::Box2i m_displayWindow;
 		Imath::Box2i m_dataWindow;
@@ -156,6 +165,9 @@ class IECORE_API TIFFImageReader : public ImageReader
 		template<typename T, typename V>
 		DataPtr readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow );
 
+		template<typename T, typename V>
+		struct ReadTiles;
+
 };
 
 IE_CORE_DECLAREPTR(TIFFImageReader);
@@ -98,6 +98,9 @@ class IECORE_API TIFFImageWriter : public ImageWriter
 		template<typename ChannelData>
 		struct ChannelConverter;
 
+		template<typename T>
+		struct InterleaveChannels;
+
 		template<typename T>
 		void encodeChannels( const ImagePrimitive * image, const std::vector<std::string> &names,
 		                     const Imath::Box2i &dw, tiff *tiffImage, size_t bufSize, unsigned int numStrips ) const;
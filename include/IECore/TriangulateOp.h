@@ -68,6 +68,8 @@ class IECORE_API TriangulateOp : public TypedPrimitiveOp<MeshPrimitive>
 
 		struct TriangulateFn;
 
+		/// Returns true unless the mesh is being triangulated in place.
+		virtual bool resultCacheable( const CompoundObject *operands ) const;
 		virtual void modifyTypedPrimitive( MeshPrimitive * mesh, const CompoundObject * operands );
 
 		BoolParameterPtr m_throwExceptionsParameter;
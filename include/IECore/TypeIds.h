@@ -439,6 +439,7 @@ enum TypeId
 	EXRDeepImageReaderTypeId = 391,
 	EXRDeepImageWriterTypeId = 392,
 	ExternalProceduralTypeId = 393,
+	DeepImageMergeOpTypeId = 394,
 
 	// Remember to update TypeIdBinding.cpp !!!
 
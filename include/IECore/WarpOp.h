@@ -79,7 +79,10 @@ class IECORE_API WarpOp : public ImagePrimitiveOp
 		/// Called once per element (pixel for ImagePrimitives).
 		/// Must be implemented by subclasses to determine where the color will come from.
 		/// The returned coordinate is on pixel space of the input image and the given V2f coordinates are on the
-		/// output image pixel space.
+		/// output image pixel space. The result is shared by all channels, and calls are made
+		/// concurrently from multiple threads in no particular order, so implementations must be
+		/// threadsafe - typically this means doing any setup in begin() and only reading from
+		/// member data here.
 		virtual Imath::V2f warp( const Imath::V2f &p ) const = 0;
 		/// Called once per operation, after all calls to transform() have been made. This is
 		/// an opportunity to perform any cleanup necessary.
@@ -90,7 +93,8 @@ class IECORE_API WarpOp : public ImagePrimitiveOp
 		IntParameterPtr m_filterParameter;
 		IntParameterPtr m_boundModeParameter;
 		struct Warp;
-		friend struct Warp;
+		struct WarpRows;
+		friend struct WarpRows;
 };
 
 IE_CORE_DECLAREPTR( WarpOp );
@@ -0,0 +1,75 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_BLOCKCOMPRESSION_H
+#define IECORE_BLOCKCOMPRESSION_H
+
+#include <vector>
+
+namespace IECore
+{
+
+/// Functions for compressing blocks of data in memory, shared by
+/// StreamIndexedIO and the display driver server protocol.
+namespace BlockCompression
+{
+
+/// The codecs which may be used. The values are stored in files and
+/// sent over the network, so they must never change.
+enum Codec
+{
+	Uncompressed = 0,
+	Gzip = 1,
+	LZ4 = 2,
+	Zstd = 3
+};
+
+/// Returns true if the library was built with support for the codec.
+bool available( Codec codec );
+
+/// Appends the data, compressed with the codec, to result. When fast is
+/// true, speed is favoured over compression ratio. Throws if the codec
+/// isn't available.
+void compress( Codec codec, const char *data, size_t size, std::vector<char> &result, bool fast = false );
+
+/// Decompresses data into buffer, which must be exactly the size of the
+/// uncompressed data. Throws if the data is corrupt or the codec isn't
+/// available.
+void decompress( Codec codec, const char *data, size_t size, char *buffer, size_t bufferSize );
+
+} // namespace BlockCompression
+
+} // namespace IECore
+
+#endif // IECORE_BLOCKCOMPRESSION_H
@@ -0,0 +1,233 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#ifndef IECORE_DEEPIMAGEPIPELINE_H
+#define IECORE_DEEPIMAGEPIPELINE_H
+
+#include <algorithm>
+#include <vector>
+
+#include "tbb/pipeline.h"
+#include "tbb/tbb_stddef.h"
+
+#if TBB_INTERFACE_VERSION >= 8000
+#include "tbb/task_arena.h"
+#endif
+
+#include "OpenEXR/ImathBox.h"
+
+namespace IECore
+{
+
+/// The number of scanlines in each block processed by runDeepImagePipeline().
+static const int deepImagePipelineScanlines = 16;
+
+/// Returns the region of the block of scanlines starting at y.
+inline Imath::Box2i deepImagePipelineRegion( const Imath::Box2i &dataWindow, int y )
+{
+	return Imath::Box2i(
+		Imath::V2i( dataWindow.min.x, y ),
+		Imath::V2i( dataWindow.max.x, std::min( y + deepImagePipelineScanlines - 1, dataWindow.max.y ) )
+	);
+}
+
+/// Streams the data window through the processor a block of scanlines at a time,
+/// so that only a few blocks are ever held in memory. The Processor must provide :
+///
+/// - A Block typedef, default constructible, holding the data for one block.
+/// - void read( int y, Block &block ), called serially in order of y.
+/// - void process( Block &block ), which may be called concurrently for different blocks.
+/// - void write( Block &block ), called serially in the order the blocks were read.
+///
+/// When threads is greater than 1 the stages run as a TBB pipeline, limited to
+/// that many threads where the TBB version supports it. Otherwise everything is
+/// done on the calling thread.
+template<typename Processor>
+void runDeepImagePipeline( Processor &processor, const Imath::Box2i &dataWindow, int threads );
+
+namespace Detail
+{
+
+// Each token is a pointer to one of a fixed number of blocks, which are reused in
+// turn. This is safe because the pipeline never has more tokens in flight than there
+// are blocks, and the tokens leave the final stage in the order they were created,
+// so a block is always free by the time it comes around again. It also bounds the
+// memory used.
+template<typename Processor>
+class DeepImagePipelineReadFilter : public tbb::filter
+{
+
+	public :
+
+		typedef typename Processor::Block Block;
+
+		DeepImagePipelineReadFilter( Processor &processor, const Imath::Box2i &dataWindow, std::vector<Block> &blocks )
+			:	tbb::filter( tbb::filter::serial_in_order ), m_processor( processor ), m_dataWindow( dataWindow ), m_blocks( blocks ), m_y( dataWindow.min.y ), m_index( 0 )
+		{
+		}
+
+		virtual void *operator()( void * )
+		{
+			if ( m_y > m_dataWindow.max.y )
+			{
+				return 0;
+			}
+
+			Block &block = m_blocks[ m_index++ % m_blocks.size() ];
+			m_processor.read( m_y, block );
+			m_y += deepImagePipelineScanlines;
+
+			return &block;
+		}
+
+	private :
+
+		Processor &m_processor;
+		const Imath::Box2i &m_dataWindow;
+		std::vector<Block> &m_blocks;
+		int m_y;
+		size_t m_index;
+
+};
+
+template<typename Processor>
+class DeepImagePipelineProcessFilter : public tbb::filter
+{
+
+	public :
+
+		DeepImagePipelineProcessFilter( Processor &processor )
+			:	tbb::filter( tbb::filter::parallel ), m_processor( processor )
+		{
+		}
+
+		virtual void *operator()( void *item )
+		{
+			m_processor.process( *static_cast<typename Processor::Block *>( item ) );
+			return item;
+		}
+
+	private :
+
+		Processor &m_processor;
+
+};
+
+template<typename Processor>
+class DeepImagePipelineWriteFilter : public tbb::filter
+{
+
+	public :
+
+		DeepImagePipelineWriteFilter( Processor &processor )
+			:	tbb::filter( tbb::filter::serial_in_order ), m_processor( processor )
+		{
+		}
+
+		virtual void *operator()( void *item )
+		{
+			m_processor.write( *static_cast<typename Processor::Block *>( item ) );
+			return 0;
+		}
+
+	private :
+
+		Processor &m_processor;
+
+};
+
+// Runs a pipeline, for use with tbb::task_arena::execute().
+struct DeepImagePipelineRun
+{
+
+	DeepImagePipelineRun( tbb::pipeline &pipeline, size_t maxTokens )
+		:	m_pipeline( pipeline ), m_maxTokens( maxTokens )
+	{
+	}
+
+	void operator()() const
+	{
+		m_pipeline.run( m_maxTokens );
+	}
+
+	private :
+
+		tbb::pipeline &m_pipeline;
+		size_t m_maxTokens;
+
+};
+
+} // namespace Detail
+
+template<typename Processor>
+void runDeepImagePipeline( Processor &processor, const Imath::Box2i &dataWindow, int threads )
+{
+	if ( threads <= 1 )
+	{
+		typename Processor::Block block;
+		for ( int y=dataWindow.min.y; y <= dataWindow.max.y; y += deepImagePipelineScanlines )
+		{
+			processor.read( y, block );
+			processor.process( block );
+			processor.write( block );
+		}
+		return;
+	}
+
+	std::vector<typename Processor::Block> blocks( 2 * threads );
+
+	Detail::DeepImagePipelineReadFilter<Processor> readFilter( processor, dataWindow, blocks );
+	Detail::DeepImagePipelineProcessFilter<Processor> processFilter( processor );
+	Detail::DeepImagePipelineWriteFilter<Processor> writeFilter( processor );
+
+	tbb::pipeline pipeline;
+	pipeline.add_filter( readFilter );
+	pipeline.add_filter( processFilter );
+	pipeline.add_filter( writeFilter );
+
+	Detail::DeepImagePipelineRun run( pipeline, blocks.size() );
+#if TBB_INTERFACE_VERSION >= 8000
+	// the arena limits the processing to the requested number of threads.
+	// arenas are only a preview feature before TBB 4.3, so with older
+	// versions the pipeline's token limit is the only bound.
+	tbb::task_arena arena( threads );
+	arena.execute( run );
+#else
+	run();
+#endif
+}
+
+} // namespace IECore
+
+#endif // IECORE_DEEPIMAGEPIPELINE_H
@@ -46,16 +46,37 @@ namespace IECore
 * [1] - protocol version ( 1 )
 * [2] - message type ( imageOpen, imageData, imageClose )
 * [3-6] - length of following data block.
+*
+* The data block for rawImageData messages holds a bucket of pixels without
+* any IndexedIO serialisation :
+* [0-15] - box min.x, min.y, max.x, max.y as little endian 32 bit integers.
+* [16] - pixel format ( rawFloat, rawHalf ).
+* [17] - 1 if the pixels are little endian, 0 otherwise.
+* [18] - compression, as a BlockCompression::Codec.
+* [19] - reserved.
+* [20-23] - size in bytes of the uncompressed pixel values, as a little endian 32 bit integer.
+* [24-] - interleaved pixel values, compressed as specified by [18].
+*
+* Clients only send rawImageData messages to servers which report support
+* for at least rawImageDataProtocolVersion in response to imageOpen. Servers
+* replying with compressionProtocolVersion also send a byte with bit ( 1 << codec )
+* set for each codec they can decompress, and clients fall back to gzip or no
+* compression if their preferred codec is not among them. Servers replying
+* with rawImageDataProtocolVersion are assumed to support just those two.
 */
 class DisplayDriverServerHeader
 {
 	public:
 
-		enum MessageType { imageOpen = 1, imageData = 2, imageClose = 3, exception = 4 };
+		enum MessageType { imageOpen = 1, imageData = 2, imageClose = 3, exception = 4, rawImageData = 5 };
+		enum RawImageDataFormat { rawFloat = 0, rawHalf = 1 };
 
 		static const unsigned char headerLength = 7;
 		static const unsigned char magicNumber = 0x82;
 		static const unsigned char currentProtocolVersion = 1;
+		static const unsigned char rawImageDataProtocolVersion = 2;
+		static const unsigned char compressionProtocolVersion = 3;
+		static const unsigned char rawImageDataHeaderLength = 24;
 
 		DisplayDriverServerHeader();
 		DisplayDriverServerHeader( MessageType msg, size_t dataSize );
@@ -35,14 +35,401 @@
 #ifndef IECOREPYTHON_VECTORTYPEDDATABINDING_INL
 #define IECOREPYTHON_VECTORTYPEDDATABINDING_INL
 
+#include "boost/python/def_visitor.hpp"
+#include "boost/mpl/if.hpp"
+
+#include "OpenEXR/half.h"
+#include "OpenEXR/ImathBox.h"
+#include "OpenEXR/ImathColor.h"
+#include "OpenEXR/ImathMatrix.h"
+#include "OpenEXR/ImathQuat.h"
+#include "OpenEXR/ImathVec.h"
+
 #include "IECorePython/IECoreBinding.h"
 #include "IECorePython/RunTimeTypedBinding.h"
 
+#include <cstring>
 #include <sstream>
 
 namespace IECorePython
 {
 
+namespace Detail
+{
+
+/// Describes how a single element of a vector is laid out in terms of
+/// its base type, so that the vector can be presented as a multidimensional
+/// array via the buffer protocol. The default is suitable for scalar types.
+template<typename T>
+struct BufferElementTraits
+{
+	static int dimensions() { return 0; }
+	static Py_ssize_t extent( int dimension ) { return 1; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Vec2<T> >
+{
+	static int dimensions() { return 1; }
+	static Py_ssize_t extent( int dimension ) { return 2; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Vec3<T> >
+{
+	static int dimensions() { return 1; }
+	static Py_ssize_t extent( int dimension ) { return 3; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Color3<T> >
+{
+	static int dimensions() { return 1; }
+	static Py_ssize_t extent( int dimension ) { return 3; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Color4<T> >
+{
+	static int dimensions() { return 1; }
+	static Py_ssize_t extent( int dimension ) { return 4; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Quat<T> >
+{
+	static int dimensions() { return 1; }
+	static Py_ssize_t extent( int dimension ) { return 4; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Matrix33<T> >
+{
+	static int dimensions() { return 2; }
+	static Py_ssize_t extent( int dimension ) { return 3; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Matrix44<T> >
+{
+	static int dimensions() { return 2; }
+	static Py_ssize_t extent( int dimension ) { return 4; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Box<Imath::Vec2<T> > >
+{
+	static int dimensions() { return 2; }
+	static Py_ssize_t extent( int dimension ) { return 2; }
+};
+
+template<typename T>
+struct BufferElementTraits<Imath::Box<Imath::Vec3<T> > >
+{
+	static int dimensions() { return 2; }
+	static Py_ssize_t extent( int dimension ) { return dimension == 0 ? 2 : 3; }
+};
+
+/// Provides the struct module style format string for a base type, and
+/// the kind of value it holds ( 'i' for signed integers, 'u' for unsigned
+/// integers and 'f' for floating point ). Only numeric types are supported,
+/// as indicated by the supported member.
+template<typename T>
+struct BufferFormat
+{
+	static const bool supported = false;
+};
+
+#define IECOREPYTHON_DEFINEBUFFERFORMAT( TYPE, FORMAT, KIND )	\
+template<>														\
+struct BufferFormat<TYPE>										\
+{																\
+	static const bool supported = true;							\
+	static const char *format() { return FORMAT; }				\
+	static char kind() { return KIND; }							\
+};
+
+IECOREPYTHON_DEFINEBUFFERFORMAT( half, "e", 'f' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( float, "f", 'f' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( double, "d", 'f' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( char, "b", 'i' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned char, "B", 'u' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( short, "h", 'i' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned short, "H", 'u' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( int, "i", 'i' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( unsigned int, "I", 'u' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( int64_t, "q", 'i' )
+IECOREPYTHON_DEFINEBUFFERFORMAT( uint64_t, "Q", 'u' )
+
+#undef IECOREPYTHON_DEFINEBUFFERFORMAT
+
+/// Returns the kind of value described by a struct module style format
+/// string, or 0 if it isn't a single native value.
+inline char bufferFormatKind( const char *format )
+{
+	if( !format )
+	{
+		// no format means unsigned bytes
+		return 'u';
+	}
+
+	if( *format == '@' || *format == '=' )
+	{
+		format++;
+	}
+	else if( *format == '<' || *format == '>' || *format == '!' )
+	{
+		const int one = 1;
+		const bool littleEndian = *reinterpret_cast<const char *>( &one );
+		if( ( *format == '<' ) != littleEndian )
+		{
+			return 0;
+		}
+		format++;
+	}
+
+	if( !*format || format[1] )
+	{
+		return 0;
+	}
+
+	switch( *format )
+	{
+		case 'b' :
+		case 'c' :
+		case 'h' :
+		case 'i' :
+		case 'l' :
+		case 'q' :
+			return 'i';
+		case 'B' :
+		case 'H' :
+		case 'I' :
+		case 'L' :
+		case 'Q' :
+			return 'u';
+		case 'e' :
+		case 'f' :
+		case 'd' :
+			return 'f';
+		default :
+			return 0;
+	}
+}
+
+/// Provides the base type used to present a VectorTypedData type as a buffer,
+/// or void if the type can't be presented as a buffer, because it has no base
+/// type or a non-numeric one ( as with StringVectorData ).
+template<typename ThisClass>
+struct BufferBaseType
+{
+	typedef typename ThisClass::BaseType BaseType;
+	typedef typename boost::mpl::if_c<BufferFormat<BaseType>::supported, BaseType, void>::type Type;
+};
+
+} // namespace Detail
+
+/// Implements the python buffer protocol for VectorTypedData types with a
+/// numeric base type, allowing the data to be viewed without copying by python
+/// modules such as numpy. Elements are presented as arrays of their base
+/// type, so a V3fVectorData of length n appears as an n x 3 array of floats.
+/// Requesting a writable buffer calls writable() on the data, so data shared
+/// with other instances is copied first, as it would be in C++. Releasing a
+/// writable buffer calls writable() again, so that hash() reflects any writes
+/// made through it. As with writable(), views are only valid until the vector
+/// is resized, and the data shouldn't be copied or hashed while a writable view
+/// is held. Writable buffers are only provided by the new style buffer protocol,
+/// as the old style protocol has no means of telling us when writing is done.
+template<typename ThisClass, typename BaseType = typename Detail::BufferBaseType<ThisClass>::Type>
+class VectorTypedDataBuffer : public boost::python::def_visitor<VectorTypedDataBuffer<ThisClass, BaseType> >
+{
+
+	public :
+
+		typedef typename ThisClass::ValueType Container;
+		typedef typename Container::value_type ElementType;
+		typedef Detail::BufferElementTraits<ElementType> ElementTraits;
+
+		/// Fills result with a copy of the data from any python object supporting
+		/// the buffer protocol with a matching base type and element shape.
+		/// Returns false without altering result if the object doesn't provide
+		/// such a buffer.
+		static bool fromBuffer( PyObject *object, Container &result )
+		{
+			if( !PyObject_CheckBuffer( object ) || PyString_Check( object ) || PyUnicode_Check( object ) )
+			{
+				return false;
+			}
+
+			Py_buffer view;
+			if( PyObject_GetBuffer( object, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT ) == -1 )
+			{
+				PyErr_Clear();
+				return false;
+			}
+
+			bool compatible =
+				view.itemsize == (Py_ssize_t)sizeof( BaseType ) &&
+				Detail::bufferFormatKind( view.format ) == Detail::BufferFormat<BaseType>::kind() &&
+				view.ndim == 1 + ElementTraits::dimensions() &&
+				view.len % sizeof( ElementType ) == 0;
+
+			for( int i = 1; compatible && i < view.ndim; ++i )
+			{
+				compatible = view.shape[i] == ElementTraits::extent( i - 1 );
+			}
+
+			if( compatible )
+			{
+				result.resize( view.len / sizeof( ElementType ) );
+				if( view.len )
+				{
+					memcpy( &result[0], view.buf, view.len );
+				}
+			}
+
+			PyBuffer_Release( &view );
+			return compatible;
+		}
+
+	private :
+
+		friend class boost::python::def_visitor_access;
+
+		template<typename Class>
+		void visit( Class &c ) const
+		{
+			static PyBufferProcs bufferProcs = {
+				&readBuffer,
+				0,
+				&segmentCount,
+				0,
+				&getBuffer,
+				&releaseBuffer
+			};
+
+			PyTypeObject *type = reinterpret_cast<PyTypeObject *>( c.ptr() );
+			type->tp_as_buffer = &bufferProcs;
+			type->tp_flags |= Py_TPFLAGS_HAVE_NEWBUFFER;
+		}
+
+		static void *data( ThisClass &d, bool writable )
+		{
+			static ElementType empty;
+			if( d.readable().empty() )
+			{
+				return &empty;
+			}
+			return writable ? (void *)d.baseWritable() : (void *)d.baseReadable();
+		}
+
+		static Py_ssize_t readBuffer( PyObject *object, Py_ssize_t segment, void **ptr )
+		{
+			ThisClass &d = boost::python::extract<ThisClass &>( object );
+			*ptr = data( d, false );
+			return d.readable().size() * sizeof( ElementType );
+		}
+
+		static Py_ssize_t segmentCount( PyObject *object, Py_ssize_t *len )
+		{
+			if( len )
+			{
+				ThisClass &d = boost::python::extract<ThisClass &>( object );
+				*len = d.readable().size() * sizeof( ElementType );
+			}
+			return 1;
+		}
+
+		static int getBuffer( PyObject *object, Py_buffer *view, int flags )
+		{
+			try
+			{
+				fillBuffer( object, view, flags );
+			}
+			catch( const boost::python::error_already_set & )
+			{
+				return -1;
+			}
+			catch( const std::exception &e )
+			{
+				PyErr_SetString( PyExc_BufferError, e.what() );
+				return -1;
+			}
+			return 0;
+		}
+
+		static void fillBuffer( PyObject *object, Py_buffer *view, int flags )
+		{
+			ThisClass &d = boost::python::extract<ThisClass &>( object );
+
+			const int ndim = 1 + ElementTraits::dimensions();
+			// storage for the shape followed by the strides, freed in releaseBuffer()
+			Py_ssize_t *shapeAndStrides = new Py_ssize_t[ndim * 2];
+			Py_ssize_t *shape = shapeAndStrides;
+			Py_ssize_t *strides = shapeAndStrides + ndim;
+
+			shape[0] = d.readable().size();
+			for( int i = 1; i < ndim; ++i )
+			{
+				shape[i] = ElementTraits::extent( i - 1 );
+			}
+			strides[ndim-1] = sizeof( BaseType );
+			for( int i = ndim - 2; i >= 0; --i )
+			{
+				strides[i] = strides[i+1] * shape[i+1];
+			}
+
+			const bool writable = flags & PyBUF_WRITABLE;
+			view->buf = data( d, writable );
+			view->obj = object;
+			Py_INCREF( object );
+			view->len = d.readable().size() * sizeof( ElementType );
+			view->readonly = !writable;
+			view->itemsize = sizeof( BaseType );
+			view->format = ( flags & PyBUF_FORMAT ) ? const_cast<char *>( Detail::BufferFormat<BaseType>::format() ) : 0;
+			view->ndim = ndim;
+			view->shape = ( flags & PyBUF_ND ) == PyBUF_ND ? shape : 0;
+			view->strides = ( flags & PyBUF_STRIDES ) == PyBUF_STRIDES ? strides : 0;
+			view->suboffsets = 0;
+			view->internal = shapeAndStrides;
+		}
+
+		static void releaseBuffer( PyObject *object, Py_buffer *view )
+		{
+			delete[] static_cast<Py_ssize_t *>( view->internal );
+			if( !view->readonly )
+			{
+				// invalidate the hash, as the data may have been written
+				ThisClass &d = boost::python::extract<ThisClass &>( object );
+				d.writable();
+			}
+		}
+
+};
+
+/// Types without a numeric base type don't support the buffer protocol.
+template<typename ThisClass>
+class VectorTypedDataBuffer<ThisClass, void> : public boost::python::def_visitor<VectorTypedDataBuffer<ThisClass, void> >
+{
+
+	public :
+
+		static bool fromBuffer( PyObject *object, typename ThisClass::ValueType &result )
+		{
+			return false;
+		}
+
+	private :
+
+		friend class boost::python::def_visitor_access;
+
+		template<typename Class>
+		void visit( Class &c ) const
+		{
+		}
+
+};
+
 template<typename ThisClass>
 class VectorTypedDataFunctions
 {
@@ -77,7 +464,10 @@ class VectorTypedDataFunctions
 			else
 			{
 				ThisClassPtr r = new ThisClass();
-				boost::python::container_utils::extend_container( r->writable(), v );
+				if( !VectorTypedDataBuffer<ThisClass>::fromBuffer( v.ptr(), r->writable() ) )
+				{
+					boost::python::container_utils::extend_container( r->writable(), v );
+				}
 				return r;
 			}
 		}
@@ -696,6 +1086,7 @@ std::string str<TypedData<std::vector<TYPE> > >( TypedData<std::vector<TYPE> > &
 			.def("hasBase", &ThisClass::hasBase ).staticmethod( "hasBase" ) \
 			.def("__str__", &str<ThisClass> )	\
 			.def("__repr__", &repr<ThisClass> )	\
+			.def( VectorTypedDataBuffer<ThisClass>() )	\
 
 // bind a VectorTypedData class that does not support Math operators
 #define BIND_VECTOR_TYPEDDATA(T, Tname)													\
@@ -66,6 +66,14 @@ class PointsExpressionOp( ModifyOp ) :
 			]
 		)
 
+	## The result depends only on the points and the expression, so
+	# it may be cached unless the points are being modified in place.
+	# Note that expressions with random or otherwise varying results
+	# shouldn't be used while the Op result cache is enabled.
+	def resultCacheable( self, operands ) :
+
+		return operands["copyInput"].value
+
 	def modify( self, pointsPrim, operands ) :
 
 		# this dictionary derived class provides the locals for
@@ -180,37 +180,6 @@ class SequenceLsOp( Op ) :
 			]
 		)
 
-	@staticmethod
-	def __walk(top, topdown=True, followlinks=False):
-
-		from os.path import join, isdir, islink
-		from os import listdir, error
-
-		try:
-			names = listdir(top)
-		except error :
-		        return
-
-		dirs, nondirs = [], []
-		for name in names:
-			if isdir(join(top, name)):
-				dirs.append(name)
-			else:
-				nondirs.append(name)
-
-		if topdown:
-			yield top, dirs, nondirs
-
-		for name in dirs:
-			path = join(top, name)
-			if followlinks or not islink(path):
-				for x in SequenceLsOp.__walk(path, topdown, followlinks):
-					yield x
-
-		if not topdown:
-			yield top, dirs, nondirs
-
-
 	def doOperation( self, operands ) :
 
 		# recursively find sequences
@@ -218,7 +187,13 @@ class SequenceLsOp( Op ) :
 		if baseDirectory != "/" and baseDirectory[-1] == '/' :
 			baseDirectory = baseDirectory[:-1]
 
-		sequences = ls( baseDirectory, operands["minSequenceSize"].value )
+		sequences = ls(
+			baseDirectory,
+			operands["minSequenceSize"].value,
+			recurse = operands["recurse"].value,
+			followLinks = operands["followLinks"].value,
+			maxDepth = operands["maxDepth"].value,
+		)
 
 		# If we've passed in a directory which isn't the current one it is convenient to get that included in the returned sequence names
 		relDir = os.path.normpath( baseDirectory ) != "."
@@ -227,30 +202,6 @@ class SequenceLsOp( Op ) :
 			for s in sequences :
 				s.fileName = os.path.join( baseDirectory, s.fileName )
 
-		if operands["recurse"].value :
-			# \todo Can safely use os.walk here after Python 2.6, which introduced the followlinks parameter
-			for root, dirs, files in SequenceLsOp.__walk( baseDirectory, topdown = True, followlinks = operands["followLinks"].value ) :
-				relRoot = root[len(baseDirectory)+1:]
-				if relRoot!="" :
-					depth = len( relRoot.split( "/" ) )
-				else :
-					depth = 0
-
-				if depth>=operands["maxDepth"].value :
-					dirs[:] = []
-
-				for d in dirs :
-					ss = ls( os.path.join( root, d ), operands["minSequenceSize"].value )
-					if ss :
-						for s in ss :
-
-							if relDir :
-								s.fileName = os.path.join( baseDirectory, relRoot, d, s.fileName )
-							else :
-								s.fileName = os.path.join( relRoot, d, s.fileName )
-							sequences.append( s )
-
-
 		# \todo This Op would benefit considerably from dynamic parameters
 		# NB. Ordering of filters could have considerable impact on execution time. The most expensive filters should be specified last.
 		filters = []
@@ -73,6 +73,11 @@ struct AlexaLogcToLinearOp::Converter
 	}
 };
 
+bool AlexaLogcToLinearOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void AlexaLogcToLinearOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	AlexaLogcToLinearOp::Converter converter;
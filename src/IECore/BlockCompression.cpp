@@ -0,0 +1,194 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+
+#include <cstring>
+
+#include "boost/iostreams/filtering_stream.hpp"
+#include "boost/iostreams/filter/gzip.hpp"
+
+#include "IECore/private/BlockCompression.h"
+#include "IECore/MemoryStream.h"
+#include "IECore/Exception.h"
+
+#ifdef IECORE_WITH_LZ4
+#include "lz4.h"
+#endif
+
+#ifdef IECORE_WITH_ZSTD
+#include "zstd.h"
+#endif
+
+using namespace IECore;
+namespace io = boost::iostreams;
+
+bool BlockCompression::available( Codec codec )
+{
+	switch( codec )
+	{
+		case Uncompressed :
+		case Gzip :
+			return true;
+#ifdef IECORE_WITH_LZ4
+		case LZ4 :
+			return true;
+#endif
+#ifdef IECORE_WITH_ZSTD
+		case Zstd :
+			return true;
+#endif
+		default :
+			return false;
+	}
+}
+
+void BlockCompression::compress( Codec codec, const char *data, size_t size, std::vector<char> &result, bool fast )
+{
+	switch( codec )
+	{
+		case Uncompressed :
+		{
+			result.insert( result.end(), data, data + size );
+			break;
+		}
+		case Gzip :
+		{
+			MemoryStreamSink sink;
+			io::filtering_ostream compressingStream;
+			compressingStream.push( io::gzip_compressor( io::gzip_params( fast ? io::gzip::best_speed : io::gzip::default_compression ) ) );
+			compressingStream.push( sink );
+			compressingStream.write( data, size );
+			compressingStream.pop();
+			compressingStream.pop();
+
+			char *compressed = 0;
+			std::streamsize compressedSize = 0;
+			sink.get( compressed, compressedSize );
+			result.insert( result.end(), compressed, compressed + compressedSize );
+			break;
+		}
+#ifdef IECORE_WITH_LZ4
+		case LZ4 :
+		{
+			if( size > LZ4_MAX_INPUT_SIZE )
+			{
+				throw IOException( "BlockCompression : Block too large for LZ4 compression!" );
+			}
+			const size_t offset = result.size();
+			const int bound = LZ4_compressBound( size );
+			result.resize( offset + bound );
+			const int compressedSize = LZ4_compress_default( data, &result[offset], size, bound );
+			if( compressedSize <= 0 )
+			{
+				throw IOException( "BlockCompression : LZ4 compression failed!" );
+			}
+			result.resize( offset + compressedSize );
+			break;
+		}
+#endif
+#ifdef IECORE_WITH_ZSTD
+		case Zstd :
+		{
+			const size_t offset = result.size();
+			const size_t bound = ZSTD_compressBound( size );
+			result.resize( offset + bound );
+			const size_t compressedSize = ZSTD_compress( &result[offset], bound, data, size, fast ? 1 : 3 );
+			if( ZSTD_isError( compressedSize ) )
+			{
+				throw IOException( std::string( "BlockCompression : Zstd compression failed! " ) + ZSTD_getErrorName( compressedSize ) );
+			}
+			result.resize( offset + compressedSize );
+			break;
+		}
+#endif
+		default :
+			throw IOException( "BlockCompression : Unsupported compression codec! The library may have been built without it." );
+	}
+}
+
+void BlockCompression::decompress( Codec codec, const char *data, size_t size, char *buffer, size_t bufferSize )
+{
+	switch( codec )
+	{
+		case Uncompressed :
+		{
+			if( size != bufferSize )
+			{
+				throw IOException( "BlockCompression : Corrupted compressed block!" );
+			}
+			if( size )
+			{
+				memcpy( buffer, data, size );
+			}
+			break;
+		}
+		case Gzip :
+		{
+			MemoryStreamSource source( const_cast<char *>( data ), size, false );
+			io::filtering_istream decompressingStream;
+			decompressingStream.push( io::gzip_decompressor() );
+			decompressingStream.push( source );
+			decompressingStream.read( buffer, bufferSize );
+			if( (size_t)decompressingStream.gcount() != bufferSize )
+			{
+				throw IOException( "BlockCompression : Corrupted compressed block!" );
+			}
+			break;
+		}
+#ifdef IECORE_WITH_LZ4
+		case LZ4 :
+		{
+			const int decompressedSize = LZ4_decompress_safe( data, buffer, size, bufferSize );
+			if( decompressedSize < 0 || (size_t)decompressedSize != bufferSize )
+			{
+				throw IOException( "BlockCompression : Corrupted compressed block!" );
+			}
+			break;
+		}
+#endif
+#ifdef IECORE_WITH_ZSTD
+		case Zstd :
+		{
+			const size_t decompressedSize = ZSTD_decompress( buffer, bufferSize, data, size );
+			if( ZSTD_isError( decompressedSize ) || decompressedSize != bufferSize )
+			{
+				throw IOException( "BlockCompression : Corrupted compressed block!" );
+			}
+			break;
+		}
+#endif
+		default :
+			throw IOException( "BlockCompression : Unsupported compression codec! The library may have been built without it." );
+	}
+}
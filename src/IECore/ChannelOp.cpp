@@ -39,12 +39,43 @@
 
 #include "boost/format.hpp"
 
+#include "tbb/parallel_for.h"
+
 using namespace IECore;
 using namespace std;
 using namespace boost;
 
 IE_CORE_DEFINERUNTIMETYPED( ChannelOp );
 
+// Calls modifyChannels() for each of a range of channels in turn.
+class ChannelOp::ModifyChannels
+{
+
+	public :
+
+		ModifyChannels( ChannelOp *op, const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, const ChannelVector &channels )
+			:	m_op( op ), m_displayWindow( displayWindow ), m_dataWindow( dataWindow ), m_channels( channels )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<size_t> &r ) const
+		{
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				ChannelVector channel( 1, m_channels[i] );
+				m_op->modifyChannels( m_displayWindow, m_dataWindow, channel );
+			}
+		}
+
+	private :
+
+		ChannelOp *m_op;
+		const Imath::Box2i &m_displayWindow;
+		const Imath::Box2i &m_dataWindow;
+		const ChannelVector &m_channels;
+
+};
+
 ChannelOp::ChannelOp( const std::string &description )
 	:	ImagePrimitiveOp( description )
 {
@@ -77,6 +108,19 @@ const StringVectorParameter * ChannelOp::channelNamesParameter() const
 	return m_channelNamesParameter.get();
 }
 
+bool ChannelOp::channelsAreIndependent() const
+{
+	return false;
+}
+
+void ChannelOp::begin( const CompoundObject *operands )
+{
+}
+
+void ChannelOp::end()
+{
+}
+
 void ChannelOp::modifyTypedPrimitive( ImagePrimitive * image, const CompoundObject * operands )
 {
 	if( image->getDataWindow().isEmpty() )
@@ -126,6 +170,20 @@ void ChannelOp::modifyTypedPrimitive( ImagePrimitive * image, const CompoundObje
 		channels.push_back( boost::static_pointer_cast< FloatVectorData >( it->second.data ) );
 	}
 
-	modifyChannels( image->getDisplayWindow(), image->getDataWindow(), channels );
+	begin( operands );
+
+	if( channelsAreIndependent() && channels.size() > 1 )
+	{
+		tbb::parallel_for(
+			tbb::blocked_range<size_t>( 0, channels.size(), 1 ),
+			ModifyChannels( this, image->getDisplayWindow(), image->getDataWindow(), channels )
+		);
+	}
+	else
+	{
+		modifyChannels( image->getDisplayWindow(), image->getDataWindow(), channels );
+	}
+
+	end();
 	/// \todo Consider cases where the derived class invalidates the channel data (by changing its length)
 }
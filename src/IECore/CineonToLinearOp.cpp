@@ -173,6 +173,11 @@ struct CineonToLinearOp::Converter
 
 };
 
+bool CineonToLinearOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void CineonToLinearOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	CineonToLinearOp::Converter converter(
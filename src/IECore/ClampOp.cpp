@@ -156,6 +156,11 @@ const FloatParameter *ClampOp::maxToParameter() const
 	return parameters()->parameter<FloatParameter>( "maxTo" );
 }
 
+bool ClampOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void ClampOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	float minValue = minParameter()->getNumericValue();
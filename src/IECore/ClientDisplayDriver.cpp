@@ -35,11 +35,21 @@
 
 #include "boost/asio.hpp"
 #include "boost/bind.hpp"
+#include "boost/format.hpp"
+
+#include "tbb/tbb_thread.h"
+#include "tbb/concurrent_queue.h"
+#include "tbb/atomic.h"
+
+#include "OpenEXR/half.h"
 
 #include "IECore/ClientDisplayDriver.h"
 #include "IECore/private/DisplayDriverServerHeader.h"
+#include "IECore/private/BlockCompression.h"
 #include "IECore/SimpleTypedData.h"
 #include "IECore/MemoryIndexedIO.h"
+#include "IECore/ByteOrder.h"
+#include "IECore/MessageHandler.h"
 
 using namespace boost;
 using namespace std;
@@ -51,21 +61,128 @@ class ClientDisplayDriver::PrivateData : public RefCounted
 {
 	public :
 		PrivateData() :
-		m_service(), m_host(""), m_port(""), m_scanLineOrderOnly(false), m_acceptsRepeatedData(false), m_socket( m_service )
+		m_service(), m_host(""), m_port(""), m_scanLineOrderOnly(false), m_acceptsRepeatedData(false), m_rawImageData(false), m_halfImageData(false), m_compression( BlockCompression::Uncompressed ), m_socket( m_service ), m_sendThread()
 		{
+			m_sendFailed = false;
+			m_sendQueue.set_capacity( maxQueuedMessages );
 		}
 
 		~PrivateData()
 		{
+			stopSending();
 			m_socket.close();
 		}
 
+		// The maximum number of messages waiting to be sent. When this is reached,
+		// imageData() blocks until the send thread catches up, so that a renderer
+		// producing buckets faster than the network can accept them doesn't
+		// consume unbounded memory.
+		static const size_t maxQueuedMessages = 64;
+		// Messages waiting in the queue are written to the socket together, up to
+		// this many bytes at a time.
+		static const size_t maxBatchSize = 4 * 1024 * 1024;
+
+		void startSending()
+		{
+			tbb::tbb_thread newThread( boost::bind( &PrivateData::sendThread, this ) );
+			m_sendThread.swap( newThread );
+		}
+
+		void send( ConstCharVectorDataPtr message )
+		{
+			if( !m_sendThread.joinable() )
+			{
+				throw Exception( "Could not send image data to remote display driver server : image has been closed" );
+			}
+			throwIfSendFailed();
+			m_sendQueue.push( message );
+		}
+
+		// Waits for all queued messages to be sent.
+		void stopSending()
+		{
+			if( !m_sendThread.joinable() )
+			{
+				return;
+			}
+			// a null message tells the send thread to finish
+			m_sendQueue.push( ConstCharVectorDataPtr() );
+			m_sendThread.join();
+		}
+
+		void throwIfSendFailed() const
+		{
+			if( m_sendFailed )
+			{
+				throw Exception( std::string( "Could not send image data to remote display driver server : " ) + m_sendError );
+			}
+		}
+
 		boost::asio::io_service m_service;
 		std::string m_host;
 		std::string m_port;
 		bool m_scanLineOrderOnly;
 		bool m_acceptsRepeatedData;
+		bool m_rawImageData;
+		bool m_halfImageData;
+		BlockCompression::Codec m_compression;
 		boost::asio::ip::tcp::socket m_socket;
+
+	private :
+
+		void sendThread()
+		{
+			std::vector<ConstCharVectorDataPtr> batch;
+			std::vector<boost::asio::const_buffer> buffers;
+			bool finished = false;
+			while( !finished )
+			{
+				// wait for a message, and then gather up any others that are
+				// already waiting, so they can be sent in a single write.
+				ConstCharVectorDataPtr message;
+				m_sendQueue.pop( message );
+				finished = !message;
+				size_t batchSize = 0;
+				while( message )
+				{
+					batchSize += message->readable().size();
+					batch.push_back( message );
+					if( batchSize >= maxBatchSize || !m_sendQueue.try_pop( message ) )
+					{
+						break;
+					}
+					finished = !message;
+				}
+
+				// after a failure we keep emptying the queue, so that
+				// send() never blocks waiting for us.
+				if( !batch.empty() && !m_sendFailed )
+				{
+					buffers.clear();
+					for( std::vector<ConstCharVectorDataPtr>::const_iterator it = batch.begin(); it != batch.end(); ++it )
+					{
+						buffers.push_back( boost::asio::buffer( (*it)->readable() ) );
+					}
+
+					boost::system::error_code error;
+					boost::asio::write( m_socket, buffers, error );
+					if( error )
+					{
+						m_sendError = error.message();
+						m_sendFailed = true;
+					}
+				}
+				batch.clear();
+			}
+		}
+
+		typedef tbb::concurrent_bounded_queue<ConstCharVectorDataPtr> SendQueue;
+		SendQueue m_sendQueue;
+		tbb::tbb_thread m_sendThread;
+		// m_sendError is written before m_sendFailed is set, so is
+		// safe to read from any thread once m_sendFailed is true.
+		std::string m_sendError;
+		tbb::atomic<bool> m_sendFailed;
 };
 
 IE_CORE_DEFINERUNTIMETYPED( ClientDisplayDriver );
@@ -82,6 +199,43 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 	
 	m_data->m_host = displayHostData->readable();
 	m_data->m_port = displayPortData->readable();
+
+	if( const StringData *imageDataFormatData = parameters->member<StringData>( "imageDataFormat" ) )
+	{
+		if( imageDataFormatData->readable() == "half" )
+		{
+			m_data->m_halfImageData = true;
+		}
+		else if( imageDataFormatData->readable() != "float" )
+		{
+			throw InvalidArgumentException( std::string( "Unsupported imageDataFormat \"" ) + imageDataFormatData->readable() + "\"" );
+		}
+	}
+
+	if( const StringData *compressionData = parameters->member<StringData>( "imageDataCompression" ) )
+	{
+		const std::string &compression = compressionData->readable();
+		if( compression == "gzip" )
+		{
+			m_data->m_compression = BlockCompression::Gzip;
+		}
+#ifdef IECORE_WITH_LZ4
+		else if( compression == "lz4" )
+		{
+			m_data->m_compression = BlockCompression::LZ4;
+		}
+#endif
+#ifdef IECORE_WITH_ZSTD
+		else if( compression == "zstd" )
+		{
+			m_data->m_compression = BlockCompression::Zstd;
+		}
+#endif
+		else if( compression != "none" )
+		{
+			throw InvalidArgumentException( std::string( "Unsupported imageDataCompression \"" ) + compression + "\"" );
+		}
+	}
 	
 	tcp::resolver resolver(m_data->m_service);
 	tcp::resolver::query query(m_data->m_host, m_data->m_port);
@@ -110,6 +264,10 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 
 	IECore::CompoundDataPtr tmpParameters = parameters->copy();
 	tmpParameters->writable()[ "clientPID" ] = new IntData( getpid() );
+	// let the server know that we can send raw bucket data and negotiate its
+	// compression. servers which predate rawImageData just pass this through
+	// to the display driver.
+	tmpParameters->writable()[ "clientProtocolVersion" ] = new IntData( DisplayDriverServerHeader::compressionProtocolVersion );
 
 	// build the data block
 	io = new MemoryIndexedIO( ConstCharVectorDataPtr(), IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Write );
@@ -131,11 +289,40 @@ ClientDisplayDriver::ClientDisplayDriver( const Imath::Box2i &displayWindow, con
 	}
 	m_data->m_socket.receive( boost::asio::buffer( &m_data->m_scanLineOrderOnly, sizeof(m_data->m_scanLineOrderOnly) ) );
 	
-	if ( receiveHeader( DisplayDriverServerHeader::imageOpen ) != sizeof(m_data->m_acceptsRepeatedData) )
+	// servers which support rawImageData follow acceptsRepeatedData
+	// with the protocol version they support, and then with the codecs
+	// they support if that version allows compression negotiation.
+	size_t replySize = receiveHeader( DisplayDriverServerHeader::imageOpen );
+	if ( replySize < sizeof(m_data->m_acceptsRepeatedData) || replySize > sizeof(m_data->m_acceptsRepeatedData) + 2 )
 	{
 		throw Exception( "Invalid returned acceptsRepeatedData from display driver server!" );
 	}
 	m_data->m_socket.receive( boost::asio::buffer( &m_data->m_acceptsRepeatedData, sizeof(m_data->m_acceptsRepeatedData) ) );
+	if( replySize > sizeof(m_data->m_acceptsRepeatedData) )
+	{
+		unsigned char serverProtocolVersion = 0;
+		m_data->m_socket.receive( boost::asio::buffer( &serverProtocolVersion, 1 ) );
+		m_data->m_rawImageData = serverProtocolVersion >= DisplayDriverServerHeader::rawImageDataProtocolVersion;
+
+		unsigned char serverCodecs = ( 1 << BlockCompression::Uncompressed ) | ( 1 << BlockCompression::Gzip );
+		if( replySize > sizeof(m_data->m_acceptsRepeatedData) + 1 )
+		{
+			m_data->m_socket.receive( boost::asio::buffer( &serverCodecs, 1 ) );
+		}
+
+		if( !( serverCodecs & ( 1 << m_data->m_compression ) ) )
+		{
+			const BlockCompression::Codec fallback = ( serverCodecs & ( 1 << BlockCompression::Gzip ) ) ? BlockCompression::Gzip : BlockCompression::Uncompressed;
+			msg(
+				Msg::Warning, "ClientDisplayDriver",
+				boost::format( "Display driver server does not support the requested imageDataCompression. Using \"%s\" instead." ) %
+				( fallback == BlockCompression::Gzip ? "gzip" : "none" )
+			);
+			m_data->m_compression = fallback;
+		}
+	}
+
+	m_data->startSending();
 }
 
 ClientDisplayDriver::~ClientDisplayDriver()
@@ -194,28 +381,76 @@ size_t ClientDisplayDriver::receiveHeader( int msg )
 
 void ClientDisplayDriver::imageData( const Box2i &box, const float *data, size_t dataSize )
 {
-	MemoryIndexedIOPtr io;
-	ConstCharVectorDataPtr buf;
+	CharVectorDataPtr message = new CharVectorData;
+	std::vector<char> &messageBuffer = message->writable();
 
-	// build the data block
-	Box2iDataPtr boxData = new Box2iData( box );
-	FloatVectorDataPtr dataData = new FloatVectorData( std::vector<float>( data, data+dataSize ) );
+	if( m_data->m_rawImageData )
+	{
+		// the pixels follow a 7 byte header in the message, so we can't write
+		// halfs into it directly without misaligning them. instead we convert
+		// them separately, and copy or compress them into place.
+		std::vector<half> halfData;
+		const char *pixels = reinterpret_cast<const char *>( data );
+		size_t pixelBytes = dataSize * sizeof( float );
+		if( m_data->m_halfImageData )
+		{
+			halfData.insert( halfData.end(), data, data + dataSize );
+			pixels = dataSize ? reinterpret_cast<const char *>( &halfData[0] ) : 0;
+			pixelBytes = dataSize * sizeof( half );
+		}
 
-	io = new MemoryIndexedIO( ConstCharVectorDataPtr(), IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Write );
-	boost::static_pointer_cast<Object>(boxData)->save( io, "box" );
-	boost::static_pointer_cast<Object>(dataData)->save( io, "data" );
-	buf = io->buffer();
-	size_t blockSize = buf->readable().size();
+		messageBuffer.resize( DisplayDriverServerHeader::headerLength + DisplayDriverServerHeader::rawImageDataHeaderLength, 0 );
 
-	sendHeader( DisplayDriverServerHeader::imageData, blockSize );
+		char *block = &messageBuffer[DisplayDriverServerHeader::headerLength];
+		const int coordinates[4] = { box.min.x, box.min.y, box.max.x, box.max.y };
+		for( int i = 0; i < 4; ++i )
+		{
+			const int c = asLittleEndian( coordinates[i] );
+			memcpy( block + i * sizeof( int ), &c, sizeof( int ) );
+		}
+		block[16] = m_data->m_halfImageData ? DisplayDriverServerHeader::rawHalf : DisplayDriverServerHeader::rawFloat;
+		block[17] = littleEndian() ? 1 : 0;
+		block[18] = m_data->m_compression;
+		const int uncompressedSize = asLittleEndian( (int)pixelBytes );
+		memcpy( block + 20, &uncompressedSize, sizeof( int ) );
+
+		// appends the pixels, compressing them if requested
+		BlockCompression::compress( m_data->m_compression, pixels, pixelBytes, messageBuffer, /* fast = */ true );
 
-	m_data->m_socket.send( boost::asio::buffer( &(buf->readable()[0]), blockSize) );
+		DisplayDriverServerHeader header( DisplayDriverServerHeader::rawImageData, messageBuffer.size() - DisplayDriverServerHeader::headerLength );
+		std::copy( header.buffer(), header.buffer() + DisplayDriverServerHeader::headerLength, messageBuffer.begin() );
+	}
+	else
+	{
+		MemoryIndexedIOPtr io;
+		ConstCharVectorDataPtr buf;
+
+		// build the data block
+		Box2iDataPtr boxData = new Box2iData( box );
+		FloatVectorDataPtr dataData = new FloatVectorData( std::vector<float>( data, data+dataSize ) );
+
+		io = new MemoryIndexedIO( ConstCharVectorDataPtr(), IndexedIO::rootPath, IndexedIO::Exclusive | IndexedIO::Write );
+		boost::static_pointer_cast<Object>(boxData)->save( io, "box" );
+		boost::static_pointer_cast<Object>(dataData)->save( io, "data" );
+		buf = io->buffer();
+		size_t blockSize = buf->readable().size();
+
+		DisplayDriverServerHeader header( DisplayDriverServerHeader::imageData, blockSize );
+		messageBuffer.reserve( DisplayDriverServerHeader::headerLength + blockSize );
+		messageBuffer.insert( messageBuffer.end(), header.buffer(), header.buffer() + DisplayDriverServerHeader::headerLength );
+		messageBuffer.insert( messageBuffer.end(), buf->readable().begin(), buf->readable().end() );
+	}
+
+	// the message is sent on a background thread, so the renderer
+	// can carry on producing buckets in the meantime.
+	m_data->send( message );
 }
 
 void ClientDisplayDriver::imageClose()
 {
+	m_data->stopSending();
+	m_data->throwIfSendFailed();
 	sendHeader( DisplayDriverServerHeader::imageClose, 0 );
 	receiveHeader( DisplayDriverServerHeader::imageClose );
 	m_data->m_socket.close();
 }
-
@@ -223,6 +223,37 @@ const Object *CompoundParameter::getValue() const
 	return value;
 }
 
+static inline bool nameLess( const std::pair<std::string, const Parameter *> &a, const std::pair<std::string, const Parameter *> &b )
+{
+	return a.first < b.first;
+}
+
+void CompoundParameter::hash( MurmurHash &h ) const
+{
+	if( !runTimeCast<const CompoundObject>( Parameter::getValue() ) )
+	{
+		Parameter::hash( h );
+		return;
+	}
+
+	// match CompoundObject::hash(), which hashes the members
+	// in the order of their names rather than their addresses.
+	std::vector<std::pair<std::string, const Parameter *> > children;
+	children.reserve( m_namesToParameters.size() );
+	for( ParameterMap::const_iterator it=m_namesToParameters.begin(); it!=m_namesToParameters.end(); it++ )
+	{
+		children.push_back( std::pair<std::string, const Parameter *>( it->first.value(), it->second.get() ) );
+	}
+	sort( children.begin(), children.end(), nameLess );
+
+	h.append( (int)CompoundObjectTypeId );
+	for( std::vector<std::pair<std::string, const Parameter *> >::const_iterator it=children.begin(); it!=children.end(); it++ )
+	{
+		h.append( it->first );
+		it->second->hash( h );
+	}
+}
+
 bool CompoundParameter::valueValid( const Object *value, std::string *reason ) const
 {
 	if( !Parameter::valueValid( value, reason ) )
@@ -372,6 +372,19 @@ PrimitiveEvaluator::ResultPtr CurvesPrimitiveEvaluator::createResult() const
 	return new Result( m_p, m_curvesPrimitive->basis() == CubicBasisf::linear(), m_curvesPrimitive->periodic() );
 }
 
+PrimitiveEvaluator::ResultArraysPtr CurvesPrimitiveEvaluator::createResultArrays( size_t size ) const
+{
+	return new ResultArrays( size, false, true );
+}
+
+void CurvesPrimitiveEvaluator::prepareClosestPoints() const
+{
+	if( m_verticesPerCurve.size() )
+	{
+		const_cast<CurvesPrimitiveEvaluator *>( this )->buildTree();
+	}
+}
+
 void CurvesPrimitiveEvaluator::validateResult( PrimitiveEvaluator::Result *result ) const
 {
 	if( ! dynamic_cast<CurvesPrimitiveEvaluator::Result *>( result ) )
@@ -33,6 +33,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECore/DPXImageReader.h"
+#include "IECore/IECore.h"
 #include "IECore/SimpleTypedData.h"
 #include "IECore/VectorTypedData.h"
 #include "IECore/ByteOrder.h"
@@ -46,6 +47,8 @@
 
 #include "boost/format.hpp"
 
+#include "tbb/parallel_for.h"
+
 #include <algorithm>
 
 #include <fstream>
@@ -68,6 +71,9 @@ struct DPXImageReader::Header
 
 const Reader::ReaderDescription<DPXImageReader> DPXImageReader::m_readerDescription("dpx");
 
+// the number of scanlines read at a time by decodeTile()
+static const unsigned int g_rowsPerTile = 32;
+
 DPXImageReader::DPXImageReader() :
 		ImageReader( "Reads Digital Picture eXchange (DPX) files."),
 		m_header( 0 )
@@ -147,29 +153,84 @@ std::string DPXImageReader::sourceColorSpace() const
 /// typename V applying domain scale as necessary. Note that there's no cineon to linear conversion as
 /// it's now up to the base class to do it.
 template<typename V>
-DataPtr DPXImageReader::readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow )
+struct DPXImageReader::ReadRows
 {
-	typedef TypedData< std::vector< V > > TargetVector;
 
-	/// \todo
-	// kinda useless here, we have implicitly assumed log 10 bit in the surrounding code
-	int bpp = 10;
-	// that's the bit offset necessary to scale the channel values to unsigned short range of values.
-	int ushortShift = sizeof(unsigned short)*8 - bpp;
+	ReadRows( DPXImageReader *reader, const std::string &name, const Box2i &window, V *data )
+		:	m_reader( reader ), m_window( window ), m_data( data )
+	{
+		/// \todo
+		// figure out the offset into the bitstream for the given channel
+		m_channelOffset = name == "R" ? 0 : name == "G" ? 1 : 2;
 
-	/// \todo
-	// figure out the offset into the bitstream for the given channel
-	int channelOffset = name == "R" ? 0 : name == "G" ? 1 : 2;
+		// form the mask for this channel
+		m_mask = 0;
+		for (int pi = 0; pi < g_bpp; ++pi)
+		{
+			m_mask = 1 + (m_mask << 1);
+		}
+		m_mask <<= ((32 - g_bpp) - m_channelOffset * g_bpp);
+	}
 
-	// form the mask for this channel
-	unsigned int mask = 0;
-	for (int pi = 0; pi < bpp; ++pi)
+	void operator()( const tbb::blocked_range<int> &rows ) const
 	{
-		mask = 1 + (mask << 1);
+		// that's the bit offset necessary to scale the channel values to unsigned short range of values.
+		const int ushortShift = sizeof(unsigned short)*8 - g_bpp;
+
+		ScaledDataConversion< unsigned short, V> converter;
+
+		const int dataWidth = 1 + m_window.size().x;
+
+		ConstCharVectorDataPtr tileData;
+		int tileIndex = -1;
+
+		for ( int y = rows.begin() ; y != rows.end() ; ++y )
+		{
+			// only read the blocks of scanlines which intersect the requested window
+			if ( y / (int)g_rowsPerTile != tileIndex )
+			{
+				tileIndex = y / g_rowsPerTile;
+				tileData = m_reader->cachedTile( "", tileIndex );
+			}
+			const unsigned int *tile = reinterpret_cast<const unsigned int *>( &tileData->readable()[0] );
+
+			V *out = m_data + ( y - m_window.min.y ) * dataWidth;
+			std::vector<unsigned int>::size_type tileOffset = ( y - tileIndex * g_rowsPerTile ) * m_reader->m_bufferWidth + m_window.min.x;
+
+			for ( int x = m_window.min.x;  x <= m_window.max.x ; ++x, ++out, ++tileOffset  )
+			{
+				unsigned int cell = tile[ tileOffset ];
+				if ( m_reader->m_reverseBytes )
+				{
+					cell = reverseBytes( cell );
+				}
+
+				// assume we have 10bit log, two wasted bits aligning to 32 longword
+				unsigned short cv = (unsigned short) ( ( m_mask & cell ) >> ( 2 + ( 2 - m_channelOffset ) * g_bpp ) );
+				assert( cv < 1024 );
+				*out = converter( (cv << ushortShift) + ((1 << ushortShift) - 1) );
+			}
+		}
 	}
-	mask <<= ((32 - bpp) - channelOffset * bpp);
 
-	ScaledDataConversion< unsigned short, V> converter;
+	private :
+
+		/// \todo
+		// kinda useless here, we have implicitly assumed log 10 bit in the surrounding code
+		static const int g_bpp = 10;
+
+		DPXImageReader *m_reader;
+		const Box2i m_window;
+		V *m_data;
+		int m_channelOffset;
+		unsigned int m_mask;
+
+};
+
+template<typename V>
+DataPtr DPXImageReader::readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow )
+{
+	typedef TypedData< std::vector< V > > TargetVector;
 
 	typename TargetVector::Ptr dataContainer = new TargetVector();
 	typename TargetVector::ValueType &data = dataContainer->writable();
@@ -177,38 +238,20 @@ DataPtr DPXImageReader::readTypedChannel( const std::string &name, const Imath::
 	assert( area >= 0 );
 	data.resize( area );
 
-	int dataWidth = 1 + dataWindow.size().x;
-
 	Box2i wholeDataWindow = this->dataWindow();
+	const Box2i window( dataWindow.min - wholeDataWindow.min, dataWindow.max - wholeDataWindow.min );
 
-	const int yMin = dataWindow.min.y - wholeDataWindow.min.y;
-	const int yMax = dataWindow.max.y - wholeDataWindow.min.y;
-
-	const int xMin = dataWindow.min.x - wholeDataWindow.min.x;
-	const int xMax = dataWindow.max.x - wholeDataWindow.min.x;
-
-	int dataY = 0;
-	for ( int y = yMin ; y <= yMax ; ++y, ++dataY )
+	ReadRows<V> readRows( this, name, window, &data[0] );
+	tbb::blocked_range<int> rows( window.min.y, window.max.y + 1, g_rowsPerTile );
+	if ( getImageIOThreads() > 1 )
 	{
-		typename TargetVector::ValueType::size_type dataOffset = dataY * dataWidth;
-		std::vector<unsigned int>::size_type bufferOffset = y * m_bufferWidth + xMin;
-
-		for ( int x = xMin;  x <= xMax ; ++x, ++dataOffset, ++bufferOffset  )
-		{
-			assert( dataOffset < data.size() );
-
-			unsigned int cell = m_buffer[ bufferOffset ];
-			if ( m_reverseBytes )
-			{
-				cell = reverseBytes( cell );
-			}
-
-			// assume we have 10bit log, two wasted bits aligning to 32 longword
-			unsigned short cv = (unsigned short) ( ( mask & cell ) >> ( 2 + ( 2 - channelOffset ) * bpp ) );
-			assert( cv < 1024 );
-			data[dataOffset] = converter( (cv << ushortShift) + ((1 << ushortShift) - 1) );
-		}
+		tbb::parallel_for( rows, readRows );
 	}
+	else
+	{
+		readRows( rows );
+	}
+
 	return dataContainer;
 }
 
@@ -242,7 +285,6 @@ bool DPXImageReader::open( bool throwOnFailure )
 	try
 	{
 		m_bufferFileName = fileName();
-		m_buffer.clear();
 		delete m_header;
 		m_header = new Header();
 
@@ -327,18 +369,12 @@ bool DPXImageReader::open( bool throwOnFailure )
 
 		m_bufferWidth = m_header->m_imageInformation.pixels_per_line;
 		m_bufferHeight = m_header->m_imageInformation.lines_per_image_ele;
-		in.seekg( m_header->m_fileInformation.image_data_offset, ios_base::beg );
-		if ( in.fail() )
-		{
-			throw IOException( "DPXImageReader: Error reading " + fileName() );
-		}
-
-		// Read the data into the buffer - remember that we're currently packing upto 3 channels into each 32-bit "cell"
-		int bufferSize = ( std::max<unsigned int>( 1u, 3 / 3 ) ) * m_bufferWidth * m_bufferHeight;
-		m_buffer.resize( bufferSize, 0 );
-
-		in.read( reinterpret_cast<char*>(&m_buffer[0]), sizeof(unsigned int) * bufferSize );
-		if ( in.fail() )
+		// check that the file contains all of the image data, but don't read
+		// it - that's done a block at a time by decodeTile(), so that we only
+		// read the scanlines which are needed.
+		in.seekg( 0, ios_base::end );
+		std::streamoff dataEnd = (std::streamoff)m_header->m_fileInformation.image_data_offset + (std::streamoff)sizeof( unsigned int ) * m_bufferWidth * m_bufferHeight;
+		if ( in.fail() || in.tellg() < dataEnd )
 		{
 			throw IOException( "DPXImageReader: Error reading " + fileName() );
 		}
@@ -358,6 +394,33 @@ bool DPXImageReader::open( bool throwOnFailure )
 	return true;
 }
 
+ConstCharVectorDataPtr DPXImageReader::decodeTile( const std::string &tileSet, int tileIndex )
+{
+	const unsigned int yBegin = tileIndex * g_rowsPerTile;
+	const unsigned int yEnd = std::min( yBegin + g_rowsPerTile, m_bufferHeight );
+	assert( yBegin < yEnd );
+
+	ifstream in( fileName().c_str() );
+	if ( !in.is_open() || in.fail() )
+	{
+		throw IOException( "DPXImageReader: Could not open " + fileName() );
+	}
+
+	// remember that we're currently packing upto 3 channels into each 32-bit "cell"
+	const std::streamoff rowSize = (std::streamoff)sizeof( unsigned int ) * m_bufferWidth;
+	in.seekg( (std::streamoff)m_header->m_fileInformation.image_data_offset + rowSize * yBegin, ios_base::beg );
+
+	CharVectorDataPtr result = new CharVectorData;
+	result->writable().resize( rowSize * ( yEnd - yBegin ) );
+	in.read( &result->writable()[0], result->readable().size() );
+	if ( in.fail() )
+	{
+		throw IOException( "DPXImageReader: Error reading " + fileName() );
+	}
+
+	return result;
+}
+
 const char* DPXImageReader::descriptorStr( int descriptor ) const
 {
 	switch ( descriptor )
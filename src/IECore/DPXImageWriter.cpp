@@ -33,6 +33,7 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECore/DPXImageWriter.h"
+#include "IECore/IECore.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/VectorTypedData.h"
 #include "IECore/ByteOrder.h"
@@ -49,6 +50,8 @@
 #include "boost/multi_array.hpp"
 #include "boost/format.hpp"
 
+#include "tbb/parallel_for.h"
+
 #include <fstream>
 
 using namespace IECore;
@@ -96,38 +99,73 @@ struct DPXImageWriter::ChannelConverter
 	{
 	}
 
+	// Converts a range of rows, ORing them into the image buffer. Rows don't
+	// overlap, so separate ranges may be converted concurrently.
 	template<typename T>
-			ReturnType operator()( T *dataContainer )
+	struct ConvertRows
 	{
-		assert( dataContainer );
 
-		const typename T::ValueType &data = dataContainer->readable();
+		ConvertRows( const T *dataContainer, const ImagePrimitive *image, const Box2i &copyRegion, unsigned int bitShift, std::vector<unsigned int> &imageBuffer )
+			:	m_dataContainer( dataContainer ), m_image( image ), m_copyRegion( copyRegion ), m_bitShift( bitShift ), m_imageBuffer( imageBuffer )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<int> &rows ) const
+		{
+			const typename T::ValueType &data = m_dataContainer->readable();
 
-		ScaledDataConversion<typename T::ValueType::value_type, float> converter;
+			ScaledDataConversion<typename T::ValueType::value_type, float> converter;
 
-		typedef boost::multi_array_ref< const typename T::ValueType::value_type, 2 > SourceArray2D;
-		typedef boost::multi_array_ref< unsigned int, 2 > TargetArray2D;
-		
-		// Grab the display and data windows to avoid dereferencing pointers during the tight loop later...
-		const Box2i srcDisplayWindow = m_image->getDisplayWindow();
-		const Box2i srcDataWindow = m_image->getDataWindow();
-		
-		const SourceArray2D sourceData( &data[0], extents[ srcDataWindow.size().y + 1 ][ srcDataWindow.size().x + 1 ] );
-		TargetArray2D targetData( &m_imageBuffer[0], extents[ srcDisplayWindow.size().y + 1 ][ srcDisplayWindow.size().x + 1 ] );
+			typedef boost::multi_array_ref< const typename T::ValueType::value_type, 2 > SourceArray2D;
+			typedef boost::multi_array_ref< unsigned int, 2 > TargetArray2D;
 
-		const Box2i copyRegion = boxIntersection( m_dataWindow, boxIntersection( srcDisplayWindow, srcDataWindow ) );
-		
-		const unsigned int boxOffsetX = copyRegion.min.x - srcDisplayWindow.min.x;
-		const unsigned int boxOffsetY = copyRegion.min.y - srcDisplayWindow.min.y;
+			// Grab the display and data windows to avoid dereferencing pointers during the tight loop later...
+			const Box2i srcDisplayWindow = m_image->getDisplayWindow();
+			const Box2i srcDataWindow = m_image->getDataWindow();
 
-		for ( int y = copyRegion.min.y; y <= copyRegion.max.y ; y++ )
-		{
-			for ( int x = copyRegion.min.x; x <= copyRegion.max.x ; x++ )
+			const SourceArray2D sourceData( &data[0], extents[ srcDataWindow.size().y + 1 ][ srcDataWindow.size().x + 1 ] );
+			TargetArray2D targetData( &m_imageBuffer[0], extents[ srcDisplayWindow.size().y + 1 ][ srcDisplayWindow.size().x + 1 ] );
+
+			const unsigned int boxOffsetX = m_copyRegion.min.x - srcDisplayWindow.min.x;
+			const unsigned int boxOffsetY = m_copyRegion.min.y - srcDisplayWindow.min.y;
+
+			for ( int y = rows.begin(); y != rows.end() ; y++ )
 			{
-				targetData[ (y - copyRegion.min.y) + boxOffsetY ][ (x - copyRegion.min.x) + boxOffsetX ]
-						|= std::min((unsigned int)1023, (unsigned int)(converter( sourceData[ y - srcDataWindow.min.y ][ x - srcDataWindow.min.x ] ) * 1023 )) << m_bitShift;
+				for ( int x = m_copyRegion.min.x; x <= m_copyRegion.max.x ; x++ )
+				{
+					targetData[ (y - m_copyRegion.min.y) + boxOffsetY ][ (x - m_copyRegion.min.x) + boxOffsetX ]
+							|= std::min((unsigned int)1023, (unsigned int)(converter( sourceData[ y - srcDataWindow.min.y ][ x - srcDataWindow.min.x ] ) * 1023 )) << m_bitShift;
+				}
 			}
 		}
+
+		private :
+
+			const T *m_dataContainer;
+			const ImagePrimitive *m_image;
+			const Box2i m_copyRegion;
+			const unsigned int m_bitShift;
+			std::vector<unsigned int> &m_imageBuffer;
+
+	};
+
+	template<typename T>
+			ReturnType operator()( T *dataContainer )
+	{
+		assert( dataContainer );
+
+		const Box2i copyRegion = boxIntersection( m_dataWindow, boxIntersection( m_image->getDisplayWindow(), m_image->getDataWindow() ) );
+
+		ConvertRows<T> convertRows( dataContainer, m_image, copyRegion, m_bitShift, m_imageBuffer );
+		tbb::blocked_range<int> rows( copyRegion.min.y, copyRegion.max.y + 1 );
+		if ( getImageIOThreads() > 1 )
+		{
+			tbb::parallel_for( rows, convertRows );
+		}
+		else
+		{
+			convertRows( rows );
+		}
 	};
 
 	struct ErrorHandler
@@ -343,13 +381,17 @@ void DPXImageWriter::writeImage( const vector<string> &names, const ImagePrimiti
 	}
 
 	// write the buffer
-	for (int i = 0; i < displayWidth * displayHeight; ++i)
+	if ( littleEndian() )
 	{
-		imageBuffer[i] = asBigEndian<>(imageBuffer[i]);
-		out.write( (const char *) (&imageBuffer[i]), sizeof(unsigned int) );
-		if ( out.fail() )
+		for ( vector<unsigned int>::iterator it = imageBuffer.begin(); it != imageBuffer.end(); ++it )
 		{
-			throw IOException( "DPXImageWriter: Error writing to " + fileName() );
+			*it = reverseBytes( *it );
 		}
 	}
+
+	out.write( (const char *) (&imageBuffer[0]), sizeof(unsigned int) * imageBuffer.size() );
+	if ( out.fail() )
+	{
+		throw IOException( "DPXImageWriter: Error writing to " + fileName() );
+	}
 }
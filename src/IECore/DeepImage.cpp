@@ -0,0 +1,439 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include <algorithm>
+
+#include "boost/format.hpp"
+
+#include "IECore/DeepImage.h"
+#include "IECore/Exception.h"
+
+using namespace IECore;
+
+DeepImage::DeepImage( ConstStringVectorDataPtr channelNames, const Imath::Box2i &window )
+	:	m_channelNames( channelNames ), m_window( window ), m_width( 0 ), m_sampleOffsets( 1, 0 )
+{
+	if ( !m_channelNames )
+	{
+		throw InvalidArgumentException( "DeepImage : No channel names provided." );
+	}
+
+	if ( !m_window.isEmpty() )
+	{
+		m_width = m_window.max.x - m_window.min.x + 1;
+		m_sampleOffsets.resize( numPixels() + 1, 0 );
+	}
+}
+
+DeepImage::~DeepImage()
+{
+}
+
+const std::vector<std::string> &DeepImage::channelNames() const
+{
+	return m_channelNames->readable();
+}
+
+const StringVectorData *DeepImage::channelNamesData() const
+{
+	return m_channelNames.get();
+}
+
+unsigned DeepImage::numChannels() const
+{
+	return m_channelNames->readable().size();
+}
+
+int DeepImage::channelIndex( const std::string &name ) const
+{
+	const std::vector<std::string> &names = m_channelNames->readable();
+	std::vector<std::string>::const_iterator it = std::find( names.begin(), names.end(), name );
+	if ( it == names.end() )
+	{
+		return -1;
+	}
+
+	return it - names.begin();
+}
+
+const Imath::Box2i &DeepImage::window() const
+{
+	return m_window;
+}
+
+size_t DeepImage::numPixels() const
+{
+	return m_sampleOffsets.size() - 1;
+}
+
+size_t DeepImage::pixelIndex( int x, int y ) const
+{
+	return ( y - m_window.min.y ) * m_width + ( x - m_window.min.x );
+}
+
+size_t DeepImage::numSamples() const
+{
+	return m_depths.size();
+}
+
+unsigned DeepImage::numSamples( size_t pixelIndex ) const
+{
+	return m_sampleOffsets[pixelIndex+1] - m_sampleOffsets[pixelIndex];
+}
+
+size_t DeepImage::sampleOffset( size_t pixelIndex ) const
+{
+	return m_sampleOffsets[pixelIndex];
+}
+
+void DeepImage::setSampleCounts( const unsigned *sampleCounts )
+{
+	const size_t n = numPixels();
+	for ( size_t i = 0; i < n; ++i )
+	{
+		m_sampleOffsets[i+1] = m_sampleOffsets[i] + sampleCounts[i];
+	}
+
+	const size_t total = m_sampleOffsets[n];
+
+	// assign rather than resize, so that all values are reset
+	m_depths.assign( total, 0.0f );
+	m_channelData.assign( total * numChannels(), 0.0f );
+}
+
+class DeepImage::DepthComparison
+{
+	public :
+
+		DepthComparison( const float *depths ) : m_depths( depths )
+		{
+		}
+
+		bool operator ()( size_t a, size_t b ) const
+		{
+			return m_depths[a] < m_depths[b];
+		}
+
+	private :
+
+		const float *m_depths;
+
+};
+
+void DeepImage::sortSamples()
+{
+	const size_t n = numPixels();
+	const unsigned nc = numChannels();
+	const size_t total = numSamples();
+
+	std::vector<size_t> order;
+	std::vector<float> buffer;
+	for ( size_t p = 0; p < n; ++p )
+	{
+		const size_t begin = m_sampleOffsets[p];
+		const size_t end = m_sampleOffsets[p+1];
+
+		// most pixels are already sorted, and there's no
+		// need to reorder anything for those.
+		bool sorted = true;
+		for ( size_t s = begin + 1; s < end; ++s )
+		{
+			if ( m_depths[s] < m_depths[s-1] )
+			{
+				sorted = false;
+				break;
+			}
+		}
+
+		if ( sorted )
+		{
+			continue;
+		}
+
+		order.resize( end - begin );
+		for ( size_t s = begin; s < end; ++s )
+		{
+			order[s-begin] = s;
+		}
+
+		std::stable_sort( order.begin(), order.end(), DepthComparison( &m_depths[0] ) );
+
+		// apply the new order to the depths and to each channel in turn.
+		buffer.resize( order.size() );
+		for ( int c = -1; c < (int)nc; ++c )
+		{
+			float *data = c < 0 ? &m_depths[0] : &m_channelData[0] + c * total;
+			for ( size_t i = 0; i < order.size(); ++i )
+			{
+				buffer[i] = data[ order[i] ];
+			}
+			std::copy( buffer.begin(), buffer.end(), data + begin );
+		}
+	}
+}
+
+float *DeepImage::depths()
+{
+	return m_depths.size() ? &m_depths[0] : 0;
+}
+
+const float *DeepImage::depths() const
+{
+	return m_depths.size() ? &m_depths[0] : 0;
+}
+
+float *DeepImage::channelData( unsigned channelIndex )
+{
+	return m_depths.size() ? &m_channelData[0] + channelIndex * m_depths.size() : 0;
+}
+
+const float *DeepImage::channelData( unsigned channelIndex ) const
+{
+	return m_depths.size() ? &m_channelData[0] + channelIndex * m_depths.size() : 0;
+}
+
+DeepPixelPtr DeepImage::pixel( int x, int y ) const
+{
+	if ( !m_window.intersects( Imath::V2i( x, y ) ) )
+	{
+		throw InvalidArgumentException( ( boost::format( "DeepImage::pixel : Pixel %d, %d is not within the window." ) % x % y ).str() );
+	}
+
+	const size_t p = pixelIndex( x, y );
+	const unsigned n = numSamples( p );
+	if ( !n )
+	{
+		return 0;
+	}
+
+	const unsigned nc = numChannels();
+	DeepPixelPtr result = new DeepPixel( m_channelNames->readable(), n );
+	std::vector<float> sample( nc );
+
+	const size_t total = m_depths.size();
+	for ( size_t s = m_sampleOffsets[p]; s < m_sampleOffsets[p+1]; ++s )
+	{
+		for ( unsigned c = 0; c < nc; ++c )
+		{
+			sample[c] = m_channelData[ c * total + s ];
+		}
+
+		result->addSample( m_depths[s], nc ? &sample[0] : 0 );
+	}
+
+	return result;
+}
+
+DeepImagePtr DeepImage::crop( const Imath::Box2i &window ) const
+{
+	if ( window.isEmpty() || !m_window.intersects( window.min ) || !m_window.intersects( window.max ) )
+	{
+		throw InvalidArgumentException( "DeepImage::crop : Window is not within the window of the image." );
+	}
+
+	DeepImagePtr result = new DeepImage( m_channelNames, window );
+
+	std::vector<unsigned> sampleCounts;
+	sampleCounts.reserve( result->numPixels() );
+	for ( int y = window.min.y; y <= window.max.y; ++y )
+	{
+		for ( int x = window.min.x; x <= window.max.x; ++x )
+		{
+			sampleCounts.push_back( numSamples( pixelIndex( x, y ) ) );
+		}
+	}
+
+	result->setSampleCounts( &sampleCounts[0] );
+
+	// Copy a row at a time, as the samples for each row of
+	// the window are contiguous in both images.
+	const unsigned nc = numChannels();
+	const size_t total = numSamples();
+	const size_t resultTotal = result->numSamples();
+	for ( int y = window.min.y; y <= window.max.y; ++y )
+	{
+		const size_t begin = m_sampleOffsets[ pixelIndex( window.min.x, y ) ];
+		const size_t end = m_sampleOffsets[ pixelIndex( window.max.x, y ) + 1 ];
+		const size_t resultBegin = result->m_sampleOffsets[ result->pixelIndex( window.min.x, y ) ];
+
+		std::copy( m_depths.begin() + begin, m_depths.begin() + end, result->m_depths.begin() + resultBegin );
+		for ( unsigned c = 0; c < nc; ++c )
+		{
+			std::copy(
+				m_channelData.begin() + c * total + begin,
+				m_channelData.begin() + c * total + end,
+				result->m_channelData.begin() + c * resultTotal + resultBegin
+			);
+		}
+	}
+
+	return result;
+}
+
+void DeepImage::composite( size_t pixelIndex, float *result ) const
+{
+	const unsigned nc = numChannels();
+	const size_t total = numSamples();
+	const size_t begin = m_sampleOffsets[pixelIndex];
+	const size_t end = m_sampleOffsets[pixelIndex+1];
+
+	if ( begin == end )
+	{
+		std::fill( result, result + nc, 0.0f );
+		return;
+	}
+
+	const int alphaChannel = channelIndex( "A" );
+	if ( alphaChannel < 0 )
+	{
+		for ( unsigned c = 0; c < nc; ++c )
+		{
+			result[c] = m_channelData[ c * total + begin ];
+		}
+
+		return;
+	}
+
+	std::fill( result, result + nc, 0.0f );
+
+	float alpha = 1.0;
+	for ( size_t s = begin; s < end && result[alphaChannel] < 1.0; ++s )
+	{
+		for ( unsigned c = 0; c < nc; ++c )
+		{
+			result[c] += m_channelData[ c * total + s ] * alpha;
+		}
+
+		alpha = std::max( 1 - result[alphaChannel], 0.0f );
+	}
+}
+
+DeepImagePtr DeepImage::merge( const std::vector<const DeepImage *> &images )
+{
+	if ( images.empty() )
+	{
+		throw InvalidArgumentException( "DeepImage::merge : No images provided." );
+	}
+
+	const Imath::Box2i &window = images[0]->window();
+	for ( size_t i = 1; i < images.size(); ++i )
+	{
+		if ( images[i]->window() != window )
+		{
+			throw InvalidArgumentException( "DeepImage::merge : All images must have the same window." );
+		}
+	}
+
+	// find the union of the channel names, sharing the names
+	// of the first image if it has all the channels.
+	std::vector<std::string> names = images[0]->channelNames();
+	for ( size_t i = 1; i < images.size(); ++i )
+	{
+		const std::vector<std::string> &imageNames = images[i]->channelNames();
+		for ( std::vector<std::string>::const_iterator it = imageNames.begin(); it != imageNames.end(); ++it )
+		{
+			if ( std::find( names.begin(), names.end(), *it ) == names.end() )
+			{
+				names.push_back( *it );
+			}
+		}
+	}
+
+	ConstStringVectorDataPtr channelNames = images[0]->m_channelNames;
+	if ( names.size() != images[0]->numChannels() )
+	{
+		channelNames = new StringVectorData( names );
+	}
+
+	DeepImagePtr result = new DeepImage( channelNames, window );
+	const unsigned nc = result->numChannels();
+	const size_t n = result->numPixels();
+
+	// the index in each image of each of the result channels
+	std::vector<std::vector<int> > channelIndices( images.size(), std::vector<int>( nc ) );
+	for ( size_t i = 0; i < images.size(); ++i )
+	{
+		for ( unsigned c = 0; c < nc; ++c )
+		{
+			channelIndices[i][c] = images[i]->channelIndex( names[c] );
+		}
+	}
+
+	std::vector<unsigned> sampleCounts( n, 0 );
+	for ( size_t i = 0; i < images.size(); ++i )
+	{
+		for ( size_t p = 0; p < n; ++p )
+		{
+			sampleCounts[p] += images[i]->numSamples( p );
+		}
+	}
+
+	result->setSampleCounts( n ? &sampleCounts[0] : 0 );
+
+	const size_t resultTotal = result->numSamples();
+	for ( size_t p = 0; p < n; ++p )
+	{
+		size_t offset = result->m_sampleOffsets[p];
+		for ( size_t i = 0; i < images.size(); ++i )
+		{
+			const DeepImage *image = images[i];
+			const size_t total = image->numSamples();
+			const size_t begin = image->m_sampleOffsets[p];
+			const size_t end = image->m_sampleOffsets[p+1];
+
+			std::copy( image->m_depths.begin() + begin, image->m_depths.begin() + end, result->m_depths.begin() + offset );
+			for ( unsigned c = 0; c < nc; ++c )
+			{
+				const int imageChannel = channelIndices[i][c];
+				if ( imageChannel < 0 )
+				{
+					// left at the 0 assigned by setSampleCounts()
+					continue;
+				}
+
+				std::copy(
+					image->m_channelData.begin() + imageChannel * total + begin,
+					image->m_channelData.begin() + imageChannel * total + end,
+					result->m_channelData.begin() + c * resultTotal + offset
+				);
+			}
+
+			offset += end - begin;
+		}
+	}
+
+	result->sortSamples();
+
+	return result;
+}
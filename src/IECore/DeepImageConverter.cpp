@@ -32,6 +32,8 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
+#include <algorithm>
+
 #include "boost/algorithm/string/join.hpp"
 
 #include "IECore/CompoundParameter.h"
@@ -39,12 +41,60 @@
 #include "IECore/DeepImageReader.h"
 #include "IECore/DeepImageWriter.h"
 #include "IECore/FileNameParameter.h"
+#include "IECore/IECore.h"
 #include "IECore/SimpleTypedParameter.h"
+#include "IECore/private/DeepImagePipeline.h"
 
 using namespace IECore;
 
 IE_CORE_DEFINERUNTIMETYPED( DeepImageConverter );
 
+namespace
+{
+
+// Converts the image a block of scanlines at a time, for use with
+// runDeepImagePipeline(). Reading and writing must happen serially,
+// as the readers and writers aren't threadsafe, but the blocks can
+// be sorted in parallel in between.
+class Converter
+{
+
+	public :
+
+		typedef DeepImagePtr Block;
+
+		Converter( DeepImageReader *reader, DeepImageWriter *writer, const Imath::Box2i &dataWindow )
+			:	m_reader( reader ), m_writer( writer ), m_dataWindow( dataWindow )
+		{
+		}
+
+		void read( int y, Block &block )
+		{
+			block = m_reader->readRegion( deepImagePipelineRegion( m_dataWindow, y ) );
+		}
+
+		void process( Block &block )
+		{
+			block->sortSamples();
+		}
+
+		void write( Block &block )
+		{
+			m_writer->writeRegion( block.get() );
+			// release the block now, rather than when it is reused
+			block = 0;
+		}
+
+	private :
+
+		DeepImageReader *m_reader;
+		DeepImageWriter *m_writer;
+		const Imath::Box2i &m_dataWindow;
+
+};
+
+} // namespace
+
 DeepImageConverter::DeepImageConverter()
 	: Op( "Converts from one deep image format to another", new StringParameter( "result", "The new file", "" ) )
 {
@@ -113,14 +163,12 @@ ObjectPtr DeepImageConverter::doOperation( const CompoundObject *operands )
 		writer->worldToNDCParameter()->setValue( worldToNDC );
 	}
 
-	for ( int y=dataWindow.min.y; y <= dataWindow.max.y; ++y )
-	{
-		for ( int x=dataWindow.min.x; x <= dataWindow.max.x; ++x )
-		{
-			DeepPixelPtr pixel = reader->readPixel( x, y );
-			writer->writePixel( x, y, pixel.get() );
-		}
-	}
+	// Stream the image a few scanlines at a time, so that we never
+	// hold more than a small part of it in memory. The samples are
+	// sorted by depth on the way through, so that the output is the
+	// same as if each pixel had been read as a DeepPixel.
+	Converter converter( reader.get(), writer.get(), dataWindow );
+	runDeepImagePipeline( converter, dataWindow, getImageIOThreads() );
 
 	return new StringData( writer->fileName() );
 }
@@ -0,0 +1,251 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include <algorithm>
+
+#include "boost/algorithm/string/join.hpp"
+
+#include "IECore/CompoundParameter.h"
+#include "IECore/DeepImageMergeOp.h"
+#include "IECore/DeepImageReader.h"
+#include "IECore/DeepImageWriter.h"
+#include "IECore/FileNameParameter.h"
+#include "IECore/IECore.h"
+#include "IECore/ImagePrimitive.h"
+#include "IECore/NullObject.h"
+#include "IECore/ObjectParameter.h"
+#include "IECore/private/DeepImagePipeline.h"
+
+using namespace IECore;
+
+IE_CORE_DEFINERUNTIMETYPED( DeepImageMergeOp );
+
+namespace
+{
+
+// Merges the images a block of scanlines at a time, for use with
+// runDeepImagePipeline().
+class Merger
+{
+
+	public :
+
+		// A block of scanlines as it passes through the merge.
+		struct Block
+		{
+			int y;
+			std::vector<DeepImagePtr> inputs;
+			DeepImagePtr merged;
+		};
+
+		Merger( const std::vector<DeepImageReaderPtr> &readers, DeepImageWriter *writer, const Imath::Box2i &dataWindow, const std::vector<std::vector<float> *> &flatChannels )
+			:	m_readers( readers ), m_writer( writer ), m_dataWindow( dataWindow ), m_flatChannels( flatChannels )
+		{
+		}
+
+		// Reads the block from every reader. This must happen serially,
+		// as the readers aren't threadsafe.
+		void read( int y, Block &block )
+		{
+			const Imath::Box2i region = deepImagePipelineRegion( m_dataWindow, y );
+
+			block.y = y;
+			block.inputs.clear();
+			for ( std::vector<DeepImageReaderPtr>::const_iterator it = m_readers.begin(); it != m_readers.end(); ++it )
+			{
+				block.inputs.push_back( (*it)->readRegion( region ) );
+			}
+		}
+
+		// Merges the inputs of a block, and composites the result into the
+		// corresponding scanlines of the flat channels. Blocks may be merged
+		// in parallel, as each writes to different scanlines.
+		void process( Block &block )
+		{
+			std::vector<const DeepImage *> inputs;
+			for ( std::vector<DeepImagePtr>::const_iterator it = block.inputs.begin(); it != block.inputs.end(); ++it )
+			{
+				inputs.push_back( it->get() );
+			}
+
+			block.merged = DeepImage::merge( inputs );
+			block.inputs.clear();
+
+			const DeepImage *merged = block.merged.get();
+			const unsigned numChannels = merged->numChannels();
+			const size_t numPixels = merged->numPixels();
+			const size_t offset = ( block.y - m_dataWindow.min.y ) * ( m_dataWindow.max.x - m_dataWindow.min.x + 1 );
+
+			std::vector<float> flat( numChannels );
+			for ( size_t p=0; p < numPixels; ++p )
+			{
+				if ( !merged->numSamples( p ) )
+				{
+					continue;
+				}
+
+				merged->composite( p, numChannels ? &flat[0] : 0 );
+				for ( unsigned c=0; c < numChannels; ++c )
+				{
+					(*m_flatChannels[c])[offset + p] = flat[c];
+				}
+			}
+		}
+
+		// Writes the merged samples of a block, if there is a writer, and
+		// releases the block.
+		void write( Block &block )
+		{
+			if ( m_writer )
+			{
+				m_writer->writeRegion( block.merged.get() );
+			}
+
+			block.merged = 0;
+		}
+
+	private :
+
+		const std::vector<DeepImageReaderPtr> &m_readers;
+		DeepImageWriter *m_writer;
+		const Imath::Box2i &m_dataWindow;
+		const std::vector<std::vector<float> *> &m_flatChannels;
+
+};
+
+} // namespace
+
+DeepImageMergeOp::DeepImageMergeOp()
+	: Op( "Merges the samples of several deep images, and composites the result into a flat image.", new ObjectParameter( "result", "The composited image", new NullObject, ImagePrimitive::staticTypeId() ) )
+{
+	m_inputFilesParameter = new StringVectorParameter(
+		"inputFiles",
+		"The deep image files to merge. All must have the same data window.",
+		new StringVectorData
+	);
+
+	std::vector<std::string> extensions;
+	DeepImageWriter::supportedExtensions( extensions );
+
+	m_outputFileParameter = new FileNameParameter(
+		"outputFile",
+		"An optional deep image file in which to store the merged samples.",
+		boost::algorithm::join( extensions, " " ),
+		"",
+		true,
+		PathParameter::DontCare
+	);
+
+	parameters()->addParameter( m_inputFilesParameter );
+	parameters()->addParameter( m_outputFileParameter );
+}
+
+DeepImageMergeOp::~DeepImageMergeOp()
+{
+}
+
+ObjectPtr DeepImageMergeOp::doOperation( const CompoundObject *operands )
+{
+	const std::vector<std::string> &inputFiles = m_inputFilesParameter->getTypedValue();
+	const std::string &outputFile = m_outputFileParameter->getTypedValue();
+	if ( inputFiles.empty() )
+	{
+		throw InvalidArgumentException( "DeepImageMergeOp : At least one input file must be specified." );
+	}
+
+	if ( std::find( inputFiles.begin(), inputFiles.end(), outputFile ) != inputFiles.end() )
+	{
+		throw InvalidArgumentException( "DeepImageMergeOp : The output file must not be one of the input files." );
+	}
+
+	std::vector<DeepImageReaderPtr> readers;
+	std::vector<std::string> channelNames;
+	for ( std::vector<std::string>::const_iterator it = inputFiles.begin(); it != inputFiles.end(); ++it )
+	{
+		DeepImageReaderPtr reader = IECore::runTimeCast<DeepImageReader>( Reader::create( *it ) );
+		if ( !reader )
+		{
+			throw InvalidArgumentException( "DeepImageMergeOp : The input file does not have an associated DeepImageReader: " + *it );
+		}
+
+		if ( readers.size() && reader->dataWindow() != readers[0]->dataWindow() )
+		{
+			throw InvalidArgumentException( "DeepImageMergeOp : The input files must all have the same data window: " + *it );
+		}
+
+		// the channels of the result are the union of the input channels,
+		// in the same order as DeepImage::merge() uses.
+		std::vector<std::string> names;
+		reader->channelNames( names );
+		for ( std::vector<std::string>::const_iterator nIt = names.begin(); nIt != names.end(); ++nIt )
+		{
+			if ( std::find( channelNames.begin(), channelNames.end(), *nIt ) == channelNames.end() )
+			{
+				channelNames.push_back( *nIt );
+			}
+		}
+
+		readers.push_back( reader );
+	}
+
+	const Imath::Box2i dataWindow = readers[0]->dataWindow();
+
+	ImagePrimitivePtr image = new ImagePrimitive( dataWindow, readers[0]->displayWindow() );
+	const Imath::V2i pixelDimensions = dataWindow.size() + Imath::V2i( 1 );
+	const size_t numPixels = pixelDimensions.x * pixelDimensions.y;
+
+	std::vector<std::vector<float> *> flatChannels;
+	flatChannels.reserve( channelNames.size() );
+	for ( std::vector<std::string>::const_iterator it = channelNames.begin(); it != channelNames.end(); ++it )
+	{
+		FloatVectorDataPtr data = new FloatVectorData( std::vector<float>( numPixels ) );
+		flatChannels.push_back( &data->writable() );
+		image->variables[*it] = PrimitiveVariable( PrimitiveVariable::Vertex, data );
+	}
+
+	DeepImageWriterPtr writer = 0;
+	if ( !outputFile.empty() )
+	{
+		writer = DeepImageWriter::create( outputFile );
+		writer->channelNamesParameter()->setTypedValue( channelNames );
+		writer->resolutionParameter()->setTypedValue( pixelDimensions );
+		writer->worldToCameraParameter()->setTypedValue( readers[0]->worldToCameraMatrix() );
+		writer->worldToNDCParameter()->setTypedValue( readers[0]->worldToNDCMatrix() );
+	}
+
+	Merger merger( readers, writer.get(), dataWindow, flatChannels );
+	runDeepImagePipeline( merger, dataWindow, getImageIOThreads() );
+
+	return image;
+}
@@ -32,6 +32,8 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
+#include <algorithm>
+
 #include "IECore/DeepImageReader.h"
 #include "IECore/FileNameParameter.h"
 #include "IECore/ImagePrimitive.h"
@@ -75,22 +77,31 @@ ObjectPtr DeepImageReader::doOperation( const CompoundObject *operands )
 		image->variables[*cIt] = PrimitiveVariable( PrimitiveVariable::Vertex, data );
 	}
 
-	DeepPixelPtr pixel = 0;
-	float channelData[channels.size()];
+	// Read a few scanlines at a time, which is much quicker than reading
+	// individual pixels, without holding the entire deep image in memory.
+	const int scanlinesPerRegion = 16;
+	std::vector<float> channelData( numChannels );
 	
 	unsigned p = 0;
-	for ( int y=dataWind.min.y; y < dataWind.max.y + 1; ++y )
+	for ( int y=dataWind.min.y; y < dataWind.max.y + 1; y += scanlinesPerRegion )
 	{
-		for ( int x=dataWind.min.x; x < dataWind.max.x + 1; ++x, ++p )
+		const Imath::Box2i region(
+			Imath::V2i( dataWind.min.x, y ),
+			Imath::V2i( dataWind.max.x, std::min( y + scanlinesPerRegion - 1, dataWind.max.y ) )
+		);
+		
+		DeepImagePtr deepImage = readRegion( region );
+		deepImage->sortSamples();
+		
+		const size_t numRegionPixels = deepImage->numPixels();
+		for ( size_t i=0; i < numRegionPixels; ++i, ++p )
 		{
-			pixel = readPixel( x, y );
-			
-			if ( !pixel )
+			if ( !deepImage->numSamples( i ) )
 			{
 				continue;
 			}
 			
-			pixel->composite( channelData );
+			deepImage->composite( i, numChannels ? &channelData[0] : 0 );
 			
 			for ( unsigned c=0; c < numChannels; ++c )
 			{
@@ -113,6 +124,65 @@ DeepPixelPtr DeepImageReader::readPixel( int x, int y )
 	return doReadPixel( x, y );
 }
 
+DeepImagePtr DeepImageReader::readRegion( const Imath::Box2i &region )
+{
+	// validate that requested region is inside the available data window
+	const Imath::Box2i dataWind = dataWindow();
+	if( region.isEmpty() || !dataWind.intersects( region.min ) || !dataWind.intersects( region.max ) )
+	{
+		throw Exception( "Requested region not in available data window." );
+	}
+	
+	return doReadRegion( region );
+}
+
+DeepImagePtr DeepImageReader::doReadRegion( const Imath::Box2i &region )
+{
+	StringVectorDataPtr channels = new StringVectorData;
+	channelNames( channels->writable() );
+	
+	DeepImagePtr result = new DeepImage( channels, region );
+	const unsigned numChannels = result->numChannels();
+	
+	std::vector<ConstDeepPixelPtr> pixels;
+	std::vector<unsigned> sampleCounts;
+	pixels.reserve( result->numPixels() );
+	sampleCounts.reserve( result->numPixels() );
+	for ( int y=region.min.y; y <= region.max.y; ++y )
+	{
+		for ( int x=region.min.x; x <= region.max.x; ++x )
+		{
+			pixels.push_back( doReadPixel( x, y ) );
+			sampleCounts.push_back( pixels.back() ? pixels.back()->numSamples() : 0 );
+		}
+	}
+	
+	result->setSampleCounts( &sampleCounts[0] );
+	
+	float *depths = result->depths();
+	for ( size_t p=0; p < pixels.size(); ++p )
+	{
+		const DeepPixel *pixel = pixels[p].get();
+		if ( !pixel )
+		{
+			continue;
+		}
+		
+		const size_t offset = result->sampleOffset( p );
+		for ( unsigned s=0; s < sampleCounts[p]; ++s )
+		{
+			depths[offset + s] = pixel->getDepth( s );
+			const float *channelData = pixel->channelData( s );
+			for ( unsigned c=0; c < numChannels; ++c )
+			{
+				result->channelData( c )[offset + s] = channelData[c];
+			}
+		}
+	}
+	
+	return result;
+}
+
 CompoundObjectPtr DeepImageReader::readHeader()
 {
 	std::vector<std::string> names;
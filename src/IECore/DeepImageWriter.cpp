@@ -125,6 +125,39 @@ void DeepImageWriter::writePixel( int x, int y, const DeepPixel *pixel )
 	doWritePixel( x, y, pixel );
 }
 
+void DeepImageWriter::writeRegion( const DeepImage *image )
+{
+	if ( !image )
+	{
+		throw InvalidArgumentException( std::string( "No DeepImage provided." ) );
+	}
+	
+	if ( image->numChannels() != m_channelsParameter->getTypedValue().size() )
+	{
+		throw InvalidArgumentException( std::string( "DeepImage does not have the correct channels." ) );
+	}
+	
+	doWriteRegion( image );
+}
+
+void DeepImageWriter::doWriteRegion( const DeepImage *image )
+{
+	const Imath::Box2i &window = image->window();
+	for ( int y=window.min.y; y <= window.max.y; ++y )
+	{
+		for ( int x=window.min.x; x <= window.max.x; ++x )
+		{
+			if ( !image->numSamples( image->pixelIndex( x, y ) ) )
+			{
+				continue;
+			}
+			
+			DeepPixelPtr pixel = image->pixel( x, y );
+			doWritePixel( x, y, pixel.get() );
+		}
+	}
+}
+
 void DeepImageWriter::registerDeepImageWriter( const std::string &extensions, CanWriteFn canWrite, CreatorFn creator, TypeId typeId )
 {
 	assert( canWrite );
@@ -0,0 +1,309 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include <algorithm>
+#include <ctime>
+
+#include "boost/filesystem.hpp"
+
+#include "IECore/DiskObjectCache.h"
+#include "IECore/FileIndexedIO.h"
+#include "IECore/Exception.h"
+#include "IECore/MessageHandler.h"
+
+using namespace IECore;
+using namespace boost::filesystem;
+
+//////////////////////////////////////////////////////////////////////////
+// Internal utilities
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+const char *g_extension = ".fio";
+const char *g_temporaryExtension = ".tmp";
+const char *g_objectEntry = "object";
+
+// Temporary files older than this are assumed to have been
+// left behind by a process which crashed while writing them.
+const std::time_t g_staleTemporaryFileAge = 60 * 60;
+
+// When the disk usage exceeds the limit, files are removed until
+// it falls below this fraction of the limit, so that we don't need
+// to rescan the directory for every subsequent write.
+const double g_limitFraction = 0.9;
+
+struct CacheFile
+{
+	path fileName;
+	std::time_t lastUsed;
+	boost::uintmax_t size;
+
+	bool operator < ( const CacheFile &other ) const
+	{
+		return lastUsed < other.lastUsed;
+	}
+};
+
+// Returns the total size of the cache files in the directory, optionally
+// filling files with their details. Files may be removed by other processes
+// while we scan, so errors for individual files are ignored.
+boost::uintmax_t scanDirectory( const std::string &directory, std::vector<CacheFile> *files )
+{
+	boost::uintmax_t total = 0;
+	const std::time_t now = std::time( 0 );
+
+	boost::system::error_code ec;
+	for( recursive_directory_iterator it( directory, ec ), eIt; !ec && it != eIt; it.increment( ec ) )
+	{
+		const path &fileName = it->path();
+		if( !is_regular_file( it->status() ) )
+		{
+			continue;
+		}
+
+		boost::system::error_code fileEc;
+		const std::time_t lastUsed = last_write_time( fileName, fileEc );
+		if( fileEc )
+		{
+			continue;
+		}
+
+		if( fileName.extension() == g_temporaryExtension )
+		{
+			if( now - lastUsed > g_staleTemporaryFileAge )
+			{
+				boost::filesystem::remove( fileName, fileEc );
+			}
+			continue;
+		}
+		else if( fileName.extension() != g_extension )
+		{
+			continue;
+		}
+
+		const boost::uintmax_t size = file_size( fileName, fileEc );
+		if( fileEc )
+		{
+			continue;
+		}
+
+		total += size;
+		if( files )
+		{
+			CacheFile f;
+			f.fileName = fileName;
+			f.lastUsed = lastUsed;
+			f.size = size;
+			files->push_back( f );
+		}
+	}
+
+	return total;
+}
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// DiskObjectCache
+//////////////////////////////////////////////////////////////////////////
+
+DiskObjectCache::DiskObjectCache( const std::string &directory, size_t maxDiskUsage )
+	:	m_directory( directory ), m_maxDiskUsage( maxDiskUsage )
+{
+	boost::system::error_code ec;
+	create_directories( m_directory, ec );
+	if( ec || !is_directory( m_directory ) )
+	{
+		throw IOException( "DiskObjectCache : Unable to create directory \"" + m_directory + "\"" );
+	}
+
+	m_estimatedDiskUsage = scanDirectory( m_directory, NULL );
+	if( m_estimatedDiskUsage > m_maxDiskUsage )
+	{
+		limitDiskUsage();
+	}
+}
+
+DiskObjectCache::~DiskObjectCache()
+{
+}
+
+const std::string &DiskObjectCache::directory() const
+{
+	return m_directory;
+}
+
+ConstObjectPtr DiskObjectCache::retrieve( const MurmurHash &hash ) const
+{
+	const std::string f = fileName( hash );
+
+	boost::system::error_code ec;
+	if( !boost::filesystem::exists( f, ec ) )
+	{
+		return 0;
+	}
+
+	ConstObjectPtr result;
+	try
+	{
+		IndexedIOPtr io = new FileIndexedIO( f, IndexedIO::rootPath, IndexedIO::Read );
+		result = Object::load( io, g_objectEntry );
+	}
+	catch( const std::exception &e )
+	{
+		// the file may have been removed by another process since we
+		// checked for its existence, or it may be unreadable for some
+		// other reason. either way, we just report that we don't have it.
+		msg( Msg::Warning, "DiskObjectCache::retrieve", e.what() );
+		return 0;
+	}
+
+	// record the access, so that recently used files are the last to be removed.
+	last_write_time( f, std::time( 0 ), ec );
+
+	return result;
+}
+
+void DiskObjectCache::store( const MurmurHash &hash, const Object *obj )
+{
+	const path f( fileName( hash ) );
+
+	boost::system::error_code ec;
+	create_directories( f.parent_path(), ec );
+
+	// we write to a uniquely named temporary file and then rename it into place,
+	// so that other processes never see a partially written file.
+	const std::string temporaryFileName = f.string() + "." + unique_path().string() + g_temporaryExtension;
+	try
+	{
+		IndexedIOPtr io = new FileIndexedIO( temporaryFileName, IndexedIO::rootPath, IndexedIO::Write );
+		obj->save( io, g_objectEntry );
+		io = 0;
+		boost::filesystem::rename( temporaryFileName, f );
+	}
+	catch( const std::exception &e )
+	{
+		boost::filesystem::remove( temporaryFileName, ec );
+		throw IOException( std::string( "DiskObjectCache : Unable to store object : " ) + e.what() );
+	}
+
+	const boost::uintmax_t size = file_size( f, ec );
+	if( !ec )
+	{
+		m_estimatedDiskUsage += size;
+	}
+
+	if( m_estimatedDiskUsage > m_maxDiskUsage )
+	{
+		limitDiskUsage();
+	}
+}
+
+bool DiskObjectCache::contains( const MurmurHash &hash ) const
+{
+	boost::system::error_code ec;
+	return boost::filesystem::exists( fileName( hash ), ec );
+}
+
+bool DiskObjectCache::erase( const MurmurHash &hash )
+{
+	boost::system::error_code ec;
+	return boost::filesystem::remove( fileName( hash ), ec );
+}
+
+void DiskObjectCache::clear()
+{
+	tbb::mutex::scoped_lock lock( m_limitMutex );
+
+	std::vector<CacheFile> files;
+	scanDirectory( m_directory, &files );
+	boost::system::error_code ec;
+	for( std::vector<CacheFile>::const_iterator it = files.begin(), eIt = files.end(); it != eIt; ++it )
+	{
+		boost::filesystem::remove( it->fileName, ec );
+	}
+
+	m_estimatedDiskUsage = 0;
+}
+
+void DiskObjectCache::setMaxDiskUsage( size_t maxDiskUsage )
+{
+	m_maxDiskUsage = maxDiskUsage;
+	limitDiskUsage();
+}
+
+size_t DiskObjectCache::getMaxDiskUsage() const
+{
+	return m_maxDiskUsage;
+}
+
+size_t DiskObjectCache::diskUsage() const
+{
+	return scanDirectory( m_directory, NULL );
+}
+
+std::string DiskObjectCache::fileName( const MurmurHash &hash ) const
+{
+	// we use a subdirectory per hash prefix, to avoid
+	// ending up with enormous numbers of files in one
+	// directory.
+	const std::string h = hash.toString();
+	return m_directory + "/" + h.substr( 0, 2 ) + "/" + h + g_extension;
+}
+
+void DiskObjectCache::limitDiskUsage()
+{
+	tbb::mutex::scoped_lock lock( m_limitMutex );
+
+	std::vector<CacheFile> files;
+	boost::uintmax_t usage = scanDirectory( m_directory, &files );
+	if( usage > m_maxDiskUsage )
+	{
+		std::sort( files.begin(), files.end() );
+
+		const boost::uintmax_t targetUsage = (boost::uintmax_t)( m_maxDiskUsage * g_limitFraction );
+		boost::system::error_code ec;
+		for( std::vector<CacheFile>::const_iterator it = files.begin(), eIt = files.end(); it != eIt && usage > targetUsage; ++it )
+		{
+			if( boost::filesystem::remove( it->fileName, ec ) )
+			{
+				usage -= it->size;
+			}
+		}
+	}
+
+	m_estimatedDiskUsage = usage;
+}
@@ -39,11 +39,15 @@
 #include "boost/bind.hpp"
 #include "tbb/tbb_thread.h"
 
+#include "OpenEXR/half.h"
+
 #include "IECore/DisplayDriverServer.h"
 #include "IECore/private/DisplayDriverServerHeader.h"
+#include "IECore/private/BlockCompression.h"
 #include "IECore/SimpleTypedData.h"
 #include "IECore/MemoryIndexedIO.h"
 #include "IECore/MessageHandler.h"
+#include "IECore/ByteOrder.h"
 
 using namespace IECore;
 using boost::asio::ip::tcp;
@@ -66,6 +70,7 @@ class DisplayDriverServer::Session : public RefCounted
 		void handleReadHeader( const boost::system::error_code& error );
 		void handleReadOpenParameters( const boost::system::error_code& error );
 		void handleReadDataParameters( const boost::system::error_code& error );
+		void handleReadRawImageData( const boost::system::error_code& error );
 		void sendResult( DisplayDriverServerHeader::MessageType msg, size_t dataSize );
 		void sendException( const char *message );
 
@@ -74,6 +79,11 @@ class DisplayDriverServer::Session : public RefCounted
 		DisplayDriverPtr m_displayDriver;
 		DisplayDriverServerHeader m_header;
 		CharVectorDataPtr m_buffer;
+		// used to convert raw image data which can't
+		// be passed to the display driver directly.
+		std::vector<float> m_convertedData;
+		// used to hold raw image data after decompression.
+		std::vector<char> m_decompressedData;
 };
 
 class DisplayDriverServer::PrivateData : public RefCounted
@@ -240,6 +250,13 @@ void DisplayDriverServer::Session::handleReadHeader( const boost::system::error_
 				boost::asio::placeholders::error));
 		break;
 
+	case DisplayDriverServerHeader::rawImageData:
+		boost::asio::async_read( m_socket,
+				boost::asio::buffer( &data[0], bytesAhead ),
+				boost::bind(&DisplayDriverServer::Session::handleReadRawImageData, SessionPtr(this),
+				boost::asio::placeholders::error));
+		break;
+
 	case DisplayDriverServerHeader::imageClose:
 		if ( m_displayDriver )
 		{
@@ -293,6 +310,7 @@ void DisplayDriverServer::Session::handleReadOpenParameters( const boost::system
 	CompoundDataPtr parameters;
 	bool scanLineOrder = false;
 	bool acceptsRepeatedData = false;
+	int clientProtocolVersion = 0;
 
 	// handle imageOpen parameters.
 	try
@@ -310,6 +328,11 @@ void DisplayDriverServer::Session::handleReadOpenParameters( const boost::system
 
 		scanLineOrder = m_displayDriver->scanLineOrderOnly();
 		acceptsRepeatedData = m_displayDriver->acceptsRepeatedData();
+
+		if( const IntData *clientProtocolVersionData = parameters->member<IntData>( "clientProtocolVersion" ) )
+		{
+			clientProtocolVersion = clientProtocolVersionData->readable();
+		}
 	}
 	catch( std::exception &e )
 	{
@@ -325,8 +348,36 @@ void DisplayDriverServer::Session::handleReadOpenParameters( const boost::system
 		sendResult( DisplayDriverServerHeader::imageOpen, sizeof(scanLineOrder) );
 		m_socket.send( boost::asio::buffer( &scanLineOrder, sizeof(scanLineOrder) ) );
 
-		sendResult( DisplayDriverServerHeader::imageOpen, sizeof(acceptsRepeatedData) );
-		m_socket.send( boost::asio::buffer( &acceptsRepeatedData, sizeof(acceptsRepeatedData) ) );
+		if( clientProtocolVersion >= DisplayDriverServerHeader::compressionProtocolVersion )
+		{
+			// clients which negotiate compression expect to find our
+			// protocol version and the codecs we support following
+			// acceptsRepeatedData.
+			unsigned char codecs = 0;
+			for( int codec = BlockCompression::Uncompressed; codec <= BlockCompression::Zstd; ++codec )
+			{
+				if( BlockCompression::available( (BlockCompression::Codec)codec ) )
+				{
+					codecs |= 1 << codec;
+				}
+			}
+			unsigned char reply[3] = { acceptsRepeatedData, DisplayDriverServerHeader::compressionProtocolVersion, codecs };
+			sendResult( DisplayDriverServerHeader::imageOpen, sizeof(reply) );
+			m_socket.send( boost::asio::buffer( reply, sizeof(reply) ) );
+		}
+		else if( clientProtocolVersion >= DisplayDriverServerHeader::rawImageDataProtocolVersion )
+		{
+			// clients which can send rawImageData expect to find
+			// our protocol version following acceptsRepeatedData.
+			unsigned char reply[2] = { acceptsRepeatedData, DisplayDriverServerHeader::rawImageDataProtocolVersion };
+			sendResult( DisplayDriverServerHeader::imageOpen, sizeof(reply) );
+			m_socket.send( boost::asio::buffer( reply, sizeof(reply) ) );
+		}
+		else
+		{
+			sendResult( DisplayDriverServerHeader::imageOpen, sizeof(acceptsRepeatedData) );
+			m_socket.send( boost::asio::buffer( &acceptsRepeatedData, sizeof(acceptsRepeatedData) ) );
+		}
 
 		// prepare for getting imageData packages
 		boost::asio::async_read( m_socket,
@@ -392,6 +443,125 @@ void DisplayDriverServer::Session::handleReadDataParameters( const boost::system
 	}
 }
 
+void DisplayDriverServer::Session::handleReadRawImageData( const boost::system::error_code& error )
+{
+	if (error)
+	{
+		msg( Msg::Error, "DisplayDriverServer::Session::handleReadRawImageData", error.message().c_str() );
+		m_socket.close();
+		return;
+	}
+
+	if (! m_displayDriver )
+	{
+		msg( Msg::Error, "DisplayDriverServer::Session::handleReadRawImageData", "No display drivers!" );
+		m_socket.close();
+		return;
+	}
+
+	try
+	{
+		const std::vector<char> &buffer = m_buffer->readable();
+		if( buffer.size() < DisplayDriverServerHeader::rawImageDataHeaderLength )
+		{
+			throw Exception( "Truncated image data." );
+		}
+
+		int coordinates[4];
+		for( int i = 0; i < 4; ++i )
+		{
+			memcpy( &coordinates[i], &buffer[i * sizeof( int )], sizeof( int ) );
+			coordinates[i] = asLittleEndian( coordinates[i] );
+		}
+		const Imath::Box2i box( Imath::V2i( coordinates[0], coordinates[1] ), Imath::V2i( coordinates[2], coordinates[3] ) );
+
+		const unsigned char format = buffer[16];
+		const bool reverse = ( buffer[17] != 0 ) != littleEndian();
+		const BlockCompression::Codec compression = (BlockCompression::Codec)buffer[18];
+		int uncompressedSize = 0;
+		memcpy( &uncompressedSize, &buffer[20], sizeof( int ) );
+		uncompressedSize = asLittleEndian( uncompressedSize );
+		if( uncompressedSize < 0 )
+		{
+			throw Exception( "Invalid image data size." );
+		}
+
+		const char *pixels = &buffer[0] + DisplayDriverServerHeader::rawImageDataHeaderLength;
+		const size_t pixelBytes = uncompressedSize;
+		if( compression != BlockCompression::Uncompressed )
+		{
+			m_decompressedData.resize( pixelBytes );
+			char *decompressed = pixelBytes ? &m_decompressedData[0] : 0;
+			BlockCompression::decompress( compression, pixels, buffer.size() - DisplayDriverServerHeader::rawImageDataHeaderLength, decompressed, pixelBytes );
+			pixels = decompressed;
+		}
+		else if( pixelBytes != buffer.size() - DisplayDriverServerHeader::rawImageDataHeaderLength )
+		{
+			throw Exception( "Truncated image data." );
+		}
+
+		const float *data = 0;
+		size_t dataSize = 0;
+		if( format == DisplayDriverServerHeader::rawFloat )
+		{
+			dataSize = pixelBytes / sizeof( float );
+			if( !reverse )
+			{
+				// both the message buffer and the decompression buffer
+				// keep the floats aligned, so we can avoid a copy.
+				data = reinterpret_cast<const float *>( pixels );
+			}
+			else if( dataSize )
+			{
+				m_convertedData.resize( dataSize );
+				memcpy( &m_convertedData[0], pixels, dataSize * sizeof( float ) );
+				for( size_t i = 0; i < dataSize; ++i )
+				{
+					m_convertedData[i] = reverseBytes( m_convertedData[i] );
+				}
+				data = &m_convertedData[0];
+			}
+		}
+		else if( format == DisplayDriverServerHeader::rawHalf )
+		{
+			dataSize = pixelBytes / sizeof( half );
+			m_convertedData.resize( dataSize );
+			for( size_t i = 0; i < dataSize; ++i )
+			{
+				half h;
+				memcpy( &h, pixels + i * sizeof( half ), sizeof( half ) );
+				if( reverse )
+				{
+					h.setBits( reverseBytes( h.bits() ) );
+				}
+				m_convertedData[i] = h;
+			}
+			data = dataSize ? &m_convertedData[0] : 0;
+		}
+		else
+		{
+			throw Exception( "Unsupported image data format." );
+		}
+
+		m_displayDriver->imageData( box, data, dataSize );
+
+		// prepare for getting more imageData packages or a imageClose.
+		boost::asio::async_read( m_socket,
+			boost::asio::buffer( m_header.buffer(), m_header.headerLength),
+			boost::bind(
+				&DisplayDriverServer::Session::handleReadHeader, SessionPtr(this),
+				boost::asio::placeholders::error
+			)
+		);
+	}
+	catch( std::exception &e )
+	{
+		msg( Msg::Error, "DisplayDriverServer::Session::handleReadRawImageData", e.what() );
+		m_socket.close();
+		return;
+	}
+}
+
 void DisplayDriverServer::Session::sendResult( DisplayDriverServerHeader::MessageType msg, size_t dataSize )
 {
 	DisplayDriverServerHeader header( msg, dataSize );
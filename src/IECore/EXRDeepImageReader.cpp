@@ -62,13 +62,13 @@ const Reader::ReaderDescription<EXRDeepImageReader> EXRDeepImageReader::g_reader
 
 EXRDeepImageReader::EXRDeepImageReader()
 	:	DeepImageReader( "Reads EXR 2.0 deep image file format." ),
-		m_cache( 0 ), m_inputFile( 0 ), m_depthChannel( -1 ), m_channelNames()
+		m_cache( 0 ), m_inputFile( 0 ), m_depthChannel( -1 ), m_channelNames( new StringVectorData )
 {
 }
 
 EXRDeepImageReader::EXRDeepImageReader( const std::string &fileName )
 	:	DeepImageReader( "Reads EXR 2.0 deep image file format." ),
-		m_cache( 0 ), m_inputFile( 0 ), m_depthChannel( -1 ), m_channelNames()
+		m_cache( 0 ), m_inputFile( 0 ), m_depthChannel( -1 ), m_channelNames( new StringVectorData )
 {
 	m_fileNameParameter->setTypedValue( fileName );
 }
@@ -113,12 +113,7 @@ void EXRDeepImageReader::channelNames( std::vector<std::string> &names )
 {
 	open( true );
 	
-	unsigned numChannels = m_channelNames.size();
-	names.resize( numChannels );
-	for ( unsigned i=0; i < numChannels; ++i )
-	{
-		names[i] = m_channelNames[i];
-	}
+	names = m_channelNames->readable();
 }
 
 bool EXRDeepImageReader::isComplete()
@@ -192,7 +187,7 @@ DeepPixelPtr EXRDeepImageReader::doReadPixel( int x, int y )
 		return 0;
 	}
 	
-	DeepPixelPtr pixel = new DeepPixel( m_channelNames, numSamples );
+	DeepPixelPtr pixel = new DeepPixel( m_channelNames->readable(), numSamples );
 	
 	int numChannels = pixel->numChannels();
 	float channelData[numChannels];
@@ -235,6 +230,68 @@ DeepPixelPtr EXRDeepImageReader::doReadPixel( int x, int y )
 	return pixel;
 }
 
+DeepImagePtr EXRDeepImageReader::doReadRegion( const Imath::Box2i &region )
+{
+	open( true );
+	
+	const Imath::Box2i dataWindow = m_inputFile->header().dataWindow();
+	const size_t width = dataWindow.max.x - dataWindow.min.x + 1;
+	
+	// Deep scanlines can only be read in their entirety, so
+	// we read the full width and crop afterwards if necessary.
+	const Imath::Box2i scanlines( Imath::V2i( dataWindow.min.x, region.min.y ), Imath::V2i( dataWindow.max.x, region.max.y ) );
+	DeepImagePtr result = new DeepImage( m_channelNames, scanlines );
+	
+	Imf::DeepFrameBuffer frameBuffer;
+	
+	std::vector<unsigned> sampleCounts( result->numPixels() );
+	frameBuffer.insertSampleCountSlice(
+		Imf::Slice(
+			Imf::UINT, reinterpret_cast< char * >( &sampleCounts[0] - dataWindow.min.x - scanlines.min.y * width ),
+			sizeof( unsigned ), sizeof( unsigned ) * width
+		)
+	);
+	
+	m_inputFile->setFrameBuffer( frameBuffer );
+	m_inputFile->readPixelSampleCounts( scanlines.min.y, scanlines.max.y );
+	
+	result->setSampleCounts( &sampleCounts[0] );
+	if ( !result->numSamples() )
+	{
+		return region == scanlines ? result : result->crop( region );
+	}
+	
+	// Point each pixel of each channel at its samples in the DeepImage,
+	// letting OpenEXR convert any half channels to float as it reads.
+	const Imf::ChannelList &channels = m_inputFile->header().channels();
+	const size_t numPixels = result->numPixels();
+	std::vector<char *> pointers( numPixels * ( result->numChannels() + 1 ) );
+	
+	int c = 0;
+	for ( Imf::ChannelList::ConstIterator it = channels.begin(); it != channels.end(); ++it, ++c )
+	{
+		float *samples = c == m_depthChannel ? result->depths() : result->channelData( c > m_depthChannel ? c - 1 : c );
+		char **channelPointers = &pointers[ numPixels * c ];
+		for ( size_t p=0; p < numPixels; ++p )
+		{
+			channelPointers[p] = reinterpret_cast< char * >( samples + result->sampleOffset( p ) );
+		}
+		
+		frameBuffer.insert(
+			it.name(),
+			Imf::DeepSlice(
+				Imf::FLOAT, reinterpret_cast< char * >( channelPointers - dataWindow.min.x - scanlines.min.y * width ),
+				sizeof( char * ), sizeof( char * ) * width, sizeof( float )
+			)
+		);
+	}
+	
+	m_inputFile->setFrameBuffer( frameBuffer );
+	m_inputFile->readPixels( scanlines.min.y, scanlines.max.y );
+	
+	return region == scanlines ? result : result->crop( region );
+}
+
 EXRDeepImageReader::Scanline::Scanline( size_t width, size_t numChannels )
 	: sampleCount( width ), pointers( width * numChannels ), data()
 {
@@ -336,7 +393,7 @@ bool EXRDeepImageReader::open( bool throwOnFailure )
 	delete m_inputFile;
 	m_inputFile = 0;
 	m_cache = 0;
-	m_channelNames.clear();
+	m_channelNames = new StringVectorData;
 	m_channelTypes.clear();
 	m_depthChannel = -1;
 		
@@ -355,7 +412,7 @@ bool EXRDeepImageReader::open( bool throwOnFailure )
 			
 			if ( strcmp( it.name(), "Z" ) )
 			{
-				m_channelNames.push_back( it.name() );
+				m_channelNames->writable().push_back( it.name() );
 			}
 			else
 			{
@@ -372,7 +429,7 @@ bool EXRDeepImageReader::open( bool throwOnFailure )
 		
 		// We're assuming each scanline has a cost of 1, so 64 allows us to access
 		// a decent sized tile without re-reading any data.
-		m_cache = new Cache( Getter( m_inputFile, m_channelNames.size() + 1 ), 64 );
+		m_cache = new Cache( Getter( m_inputFile, m_channelNames->readable().size() + 1 ), 64 );
 	}
 	catch( ... )
 	{
@@ -380,7 +437,7 @@ bool EXRDeepImageReader::open( bool throwOnFailure )
 		delete m_inputFile;
 		m_inputFile = 0;
 		m_cache = 0;
-		m_channelNames.clear();
+		m_channelNames = new StringVectorData;
 		m_channelTypes.clear();
 		m_depthChannel = -1;
 		
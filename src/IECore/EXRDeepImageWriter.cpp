@@ -276,6 +276,95 @@ void EXRDeepImageWriter::doWritePixel( int x, int y, const DeepPixel *pixel )
 	}
 }
 
+void EXRDeepImageWriter::doWriteRegion( const DeepImage *image )
+{
+	open();
+	
+	const Imath::Box2i dataWindow( m_outputFile->header().dataWindow() );
+	const Imath::Box2i &window = image->window();
+	if (
+		window.isEmpty() ||
+		window.min.x != dataWindow.min.x || window.max.x != dataWindow.max.x ||
+		window.min.y < m_currentSlice || window.max.y > m_lastSlice
+	)
+	{
+		// Not a block of complete scanlines that we can write directly, so
+		// let the base class write it a pixel at a time. It will throw if
+		// the pixels are out of order or out of bounds.
+		DeepImageWriter::doWriteRegion( image );
+		return;
+	}
+	
+	// Write any scanlines before the region.
+	while( m_currentSlice < window.min.y )
+	{
+		writeScanline();
+	}
+	
+	const size_t numPixels = image->numPixels();
+	const unsigned int numChannels = numberOfChannels();
+	
+	std::vector<unsigned> sampleCounts( numPixels );
+	for ( size_t p = 0; p < numPixels; ++p )
+	{
+		sampleCounts[p] = image->numSamples( p );
+	}
+	
+	Imf::DeepFrameBuffer frameBuffer;
+	frameBuffer.insertSampleCountSlice(
+		Imf::Slice(
+			Imf::UINT, reinterpret_cast< char * >( &sampleCounts[0] - dataWindow.min.x - window.min.y * m_width ),
+			sizeof( unsigned int ), sizeof( unsigned int ) * m_width
+		)
+	);
+	
+	// Point each pixel of each channel at its samples in the DeepImage,
+	// letting OpenEXR convert to half precision where necessary. The
+	// last set of pointers is for the Z channel.
+	std::vector< const float * > pointers( numPixels * ( numChannels + 1 ) );
+	for( unsigned int c = 0; c <= numChannels; ++c )
+	{
+		const float *samples = 0;
+		const char *name = "Z";
+		if ( c < numChannels )
+		{
+			const int channelIndex = image->channelIndex( channelName( c ) );
+			if ( channelIndex < 0 )
+			{
+				throw InvalidArgumentException( "DeepImage does not have channel \"" + channelName( c ) + "\"." );
+			}
+			samples = image->channelData( channelIndex );
+			name = channelName( c ).c_str();
+		}
+		else
+		{
+			samples = image->depths();
+		}
+		
+		const float **channelPointers = &pointers[ numPixels * c ];
+		for ( size_t p = 0; p < numPixels; ++p )
+		{
+			channelPointers[p] = samples + image->sampleOffset( p );
+		}
+		
+		frameBuffer.insert(
+			name,
+			Imf::DeepSlice(
+				Imf::FLOAT, reinterpret_cast< char * >( channelPointers - dataWindow.min.x - window.min.y * m_width ),
+				sizeof( float * ), sizeof( float * ) * m_width, sizeof( float )
+			)
+		);
+	}
+	
+	m_outputFile->setFrameBuffer( frameBuffer );
+	m_outputFile->writePixels( window.max.y - window.min.y + 1 );
+	
+	m_currentSlice = window.max.y + 1;
+	
+	// Clear anything that was buffered by writePixel() for the first scanline.
+	clearScanlineBuffer();
+}
+
 Imf::Compression EXRDeepImageWriter::compression() const
 {
 	return static_cast< Imf::Compression >( parameters()->parameter<IECore::IntParameter>("compression")->getNumericValue() );
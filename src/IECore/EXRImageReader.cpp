@@ -35,6 +35,7 @@
 #include "math.h"
 
 #include "IECore/EXRImageReader.h"
+#include "IECore/IECore.h"
 #include "IECore/SimpleTypedData.h"
 #include "IECore/VectorTypedData.h"
 #include "IECore/ImagePrimitive.h"
@@ -49,6 +50,7 @@
 
 #include "OpenEXR/Iex.h"
 #include "OpenEXR/ImfTestFile.h"
+#include "OpenEXR/ImfThreading.h"
 #include "OpenEXR/ImfFloatAttribute.h"
 #include "OpenEXR/ImfDoubleAttribute.h"
 #include "OpenEXR/ImfIntAttribute.h"
@@ -81,13 +83,13 @@ const Reader::ReaderDescription<EXRImageReader> EXRImageReader::g_readerDescript
 
 EXRImageReader::EXRImageReader() :
 		ImageReader( "Reads ILM OpenEXR file format." ),
-		m_inputFile( 0 )
+		m_inputFile( 0 ), m_tiledInputFile( 0 )
 {
 }
 
 EXRImageReader::EXRImageReader(const string &fileName) :
 		ImageReader( "Reads ILM OpenEXR file format." ),
-		m_inputFile( 0 )
+		m_inputFile( 0 ), m_tiledInputFile( 0 )
 {
 	m_fileNameParameter->setTypedValue( fileName );
 }
@@ -95,6 +97,7 @@ EXRImageReader::EXRImageReader(const string &fileName) :
 EXRImageReader::~EXRImageReader()
 {
 	delete m_inputFile;
+	delete m_tiledInputFile;
 }
 
 bool EXRImageReader::canRead( const string &fileName )
@@ -176,72 +179,131 @@ std::string EXRImageReader::sourceColorSpace() const
 	return "linear";
 }
 
+// The number of scanlines in each of the blocks decoded by decodeTile() for
+// scanline files. This is a multiple of the scanline blocks used by most
+// compression methods, so that no block in the file need be decompressed more
+// than once. It is also large enough to span several compressed blocks, which
+// OpenEXR's thread pool can then decompress in parallel. Tiled files are
+// decoded a tile at a time instead.
+static const int g_scanlineBlockHeight = 64;
+
+static size_t elementSize( Imf::PixelType type )
+{
+	return type == HALF ? sizeof( half ) : sizeof( float );
+}
+
 template<class T>
-DataPtr EXRImageReader::readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow, const Imf::Channel *channel )
+DataPtr EXRImageReader::readTypedChannel( const std::string &name, const Imath::Box2i &dataWindow )
 {
-	assert( channel );
 	Imath::V2i pixelDimensions = dataWindow.size() + Imath::V2i( 1 );
 	unsigned numPixels = pixelDimensions.x * pixelDimensions.y;
 
 	typedef TypedData<vector<T> > DataType;
 	typename DataType::Ptr data = new DataType;
 	data->writable().resize( numPixels );
+	T *result = data->baseWritable();
 
 	Imath::Box2i fullDataWindow = this->dataWindow();
-	if( fullDataWindow.min.x==dataWindow.min.x && fullDataWindow.max.x==dataWindow.max.x )
-	{
-		// the width we want to read matches the width in the file, so we can read straight
-		// into the result buffer
-		FrameBuffer frameBuffer;
-		T *buffer00 = data->baseWritable() - dataWindow.min.y * pixelDimensions.x - fullDataWindow.min.x;
-		Slice slice( channel->type, (char *)buffer00, sizeof(T), sizeof(T) * pixelDimensions.x );
-		frameBuffer.insert( name.c_str(), slice );
-		m_inputFile->setFrameBuffer( frameBuffer );
-		// exr library will choose the best order to read scanlines automatically (increasing or decreasing)
-		try
-		{
-			m_inputFile->readPixels( dataWindow.min.y, dataWindow.max.y );
-		}
-		catch( Iex::InputExc &e )
+	const MurmurHash fileHash = tileCacheFileHash();
+
+	if( m_tiledInputFile )
+	{
+		// we decode only the tiles which intersect the data window, and
+		// transfer just the bits we need from them into the result buffer.
+		const Imf::TileDescription &tileDescription = m_tiledInputFile->header().tileDescription();
+		const int numXTiles = m_tiledInputFile->numXTiles( 0 );
+		const int tx0 = ( dataWindow.min.x - fullDataWindow.min.x ) / tileDescription.xSize;
+		const int tx1 = ( dataWindow.max.x - fullDataWindow.min.x ) / tileDescription.xSize;
+		const int ty0 = ( dataWindow.min.y - fullDataWindow.min.y ) / tileDescription.ySize;
+		const int ty1 = ( dataWindow.max.y - fullDataWindow.min.y ) / tileDescription.ySize;
+
+		prefetchTiles( fileHash, name, tx0, tx1, ty0, ty1 );
+
+		bool missingTiles = false;
+		for( int ty = ty0; ty <= ty1; ++ty )
 		{
-			// so we can read incomplete files
-			msg( Msg::Warning, "EXRImageReader::readChannel", e.what() );
-			return data;
+			for( int tx = tx0; tx <= tx1; ++tx )
+			{
+				ConstCharVectorDataPtr tile = cachedTile( fileHash, name, ty * numXTiles + tx );
+				if( tile->readable().empty() )
+				{
+					// so we can read incomplete files. tiles may be written
+					// in any order, so we carry on and read the others.
+					if( !missingTiles )
+					{
+						msg( Msg::Warning, "EXRImageReader::readChannel", boost::format( "File \"%s\" is incomplete : tiles of channel \"%s\" are missing." ) % fileName() % name );
+						missingTiles = true;
+					}
+					continue;
+				}
+
+				const Imath::Box2i tileWindow = m_tiledInputFile->dataWindowForTile( tx, ty );
+				const Imath::Box2i region = boxIntersection( tileWindow, dataWindow );
+				const int tileWidth = tileWindow.size().x + 1;
+				const T *tileData = reinterpret_cast<const T *>( &(tile->readable()[0]) );
+				for( int y = region.min.y; y <= region.max.y; ++y )
+				{
+					memcpy(
+						(char *)( result + ( y - dataWindow.min.y ) * pixelDimensions.x + region.min.x - dataWindow.min.x ),
+						(const char *)( tileData + ( y - tileWindow.min.y ) * tileWidth + region.min.x - tileWindow.min.x ),
+						( region.size().x + 1 ) * sizeof( T )
+					);
+				}
+			}
 		}
 	}
 	else
 	{
-		// widths don't match, we need to read into a temporary buffer and then transfer just
-		// the bits we need into the result buffer.
-		int numTmpPixels = fullDataWindow.size().x + 1;
-		vector<T> tmpBuffer( numTmpPixels );
-		T *tmpBufferTransferStart = &(tmpBuffer[0]) + dataWindow.min.x - fullDataWindow.min.x;
-		size_t tmpBufferTransferLength = pixelDimensions.x * sizeof( T );
-		T *transferDestination = &(data->writable()[0]);
-
-		// slice has yStride of 0 so each successive scanline just overwrites the previous one
-		Slice slice( channel->type, (char *)(&(tmpBuffer[0]) - fullDataWindow.min.x), sizeof(T), 0 );
-		FrameBuffer frameBuffer;
-		frameBuffer.insert( name.c_str(), slice );
-		m_inputFile->setFrameBuffer( frameBuffer );
-
-		int yStart = dataWindow.min.y;
-		int yEnd = dataWindow.max.y;
-		int yStep = 1;
-		try
+		const int fullWidth = fullDataWindow.size().x + 1;
+
+		// we decode only the blocks of scanlines which intersect the data window,
+		// and transfer just the bits we need from them into the result buffer.
+		size_t transferLength = pixelDimensions.x * sizeof( T );
+		T *transferDestination = result;
+
+		ConstCharVectorDataPtr block;
+		int blockIndex = -1;
+		for( int y = dataWindow.min.y; y <= dataWindow.max.y; ++y )
 		{
-			for( int y=yStart; y!=(yEnd+yStep); y+=yStep )
+			const int blockY = y - fullDataWindow.min.y;
+			if( blockY / g_scanlineBlockHeight != blockIndex )
 			{
-				m_inputFile->readPixels( y );
-				memcpy( (char *)transferDestination, (const char *)tmpBufferTransferStart, tmpBufferTransferLength );
-				transferDestination += pixelDimensions.x;
+				blockIndex = blockY / g_scanlineBlockHeight;
+				block = cachedTile( fileHash, name, blockIndex );
+				if( block->readable().empty() )
+				{
+					// so we can read incomplete files
+					msg( Msg::Warning, "EXRImageReader::readChannel", boost::format( "File \"%s\" is incomplete : scanlines of channel \"%s\" are missing." ) % fileName() % name );
+
+					// the block couldn't be decoded as a whole, so we read the scanlines
+					// it contains individually, until we reach the first missing one. the
+					// frame buffer has a y stride of 0 so that each scanline is read into
+					// the same row buffer.
+					const int blockEnd = std::min( fullDataWindow.min.y + ( blockIndex + 1 ) * g_scanlineBlockHeight - 1, dataWindow.max.y );
+					std::vector<T> rowBuffer( fullWidth );
+					FrameBuffer frameBuffer;
+					frameBuffer.insert( name.c_str(), Slice( m_inputFile->header().channels().findChannel( name.c_str() )->type, (char *)( &rowBuffer[0] - fullDataWindow.min.x ), sizeof( T ), 0 ) );
+					m_inputFile->setFrameBuffer( frameBuffer );
+					try
+					{
+						for( ; y <= blockEnd; ++y )
+						{
+							m_inputFile->readPixels( y );
+							memcpy( (char *)transferDestination, (const char *)( &rowBuffer[0] + dataWindow.min.x - fullDataWindow.min.x ), transferLength );
+							transferDestination += pixelDimensions.x;
+						}
+					}
+					catch( Iex::InputExc & )
+					{
+						// this is the first missing scanline, and the rest of the image is left black
+					}
+					return data;
+				}
 			}
-		}
-		catch( Iex::InputExc &e )
-		{
-			// so we can read incomplete files
-			msg( Msg::Warning, "EXRImageReader::readChannel", e.what() );
-			return data;
+
+			const T *row = reinterpret_cast<const T *>( &(block->readable()[0]) ) + ( blockY - blockIndex * g_scanlineBlockHeight ) * fullWidth;
+			memcpy( (char *)transferDestination, (const char *)( row + dataWindow.min.x - fullDataWindow.min.x ), transferLength );
+			transferDestination += pixelDimensions.x;
 		}
 	}
 
@@ -272,7 +334,7 @@ DataPtr EXRImageReader::readChannel( const string &name, const Imath::Box2i &dat
 		{
 			case UINT :
 				BOOST_STATIC_ASSERT( sizeof( unsigned int ) == 4 );
-				res = readTypedChannel<unsigned int>( name, dataWindow, channel );
+				res = readTypedChannel<unsigned int>( name, dataWindow );
 				if ( raw )
 				{
 					return res;
@@ -285,7 +347,7 @@ DataPtr EXRImageReader::readChannel( const string &name, const Imath::Box2i &dat
 				}
 
 			case HALF :
-				res = readTypedChannel<half>( name, dataWindow, channel );
+				res = readTypedChannel<half>( name, dataWindow );
 				if ( raw )
 				{
 					return res;
@@ -299,7 +361,7 @@ DataPtr EXRImageReader::readChannel( const string &name, const Imath::Box2i &dat
 
 			case FLOAT :
 				BOOST_STATIC_ASSERT( sizeof( float ) == 4 );
-				return readTypedChannel<float>( name, dataWindow, channel );
+				return readTypedChannel<float>( name, dataWindow );
 
 			default:
 				throw IOException( ( boost::format( "EXRImageReader : Unsupported data type for channel \"%s\"" ) % name ).str() );
@@ -326,6 +388,144 @@ DataPtr EXRImageReader::readChannel( const string &name, const Imath::Box2i &dat
 	}
 }
 
+ConstCharVectorDataPtr EXRImageReader::decodeTile( const std::string &tileSet, int tileIndex )
+{
+	try
+	{
+		return decodeTileInternal( tileSet, tileIndex );
+	}
+	catch( Iex::InputExc & )
+	{
+		// the file is incomplete. rather than throw, which would give other threads
+		// waiting on the tile cache a different exception, we cache an empty tile
+		// to mark the data as missing. the cache key includes the file size and
+		// modification time, so the tile is reread when the file is completed.
+		return new CharVectorData;
+	}
+}
+
+ConstCharVectorDataPtr EXRImageReader::decodeTileInternal( const std::string &tileSet, int tileIndex )
+{
+	if( m_tiledInputFile )
+	{
+		const int numXTiles = m_tiledInputFile->numXTiles( 0 );
+		const int tx = tileIndex % numXTiles;
+		const int ty = tileIndex / numXTiles;
+		std::vector<ConstCharVectorDataPtr> tiles;
+		decodeTiles( tileSet, tx, tx, ty, ty, tiles );
+		return tiles[0];
+	}
+
+	const Channel *channel = m_inputFile->header().channels().findChannel( tileSet.c_str() );
+	assert( channel );
+	const ptrdiff_t channelElementSize = elementSize( channel->type );
+
+	const Imath::Box2i fullDataWindow = m_inputFile->header().dataWindow();
+	const int width = fullDataWindow.size().x + 1;
+	const int yBegin = fullDataWindow.min.y + tileIndex * g_scanlineBlockHeight;
+	const int yEnd = std::min( yBegin + g_scanlineBlockHeight - 1, fullDataWindow.max.y );
+
+	CharVectorDataPtr result = new CharVectorData;
+	std::vector<char> &buffer = result->writable();
+	buffer.resize( channelElementSize * width * ( yEnd - yBegin + 1 ) );
+
+	char *buffer00 = &(buffer[0]) - channelElementSize * ( (ptrdiff_t)yBegin * width + fullDataWindow.min.x );
+	FrameBuffer frameBuffer;
+	frameBuffer.insert( tileSet.c_str(), Slice( channel->type, buffer00, channelElementSize, channelElementSize * width ) );
+	m_inputFile->setFrameBuffer( frameBuffer );
+	m_inputFile->readPixels( yBegin, yEnd );
+
+	return result;
+}
+
+void EXRImageReader::decodeTiles( const std::string &channelName, int tx0, int tx1, int ty0, int ty1, std::vector<ConstCharVectorDataPtr> &tiles )
+{
+	const Channel *channel = m_tiledInputFile->header().channels().findChannel( channelName.c_str() );
+	assert( channel );
+	const ptrdiff_t channelElementSize = elementSize( channel->type );
+
+	// read all the tiles into a single buffer, so that OpenEXR
+	// can decompress them in parallel.
+	Imath::Box2i window = m_tiledInputFile->dataWindowForTile( tx0, ty0 );
+	window.extendBy( m_tiledInputFile->dataWindowForTile( tx1, ty1 ) );
+	const ptrdiff_t width = window.size().x + 1;
+
+	std::vector<char> buffer( channelElementSize * width * ( window.size().y + 1 ) );
+	char *buffer00 = &(buffer[0]) - channelElementSize * ( (ptrdiff_t)window.min.y * width + window.min.x );
+	FrameBuffer frameBuffer;
+	frameBuffer.insert( channelName.c_str(), Slice( channel->type, buffer00, channelElementSize, channelElementSize * width ) );
+	m_tiledInputFile->setFrameBuffer( frameBuffer );
+	m_tiledInputFile->readTiles( tx0, tx1, ty0, ty1 );
+
+	// and then split them out into contiguous tiles.
+	tiles.clear();
+	for( int ty = ty0; ty <= ty1; ++ty )
+	{
+		for( int tx = tx0; tx <= tx1; ++tx )
+		{
+			const Imath::Box2i tileWindow = m_tiledInputFile->dataWindowForTile( tx, ty );
+			const size_t rowLength = channelElementSize * ( tileWindow.size().x + 1 );
+
+			CharVectorDataPtr tile = new CharVectorData;
+			std::vector<char> &tileBuffer = tile->writable();
+			tileBuffer.resize( rowLength * ( tileWindow.size().y + 1 ) );
+			for( int y = tileWindow.min.y; y <= tileWindow.max.y; ++y )
+			{
+				memcpy(
+					&(tileBuffer[0]) + rowLength * ( y - tileWindow.min.y ),
+					buffer00 + channelElementSize * ( (ptrdiff_t)y * width + tileWindow.min.x ),
+					rowLength
+				);
+			}
+			tiles.push_back( tile );
+		}
+	}
+}
+
+void EXRImageReader::prefetchTiles( const MurmurHash &fileHash, const std::string &channelName, int tx0, int tx1, int ty0, int ty1 )
+{
+	// find the range of tiles which aren't cached already
+	const int numXTiles = m_tiledInputFile->numXTiles( 0 );
+	Imath::Box2i missing;
+	for( int ty = ty0; ty <= ty1; ++ty )
+	{
+		for( int tx = tx0; tx <= tx1; ++tx )
+		{
+			if( !tileCached( fileHash, channelName, ty * numXTiles + tx ) )
+			{
+				missing.extendBy( Imath::V2i( tx, ty ) );
+			}
+		}
+	}
+
+	if( missing.isEmpty() || missing.min == missing.max )
+	{
+		// nothing to gain over letting cachedTile() decode a single tile
+		return;
+	}
+
+	std::vector<ConstCharVectorDataPtr> tiles;
+	try
+	{
+		decodeTiles( channelName, missing.min.x, missing.max.x, missing.min.y, missing.max.y, tiles );
+	}
+	catch( Iex::InputExc & )
+	{
+		// the file is incomplete. readTypedChannel() will fall back
+		// to decoding the tiles one by one, skipping the missing ones.
+		return;
+	}
+
+	std::vector<ConstCharVectorDataPtr>::const_iterator it = tiles.begin();
+	for( int ty = missing.min.y; ty <= missing.max.y; ++ty )
+	{
+		for( int tx = missing.min.x; tx <= missing.max.x; ++tx, ++it )
+		{
+			cacheTile( fileHash, channelName, ty * numXTiles + tx, *it );
+		}
+	}
+}
+
 bool EXRImageReader::open( bool throwOnFailure )
 {
 	if( m_inputFile && fileName()==m_inputFile->fileName() )
@@ -336,15 +536,27 @@ bool EXRImageReader::open( bool throwOnFailure )
 
 	delete m_inputFile;
 	m_inputFile = 0;
+	delete m_tiledInputFile;
+	m_tiledInputFile = 0;
 
 	try
 	{
-		m_inputFile = new Imf::InputFile( fileName().c_str() );
+		// the InputFile uses OpenEXR's global thread pool, whose
+		// size is set by setImageIOThreads() or the host application.
+		m_inputFile = new Imf::InputFile( fileName().c_str(), getImageIOThreads() > 1 ? Imf::globalThreadCount() : 0 );
+		if( m_inputFile->header().hasTileDescription() )
+		{
+			// we read the pixels of tiled files a tile at a time, and use
+			// the InputFile only for the header and isComplete().
+			m_tiledInputFile = new Imf::TiledInputFile( fileName().c_str(), getImageIOThreads() > 1 ? Imf::globalThreadCount() : 0 );
+		}
 	}
 	catch( ... )
 	{
 		delete m_inputFile;
 		m_inputFile = 0;
+		delete m_tiledInputFile;
+		m_tiledInputFile = 0;
 		if( !throwOnFailure )
 		{
 			return false;
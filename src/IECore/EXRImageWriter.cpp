@@ -41,6 +41,7 @@
 #include "IECore/CompoundParameter.h"
 #include "IECore/BoxOps.h"
 #include "IECore/TimeCodeData.h"
+#include "IECore/IECore.h"
 
 #include "OpenEXR/ImfFloatAttribute.h"
 #include "OpenEXR/ImfDoubleAttribute.h"
@@ -50,6 +51,7 @@
 #include "OpenEXR/ImfMatrixAttribute.h"
 #include "OpenEXR/ImfStringAttribute.h"
 #include "OpenEXR/ImfTimeCodeAttribute.h"
+#include "OpenEXR/ImfThreading.h"
 
 #include "boost/format.hpp"
 
@@ -282,8 +284,9 @@ void EXRImageWriter::writeImage( const vector<string> &names, const ImagePrimiti
 			}
 		}
 
-		// create the output file, write, implicitly close
-		OutputFile out(fileName().c_str(), header);
+		// create the output file, write, implicitly close. the file uses OpenEXR's
+		// global thread pool, whose size is set by setImageIOThreads() or the host application.
+		OutputFile out(fileName().c_str(), header, getImageIOThreads() > 1 ? Imf::globalThreadCount() : 0 );
 
 		out.setFrameBuffer(fb);
 		out.writePixels(height);
@@ -186,6 +186,11 @@ struct FaceVaryingPromotionOp::Promoter
 
 };
 
+bool FaceVaryingPromotionOp::resultCacheable( const CompoundObject *operands ) const
+{
+	return copyParameter()->getTypedValue();
+}
+
 void FaceVaryingPromotionOp::modifyTypedPrimitive( MeshPrimitive *mesh, const CompoundObject *operands )
 {	
 	const std::vector<std::string> &names = operands->member<StringVectorData>( "primVarNames" )->readable();
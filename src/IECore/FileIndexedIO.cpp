@@ -32,6 +32,11 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
+#include <fcntl.h>
+#include <unistd.h>
+#include <errno.h>
+#include <string.h>
+
 #include "boost/filesystem/operations.hpp"
 
 #include "IECore/MessageHandler.h"
@@ -58,6 +63,9 @@ class FileIndexedIO::StreamFile : public StreamIndexedIO::StreamFile
 
 		size_t m_endPosition;
 
+		/// File descriptor used for positional reads on read-only files, -1 otherwise.
+		int m_fd;
+
 		StreamFile( const std::string &filename, IndexedIO::OpenMode mode );
 
 		virtual ~StreamFile();
@@ -66,9 +74,13 @@ class FileIndexedIO::StreamFile : public StreamIndexedIO::StreamFile
 
 		void flush( size_t endPosition );
 
+		/// Reimplemented to use pread() on read-only files, so that concurrent reads
+		/// neither lock nor share a file position.
+		virtual void positionalRead( char *buffer, size_t size, size_t pos );
+
 };
 
-FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0)
+FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::OpenMode mode ) : StreamIndexedIO::StreamFile(mode), m_filename( filename ), m_endPosition(0), m_fd(-1)
 {
 	if (mode & IndexedIO::Write)
 	{
@@ -143,6 +155,11 @@ FileIndexedIO::StreamFile::StreamFile( const std::string &filename, IndexedIO::O
 			throw IOException( "FileIndexedIO: Caught error reading file '" + filename + "'" );
 		}
 
+		m_fd = ::open( filename.c_str(), O_RDONLY );
+		if ( m_fd < 0 )
+		{
+			throw IOException( "FileIndexedIO: Cannot open file '" + filename + "' for read" );
+		}
 	}
 }
 
@@ -153,6 +170,11 @@ void FileIndexedIO::StreamFile::flush( size_t endPosition )
 
 FileIndexedIO::StreamFile::~StreamFile()
 {
+	if ( m_fd >= 0 )
+	{
+		::close( m_fd );
+	}
+
 	if ( m_openmode == IndexedIO::Write || m_openmode == IndexedIO::Append )
 	{
 		std::fstream *f = static_cast< std::fstream * >( m_stream );
@@ -173,6 +195,35 @@ FileIndexedIO::StreamFile::~StreamFile()
 	}
 }
 
+void FileIndexedIO::StreamFile::positionalRead( char *buffer, size_t size, size_t pos )
+{
+	if ( m_fd < 0 )
+	{
+		StreamIndexedIO::StreamFile::positionalRead( buffer, size, pos );
+		return;
+	}
+
+	while ( size )
+	{
+		ssize_t n = ::pread( m_fd, buffer, size, pos );
+		if ( n < 0 )
+		{
+			if ( errno == EINTR )
+			{
+				continue;
+			}
+			throw IOException( "FileIndexedIO: Error reading file '" + m_filename + "' : " + strerror( errno ) );
+		}
+		else if ( n == 0 )
+		{
+			throw IOException( "FileIndexedIO: Unexpected end of file reading '" + m_filename + "'" );
+		}
+		buffer += n;
+		pos += n;
+		size -= n;
+	}
+}
+
 bool FileIndexedIO::StreamFile::canRead( const std::string &path )
 {
 	std::fstream d( path.c_str(), std::ios::binary | std::ios::in);
@@ -34,12 +34,15 @@
 
 #include <algorithm>
 #include <cassert>
+#include <ctime>
+#include <set>
 #include <math.h>
 
 #include "boost/version.hpp"
 #include "boost/format.hpp"
 #include "boost/lexical_cast.hpp"
 #include "boost/regex.hpp"
+#include "boost/system/error_code.hpp"
 #include "boost/filesystem/operations.hpp"
 #include "boost/filesystem/path.hpp"
 #include "boost/filesystem/convenience.hpp"
@@ -52,6 +55,10 @@
 #include "IECore/EmptyFrameList.h"
 #include "IECore/FrameRange.h"
 #include "IECore/ReversedFrameList.h"
+#include "IECore/LRUCache.h"
+#include "IECore/RefCounted.h"
+
+#include "tbb/parallel_for.h"
 
 #if BOOST_VERSION < 103400
 
@@ -81,17 +88,99 @@
 
 using namespace IECore;
 
+//////////////////////////////////////////////////////////////////////////
+// Filename tokenising
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+inline bool isDigit( char c )
+{
+	return c >= '0' && c <= '9';
+}
+
+inline bool isAlpha( char c )
+{
+	return ( c >= 'a' && c <= 'z' ) || ( c >= 'A' && c <= 'Z' );
+}
+
+/// Finds the frame number in names of the form $prefix$frameNumber$suffix,
+/// returning false if there isn't one. Both $prefix and $suffix may be the
+/// empty string and $frameNumber may be preceded by a minus sign. The suffix
+/// may also end in a 3 or 4 character file extension containing a number
+/// (for example: .cr2, .mp3). This is equivalent to matching the regex
+/// "^([^#]*?)(-?[0-9]+)([^0-9#]*|[^0-9#]*\.[a-zA-Z]{2,3}[0-9])$", but
+/// considerably faster.
+bool findFrameNumber( const std::string &name, size_t &frameBegin, size_t &frameEnd )
+{
+	if( name.find( '#' ) != std::string::npos )
+	{
+		return false;
+	}
+
+	// find the last run of digits
+	size_t end = name.size();
+	while( end > 0 && !isDigit( name[end-1] ) )
+	{
+		end--;
+	}
+	if( !end )
+	{
+		return false;
+	}
+
+	size_t begin = end;
+	while( begin > 0 && isDigit( name[begin-1] ) )
+	{
+		begin--;
+	}
+
+	// if the digits are just the last character of an extension
+	// like .mp3 then the frame number is in the previous run, if
+	// there is one.
+	if( end == name.size() && end - begin == 1 )
+	{
+		size_t extensionBegin = begin;
+		while( extensionBegin > 0 && begin - extensionBegin < 3 && isAlpha( name[extensionBegin-1] ) )
+		{
+			extensionBegin--;
+		}
+		if( begin - extensionBegin >= 2 && extensionBegin > 0 && name[extensionBegin-1] == '.' )
+		{
+			size_t previousEnd = extensionBegin - 1;
+			while( previousEnd > 0 && !isDigit( name[previousEnd-1] ) )
+			{
+				previousEnd--;
+			}
+			if( previousEnd )
+			{
+				end = previousEnd;
+				begin = end;
+				while( begin > 0 && isDigit( name[begin-1] ) )
+				{
+					begin--;
+				}
+			}
+		}
+	}
+
+	if( begin > 0 && name[begin-1] == '-' )
+	{
+		begin--;
+	}
+
+	frameBegin = begin;
+	frameEnd = end;
+	return true;
+}
+
+} // namespace
+
 void IECore::findSequences( const std::vector< std::string > &names, std::vector< FileSequencePtr > &sequences, size_t minSequenceSize )
 {
 	sequences.clear();
 
-	/// this matches names of the form $prefix$frameNumber$suffix
-	/// placing each of those in a group of the resulting match.
-	/// both $prefix and $suffix may be the empty string and $frameNumber
-	/// may be preceded by a minus sign.
-	/// It also matches file extensions with 3 or 4 characters that contain numbers (for example: CR2, MP3 )
-	boost::regex matchExpression( std::string( "^([^#]*?)(-?[0-9]+)([^0-9#]*|[^0-9#]*\\.[a-zA-Z]{2,3}[0-9])$" ) );
-
 	/// build a mapping from ($prefix, $suffix) to a list of $frameNumbers
 	typedef std::vector< std::string > Frames;
 	typedef std::map< std::pair< std::string, std::string >, Frames > SequenceMap;
@@ -100,15 +189,15 @@ void IECore::findSequences( const std::vector< std::string > &names, std::vector
 
 	for ( std::vector< std::string >::const_iterator it = names.begin(); it != names.end(); ++it )
 	{
-		boost::smatch matches;
-		if ( boost::regex_match( *it, matches, matchExpression ) )
+		size_t frameBegin, frameEnd;
+		if ( findFrameNumber( *it, frameBegin, frameEnd ) )
 		{
 			sequenceMap[
 				SequenceMap::key_type(
-					std::string( matches[1].first, matches[1].second ),
-					std::string( matches[3].first, matches[3].second )
+					it->substr( 0, frameBegin ),
+					it->substr( frameEnd )
 				)
-			].push_back( std::string( matches[2].first, matches[2].second ) );
+			].push_back( it->substr( frameBegin, frameEnd - frameBegin ) );
 		}
 	}
 
@@ -116,37 +205,43 @@ void IECore::findSequences( const std::vector< std::string > &names, std::vector
 	{
 		const SequenceMap::key_type &fixes = it->first;
 		const Frames &frames = it->second;
-		// todo: could be more efficient by writing a custom comparison function that uses indexes
-		//	 into the const Frames vector rather than duplicating the strings and sorting them directly
-		Frames sortedFrames = frames;
-		std::sort( sortedFrames.begin(), sortedFrames.end() );
 
 		/// in diabolical cases the elements of frames may not all have the same padding
 		/// so we'll sort them out into padded and unpadded frame sequences here, by creating
 		/// a map of padding->list of frames. unpadded things will be considered to have a padding
-		/// of 1.
+		/// of 1, unless there are padded frames of the same width. A negative unpadded frame
+		/// only takes the padding of negative padded frames.
+		std::set< size_t > paddings, negativePaddings;
+		for ( Frames::const_iterator fIt = frames.begin(); fIt != frames.end(); ++fIt )
+		{
+			assert( fIt->size() );
+			const bool negative = (*fIt)[0] == '-';
+			const size_t digitsBegin = negative ? 1 : 0;
+			if ( (*fIt)[digitsBegin] == '0' )
+			{
+				const size_t padding = fIt->size() - digitsBegin;
+				paddings.insert( padding );
+				if ( negative )
+				{
+					negativePaddings.insert( padding );
+				}
+			}
+		}
+
 		typedef std::vector< FrameList::Frame > NumericFrames;
 		typedef std::map< unsigned int, NumericFrames > PaddingToFramesMap;
 		PaddingToFramesMap paddingToFrames;
-		for ( Frames::const_iterator fIt = sortedFrames.begin(); fIt != sortedFrames.end(); ++fIt )
+		for ( Frames::const_iterator fIt = frames.begin(); fIt != frames.end(); ++fIt )
 		{
-			std::string frame = *fIt;
-			int sign = 1;
+			const bool negative = (*fIt)[0] == '-';
+			const size_t digitsBegin = negative ? 1 : 0;
+			const size_t numDigits = fIt->size() - digitsBegin;
 
-			assert( frame.size() );
-			if ( *frame.begin() == '-' )
-			{
-				frame = frame.substr( 1, frame.size() - 1 );
-				sign = -1;
-			}
-			if ( *frame.begin() == '0' || paddingToFrames.find( frame.size() ) != paddingToFrames.end() )
-			{
-				paddingToFrames[ frame.size() ].push_back( sign * boost::lexical_cast<FrameList::Frame>( frame ) );
-			}
-			else
-			{
-				paddingToFrames[ 1 ].push_back( sign * boost::lexical_cast<FrameList::Frame>( frame ) );
-			}
+			const std::set< size_t > &knownPaddings = negative ? negativePaddings : paddings;
+			const unsigned int padding = ( (*fIt)[digitsBegin] == '0' || knownPaddings.count( numDigits ) ) ? numDigits : 1;
+
+			const FrameList::Frame frame = boost::lexical_cast<FrameList::Frame>( fIt->c_str() + digitsBegin );
+			paddingToFrames[ padding ].push_back( negative ? -frame : frame );
 		}
 
 		for ( PaddingToFramesMap::iterator pIt = paddingToFrames.begin(); pIt != paddingToFrames.end(); ++pIt )
@@ -186,20 +281,236 @@ void IECore::findSequences( const std::vector< std::string > &names, std::vector
 	findSequences( names, sequences, 2 );
 }
 
-void IECore::ls( const std::string &path, std::vector< FileSequencePtr > &sequences, size_t minSequenceSize )
+//////////////////////////////////////////////////////////////////////////
+// Directory listing cache
+//////////////////////////////////////////////////////////////////////////
+
+namespace
 {
-	sequences.clear();
 
-	if ( boost::filesystem::is_directory( path ) )
+struct DirectoryListing : public RefCounted
+{
+
+	struct Subdirectory
+	{
+		std::string name;
+		bool isLink;
+	};
+
+	std::time_t modificationTime;
+	std::time_t listingTime;
+	std::vector<std::string> names;
+	std::vector<Subdirectory> subdirectories; // sorted by name
+
+};
+
+IE_CORE_DECLAREPTR( DirectoryListing );
+
+bool subdirectoryLess( const DirectoryListing::Subdirectory &a, const DirectoryListing::Subdirectory &b )
+{
+	return a.name < b.name;
+}
+
+ConstDirectoryListingPtr listDirectory( const std::string &path )
+{
+	DirectoryListingPtr result = new DirectoryListing;
+	result->modificationTime = boost::filesystem::last_write_time( path );
+	result->listingTime = std::time( 0 );
+
+	boost::filesystem::directory_iterator end;
+	for ( boost::filesystem::directory_iterator it( path ); it != end; ++it )
+	{
+		result->names.push_back( it->path().PATH_TO_STRING );
+
+		boost::system::error_code ec;
+		if ( boost::filesystem::is_directory( it->path(), ec ) )
+		{
+			DirectoryListing::Subdirectory s;
+			s.name = result->names.back();
+			s.isLink = boost::filesystem::is_symlink( it->symlink_status() );
+			result->subdirectories.push_back( s );
+		}
+	}
+
+	std::sort( result->subdirectories.begin(), result->subdirectories.end(), subdirectoryLess );
+
+	return result;
+}
+
+typedef LRUCache<std::string, ConstDirectoryListingPtr> LsCache;
+
+ConstDirectoryListingPtr lsCacheGetter( const std::string &path, LsCache::Cost &cost )
+{
+	ConstDirectoryListingPtr result = listDirectory( path );
+	cost = std::max( result->names.size(), (size_t)1 );
+	return result;
+}
+
+LsCache &lsCache()
+{
+	static LsCache *c = 0;
+	if( !c )
+	{
+		const char *e = getenv( "IECORE_LS_CACHE_ENTRIES" );
+		c = new LsCache( lsCacheGetter, e ? boost::lexical_cast<size_t>( e ) : 0 );
+	}
+	return *c;
+}
+
+// make sure the cache is created before any threads might be
+// racing to create it.
+const size_t g_lsCacheInitializer = getLsCacheLimit();
+
+ConstDirectoryListingPtr cachedListDirectory( const std::string &path )
+{
+	LsCache &cache = lsCache();
+	if( !cache.getMaxCost() )
+	{
+		return listDirectory( path );
+	}
+
+	// key on the absolute path, so that the cache remains valid
+	// if the working directory changes.
+	const std::string key = path.size() && path[0] == '/' ? path : boost::filesystem::current_path().string() + "/" + path;
+
+	ConstDirectoryListingPtr result;
+	try
+	{
+		result = cache.get( key );
+	}
+	catch( ... )
+	{
+		// don't remember the failure - the directory may
+		// become readable later.
+		cache.erase( key );
+		throw;
+	}
+
+	// the modification time of a directory only has a resolution of a
+	// second, so we can only trust listings made in a later second than
+	// the last modification.
+	const std::time_t modificationTime = boost::filesystem::last_write_time( path );
+	if( result->modificationTime == modificationTime && result->listingTime > modificationTime )
 	{
-		boost::filesystem::directory_iterator end;
-	 	std::vector< std::string > files;
-		for ( boost::filesystem::directory_iterator it( path ); it != end; ++it )
+		return result;
+	}
+
+	cache.erase( key );
+	return listDirectory( path );
+}
+
+} // namespace
+
+size_t IECore::getLsCacheLimit()
+{
+	return lsCache().getMaxCost();
+}
+
+void IECore::setLsCacheLimit( size_t entries )
+{
+	lsCache().setMaxCost( entries );
+}
+
+void IECore::clearLsCache()
+{
+	lsCache().clear();
+}
+
+//////////////////////////////////////////////////////////////////////////
+// ls
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+void lsWalk( const std::string &path, const std::string &relativePath, size_t minSequenceSize, bool descend, bool followLinks, size_t depth, size_t maxDepth, std::vector< FileSequencePtr > &sequences );
+
+// Searches subdirectories in parallel, storing the results for each in a
+// separate vector so they can be concatenated in a deterministic order.
+class LsSubdirectories
+{
+
+	public :
+
+		LsSubdirectories( const std::string &path, const std::string &relativePath, const DirectoryListing *listing, size_t minSequenceSize, bool followLinks, size_t depth, size_t maxDepth, std::vector< std::vector< FileSequencePtr > > &results )
+			:	m_path( path ), m_relativePath( relativePath ), m_listing( listing ), m_minSequenceSize( minSequenceSize ), m_followLinks( followLinks ), m_depth( depth ), m_maxDepth( maxDepth ), m_results( results )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<size_t> &r ) const
 		{
-			files.push_back( it->path().PATH_TO_STRING );
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				const DirectoryListing::Subdirectory &s = m_listing->subdirectories[i];
+				const std::string path = m_path[m_path.size()-1] == '/' ? m_path + s.name : m_path + "/" + s.name;
+				const std::string relativePath = m_relativePath.size() ? m_relativePath + "/" + s.name : s.name;
+				try
+				{
+					lsWalk( path, relativePath, m_minSequenceSize, m_followLinks || !s.isLink, m_followLinks, m_depth + 1, m_maxDepth, m_results[i] );
+				}
+				catch( const boost::filesystem::filesystem_error &)
+				{
+					// ignore subdirectories we can't read
+					m_results[i].clear();
+				}
+			}
 		}
 
-		findSequences( files, sequences, minSequenceSize );
+	private :
+
+		const std::string &m_path;
+		const std::string &m_relativePath;
+		const DirectoryListing *m_listing;
+		const size_t m_minSequenceSize;
+		const bool m_followLinks;
+		const size_t m_depth;
+		const size_t m_maxDepth;
+		std::vector< std::vector< FileSequencePtr > > &m_results;
+
+};
+
+void lsWalk( const std::string &path, const std::string &relativePath, size_t minSequenceSize, bool descend, bool followLinks, size_t depth, size_t maxDepth, std::vector< FileSequencePtr > &sequences )
+{
+	ConstDirectoryListingPtr listing = cachedListDirectory( path );
+
+	findSequences( listing->names, sequences, minSequenceSize );
+	if( relativePath.size() )
+	{
+		for( std::vector< FileSequencePtr >::iterator it = sequences.begin(); it != sequences.end(); ++it )
+		{
+			(*it)->setFileName( relativePath + "/" + (*it)->getFileName() );
+		}
+	}
+
+	if( !descend || depth >= maxDepth || listing->subdirectories.empty() )
+	{
+		return;
+	}
+
+	std::vector< std::vector< FileSequencePtr > > subdirectorySequences( listing->subdirectories.size() );
+	LsSubdirectories lsSubdirectories( path, relativePath, listing.get(), minSequenceSize, followLinks, depth, maxDepth, subdirectorySequences );
+	tbb::parallel_for( tbb::blocked_range<size_t>( 0, listing->subdirectories.size(), 1 ), lsSubdirectories );
+
+	for( std::vector< std::vector< FileSequencePtr > >::const_iterator it = subdirectorySequences.begin(); it != subdirectorySequences.end(); ++it )
+	{
+		sequences.insert( sequences.end(), it->begin(), it->end() );
+	}
+}
+
+} // namespace
+
+void IECore::ls( const std::string &path, std::vector< FileSequencePtr > &sequences, size_t minSequenceSize )
+{
+	ls( path, sequences, minSequenceSize, false );
+}
+
+void IECore::ls( const std::string &path, std::vector< FileSequencePtr > &sequences, size_t minSequenceSize, bool recurse, bool followLinks, size_t maxDepth )
+{
+	sequences.clear();
+
+	if ( boost::filesystem::is_directory( path ) )
+	{
+		lsWalk( path, "", minSequenceSize, recurse, followLinks, 0, maxDepth, sequences );
 	}
 }
 
@@ -236,11 +547,10 @@ void IECore::ls( const std::string &sequencePath, FileSequencePtr &sequence, siz
 		dirToCheck = ".";
 	}
 
-	boost::filesystem::directory_iterator end;
-
-	for ( boost::filesystem::directory_iterator it( dirToCheck ); it != end; ++it )
+	ConstDirectoryListingPtr listing = cachedListDirectory( dirToCheck.string() );
+	for ( std::vector< std::string >::const_iterator it = listing->names.begin(); it != listing->names.end(); ++it )
 	{
-		const std::string fileName = it->path().PATH_TO_STRING;
+		const std::string &fileName = *it;
 
 		if ( fileName.size() >= std::min( prefix.size(), suffix.size() ) && fileName.substr( 0, prefix.size() ) == prefix && fileName.substr( fileName.size() - suffix.size(), suffix.size() ) == suffix )
 		{
@@ -34,8 +34,19 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include "IECore/IECore.h"
+#include "IECore/Exception.h"
 
 #include "boost/format.hpp"
+#include "boost/lexical_cast.hpp"
+
+#include <cstdlib>
+#include <algorithm>
+
+#include "tbb/atomic.h"
+#include "tbb/mutex.h"
+#include "tbb/task_scheduler_init.h"
+
+#include "OpenEXR/ImfThreading.h"
 
 namespace IECore
 {
@@ -137,4 +148,59 @@ bool withDeepEXR()
 #endif
 }
 
+static tbb::atomic<int> g_imageIOThreads; // zero until set explicitly or from the environment
+static tbb::mutex g_imageIOThreadsMutex;
+static int g_originalEXRThreads = -1; // the size of the OpenEXR pool before we first changed it
+
+int getImageIOThreads()
+{
+	if( !g_imageIOThreads )
+	{
+		const char *t = getenv( "IECORE_IMAGEIO_THREADS" );
+		if( !t )
+		{
+			// Our own threading uses TBB, so we default to its choice of
+			// thread count. OpenEXR's global thread pool may be shared with
+			// the host application, so we leave its size alone.
+			return tbb::task_scheduler_init::default_num_threads();
+		}
+
+		tbb::mutex::scoped_lock lock( g_imageIOThreadsMutex );
+		if( !g_imageIOThreads )
+		{
+			setImageIOThreads( boost::lexical_cast<int>( t ) );
+		}
+	}
+	return g_imageIOThreads;
+}
+
+void setImageIOThreads( int threads )
+{
+	if( threads < 0 )
+	{
+		throw InvalidArgumentException( "setImageIOThreads : Number of threads must not be negative." );
+	}
+
+	if( threads == 0 )
+	{
+		// Back to the default, restoring the OpenEXR pool if we changed it.
+		if( g_originalEXRThreads >= 0 )
+		{
+			Imf::setGlobalThreadCount( g_originalEXRThreads );
+			g_originalEXRThreads = -1;
+		}
+		g_imageIOThreads = 0;
+		return;
+	}
+
+	if( g_originalEXRThreads < 0 )
+	{
+		g_originalEXRThreads = Imf::globalThreadCount();
+	}
+	// OpenEXR does the work on the calling thread when the pool is
+	// empty, so a single thread corresponds to a pool of size 0.
+	Imf::setGlobalThreadCount( threads > 1 ? threads : 0 );
+	g_imageIOThreads = threads;
+}
+
 }
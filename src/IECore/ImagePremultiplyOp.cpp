@@ -114,7 +114,12 @@ struct ImagePremultiplyOp::PremultFn
 	}
 };
 
-void ImagePremultiplyOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
+bool ImagePremultiplyOp::channelsAreIndependent() const
+{
+	return true;
+}
+
+void ImagePremultiplyOp::begin( const CompoundObject *operands )
 {
 	const std::string &alphaChannelName = m_alphaChannelNameParameter->getTypedValue();
 
@@ -133,11 +138,19 @@ void ImagePremultiplyOp::modifyChannels( const Imath::Box2i &displayWindow, cons
 		throw InvalidArgumentException( "ImagePremultiplyOp: Cannot find specified alpha channel" );
 	}
 
-	FloatVectorDataPtr alphaData = despatchTypedData< ToFloatVectorData, TypeTraits::IsNumericVectorTypedData >( it->second.data.get() );
+	m_alphaData = despatchTypedData< ToFloatVectorData, TypeTraits::IsNumericVectorTypedData >( it->second.data.get() );
+}
 
-	ImagePremultiplyOp::PremultFn fn( alphaData.get() );
+void ImagePremultiplyOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
+{
+	ImagePremultiplyOp::PremultFn fn( m_alphaData.get() );
 	for ( ChannelVector::iterator it = channels.begin(); it != channels.end(); it++ )
 	{
 		despatchTypedData<ImagePremultiplyOp::PremultFn, TypeTraits::IsNumericVectorTypedData>( it->get(), fn );
 	}
 }
+
+void ImagePremultiplyOp::end()
+{
+	m_alphaData = 0;
+}
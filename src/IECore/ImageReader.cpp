@@ -42,6 +42,11 @@
 #include "IECore/NullObject.h"
 #include "IECore/BoxOps.h"
 #include "IECore/ColorSpaceTransformOp.h"
+#include "IECore/LRUCache.h"
+#include "IECore/MurmurHash.h"
+
+#include "boost/filesystem/operations.hpp"
+#include "boost/lexical_cast.hpp"
 
 using namespace std;
 using namespace IECore;
@@ -50,6 +55,81 @@ using namespace Imath;
 
 IE_CORE_DEFINERUNTIMETYPED( ImageReader );
 
+//////////////////////////////////////////////////////////////////////////
+// Tile cache
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+// Conceptually the key for the cache is just a hash of the file name,
+// modification time, tile set and tile index, but we also need the key
+// to carry the reader and the tile identifiers, so that the getter can
+// use them to decode the tile. The reader is never accessed outside of
+// the getter, which is only ever called from within cachedTile().
+struct TileCacheKey
+{
+
+	TileCacheKey()
+		:	reader( NULL ), tileIndex( 0 )
+	{
+	}
+
+	TileCacheKey( ImageReader *r, const std::string &s, int i, const MurmurHash &h )
+		:	reader( r ), tileSet( s ), tileIndex( i ), hash( h )
+	{
+	}
+
+	bool operator == ( const TileCacheKey &other ) const
+	{
+		return hash == other.hash;
+	}
+
+	mutable ImageReader *reader;
+	std::string tileSet;
+	int tileIndex;
+	MurmurHash hash;
+
+};
+
+inline size_t tbb_hasher( const TileCacheKey &key )
+{
+	return tbb_hasher( key.hash );
+}
+
+} // namespace
+
+struct ImageReader::TileCache
+{
+
+	typedef LRUCache<TileCacheKey, ConstCharVectorDataPtr> Cache;
+
+	static ConstCharVectorDataPtr getter( const TileCacheKey &key, Cache::Cost &cost )
+	{
+		ConstCharVectorDataPtr result = key.reader->decodeTile( key.tileSet, key.tileIndex );
+		cost = result->readable().size();
+		return result;
+	}
+
+	static Cache &cache()
+	{
+		static Cache *c = 0;
+		if( !c )
+		{
+			const char *m = getenv( "IECORE_IMAGEREADER_TILECACHE_MEMORY" );
+			size_t mi = m ? boost::lexical_cast<size_t>( m ) : 256;
+			c = new Cache( getter, 1024 * 1024 * mi );
+		}
+		return *c;
+	}
+
+};
+
+// make sure the cache is created before any threads might be
+// racing to create it.
+static const size_t g_tileCacheInitializer = ImageReader::getTileCacheMemoryLimit();
+
+
 ImageReader::ImageReader( const std::string &description ) :
 		Reader( description, new ObjectParameter( "result", "The loaded object", new NullObject, ImagePrimitive::staticTypeId() ) )
 {
@@ -173,6 +253,80 @@ ObjectPtr ImageReader::doOperation( const CompoundObject *operands )
 	return image;
 }
 
+size_t ImageReader::getTileCacheMemoryLimit()
+{
+	return TileCache::cache().getMaxCost();
+}
+
+void ImageReader::setTileCacheMemoryLimit( size_t bytes )
+{
+	TileCache::cache().setMaxCost( bytes );
+}
+
+size_t ImageReader::tileCacheMemoryUsage()
+{
+	return TileCache::cache().currentCost();
+}
+
+void ImageReader::clearTileCache()
+{
+	TileCache::cache().clear();
+}
+
+static TileCacheKey tileCacheKey( ImageReader *reader, const MurmurHash &fileHash, const std::string &tileSet, int tileIndex )
+{
+	MurmurHash h = fileHash;
+	h.append( tileSet );
+	h.append( tileIndex );
+
+	return TileCacheKey( reader, tileSet, tileIndex, h );
+}
+
+MurmurHash ImageReader::tileCacheFileHash() const
+{
+	const std::string &f = fileName();
+
+	// the modification time only has a resolution of a second, so we
+	// also use the size to detect files which are rewritten quickly.
+	MurmurHash h;
+	h.append( f );
+	h.append( (int64_t)boost::filesystem::last_write_time( f ) );
+	h.append( (uint64_t)boost::filesystem::file_size( f ) );
+
+	return h;
+}
+
+ConstCharVectorDataPtr ImageReader::cachedTile( const MurmurHash &fileHash, const std::string &tileSet, int tileIndex )
+{
+	TileCacheKey key = tileCacheKey( this, fileHash, tileSet, tileIndex );
+	try
+	{
+		return TileCache::cache().get( key );
+	}
+	catch( ... )
+	{
+		// the cache remembers failures, but we'd rather try again
+		// next time in case the problem has been fixed.
+		TileCache::cache().erase( key );
+		throw;
+	}
+}
+
+bool ImageReader::tileCached( const MurmurHash &fileHash, const std::string &tileSet, int tileIndex )
+{
+	return TileCache::cache().cached( tileCacheKey( this, fileHash, tileSet, tileIndex ) );
+}
+
+void ImageReader::cacheTile( const MurmurHash &fileHash, const std::string &tileSet, int tileIndex, ConstCharVectorDataPtr tile )
+{
+	TileCache::cache().set( tileCacheKey( this, fileHash, tileSet, tileIndex ), tile, tile->readable().size() );
+}
+
+ConstCharVectorDataPtr ImageReader::decodeTile( const std::string &tileSet, int tileIndex )
+{
+	throw NotImplementedException( "ImageReader::decodeTile" );
+}
+
 DataPtr ImageReader::readChannel( const std::string &name, bool raw )
 {
 	vector<string> allNames;
@@ -110,6 +110,11 @@ const FloatParameter * ImageThinner::thresholdParameter() const
 	return parameters()->parameter<FloatParameter>( "threshold" );
 }
 
+bool ImageThinner::channelsAreIndependent() const
+{
+	return true;
+}
+
 void ImageThinner::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	float threshold = thresholdParameter()->getNumericValue();
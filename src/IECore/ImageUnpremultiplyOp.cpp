@@ -117,7 +117,12 @@ struct ImageUnpremultiplyOp::UnpremultFn
 	}
 };
 
-void ImageUnpremultiplyOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
+bool ImageUnpremultiplyOp::channelsAreIndependent() const
+{
+	return true;
+}
+
+void ImageUnpremultiplyOp::begin( const CompoundObject *operands )
 {
 	const std::string &alphaChannelName = m_alphaChannelNameParameter->getTypedValue();
 
@@ -136,11 +141,19 @@ void ImageUnpremultiplyOp::modifyChannels( const Imath::Box2i &displayWindow, co
 		throw InvalidArgumentException( "ImageUnpremultiplyOp: Cannot find specified alpha channel" );
 	}
 
-	FloatVectorDataPtr alphaData = despatchTypedData< ToFloatVectorData, TypeTraits::IsNumericVectorTypedData >( it->second.data.get() );
+	m_alphaData = despatchTypedData< ToFloatVectorData, TypeTraits::IsNumericVectorTypedData >( it->second.data.get() );
+}
 
-	ImageUnpremultiplyOp::UnpremultFn fn( alphaData.get() );
+void ImageUnpremultiplyOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
+{
+	ImageUnpremultiplyOp::UnpremultFn fn( m_alphaData.get() );
 	for ( ChannelVector::iterator it = channels.begin(); it != channels.end(); it++ )
 	{
 		despatchTypedData<ImageUnpremultiplyOp::UnpremultFn, TypeTraits::IsNumericVectorTypedData>( it->get(), fn );
 	}
 }
+
+void ImageUnpremultiplyOp::end()
+{
+	m_alphaData = 0;
+}
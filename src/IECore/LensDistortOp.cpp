@@ -113,9 +113,8 @@ void LensDistortOp::begin( const CompoundObject * operands )
 	ImagePrimitive *inputImage = static_cast<ImagePrimitive *>( inputParameter()->getValue() );
 	
 	Imath::Box2i dataWindow( inputImage->getDataWindow() );
-	Imath::Box2i displayWindow( inputImage->getDisplayWindow() );
-	double displayWH[2] = { static_cast<double>( displayWindow.size().x + 1 ), static_cast<double>( displayWindow.size().y + 1 ) };
-	double displayOrigin[2] = { static_cast<double>( displayWindow.min[0] ), static_cast<double>( displayWindow.min[1] ) };
+	m_displayWindow = inputImage->getDisplayWindow();
+	const Imath::Box2i &displayWindow = m_displayWindow;
 	
 	// Get the distorted window.
 	// As the LensModel::bounds() method requires that the display window has it's origin at (0,0) in the bottom left of the image and the IECore::ImagePrimitive has it's origin in the top left,
@@ -133,34 +132,6 @@ void LensDistortOp::begin( const CompoundObject * operands )
 		Imath::V2i( distortedWindow.min[0] + displayWindow.min[0], ( displayWindow.size().y - distortedWindow.max[1] ) + displayWindow.min[1] ),
 		Imath::V2i( distortedWindow.max[0] + displayWindow.min[0], ( displayWindow.size().y - distortedWindow.min[1] ) + displayWindow.min[1] )
 	);
-	
-	// Compute a 2D cache of the warped points for use in the warp() method.
-	IECore::FloatVectorDataPtr cachePtr = new IECore::FloatVectorData;
-	std::vector<float> &cache( cachePtr->writable() );
-	cache.resize( ( m_distortedDataWindow.size().x + 1 ) * ( m_distortedDataWindow.size().y + 1 ) * 2 ); // We interleave the X and Y vector components within the cache.
-
-	for( int y = distortedWindow.max.y, pixelIndex = 0; y >= distortedWindow.min.y; --y )
-	{
-		for( int x = distortedWindow.min.x; x <= distortedWindow.max.x; ++x )
-		{
-			// Convert to UV space with the origin in the bottom left.	
-			Imath::V2f p( Imath::V2f( x, y ) );
-			Imath::V2d uv( p[0] / displayWH[0], p[1] / displayWH[1] );
-
-			// Get the distorted uv coordinate.
-			Imath::V2d duv( m_mode == kDistort ? m_lensModel->distort( uv ) : m_lensModel->undistort( uv ) );
-
-			// Transform it to image space.
-			p = Imath::V2f(
-				duv[0] * displayWH[0] + displayOrigin[0], ( ( displayWH[1] - 1. ) - ( duv[1] * displayWH[1] ) ) + displayOrigin[1] 
-			);
-
-			cache[pixelIndex++] = p[0];
-			cache[pixelIndex++] = p[1];
-		}
-	}
-
-	m_cachePtr = cachePtr;
 }
 
 Imath::Box2i LensDistortOp::warpedDataWindow( const Imath::Box2i &dataWindow ) const
@@ -170,12 +141,24 @@ Imath::Box2i LensDistortOp::warpedDataWindow( const Imath::Box2i &dataWindow ) c
 
 Imath::V2f LensDistortOp::warp( const Imath::V2f &p ) const
 {
-	// Just pull the distorted point from the cache.
-	const int w( m_distortedDataWindow.size().x + 1 );
-	const int xIdx( int( p[0] ) - m_distortedDataWindow.min.x );
-	const int yIdx( int( p[1] ) - m_distortedDataWindow.min.y );
-	const float *vector( &(( m_cachePtr->readable() )[ ( w * yIdx + xIdx ) * 2 ] ) );
-	return Imath::V2f( vector[0], vector[1] );
+	// WarpOp calls this once per pixel, so there is no need to cache the
+	// result. Convert to UV space with the origin in the bottom left.
+	const double displayWH[2] = { static_cast<double>( m_displayWindow.size().x + 1 ), static_cast<double>( m_displayWindow.size().y + 1 ) };
+	const double displayOrigin[2] = { static_cast<double>( m_displayWindow.min[0] ), static_cast<double>( m_displayWindow.min[1] ) };
+	Imath::V2d uv(
+		int( p[0] ) - m_displayWindow.min[0],
+		m_displayWindow.size().y - ( int( p[1] ) - m_displayWindow.min[1] )
+	);
+	uv[0] /= displayWH[0];
+	uv[1] /= displayWH[1];
+
+	// Get the distorted uv coordinate.
+	Imath::V2d duv( m_mode == kDistort ? m_lensModel->distort( uv ) : m_lensModel->undistort( uv ) );
+
+	// Transform it to image space.
+	return Imath::V2f(
+		duv[0] * displayWH[0] + displayOrigin[0], ( ( displayWH[1] - 1. ) - ( duv[1] * displayWH[1] ) ) + displayOrigin[1]
+	);
 }
 
 void LensDistortOp::end()
@@ -74,6 +74,11 @@ struct LinearToAlexaLogcOp::Converter
 	}
 };
 
+bool LinearToAlexaLogcOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void LinearToAlexaLogcOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	LinearToAlexaLogcOp::Converter converter;
@@ -122,6 +122,11 @@ struct LinearToCineonOp::Converter
 
 };
 
+bool LinearToCineonOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void LinearToCineonOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	LinearToCineonOp::Converter converter( filmGammaParameter()->getNumericValue(),
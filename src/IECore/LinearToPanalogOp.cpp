@@ -73,6 +73,11 @@ struct LinearToPanalogOp::Converter
 	}
 };
 
+bool LinearToPanalogOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void LinearToPanalogOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	LinearToPanalogOp::Converter converter;
@@ -74,6 +74,11 @@ struct LinearToRec709Op::Converter
 	}
 };
 
+bool LinearToRec709Op::channelsAreIndependent() const
+{
+	return true;
+}
+
 void LinearToRec709Op::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	LinearToRec709Op::Converter converter;
@@ -74,6 +74,11 @@ struct LinearToSRGBOp::Converter
 	}
 };
 
+bool LinearToSRGBOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void LinearToSRGBOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	LinearToSRGBOp::Converter converter;
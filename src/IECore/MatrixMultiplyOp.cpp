@@ -128,7 +128,19 @@ struct MultiplyFunctor
 	{
 		assert( data );
 		
+		if( matrix == T() )
+		{
+			// identity - leave the data shared with the input
+			return;
+		}
+
 		GeometricData::Interpretation mode = data->getInterpretation();
+		if( mode != GeometricData::Point && mode != GeometricData::Vector && mode != GeometricData::Normal )
+		{
+			// nothing to transform, so don't force a copy of the data
+			return;
+		}
+
 		typename U::ValueType::iterator beginIt = data->writable().begin();
 		typename U::ValueType::iterator endIt = data->writable().end();
 		if ( mode==GeometricData::Point || mode==GeometricData::Vector )
@@ -154,7 +166,19 @@ struct MultiplyFunctor
 	{
 		assert( data );
 		
+		if( matrix == T() )
+		{
+			// identity - leave the data shared with the input
+			return;
+		}
+
 		GeometricData::Interpretation mode = data->getInterpretation();
+		if( mode != GeometricData::Point && mode != GeometricData::Vector && mode != GeometricData::Normal )
+		{
+			// nothing to transform, so don't force a copy of the data
+			return;
+		}
+
 		typename U::ValueType::iterator beginIt = data->writable().begin();
 		typename U::ValueType::iterator endIt = data->writable().end();
 		if ( mode == GeometricData::Point )
@@ -201,6 +201,13 @@ struct MeshNormalsOp::HandleErrors
 	}
 };
 
+bool MeshNormalsOp::resultCacheable( const CompoundObject *operands ) const
+{
+	// when the input isn't copied the normals are added to it in
+	// place, and that has to happen every time we're asked.
+	return copyParameter()->getTypedValue();
+}
+
 void MeshNormalsOp::modifyTypedPrimitive( MeshPrimitive * mesh, const CompoundObject * operands )
 {
 	const std::string &pPrimVarName = pPrimVarNameParameter()->getTypedValue();
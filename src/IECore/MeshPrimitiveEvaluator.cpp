@@ -33,6 +33,8 @@
 //////////////////////////////////////////////////////////////////////////
 
 #include <cassert>
+#include <algorithm>
+#include <limits>
 
 #include "OpenEXR/ImathBoxAlgo.h"
 #include "OpenEXR/ImathLineAlgo.h"
@@ -205,7 +207,363 @@ const V3i &MeshPrimitiveEvaluator::Result::vertexIds() const
 	return m_vertexIds;
 }
 
-MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh ) : m_uvTree(0), m_haveMassProperties( false ), m_haveSurfaceArea( false ), m_haveAverageNormals( false )
+//////////////////////////////////////////////////////////////////////////
+// MeshPrimitiveEvaluator::BVH
+//////////////////////////////////////////////////////////////////////////
+
+// A bounding volume hierarchy flattened into a single array of nodes in
+// depth first order, so that the first child of an interior node is stored
+// immediately after it. Triangles are stored in groups of four, as structures
+// of arrays holding a vertex and two precomputed edges, so that the triangles
+// in a leaf can be intersected in simple loops which the compiler can vectorise,
+// without having to gather vertices via the mesh vertex ids.
+class MeshPrimitiveEvaluator::BVH
+{
+
+	public :
+
+		struct Hit
+		{
+			int triangleIndex;
+			V3f barycentricCoordinates;
+		};
+
+		BVH( const std::vector<V3f> &points, const std::vector<int> &vertexIds, const TriangleBoundVector &triangleBounds )
+		{
+			const size_t numTriangles = triangleBounds.size();
+			if( !numTriangles )
+			{
+				return;
+			}
+
+			std::vector<int> triangles( numTriangles );
+			std::vector<V3f> centroids( numTriangles );
+			for( size_t i = 0; i < numTriangles; ++i )
+			{
+				triangles[i] = i;
+				centroids[i] = triangleBounds[i].center();
+			}
+
+			m_nodes.reserve( 2 * ( numTriangles / g_groupSize + 1 ) );
+			m_groups.reserve( numTriangles / 2 + 1 );
+
+			build( triangles.begin(), triangles.end(), points, vertexIds, triangleBounds, centroids );
+		}
+
+		/// Finds the closest intersection nearer than maxDistance, returning
+		/// true if one was found. The direction must be normalised.
+		bool intersectionPoint( const V3f &origin, const V3f &direction, float maxDistance, Hit &hit ) const
+		{
+			if( m_nodes.empty() )
+			{
+				return false;
+			}
+
+			const V3f inverseDirection = inverse( direction );
+
+			float closest = maxDistance;
+			bool result = false;
+
+			unsigned int stack[g_maxDepth];
+			unsigned int stackSize = 0;
+			unsigned int nodeIndex = 0;
+			while( true )
+			{
+				const Node &node = m_nodes[nodeIndex];
+				if( boxIntersects( node.bound, origin, inverseDirection, closest ) )
+				{
+					if( node.axis == g_leaf )
+					{
+						result = intersectGroup( m_groups[node.offset], origin, direction, closest, hit ) || result;
+					}
+					else
+					{
+						// visit the child nearest to the origin first, so that
+						// closest shrinks quickly and prunes the other child.
+						unsigned int nearChild = nodeIndex + 1;
+						unsigned int farChild = node.offset;
+						if( direction[node.axis] < 0.0f )
+						{
+							std::swap( nearChild, farChild );
+						}
+						assert( stackSize < g_maxDepth );
+						stack[stackSize++] = farChild;
+						nodeIndex = nearChild;
+						continue;
+					}
+				}
+
+				if( !stackSize )
+				{
+					break;
+				}
+				nodeIndex = stack[--stackSize];
+			}
+
+			return result;
+		}
+
+		/// Appends all the intersections nearer than maxDistance to hits.
+		/// The direction must be normalised.
+		void intersectionPoints( const V3f &origin, const V3f &direction, float maxDistance, std::vector<Hit> &hits ) const
+		{
+			if( m_nodes.empty() )
+			{
+				return;
+			}
+
+			const V3f inverseDirection = inverse( direction );
+
+			unsigned int stack[g_maxDepth];
+			unsigned int stackSize = 0;
+			unsigned int nodeIndex = 0;
+			while( true )
+			{
+				const Node &node = m_nodes[nodeIndex];
+				if( boxIntersects( node.bound, origin, inverseDirection, maxDistance ) )
+				{
+					if( node.axis == g_leaf )
+					{
+						intersectGroup( m_groups[node.offset], origin, direction, maxDistance, hits );
+					}
+					else
+					{
+						assert( stackSize < g_maxDepth );
+						stack[stackSize++] = node.offset;
+						nodeIndex = nodeIndex + 1;
+						continue;
+					}
+				}
+
+				if( !stackSize )
+				{
+					break;
+				}
+				nodeIndex = stack[--stackSize];
+			}
+		}
+
+	private :
+
+		// The number of triangles stored in a TriangleGroup, and
+		// the maximum number of triangles in a leaf node.
+		static const unsigned int g_groupSize = 4;
+		// Value of Node::axis used to identify leaf nodes.
+		static const unsigned int g_leaf = 3;
+		// Because we split at the median the depth of the tree is
+		// logarithmic in the number of triangles, so this is plenty.
+		static const unsigned int g_maxDepth = 64;
+
+		struct Node
+		{
+			Box3f bound;
+			// For interior nodes, the index of the second child, and
+			// for leaf nodes the index of the TriangleGroup.
+			unsigned int offset;
+			// The split axis for interior nodes and g_leaf for leaves.
+			unsigned int axis;
+		};
+
+		struct TriangleGroup
+		{
+			float v0[3][g_groupSize];
+			float e1[3][g_groupSize];
+			float e2[3][g_groupSize];
+			// Unused slots have an index of -1, and degenerate
+			// edges so that they are never intersected.
+			int triangleIndex[g_groupSize];
+		};
+
+		class CentroidLess
+		{
+			public :
+
+				CentroidLess( const std::vector<V3f> &centroids, unsigned int axis )
+					:	m_centroids( centroids ), m_axis( axis )
+				{
+				}
+
+				bool operator()( int a, int b ) const
+				{
+					return m_centroids[a][m_axis] < m_centroids[b][m_axis];
+				}
+
+			private :
+
+				const std::vector<V3f> &m_centroids;
+				unsigned int m_axis;
+
+		};
+
+		void build( std::vector<int>::iterator first, std::vector<int>::iterator last, const std::vector<V3f> &points, const std::vector<int> &vertexIds, const TriangleBoundVector &triangleBounds, const std::vector<V3f> &centroids )
+		{
+			const unsigned int nodeIndex = m_nodes.size();
+			m_nodes.push_back( Node() );
+
+			Box3f bound;
+			for( std::vector<int>::const_iterator it = first; it != last; ++it )
+			{
+				bound.extendBy( triangleBounds[*it] );
+			}
+			m_nodes[nodeIndex].bound = bound;
+
+			if( last - first <= (int)g_groupSize )
+			{
+				m_nodes[nodeIndex].offset = m_groups.size();
+				m_nodes[nodeIndex].axis = g_leaf;
+
+				m_groups.push_back( TriangleGroup() );
+				TriangleGroup &group = m_groups.back();
+				for( unsigned int i = 0; i < g_groupSize; ++i )
+				{
+					V3f v0( 0 ), e1( 0 ), e2( 0 );
+					int triangleIndex = -1;
+					if( first + i < last )
+					{
+						triangleIndex = *(first + i);
+						v0 = points[vertexIds[triangleIndex*3]];
+						e1 = points[vertexIds[triangleIndex*3+1]] - v0;
+						e2 = points[vertexIds[triangleIndex*3+2]] - v0;
+					}
+					for( unsigned int a = 0; a < 3; ++a )
+					{
+						group.v0[a][i] = v0[a];
+						group.e1[a][i] = e1[a];
+						group.e2[a][i] = e2[a];
+					}
+					group.triangleIndex[i] = triangleIndex;
+				}
+				return;
+			}
+
+			Box3f centroidBound;
+			for( std::vector<int>::const_iterator it = first; it != last; ++it )
+			{
+				centroidBound.extendBy( centroids[*it] );
+			}
+
+			const unsigned int axis = centroidBound.majorAxis();
+			std::vector<int>::iterator middle = first + ( last - first ) / 2;
+			std::nth_element( first, middle, last, CentroidLess( centroids, axis ) );
+
+			m_nodes[nodeIndex].axis = axis;
+			build( first, middle, points, vertexIds, triangleBounds, centroids );
+			m_nodes[nodeIndex].offset = m_nodes.size();
+			build( middle, last, points, vertexIds, triangleBounds, centroids );
+		}
+
+		static V3f inverse( const V3f &direction )
+		{
+			// we avoid infinities so that rays lying exactly within
+			// a slab plane don't produce NaNs in boxIntersects().
+			V3f result;
+			for( unsigned int a = 0; a < 3; ++a )
+			{
+				result[a] = direction[a] != 0.0f ? 1.0f / direction[a] : std::numeric_limits<float>::max();
+			}
+			return result;
+		}
+
+		// Slab test against the segment [0, maxDistance].
+		static bool boxIntersects( const Box3f &box, const V3f &origin, const V3f &inverseDirection, float maxDistance )
+		{
+			float tMin = 0.0f;
+			float tMax = maxDistance;
+			for( unsigned int a = 0; a < 3; ++a )
+			{
+				float tNear = ( box.min[a] - origin[a] ) * inverseDirection[a];
+				float tFar = ( box.max[a] - origin[a] ) * inverseDirection[a];
+				if( tNear > tFar )
+				{
+					std::swap( tNear, tFar );
+				}
+				// guard against rounding error culling triangles which
+				// lie on the faces of the box.
+				tFar *= 1.0f + 4.0f * std::numeric_limits<float>::epsilon();
+				tMin = tNear > tMin ? tNear : tMin;
+				tMax = tFar < tMax ? tFar : tMax;
+				if( tMin > tMax )
+				{
+					return false;
+				}
+			}
+			return true;
+		}
+
+		// Moller-Trumbore intersection of a ray against all the triangles in a group,
+		// computing results for every slot before checking for any hits.
+		static void intersectGroup( const TriangleGroup &group, const V3f &o, const V3f &d, float t[g_groupSize], float u[g_groupSize], float v[g_groupSize], bool hit[g_groupSize] )
+		{
+			for( unsigned int i = 0; i < g_groupSize; ++i )
+			{
+				const float px = d.y * group.e2[2][i] - d.z * group.e2[1][i];
+				const float py = d.z * group.e2[0][i] - d.x * group.e2[2][i];
+				const float pz = d.x * group.e2[1][i] - d.y * group.e2[0][i];
+
+				const float det = group.e1[0][i] * px + group.e1[1][i] * py + group.e1[2][i] * pz;
+				const float inverseDet = det != 0.0f ? 1.0f / det : 0.0f;
+
+				const float tx = o.x - group.v0[0][i];
+				const float ty = o.y - group.v0[1][i];
+				const float tz = o.z - group.v0[2][i];
+
+				u[i] = ( tx * px + ty * py + tz * pz ) * inverseDet;
+
+				const float qx = ty * group.e1[2][i] - tz * group.e1[1][i];
+				const float qy = tz * group.e1[0][i] - tx * group.e1[2][i];
+				const float qz = tx * group.e1[1][i] - ty * group.e1[0][i];
+
+				v[i] = ( d.x * qx + d.y * qy + d.z * qz ) * inverseDet;
+				t[i] = ( group.e2[0][i] * qx + group.e2[1][i] * qy + group.e2[2][i] * qz ) * inverseDet;
+
+				hit[i] = det != 0.0f && u[i] >= 0.0f && v[i] >= 0.0f && u[i] + v[i] <= 1.0f && t[i] >= 0.0f;
+			}
+		}
+
+		static bool intersectGroup( const TriangleGroup &group, const V3f &origin, const V3f &direction, float &closest, Hit &result )
+		{
+			float t[g_groupSize], u[g_groupSize], v[g_groupSize];
+			bool hit[g_groupSize];
+			intersectGroup( group, origin, direction, t, u, v, hit );
+
+			bool found = false;
+			for( unsigned int i = 0; i < g_groupSize; ++i )
+			{
+				if( hit[i] && t[i] < closest )
+				{
+					closest = t[i];
+					result.triangleIndex = group.triangleIndex[i];
+					result.barycentricCoordinates = V3f( 1.0f - u[i] - v[i], u[i], v[i] );
+					found = true;
+				}
+			}
+			return found;
+		}
+
+		static void intersectGroup( const TriangleGroup &group, const V3f &origin, const V3f &direction, float maxDistance, std::vector<Hit> &hits )
+		{
+			float t[g_groupSize], u[g_groupSize], v[g_groupSize];
+			bool hit[g_groupSize];
+			intersectGroup( group, origin, direction, t, u, v, hit );
+
+			for( unsigned int i = 0; i < g_groupSize; ++i )
+			{
+				if( hit[i] && t[i] < maxDistance )
+				{
+					Hit h;
+					h.triangleIndex = group.triangleIndex[i];
+					h.barycentricCoordinates = V3f( 1.0f - u[i] - v[i], u[i], v[i] );
+					hits.push_back( h );
+				}
+			}
+		}
+
+		std::vector<Node> m_nodes;
+		std::vector<TriangleGroup> m_groups;
+
+};
+
+MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh, IntersectionAccelerator intersectionAccelerator ) : m_uvTree(0), m_bvh(0), m_haveMassProperties( false ), m_haveSurfaceArea( false ), m_haveAverageNormals( false )
 {
 	if (! mesh )
 	{
@@ -305,6 +663,11 @@ MeshPrimitiveEvaluator::MeshPrimitiveEvaluator( ConstMeshPrimitivePtr mesh ) : m
 	{
 		m_uvTree = 0;
 	}
+
+	if( intersectionAccelerator == BVHAccelerator )
+	{
+		m_bvh = new BVH( m_verts->readable(), *m_meshVertexIds, m_triangles );
+	}
 }
 
 PrimitiveEvaluatorPtr MeshPrimitiveEvaluator::create( ConstPrimitivePtr primitive )
@@ -324,6 +687,9 @@ MeshPrimitiveEvaluator::~MeshPrimitiveEvaluator()
 
 	delete m_uvTree;
 	m_uvTree = 0;
+
+	delete m_bvh;
+	m_bvh = 0;
 }
 
 ConstPrimitivePtr MeshPrimitiveEvaluator::primitive() const
@@ -749,6 +1115,53 @@ PrimitiveEvaluator::ResultPtr MeshPrimitiveEvaluator::createResult() const
       return new Result();
 }
 
+class MeshPrimitiveEvaluator::ResultArrays : public PrimitiveEvaluator::ResultArrays
+{
+
+	public :
+
+		ResultArrays( size_t size )
+			:	PrimitiveEvaluator::ResultArrays( size )
+		{
+			m_triangleIndex = new IntVectorData;
+			m_triangleIndex->writable().resize( size );
+			m_triangleIndexWritable = size ? &m_triangleIndex->writable()[0] : 0;
+
+			m_barycentricCoordinates = new V3fVectorData;
+			m_barycentricCoordinates->writable().resize( size );
+			m_barycentricCoordinatesWritable = size ? &m_barycentricCoordinates->writable()[0] : 0;
+		}
+
+		virtual void set( size_t index, const PrimitiveEvaluator::Result *result )
+		{
+			PrimitiveEvaluator::ResultArrays::set( index, result );
+			const Result *meshResult = static_cast<const Result *>( result );
+			m_triangleIndexWritable[index] = meshResult->triangleIndex();
+			m_barycentricCoordinatesWritable[index] = meshResult->barycentricCoordinates();
+		}
+
+		virtual CompoundDataPtr arrays() const
+		{
+			CompoundDataPtr result = PrimitiveEvaluator::ResultArrays::arrays();
+			result->writable()["triangleIndex"] = m_triangleIndex;
+			result->writable()["barycentricCoordinates"] = m_barycentricCoordinates;
+			return result;
+		}
+
+	private :
+
+		IntVectorDataPtr m_triangleIndex;
+		V3fVectorDataPtr m_barycentricCoordinates;
+		int *m_triangleIndexWritable;
+		V3f *m_barycentricCoordinatesWritable;
+
+};
+
+PrimitiveEvaluator::ResultArraysPtr MeshPrimitiveEvaluator::createResultArrays( size_t size ) const
+{
+	return new ResultArrays( size );
+}
+
 void MeshPrimitiveEvaluator::validateResult( PrimitiveEvaluator::Result *result ) const
 {
 	if (! dynamic_cast<MeshPrimitiveEvaluator::Result *>( result ) )
@@ -812,6 +1225,16 @@ bool MeshPrimitiveEvaluator::intersectionPoint( const Imath::V3f &origin, const
 	ray.pos = origin;
 	ray.dir = direction.normalized();
 
+	if( m_bvh )
+	{
+		BVH::Hit bvhHit;
+		if( !m_bvh->intersectionPoint( ray.pos, ray.dir, maxDistance, bvhHit ) )
+		{
+			return false;
+		}
+		return barycentricPosition( bvhHit.triangleIndex, bvhHit.barycentricCoordinates, mr );
+	}
+
 	bool hit = false;
 
 	intersectionPointWalk( m_tree->rootIndex(), ray, maxDistSqrd, mr, hit );
@@ -836,6 +1259,20 @@ int MeshPrimitiveEvaluator::intersectionPoints( const Imath::V3f &origin, const
 	ray.pos = origin;
 	ray.dir = direction.normalized();
 
+	if( m_bvh )
+	{
+		std::vector<BVH::Hit> hits;
+		m_bvh->intersectionPoints( ray.pos, ray.dir, maxDistance, hits );
+		results.reserve( hits.size() );
+		for( std::vector<BVH::Hit>::const_iterator it = hits.begin(), eIt = hits.end(); it != eIt; ++it )
+		{
+			ResultPtr result = new Result();
+			barycentricPosition( it->triangleIndex, it->barycentricCoordinates, result.get() );
+			results.push_back( result );
+		}
+		return results.size();
+	}
+
 	intersectionPointsWalk( m_tree->rootIndex(), ray, maxDistSqrd, results );
 
 	return results.size();
@@ -1293,6 +1730,11 @@ const Imath::Box2f MeshPrimitiveEvaluator::uvBound() const
 	return m_uvTree->node( m_uvTree->rootIndex() ).bound();
 }
 
+MeshPrimitiveEvaluator::IntersectionAccelerator MeshPrimitiveEvaluator::intersectionAccelerator() const
+{
+	return m_bvh ? BVHAccelerator : KDTreeAccelerator;
+}
+
 const MeshPrimitiveEvaluator::TriangleBoundVector *MeshPrimitiveEvaluator::triangleBounds() const
 {
 	return &m_triangles;
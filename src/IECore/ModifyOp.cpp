@@ -41,7 +41,7 @@ using namespace IECore;
 IE_CORE_DEFINERUNTIMETYPED( ModifyOp );
 
 ModifyOp::ModifyOp( const std::string &description, ParameterPtr resultParameter, ParameterPtr inputParameter )
-	:	Op( description, resultParameter )
+	:	Op( description, resultParameter ), m_bytesCopied( 0 )
 {
 	parameters()->addParameter( inputParameter );
 	m_inputParameter = inputParameter;
@@ -96,9 +96,15 @@ const BoolParameter *ModifyOp::enableParameter() const
 	return m_enableParameter.get();
 }
 
+size_t ModifyOp::bytesCopied() const
+{
+	return m_bytesCopied;
+}
+
 ObjectPtr ModifyOp::doOperation( const CompoundObject *operands )
 {
-	ObjectPtr object = m_inputParameter->getValue();
+	ObjectPtr input = m_inputParameter->getValue();
+	ObjectPtr object = input;
 	if( m_copyParameter->getTypedValue() )
 	{
 		object = object->copy();
@@ -107,5 +113,19 @@ ObjectPtr ModifyOp::doOperation( const CompoundObject *operands )
 	{
 		modify( object.get(), operands );
 	}
+
+	m_bytesCopied = 0;
+	if( object != input )
+	{
+		// the accumulator only counts each block of shared data once,
+		// so anything the result adds to the total isn't shared with
+		// the input.
+		Object::MemoryAccumulator accumulator;
+		accumulator.accumulate( input.get() );
+		const size_t inputBytes = accumulator.total();
+		accumulator.accumulate( object.get() );
+		m_bytesCopied = accumulator.total() - inputBytes;
+	}
+
 	return object;
 }
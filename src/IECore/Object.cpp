@@ -308,6 +308,7 @@ void Object::MemoryAccumulator::accumulate( const void *ptr, size_t bytes )
 	{
 		m_total += bytes;
 		m_accumulated.insert( ptr );
+		m_sharedBlocks.push_back( SharedBlocks::value_type( ptr, bytes ) );
 	}
 }
 
@@ -316,6 +317,11 @@ size_t Object::MemoryAccumulator::total() const
 	return m_total;
 }
 
+const Object::MemoryAccumulator::SharedBlocks &Object::MemoryAccumulator::sharedBlocks() const
+{
+	return m_sharedBlocks;
+}
+
 //////////////////////////////////////////////////////////////////////////////////////////
 // object interface stuff
 //////////////////////////////////////////////////////////////////////////////////////////
@@ -32,7 +32,14 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
+#include <map>
+
 #include "boost/lexical_cast.hpp"
+#include "boost/bind.hpp"
+
+#include "tbb/spin_mutex.h"
+#include "tbb/atomic.h"
+
 #include "IECore/LRUCache.h"
 #include "IECore/ObjectPool.h"
 
@@ -45,8 +52,10 @@ using namespace IECore;
 struct ObjectPool::MemberData
 {
 
-	MemberData( size_t maxMemory ) : cache( getter, maxMemory )
+	MemberData( size_t maxMemory )
+		:	cache( getter, boost::bind( &MemberData::removed, this, _1, _2 ), maxMemory ), maxMemory( maxMemory )
 	{
+		orphanedBytes = 0;
 	}
 
 	LRUCache< MurmurHash, ConstObjectPtr > cache;
@@ -57,6 +66,121 @@ struct ObjectPool::MemberData
 		cost = 0;
 		return NULL;
 	}
+
+	// The cost of each item in the cache is the memory it uses, minus the
+	// shared blocks of data which have already been paid for by another item.
+	// When the item which paid for a block is removed while others still refer
+	// to it, the block is "orphaned" and is accounted separately until it is
+	// paid for by a new item or is no longer referred to at all.
+	struct Block
+	{
+		Block() : size( 0 ), refCount( 0 ), payer( NULL ), orphaned( false ) {}
+
+		size_t size;
+		size_t refCount;
+		const Object *payer;
+		bool orphaned;
+	};
+
+	typedef std::map<const void *, Block> BlockMap;
+	BlockMap blocks;
+	tbb::atomic<size_t> orphanedBytes;
+	typedef tbb::spin_mutex BlocksMutex;
+	BlocksMutex blocksMutex;
+
+	size_t maxMemory;
+
+	// Registers the shared blocks used by obj, returning the
+	// cost which should be used when adding it to the cache.
+	size_t addReferences( const Object *obj )
+	{
+		std::vector<std::pair<const void *, size_t> > sharedBlocks;
+		size_t cost = objectMemoryUsage( obj, sharedBlocks );
+
+		BlocksMutex::scoped_lock lock( blocksMutex );
+		for( std::vector<std::pair<const void *, size_t> >::const_iterator it = sharedBlocks.begin(); it != sharedBlocks.end(); ++it )
+		{
+			Block &block = blocks[it->first];
+			block.size = it->second;
+			block.refCount++;
+			if( block.payer )
+			{
+				cost -= block.size;
+				continue;
+			}
+
+			block.payer = obj;
+			if( block.orphaned )
+			{
+				block.orphaned = false;
+				orphanedBytes -= block.size;
+			}
+		}
+
+		return cost;
+	}
+
+	// Unregisters the shared blocks used by obj, which must
+	// have previously been passed to addReferences().
+	void removeReferences( const Object *obj )
+	{
+		std::vector<std::pair<const void *, size_t> > sharedBlocks;
+		objectMemoryUsage( obj, sharedBlocks );
+
+		BlocksMutex::scoped_lock lock( blocksMutex );
+		for( std::vector<std::pair<const void *, size_t> >::const_iterator it = sharedBlocks.begin(); it != sharedBlocks.end(); ++it )
+		{
+			BlockMap::iterator bIt = blocks.find( it->first );
+			if( bIt == blocks.end() )
+			{
+				// object must have been modified after being
+				// stored by reference - nothing we can do.
+				continue;
+			}
+
+			Block &block = bIt->second;
+			block.refCount--;
+			if( block.payer == obj )
+			{
+				block.payer = NULL;
+				if( block.refCount )
+				{
+					block.orphaned = true;
+					orphanedBytes += block.size;
+				}
+			}
+
+			if( !block.refCount )
+			{
+				if( block.orphaned )
+				{
+					orphanedBytes -= block.size;
+				}
+				blocks.erase( bIt );
+			}
+		}
+	}
+
+	void removed( const MurmurHash &h, const ConstObjectPtr &obj )
+	{
+		if( obj )
+		{
+			removeReferences( obj.get() );
+		}
+	}
+
+	// Orphaned blocks are not accounted for by the cache itself,
+	// so we reduce the cache limit to leave room for them.
+	void limitMemory()
+	{
+		size_t orphaned = orphanedBytes;
+		size_t maxCost = orphaned < maxMemory ? maxMemory - orphaned : 0;
+		if( cache.getMaxCost() != maxCost )
+		{
+			cache.setMaxCost( maxCost );
+		}
+	}
+
 };
 
 //////////////////////////////////////////////////////////////////////////
@@ -91,18 +215,23 @@ ConstObjectPtr ObjectPool::store( const Object *obj, StoreMode mode )
 	if ( mode == StoreCopy )
 	{
 		cachedObj = obj->copy();
-		m_data->cache.set( h, cachedObj, obj->memoryUsage() );
-		return cachedObj;
 	}
 	else if ( mode == StoreReference )
 	{
-		m_data->cache.set( h, obj, obj->memoryUsage() );
-		return obj;
+		cachedObj = obj;
 	}
 	else
 	{
 		throw Exception( "Invalid store mode!" );
 	}
+
+	size_t cost = m_data->addReferences( cachedObj.get() );
+	m_data->limitMemory();
+	if( !m_data->cache.set( h, cachedObj, cost ) )
+	{
+		m_data->removeReferences( cachedObj.get() );
+	}
+	return cachedObj;
 }
 
 bool ObjectPool::contains( const MurmurHash &hash ) const
@@ -122,17 +251,26 @@ bool ObjectPool::erase( const MurmurHash &hash )
 
 void ObjectPool::setMaxMemoryUsage( size_t maxMemory )
 {
-	m_data->cache.setMaxCost(maxMemory);
+	m_data->maxMemory = maxMemory;
+	m_data->limitMemory();
 }
 
 size_t ObjectPool::getMaxMemoryUsage() const
 {
-	return m_data->cache.getMaxCost();
+	return m_data->maxMemory;
 }
 
 size_t ObjectPool::memoryUsage() const
 {
-	return m_data->cache.currentCost();
+	return m_data->cache.currentCost() + m_data->orphanedBytes;
+}
+
+size_t ObjectPool::objectMemoryUsage( const Object *obj, std::vector<std::pair<const void *, size_t> > &sharedBlocks )
+{
+	Object::MemoryAccumulator accumulator;
+	accumulator.accumulate( obj );
+	sharedBlocks = accumulator.sharedBlocks();
+	return accumulator.total();
 }
 
 ObjectPool *ObjectPool::defaultObjectPool()
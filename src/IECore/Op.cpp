@@ -32,13 +32,57 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
+#include <cstdlib>
+
+#include "boost/lexical_cast.hpp"
+
 #include "IECore/Op.h"
 #include "IECore/CompoundParameter.h"
+#include "IECore/ComputationCache.h"
+#include "IECore/Exception.h"
 
 using namespace IECore;
 
 IE_CORE_DEFINERUNTIMETYPED( Op );
 
+struct Op::Operation
+{
+	Operation( Op *o, const CompoundObject *a ) : op( o ), operands( a )
+	{
+	}
+
+	Op *op;
+	const CompoundObject *operands;
+};
+
+Op::ResultCache &Op::resultCache()
+{
+	static ResultCache *c = 0;
+	if( !c )
+	{
+		const char *e = getenv( "IECORE_OP_RESULT_CACHE_ENTRIES" );
+		c = new ResultCache( computeResult, operationHash, e ? boost::lexical_cast<size_t>( e ) : 0 );
+	}
+	return *c;
+}
+
+// make sure the cache is created before any threads might be
+// racing to create it.
+static const size_t g_resultCacheInitializer = Op::getResultCacheLimit();
+
+ConstObjectPtr Op::computeResult( const Operation &operation )
+{
+	return operation.op->doOperation( operation.operands );
+}
+
+MurmurHash Op::operationHash( const Operation &operation )
+{
+	MurmurHash h;
+	h.append( operation.op->typeName() );
+	operation.operands->hash( h );
+	return h;
+}
+
 Op::Op( const std::string &description, ParameterPtr resultParameter )
 	:	Parameterised( description ), m_resultParameter( resultParameter )
 {
@@ -61,7 +105,29 @@ ObjectPtr Op::operate()
 
 ObjectPtr Op::operate( const CompoundObject *operands )
 {
-	ObjectPtr result = doOperation( operands );
+	ObjectPtr result = 0;
+	if( getResultCacheLimit() && resultCacheable( operands ) )
+	{
+		// the cached result is shared, so we must return a copy. this
+		// is cheap, as the copy shares its data with the cached result
+		// until one or the other is modified.
+		ConstObjectPtr cachedResult = resultCache().get( Operation( this, operands ) );
+		if( cachedResult )
+		{
+			result = cachedResult->copy();
+		}
+	}
+	else
+	{
+		result = doOperation( operands );
+	}
+
+	if( !result )
+	{
+		// this would otherwise fail validation with a confusing error
+		throw Exception( std::string( typeName() ) + " : doOperation() returned no result." );
+	}
+
 	m_resultParameter->setValidatedValue( result );
 	return result;
 }
@@ -71,3 +137,23 @@ const Parameter * Op::resultParameter() const
 	return m_resultParameter.get();
 }
 
+bool Op::resultCacheable( const CompoundObject *operands ) const
+{
+	return false;
+}
+
+size_t Op::getResultCacheLimit()
+{
+	return resultCache().getMaxComputations();
+}
+
+void Op::setResultCacheLimit( size_t maxResults )
+{
+	resultCache().setMaxComputations( maxResults );
+}
+
+void Op::clearResultCache()
+{
+	resultCache().clear();
+}
+
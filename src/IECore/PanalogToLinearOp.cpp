@@ -73,6 +73,11 @@ struct PanalogToLinearOp::Converter
 	}
 };
 
+bool PanalogToLinearOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void PanalogToLinearOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	PanalogToLinearOp::Converter converter;
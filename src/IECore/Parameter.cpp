@@ -273,3 +273,15 @@ std::string Parameter::getCurrentPresetName() const
 
 	return "";
 }
+
+MurmurHash Parameter::hash() const
+{
+	MurmurHash h;
+	hash( h );
+	return h;
+}
+
+void Parameter::hash( MurmurHash &h ) const
+{
+	getValue()->hash( h );
+}
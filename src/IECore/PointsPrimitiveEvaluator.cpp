@@ -183,6 +183,19 @@ PrimitiveEvaluator::ResultPtr PointsPrimitiveEvaluator::createResult() const
 	return new Result( this );
 }
 
+PrimitiveEvaluator::ResultArraysPtr PointsPrimitiveEvaluator::createResultArrays( size_t size ) const
+{
+	return new ResultArrays( size, false, false );
+}
+
+void PointsPrimitiveEvaluator::prepareClosestPoints() const
+{
+	if( m_pointsPrimitive->getNumPoints() )
+	{
+		const_cast<PointsPrimitiveEvaluator *>( this )->buildTree();
+	}
+}
+
 void PointsPrimitiveEvaluator::validateResult( PrimitiveEvaluator::Result *result ) const
 {
 	if( ! dynamic_cast<PointsPrimitiveEvaluator::Result *>( result ) )
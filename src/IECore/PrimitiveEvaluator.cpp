@@ -32,7 +32,10 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
+#include "tbb/parallel_for.h"
+
 #include "IECore/PrimitiveEvaluator.h"
+#include "IECore/Exception.h"
 
 #include "IECore/MeshPrimitiveEvaluator.h"
 #include "IECore/SpherePrimitiveEvaluator.h"
@@ -40,6 +43,119 @@
 
 using namespace IECore;
 
+//////////////////////////////////////////////////////////////////////////
+// Queries for use with batchQuery()
+//////////////////////////////////////////////////////////////////////////
+
+namespace
+{
+
+class ClosestPointQuery
+{
+	public :
+
+		ClosestPointQuery( const std::vector<Imath::V3f> &points )
+			:	m_points( points )
+		{
+		}
+
+		bool operator()( const PrimitiveEvaluator *evaluator, size_t index, PrimitiveEvaluator::Result *result ) const
+		{
+			return evaluator->closestPoint( m_points[index], result );
+		}
+
+	private :
+
+		const std::vector<Imath::V3f> &m_points;
+
+};
+
+class PointAtUVQuery
+{
+	public :
+
+		PointAtUVQuery( const std::vector<Imath::V2f> &uvs )
+			:	m_uvs( uvs )
+		{
+		}
+
+		bool operator()( const PrimitiveEvaluator *evaluator, size_t index, PrimitiveEvaluator::Result *result ) const
+		{
+			return evaluator->pointAtUV( m_uvs[index], result );
+		}
+
+	private :
+
+		const std::vector<Imath::V2f> &m_uvs;
+
+};
+
+class IntersectionPointQuery
+{
+	public :
+
+		IntersectionPointQuery( const std::vector<Imath::V3f> &origins, const std::vector<Imath::V3f> &directions, float maxDistance )
+			:	m_origins( origins ), m_directions( directions ), m_maxDistance( maxDistance )
+		{
+		}
+
+		bool operator()( const PrimitiveEvaluator *evaluator, size_t index, PrimitiveEvaluator::Result *result ) const
+		{
+			const Imath::V3f &direction = m_directions.size() == 1 ? m_directions[0] : m_directions[index];
+			return evaluator->intersectionPoint( m_origins[index], direction, result, m_maxDistance );
+		}
+
+	private :
+
+		const std::vector<Imath::V3f> &m_origins;
+		const std::vector<Imath::V3f> &m_directions;
+		float m_maxDistance;
+
+};
+
+} // namespace
+
+//////////////////////////////////////////////////////////////////////////
+// PrimitiveEvaluator::BatchQueryTask
+//////////////////////////////////////////////////////////////////////////
+
+template<typename Query>
+class PrimitiveEvaluator::BatchQueryTask
+{
+	public :
+
+		BatchQueryTask( const PrimitiveEvaluator *evaluator, const Query &query, ResultArrays *resultArrays, std::vector<char> &success )
+			:	m_evaluator( evaluator ), m_query( query ), m_resultArrays( resultArrays ), m_success( success )
+		{
+		}
+
+		void operator()( const tbb::blocked_range<size_t> &r ) const
+		{
+			// one result is reused for the whole range, rather than
+			// allocating one per query.
+			ResultPtr result = m_evaluator->createResult();
+			for( size_t i = r.begin(); i != r.end(); ++i )
+			{
+				if( m_query( m_evaluator, i, result.get() ) )
+				{
+					m_resultArrays->set( i, result.get() );
+					m_success[i] = 1;
+				}
+			}
+		}
+
+	private :
+
+		const PrimitiveEvaluator *m_evaluator;
+		const Query &m_query;
+		ResultArrays *m_resultArrays;
+		// we use char rather than bool, as separate elements
+		// of a std::vector<bool> can't be written concurrently.
+		std::vector<char> &m_success;
+
+};
+
+
 IE_CORE_DEFINERUNTIMETYPED( PrimitiveEvaluator );
 
 PrimitiveEvaluator::CreatorMap &PrimitiveEvaluator::getCreateFns()
@@ -102,3 +218,113 @@ bool PrimitiveEvaluator::signedDistance( const Imath::V3f &p, float &distance )
 
 	return true;
 }
+
+//////////////////////////////////////////////////////////////////////////
+// Batch queries
+//////////////////////////////////////////////////////////////////////////
+
+PrimitiveEvaluator::ResultArrays::ResultArrays( size_t size, bool normals, bool uvs )
+	:	m_nWritable( 0 ), m_uvWritable( 0 )
+{
+	m_p = new V3fVectorData;
+	m_p->writable().resize( size );
+	m_pWritable = size ? &m_p->writable()[0] : 0;
+
+	if( normals )
+	{
+		m_n = new V3fVectorData;
+		m_n->writable().resize( size );
+		m_nWritable = size ? &m_n->writable()[0] : 0;
+	}
+
+	if( uvs )
+	{
+		m_uv = new V2fVectorData;
+		m_uv->writable().resize( size );
+		m_uvWritable = size ? &m_uv->writable()[0] : 0;
+	}
+}
+
+PrimitiveEvaluator::ResultArrays::~ResultArrays()
+{
+}
+
+void PrimitiveEvaluator::ResultArrays::set( size_t index, const Result *result )
+{
+	m_pWritable[index] = result->point();
+	if( m_nWritable )
+	{
+		m_nWritable[index] = result->normal();
+	}
+	if( m_uvWritable )
+	{
+		m_uvWritable[index] = result->uv();
+	}
+}
+
+CompoundDataPtr PrimitiveEvaluator::ResultArrays::arrays() const
+{
+	CompoundDataPtr result = new CompoundData;
+	result->writable()["P"] = m_p;
+	if( m_n )
+	{
+		result->writable()["N"] = m_n;
+	}
+	if( m_uv )
+	{
+		result->writable()["uv"] = m_uv;
+	}
+	return result;
+}
+
+PrimitiveEvaluator::ResultArraysPtr PrimitiveEvaluator::createResultArrays( size_t size ) const
+{
+	return new ResultArrays( size );
+}
+
+void PrimitiveEvaluator::prepareClosestPoints() const
+{
+}
+
+template<typename Query>
+CompoundDataPtr PrimitiveEvaluator::batchQuery( size_t size, const Query &query ) const
+{
+	ResultArraysPtr resultArrays = createResultArrays( size );
+	std::vector<char> success( size, 0 );
+
+	tbb::parallel_for(
+		tbb::blocked_range<size_t>( 0, size ),
+		BatchQueryTask<Query>( this, query, resultArrays.get(), success )
+	);
+
+	CompoundDataPtr result = resultArrays->arrays();
+	BoolVectorDataPtr successData = new BoolVectorData;
+	successData->writable().insert( successData->writable().end(), success.begin(), success.end() );
+	result->writable()["success"] = successData;
+
+	return result;
+}
+
+CompoundDataPtr PrimitiveEvaluator::closestPoints( const V3fVectorData *points ) const
+{
+	const std::vector<Imath::V3f> &p = points->readable();
+	prepareClosestPoints();
+	return batchQuery( p.size(), ClosestPointQuery( p ) );
+}
+
+CompoundDataPtr PrimitiveEvaluator::pointsAtUV( const V2fVectorData *uvs ) const
+{
+	const std::vector<Imath::V2f> &uv = uvs->readable();
+	return batchQuery( uv.size(), PointAtUVQuery( uv ) );
+}
+
+CompoundDataPtr PrimitiveEvaluator::closestIntersectionPoints( const V3fVectorData *origins, const V3fVectorData *directions, float maxDistance ) const
+{
+	const std::vector<Imath::V3f> &o = origins->readable();
+	const std::vector<Imath::V3f> &d = directions->readable();
+	if( d.size() != 1 && d.size() != o.size() )
+	{
+		throw InvalidArgumentException( "PrimitiveEvaluator::closestIntersectionPoints : Number of directions must be 1 or match the number of origins." );
+	}
+	return batchQuery( o.size(), IntersectionPointQuery( o, d, maxDistance ) );
+}
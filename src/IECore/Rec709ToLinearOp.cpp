@@ -73,6 +73,11 @@ struct Rec709ToLinearOp::Converter
 	}
 };
 
+bool Rec709ToLinearOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void Rec709ToLinearOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	Rec709ToLinearOp::Converter converter;
@@ -73,6 +73,11 @@ struct SRGBToLinearOp::Converter
 	}
 };
 
+bool SRGBToLinearOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void SRGBToLinearOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	SRGBToLinearOp::Converter converter;
@@ -34,6 +34,10 @@
 
 #include"boost/tuple/tuple.hpp"
 #include "tbb/concurrent_hash_map.h"
+#include "tbb/parallel_for.h"
+#include "tbb/blocked_range.h"
+#include "tbb/mutex.h"
+#include "tbb/task.h"
 
 #include "OpenEXR/ImathBoxAlgo.h"
 
@@ -44,6 +48,7 @@
 #include "IECore/ObjectInterpolator.h"
 #include "IECore/Primitive.h"
 #include "IECore/SimpleTypedData.h"
+#include "IECore/VectorTypedData.h"
 #include "IECore/TransformationMatrixData.h"
 #include "IECore/SharedSceneInterfaces.h"
 #include "IECore/MessageHandler.h"
@@ -810,6 +815,48 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 			}
 		}
 
+		// Reads the bounds and transforms for this location and all its descendants, returning them
+		// as flattened arrays in depth first order. See SceneCache::readHierarchy() for details.
+		CompoundDataPtr readHierarchy( double time )
+		{
+			// read everything into a temporary tree in parallel, and then flatten it.
+			HierarchyNode root;
+			readHierarchy( time, root );
+
+			CompoundDataPtr result = new CompoundData;
+			StringVectorDataPtr pathsData = new StringVectorData;
+			IntVectorDataPtr parentIndicesData = new IntVectorData;
+			Box3dVectorDataPtr boundsData = new Box3dVectorData;
+			M44dVectorDataPtr transformsData = new M44dVectorData;
+
+			const size_t size = root.size();
+			pathsData->writable().reserve( size );
+			parentIndicesData->writable().reserve( size );
+			boundsData->writable().reserve( size );
+			transformsData->writable().reserve( size );
+
+			Path p;
+			path( p );
+			std::string rootPath;
+			pathToString( p, rootPath );
+
+			flattenHierarchy( root, -1, rootPath, pathsData->writable(), parentIndicesData->writable(), boundsData->writable(), transformsData->writable() );
+
+			result->writable()["paths"] = pathsData;
+			result->writable()["parentIndices"] = parentIndicesData;
+			result->writable()["bounds"] = boundsData;
+			result->writable()["transforms"] = transformsData;
+			return result;
+		}
+
+		// Schedules the loading of the object and transform samples needed to read this
+		// location and all its descendants in the specified time range. Returns immediately,
+		// with the loading performed by background tasks and stored in the shared caches.
+		void prefetch( double startTime, double endTime )
+		{
+			tbb::task::enqueue( *new( tbb::task::allocate_root() ) PrefetchTask( this, startTime, endTime ) );
+		}
+
 		static ReaderImplementation *reader( Implementation *impl, bool throwException = true )
 		{
 			ReaderImplementation *reader = dynamic_cast< ReaderImplementation* >( impl );
@@ -937,6 +984,187 @@ class SceneCache::ReaderImplementation : public SceneCache::Implementation
 
 		};
 
+		// Temporary representation of the hierarchy used by readHierarchy().
+		struct HierarchyNode
+		{
+			Name name;
+			Imath::Box3d bound;
+			Imath::M44d transform;
+			std::vector<HierarchyNode> children;
+
+			size_t size() const
+			{
+				size_t result = 1;
+				for ( std::vector<HierarchyNode>::const_iterator it = children.begin(); it != children.end(); ++it )
+				{
+					result += it->size();
+				}
+				return result;
+			}
+		};
+
+		// Reads a range of child locations, so that siblings can be read in parallel.
+		class HierarchyReader
+		{
+			public :
+
+				HierarchyReader( ReaderImplementation *parent, double time, std::vector<HierarchyNode> &children )
+					:	m_parent( parent ), m_time( time ), m_children( children )
+				{
+				}
+
+				void operator()( const tbb::blocked_range<size_t> &r ) const
+				{
+					for ( size_t i = r.begin(); i != r.end(); ++i )
+					{
+						ReaderImplementationPtr c = m_parent->child( m_children[i].name, SceneInterface::ThrowIfMissing );
+						c->readHierarchy( m_time, m_children[i] );
+					}
+				}
+
+			private :
+
+				ReaderImplementation *m_parent;
+				double m_time;
+				std::vector<HierarchyNode> &m_children;
+
+		};
+
+		void readHierarchy( double time, HierarchyNode &node )
+		{
+			node.bound = readBound( time );
+			node.transform = readTransformAsMatrix( time );
+
+			NameList names;
+			childNames( names );
+			node.children.resize( names.size() );
+			for ( size_t i = 0; i < names.size(); ++i )
+			{
+				node.children[i].name = names[i];
+			}
+
+			tbb::parallel_for( tbb::blocked_range<size_t>( 0, names.size() ), HierarchyReader( this, time, node.children ) );
+		}
+
+		static void flattenHierarchy( const HierarchyNode &node, int parentIndex, const std::string &path, std::vector<std::string> &paths, std::vector<int> &parentIndices, std::vector<Imath::Box3d> &bounds, std::vector<Imath::M44d> &transforms )
+		{
+			const int index = paths.size();
+			paths.push_back( path );
+			parentIndices.push_back( parentIndex );
+			bounds.push_back( node.bound );
+			transforms.push_back( node.transform );
+
+			const std::string prefix = path == "/" ? path : path + "/";
+			for ( std::vector<HierarchyNode>::const_iterator it = node.children.begin(); it != node.children.end(); ++it )
+			{
+				flattenHierarchy( *it, index, prefix + it->name.value(), paths, parentIndices, bounds, transforms );
+			}
+		}
+
+		// Background task used to implement prefetch().
+		class PrefetchTask : public tbb::task
+		{
+			public :
+
+				PrefetchTask( ReaderImplementation *reader, double startTime, double endTime )
+					:	m_reader( reader ), m_startTime( startTime ), m_endTime( endTime )
+				{
+				}
+
+				virtual tbb::task *execute()
+				{
+					// there's nobody to report exceptions to, and they
+					// must not escape from an enqueued task.
+					try
+					{
+						m_reader->prefetchHierarchy( m_startTime, m_endTime );
+					}
+					catch( const std::exception &e )
+					{
+						msg( Msg::Warning, "SceneCache::prefetch", e.what() );
+					}
+					catch( ... )
+					{
+						msg( Msg::Warning, "SceneCache::prefetch", "Unknown exception" );
+					}
+					return 0;
+				}
+
+			private :
+
+				ReaderImplementationPtr m_reader;
+				double m_startTime;
+				double m_endTime;
+
+		};
+
+		// Prefetches a range of child locations, so that siblings can be loaded in parallel.
+		class ChildPrefetcher
+		{
+			public :
+
+				ChildPrefetcher( const std::vector< ReaderImplementationPtr > &children, double startTime, double endTime )
+					:	m_children( children ), m_startTime( startTime ), m_endTime( endTime )
+				{
+				}
+
+				void operator()( const tbb::blocked_range<size_t> &r ) const
+				{
+					for ( size_t i = r.begin(); i != r.end(); ++i )
+					{
+						m_children[i]->prefetchHierarchy( m_startTime, m_endTime );
+					}
+				}
+
+			private :
+
+				const std::vector< ReaderImplementationPtr > &m_children;
+				double m_startTime;
+				double m_endTime;
+
+		};
+
+		// Returns the indices of the first and last samples needed to read the time range.
+		static void sampleRange( const SampleTimes &sampleTimes, double startTime, double endTime, size_t &firstIndex, size_t &lastIndex )
+		{
+			size_t unused;
+			sampleInterval( sampleTimes, startTime, firstIndex, unused );
+			sampleInterval( sampleTimes, endTime, unused, lastIndex );
+		}
+
+		void prefetchHierarchy( double startTime, double endTime )
+		{
+			size_t firstIndex, lastIndex;
+			if ( m_indexedIO->hasEntry( objectEntry ) )
+			{
+				sampleRange( objectSampleTimes(), startTime, endTime, firstIndex, lastIndex );
+				for ( size_t i = firstIndex; i <= lastIndex; ++i )
+				{
+					readObjectAtSample( i );
+				}
+			}
+
+			if ( m_indexedIO->hasEntry( transformEntry ) )
+			{
+				sampleRange( transformSampleTimes(), startTime, endTime, firstIndex, lastIndex );
+				for ( size_t i = firstIndex; i <= lastIndex; ++i )
+				{
+					readTransformAtSample( i );
+				}
+			}
+
+			NameList names;
+			childNames( names );
+			std::vector< ReaderImplementationPtr > children;
+			children.reserve( names.size() );
+			for ( NameList::const_iterator it = names.begin(); it != names.end(); ++it )
+			{
+				children.push_back( child( *it, SceneInterface::ThrowIfMissing ) );
+			}
+
+			tbb::parallel_for( tbb::blocked_range<size_t>( 0, children.size() ), ChildPrefetcher( children, startTime, endTime ) );
+		}
+
 		ReaderImplementationPtr m_parent;
 		mutable SharedData *m_sharedData;
 
@@ -1438,6 +1666,15 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 		typedef ConstDataPtr TransformSample;
 		typedef std::vector< TransformSample > TransformSamples;
 
+		WriterImplementation *rootWriter()
+		{
+			if ( m_parent )
+			{
+				return m_parent->rootWriter();
+			}
+			return this;
+		}
+
 		IndexedIOPtr globalSampleTimes()
 		{
 			if ( m_parent )
@@ -1462,6 +1699,8 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 			assert( m_sampleTimesMap );
 			uint64_t sampleTimesIndex = 	0;
 			IndexedIO::EntryID samplesEntry;
+			// the map is shared by all the locations, which may be flushed concurrently
+			SampleTimesMutex::scoped_lock lock( rootWriter()->m_sampleTimesMutex );
 			std::pair< SampleTimesMap::iterator, bool > it = m_sampleTimesMap->insert( std::pair< SampleTimes, uint64_t >( sampleTimes, 0 ) );
 			if ( it.second )
 			{
@@ -1481,6 +1720,7 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 				sampleTimesIndex = it.first->second;
 				samplesEntry = sampleEntry(sampleTimesIndex);
 			}
+			lock.release();
 			location->createSubdirectory( sampleTimesEntry )->createSubdirectory( samplesEntry );
 		}
 		
@@ -1598,6 +1838,31 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 			
 		}
 
+		// Flushes a range of child locations, so that siblings can be flushed in parallel.
+		class ChildFlusher
+		{
+			public :
+
+				ChildFlusher( const std::vector< WriterImplementation * > &children, const NameList &ancestorTags, std::vector< NameList > &descendantTags )
+					: m_children( children ), m_ancestorTags( ancestorTags ), m_descendantTags( descendantTags )
+				{
+				}
+
+				void operator()( const tbb::blocked_range<size_t> &r ) const
+				{
+					for ( size_t i = r.begin(); i != r.end(); ++i )
+					{
+						m_children[i]->flush( m_ancestorTags, m_descendantTags[i] );
+					}
+				}
+
+			private :
+
+				const std::vector< WriterImplementation * > &m_children;
+				const NameList &m_ancestorTags;
+				std::vector< NameList > &m_descendantTags;
+		};
+
 		// Called from the destructor of the root location. 
 		// It triggers flush recursivelly on all the child locations.
 		// It also sets m_sampleTimesMap to NULL which prevents further modification on this and all child scene interface objects through their call to writable().
@@ -1606,18 +1871,44 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 		// animated bounding boxes in case they were not explicitly writen.
 		//
 		void flush()
+		{
+			NameList descendantTags;
+			flush( NameList(), descendantTags );
+		}
+
+		// Flushes this location and all its descendants, given the tags inherited from the parent location.
+		// Sibling locations are flushed in parallel, each of them writing to their own part of the file,
+		// and each finished child location is committed to the file so that its index can be freed.
+		// The tags which should be propagated to the parent are returned in descendantTags.
+		void flush( const NameList &ancestorTags, NameList &descendantTags )
 		{
 			if ( m_parent )
 			{
-				NameList tags;
-				// get ancestor tags from parent
-				m_parent->readTags( tags, SceneInterface::LocalTag | SceneInterface::AncestorTag );
-				writeTags( tags, SceneInterface::AncestorTag );
+				writeTags( ancestorTags, SceneInterface::AncestorTag );
 			}
+
 			/// first call flush recursively on children...
+			std::vector< WriterImplementation * > children;
+			children.reserve( m_children.size() );
 			for ( std::map< SceneCache::Name, WriterImplementationPtr >::const_iterator cit = m_children.begin(); cit != m_children.end(); cit++ )
 			{
-				cit->second->flush();
+				children.push_back( cit->second.get() );
+			}
+
+			if ( children.size() )
+			{
+				NameList childAncestorTags;
+				readTags( childAncestorTags, SceneInterface::LocalTag | SceneInterface::AncestorTag );
+
+				std::vector< NameList > childDescendantTags( children.size() );
+				ChildFlusher flusher( children, childAncestorTags, childDescendantTags );
+				tbb::parallel_for( tbb::blocked_range<size_t>( 0, children.size() ), flusher );
+
+				// propagate tags from the children
+				for ( std::vector< NameList >::const_iterator it = childDescendantTags.begin(); it != childDescendantTags.end(); ++it )
+				{
+					writeTags( *it, SceneInterface::DescendantTag );
+				}
 			}
 
 			IndexedIOPtr io;
@@ -1839,15 +2130,19 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 
 			if ( m_parent )
 			{
-				NameList tags;
-				// propagate tags to parent
-				readTags( tags, SceneInterface::LocalTag | SceneInterface::DescendantTag );
-				m_parent->writeTags( tags, SceneInterface::DescendantTag );
+				// tags to be propagated to the parent
+				readTags( descendantTags, SceneInterface::LocalTag | SceneInterface::DescendantTag );
 			}
 
 			// deallocate children since we now computed everything from them anyways...
 			m_children.clear();
 
+			if ( m_parent )
+			{
+				// this location is complete, so we can write its index to the file and release it from memory.
+				m_indexedIO->commit();
+			}
+
 			if ( !m_parent && m_sampleTimesMap )
 			{
 				// we are at the root...
@@ -1993,8 +2288,10 @@ class SceneCache::WriterImplementation : public SceneCache::Implementation
 
 		typedef std::map< SampleTimes, uint64_t > SampleTimesMap;
 		typedef std::map< SceneCache::Name, SampleTimes > AttributeSamplesMap;
+		typedef tbb::mutex SampleTimesMutex;
 
 		SampleTimesMap *m_sampleTimesMap;
+		SampleTimesMutex m_sampleTimesMutex;	// only used in the root location
 		SampleTimes m_boundSampleTimes;		// implicit or explicit bound sample times
 		SampleTimes m_transformSampleTimes;
 		AttributeSamplesMap m_attributeSampleTimes;
@@ -2312,6 +2609,18 @@ ConstObjectPtr SceneCache::readObject( double time ) const
 	return reader->readObject( time );
 }
 
+CompoundDataPtr SceneCache::readHierarchy( double time ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	return reader->readHierarchy( time );
+}
+
+void SceneCache::prefetch( double startTime, double endTime ) const
+{
+	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
+	reader->prefetch( startTime, endTime );
+}
+
 PrimitiveVariableMap SceneCache::readObjectPrimitiveVariables( const std::vector<InternedString> &primVarNames, double time ) const
 {
 	ReaderImplementation *reader = ReaderImplementation::reader( m_implementation.get() );
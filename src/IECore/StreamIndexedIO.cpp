@@ -38,18 +38,21 @@
 #include <list>
 #include <iostream>
 #include <cassert>
+#include <cstring>
 #include <map>
 #include <set>
 
 #include "boost/tokenizer.hpp"
 #include "boost/optional.hpp"
 #include "boost/format.hpp"
+#include "boost/scoped_array.hpp"
 #include "boost/iostreams/device/file.hpp"
 #include "boost/iostreams/filtering_streambuf.hpp"
 #include "boost/iostreams/filtering_stream.hpp"
 #include "boost/iostreams/stream.hpp"
 #include "boost/iostreams/filter/gzip.hpp"
 #include "tbb/spin_rw_mutex.h"
+#include "tbb/spin_mutex.h"
 
 #include "IECore/ByteOrder.h"
 #include "IECore/MemoryStream.h"
@@ -57,9 +60,11 @@
 #include "IECore/StreamIndexedIO.h"
 #include "IECore/VectorTypedData.h"
 #include "IECore/MurmurHash.h"
+#include "IECore/private/BlockCompression.h"
 
 #define HARDLINK				127
 #define SUBINDEX_DIR			126
+#define COMPRESSED_DATA			0x40
 
 static const Imf::Int64 g_unversionedMagicNumber = 0x0B00B1E5;
 static const Imf::Int64 g_versionedMagicNumber = 0xB00B1E50;
@@ -69,18 +74,32 @@ static const Imf::Int64 g_versionedMagicNumber = 0xB00B1E50;
 /// Version 5: introduced subindex as zipped data blocks (to reduce size of the main index). 
 ///            Hard links are represented as regular data nodes, that points to same data on file (no removal of data ever). 
 ///            Removed the linkCount field on the data nodes.
+/// Version 6: the main index and subindexes are stored as CompressedBlocks, with a choice of codec.
+///            Large numeric arrays may also be stored as CompressedBlocks, flagged with COMPRESSED_DATA in their DataType.
+///            Version 5 is still written when using the default codecs, so that those files remain readable by older libraries.
 /// \todo Store SubIndexSize and NodeCount as unsigned 64bit integers
-static const Imf::Int64 g_currentVersion = 5;
+static const Imf::Int64 g_currentVersion = 6;
+static const Imf::Int64 g_defaultCodecsVersion = 5;
+
+/// Arrays smaller than this are never compressed, as the gains wouldn't pay for the decompression overhead.
+static const size_t g_minCompressedDataSize = 16 * 1024;
 
 /// FileFormat ::= Data Index IndexOffset Version MagicNumber
 /// Data ::= DataEntry*
-/// Index ::= zip(StringCache NodeTree FreePages)
+/// Index ::= zip(StringCache NodeTree FreePages) ( Version 5 )
+///           CompressedBlock(StringCache NodeTree FreePages) ( Version 6 )
 
 /// DataEntry ::= Stores data from nodes: 
 ///                [Data nodes] binary data indexed by DataOffset/DataSize and 
-///                [Subindex]   SubIndexSize zip(NodeCount NodeTree*) indexed by SubIndexOffset.
+///                [Subindex]   SubIndexSize zip(NodeCount NodeTree*) indexed by SubIndexOffset ( Version 5 )
+///                [Subindex]   SubIndexSize CompressedBlock(NodeCount NodeTree*) indexed by SubIndexOffset ( Version 6 )
 /// SubIndexSize :: = uint32 - number of bytes in the zipped subindex that follows
 
+/// CompressedBlock ::= Codec UncompressedSize Payload
+/// Codec ::= char ( value from StreamIndexedIO::Codec )
+/// UncompressedSize ::= int64 ( number of bytes in the block once decompressed )
+/// Payload ::= the bytes compressed with the given Codec
+
 /// StringCache ::= NumStrings String*
 /// NumStrings ::= int64
 /// String ::= StringLength char*
@@ -92,7 +111,7 @@ static const Imf::Int64 g_currentVersion = 5;
 ///			 EntryType EntryStringCacheID SubIndexOffset ( If EntryType == SUBINDEX_DIR )
 /// EntryType ::= char ( value from IndexedIO::EntryType )
 /// EntryStringCacheID ::= int64 ( index in StringCache )
-/// DataType ::= char ( value from IndexedIO::DataType )
+/// DataType ::= char ( value from IndexedIO::DataType, or'ed with COMPRESSED_DATA when the data is a CompressedBlock )
 /// ArrayLength ::= int64 ( if DataType is array, then this tells how long they are )
 /// NodeID ::= int64 ( unique Id of this node in the file )
 /// ParentNodeID ::= int64 ( Id for the parent node )
@@ -140,6 +159,73 @@ void readLittleEndian( F &f, T &n )
 	}
 }
 
+//// Functions for compressed blocks //////
+
+static const size_t g_compressedBlockHeaderSize = sizeof(char) + sizeof(Imf::Int64);
+
+/// codecs used for new files, as specified by StreamIndexedIO::setCompression(). They are
+/// guarded by a mutex so that files being opened concurrently always see a consistent pair.
+static tbb::spin_mutex g_codecsMutex;
+static StreamIndexedIO::Codec g_indexCodec = StreamIndexedIO::Gzip;
+static StreamIndexedIO::Codec g_dataCodec = StreamIndexedIO::Uncompressed;
+
+static void currentCodecs( StreamIndexedIO::Codec &indexCodec, StreamIndexedIO::Codec &dataCodec )
+{
+	tbb::spin_mutex::scoped_lock lock( g_codecsMutex );
+	indexCodec = g_indexCodec;
+	dataCodec = g_dataCodec;
+}
+
+/// Fills result with the gzipped data.
+static void gzipData( const char *data, size_t size, std::vector<char> &result )
+{
+	result.clear();
+	BlockCompression::compress( BlockCompression::Gzip, data, size, result );
+}
+
+/// Fills block with a CompressedBlock holding the given data.
+static void compressBlock( StreamIndexedIO::Codec codec, const char *data, size_t size, std::vector<char> &block )
+{
+	block.resize( g_compressedBlockHeaderSize );
+	BlockCompression::compress( (BlockCompression::Codec)codec, data, size, block );
+
+	block[0] = codec;
+	const Imf::Int64 uncompressedSize = asLittleEndian<Imf::Int64>( size );
+	memcpy( &block[1], &uncompressedSize, sizeof( uncompressedSize ) );
+}
+
+/// Returns the number of bytes held by a CompressedBlock once decompressed.
+static Imf::Int64 compressedBlockSize( const char *block, size_t blockSize )
+{
+	if ( blockSize < g_compressedBlockHeaderSize )
+	{
+		throw IOException( "StreamIndexedIO: Corrupted compressed block!" );
+	}
+
+	Imf::Int64 uncompressedSize = 0;
+	memcpy( &uncompressedSize, block + 1, sizeof( uncompressedSize ) );
+	if ( bigEndian() )
+	{
+		uncompressedSize = reverseBytes<>( uncompressedSize );
+	}
+	return uncompressedSize;
+}
+
+/// Decompresses a CompressedBlock into buffer, which must be exactly the size returned by compressedBlockSize().
+static void decompressBlock( const char *block, size_t blockSize, char *buffer, size_t bufferSize )
+{
+	if ( compressedBlockSize( block, blockSize ) != (Imf::Int64)bufferSize )
+	{
+		throw IOException( "StreamIndexedIO: Unexpected size for compressed block!" );
+	}
+
+	BlockCompression::decompress(
+		(BlockCompression::Codec)block[0],
+		block + g_compressedBlockHeaderSize, blockSize - g_compressedBlockHeaderSize,
+		buffer, bufferSize
+	);
+}
+
 class StreamIndexedIO::StringCache
 {
 	public:
@@ -347,12 +433,18 @@ class SmallDataNode : public NodeBase
 		static const size_t maxArrayLength = UINT16_MAX;
 		static const size_t maxSize = UINT32_MAX;
 		
-		SmallDataNode( IndexedIO::EntryID name, IndexedIO::DataType dataType, Imf::Int64 arrayLength, Imf::Int64 size, Imf::Int64 offset ) : 
-			NodeBase(NodeBase::SmallData, name), m_dataType(dataType), m_arrayLength((Length)arrayLength), m_size((Size)size), m_offset(offset) {}
+		SmallDataNode( IndexedIO::EntryID name, IndexedIO::DataType dataType, Imf::Int64 arrayLength, Imf::Int64 size, Imf::Int64 offset, bool compressed = false ) : 
+			NodeBase(NodeBase::SmallData, name), m_dataType( compressed ? dataType | COMPRESSED_DATA : dataType ), m_arrayLength((Length)arrayLength), m_size((Size)size), m_offset(offset) {}
 
 		inline IndexedIO::DataType dataType() 
 		{
-			return static_cast<IndexedIO::DataType>(m_dataType);
+			return static_cast<IndexedIO::DataType>(m_dataType & ~COMPRESSED_DATA);
+		}
+
+		/// Returns true if the data is stored as a CompressedBlock
+		inline bool compressed()
+		{
+			return m_dataType & COMPRESSED_DATA;
 		}
 
 		inline Imf::Int64 arrayLength()
@@ -373,7 +465,7 @@ class SmallDataNode : public NodeBase
 	protected :
 
 		/// data fields from IndexedIO::Entry
-		// using char instead of enum to compact members in one word
+		// using char instead of enum to compact members in one word, along with the COMPRESSED_DATA flag
 		const char m_dataType;
 
 		/// data fields from IndexedIO::Entry
@@ -393,12 +485,18 @@ class DataNode : public NodeBase
 		static const size_t maxArrayLength = UINT64_MAX;
 		static const size_t maxSize = UINT64_MAX;
 		
-		DataNode( IndexedIO::EntryID name, IndexedIO::DataType dataType, Imf::Int64 arrayLength, Imf::Int64 size, Imf::Int64 offset ) : 
-			NodeBase(NodeBase::Data, name), m_dataType(dataType), m_arrayLength(arrayLength), m_size(size), m_offset(offset) {}
+		DataNode( IndexedIO::EntryID name, IndexedIO::DataType dataType, Imf::Int64 arrayLength, Imf::Int64 size, Imf::Int64 offset, bool compressed = false ) : 
+			NodeBase(NodeBase::Data, name), m_dataType( compressed ? dataType | COMPRESSED_DATA : dataType ), m_arrayLength(arrayLength), m_size(size), m_offset(offset) {}
 
 		inline IndexedIO::DataType dataType() 
 		{
-			return m_dataType;
+			return static_cast<IndexedIO::DataType>(m_dataType & ~COMPRESSED_DATA);
+		}
+
+		/// Returns true if the data is stored as a CompressedBlock
+		inline bool compressed()
+		{
+			return m_dataType & COMPRESSED_DATA;
 		}
 
 		inline Imf::Int64 arrayLength()
@@ -426,8 +524,8 @@ class DataNode : public NodeBase
 
 	protected :
 
-		/// data fields from IndexedIO::Entry
-		IndexedIO::DataType m_dataType;
+		/// data fields from IndexedIO::Entry, along with the COMPRESSED_DATA flag
+		char m_dataType;
 
 		/// data fields from IndexedIO::Entry
 		Imf::Int64 m_arrayLength;
@@ -579,10 +677,10 @@ class StreamIndexedIO::Node
 		// Returns the named child directory node or NULL if not existent. Loads the subindex for the child nodes (if applicable).
 		DirectoryNode* directoryChild( const IndexedIO::EntryID &name ) const;
 		/// returns information about the Data node
-		inline bool dataChildInfo( const IndexedIO::EntryID &name, size_t &offset, size_t &size ) const;
+		inline bool dataChildInfo( const IndexedIO::EntryID &name, size_t &offset, size_t &size, bool &compressed ) const;
 
 		DirectoryNode* addChild( const IndexedIO::EntryID & childName );
-		void addDataChild( const IndexedIO::EntryID & childName, IndexedIO::DataType dataType, size_t arrayLen, size_t offset, size_t size );
+		void addDataChild( const IndexedIO::EntryID & childName, IndexedIO::DataType dataType, size_t arrayLen, size_t offset, size_t size, bool compressed = false );
 
 		void removeChild( const IndexedIO::EntryID &childName, bool throwException = true );
 
@@ -625,6 +723,15 @@ class StreamIndexedIO::Index : public RefCounted
 		/// \param prefixSize If true than it will prepend to the block, the size of it
 		Imf::Int64 writeUniqueData( const char *data, size_t size, bool prefixSize = false );
 
+		/// Variant of writeUniqueData() for numeric arrays, which compresses the data with the data codec
+		/// when the file format allows it and it's worthwhile. Returns the offset and fills in the stored size
+		/// of the data and whether it was compressed, so that it can be read back with readData().
+		Imf::Int64 writeUniqueArrayData( const char *data, size_t size, size_t &storedSize, bool &compressed );
+
+		/// Reads the data stored at offset into buffer, decompressing it if necessary. The bufferSize
+		/// must match the size of the data as it was passed to writeUniqueData() or writeUniqueArrayData().
+		void readData( size_t offset, size_t size, bool compressed, char *buffer, size_t bufferSize ) const;
+
 		/// flushes the children of the given directory node to a subindex in the file
 		void commitNodeToSubIndex( DirectoryNode *n );
 
@@ -651,6 +758,10 @@ class StreamIndexedIO::Index : public RefCounted
 
 		Imf::Int64 m_version;
 
+		/// codecs used for writing new blocks ( Version 6 onwards )
+		StreamIndexedIO::Codec m_indexCodec;
+		StreamIndexedIO::Codec m_dataCodec;
+
 		bool m_hasChanged;
 
 		Imf::Int64 m_offset;
@@ -709,6 +820,12 @@ class StreamIndexedIO::Index : public RefCounted
 		template < typename F >
 		void writeNodeChildren( DirectoryNode *n, F &f );
 
+		/// Compresses a serialised index or subindex, ready to be written in the file.
+		void compressIndexData( const char *data, size_t size, std::vector<char> &result ) const;
+		/// Prepares a stream for reading an index or subindex, as stored by compressIndexData().
+		/// Takes ownership of data.
+		void indexStream( io::filtering_istream &stream, char *data, size_t size ) const;
+
 		template < typename F >
 		void read( F &f );
 
@@ -915,7 +1032,7 @@ DirectoryNode* StreamIndexedIO::Node::directoryChild( const IndexedIO::EntryID &
 	return 0;
 }
 
-bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, size_t &offset, size_t &size ) const
+bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, size_t &offset, size_t &size, bool &compressed ) const
 {
 	Index::MutexLock lock;
 	m_idx->lockDirectory( lock, m_node );
@@ -930,6 +1047,7 @@ bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, size_
 			DataNode *n = static_cast< DataNode *>( p );
 			offset = n->offset();
 			size = n->size();
+			compressed = n->compressed();
 			return true;
 		}
 		else if ( p->nodeType() == NodeBase::SmallData )
@@ -937,6 +1055,7 @@ bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, size_
 			SmallDataNode *n = static_cast< SmallDataNode *>( p );
 			offset = n->offset();
 			size = n->size();
+			compressed = n->compressed();
 			return true;
 		}
 	}
@@ -945,6 +1064,8 @@ bool StreamIndexedIO::Node::dataChildInfo( const IndexedIO::EntryID &name, size_
 
 DirectoryNode* StreamIndexedIO::Node::addChild( const IndexedIO::EntryID &childName )
 {
+	StreamFile::MutexLock lock( m_idx->streamFile().mutex() );
+
 	if ( m_node->subindex() )
 	{
 		throw Exception( "Cannot modify the file at current location! It was already committed to the file." );
@@ -969,8 +1090,10 @@ DirectoryNode* StreamIndexedIO::Node::addChild( const IndexedIO::EntryID &childN
 	return child;
 }
 
-void StreamIndexedIO::Node::addDataChild( const IndexedIO::EntryID &childName, IndexedIO::DataType dataType, size_t arrayLen, size_t offset, size_t size )
+void StreamIndexedIO::Node::addDataChild( const IndexedIO::EntryID &childName, IndexedIO::DataType dataType, size_t arrayLen, size_t offset, size_t size, bool compressed )
 {
+	StreamFile::MutexLock lock( m_idx->streamFile().mutex() );
+
 	if ( m_node->subindex() )
 	{
 		throw Exception( "Cannot modify the file at current location! It was already committed to the file." );
@@ -985,7 +1108,7 @@ void StreamIndexedIO::Node::addDataChild( const IndexedIO::EntryID &childName, I
 
 	if ( arrayLen <= SmallDataNode::maxArrayLength && size <= SmallDataNode::maxSize )
 	{
-		SmallDataNode* child = new SmallDataNode(childName, dataType, arrayLen, size, offset);
+		SmallDataNode* child = new SmallDataNode(childName, dataType, arrayLen, size, offset, compressed);
 		if ( !child )
 		{
 			throw Exception( "Failed to allocate node!" );
@@ -994,7 +1117,7 @@ void StreamIndexedIO::Node::addDataChild( const IndexedIO::EntryID &childName, I
 	}
 	else
 	{
-		DataNode* child = new DataNode(childName, dataType, arrayLen, size, offset);
+		DataNode* child = new DataNode(childName, dataType, arrayLen, size, offset, compressed);
 		if ( !child )
 		{
 			throw Exception( "Failed to allocate node!" );
@@ -1046,6 +1169,8 @@ void StreamIndexedIO::Node::childNames( IndexedIO::EntryIDList &names, IndexedIO
 
 void StreamIndexedIO::Node::removeChild( const IndexedIO::EntryID &childName, bool throwException )
 {
+	StreamFile::MutexLock lock( m_idx->streamFile().mutex() );
+
 	DirectoryNode::ChildMap::iterator it = m_node->findChild( childName );
 	if ( it == m_node->children().end() )
 	{
@@ -1075,7 +1200,7 @@ void StreamIndexedIO::Node::removeChild( const IndexedIO::EntryID &childName, bo
 //
 ///////////////////////////////////////////////
 
-StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream ) : m_root(0), m_version(g_currentVersion), m_hasChanged(false), m_offset(0), m_next(0), m_stream(stream)
+StreamIndexedIO::Index::Index( StreamIndexedIO::StreamFilePtr stream ) : m_root(0), m_version(g_currentVersion), m_indexCodec(StreamIndexedIO::Gzip), m_dataCodec(StreamIndexedIO::Uncompressed), m_hasChanged(false), m_offset(0), m_next(0), m_stream(stream)
 {
 	m_stringCache.add(IndexedIO::rootName);
 }
@@ -1147,6 +1272,11 @@ void StreamIndexedIO::Index::openStream()
 			throw IOException("Not a StreamIndexedIO file");
 		}
 
+		if ( m_version > g_currentVersion )
+		{
+			throw IOException( "StreamIndexedIO: File format version is newer than supported by this library" );
+		}
+
 		f.seekg( m_offset, std::ios::beg );
 
 		if (m_version >= 2 )
@@ -1154,9 +1284,7 @@ void StreamIndexedIO::Index::openStream()
 			io::filtering_istream decompressingStream;
 			char *compressedIndex = new char[ end - m_offset ];
 			f.read( compressedIndex, end - m_offset );
-			MemoryStreamSource source( compressedIndex, end - m_offset, true );
-			decompressingStream.push( io::gzip_decompressor() );
-			decompressingStream.push( source );
+			indexStream( decompressingStream, compressedIndex, end - m_offset );
 			assert( decompressingStream.is_complete() );
 
 			read( decompressingStream );
@@ -1165,12 +1293,29 @@ void StreamIndexedIO::Index::openStream()
 		{
 			read( f );
 		}
+
+		if ( m_version >= 6 )
+		{
+			// blocks describe their own codec, so new ones can use the current settings
+			currentCodecs( m_indexCodec, m_dataCodec );
+		}
+		else if ( m_version < g_defaultCodecsVersion )
+		{
+			// older files are fully loaded by now, and will be updated when the index is written
+			m_version = g_defaultCodecsVersion;
+		}
 	}
 	else
 	{
 		// creating a new empty Index
 		m_root = new DirectoryNode(IndexedIO::rootName);
 		m_hasChanged = true;
+
+		currentCodecs( m_indexCodec, m_dataCodec );
+		if ( m_indexCodec == StreamIndexedIO::Gzip && m_dataCodec == StreamIndexedIO::Uncompressed )
+		{
+			m_version = g_defaultCodecsVersion;
+		}
 	}
 }
 
@@ -1336,7 +1481,13 @@ NodeBase *StreamIndexedIO::Index::readNode( F &f )
 		char t;
 		IndexedIO::DataType dataType = IndexedIO::Invalid;
 		Imf::Int64 arrayLength = 0;
+		bool compressed = false;
 		f.read( &t, sizeof(char) );
+		if ( m_version >= 6 )
+		{
+			compressed = t & COMPRESSED_DATA;
+			t &= ~COMPRESSED_DATA;
+		}
 		dataType = (IndexedIO::DataType)t;
 	
 		if ( IndexedIO::Entry::isArray( dataType ) )
@@ -1350,12 +1501,12 @@ NodeBase *StreamIndexedIO::Index::readNode( F &f )
 
 		if ( arrayLength <= SmallDataNode::maxArrayLength && size <= SmallDataNode::maxSize )
 		{
-			SmallDataNode *n = new SmallDataNode( m_stringCache.findById( stringId ), dataType, arrayLength, size, offset );
+			SmallDataNode *n = new SmallDataNode( m_stringCache.findById( stringId ), dataType, arrayLength, size, offset, compressed );
 			return n;
 		}
 		else
 		{
-			DataNode *n = new DataNode( m_stringCache.findById( stringId ), dataType, arrayLength, size, offset );
+			DataNode *n = new DataNode( m_stringCache.findById( stringId ), dataType, arrayLength, size, offset, compressed );
 			return n;
 		}
 	}
@@ -1498,6 +1649,10 @@ void StreamIndexedIO::Index::writeDataNode( D *node, F &f )
 	writeLittleEndian( f, id );
 
 	t = node->dataType();
+	if ( node->compressed() )
+	{
+		t |= COMPRESSED_DATA;
+	}
 	f.write( &t, sizeof(char) );
 
 	if ( IndexedIO::Entry::isArray(node->dataType()) )
@@ -1593,42 +1748,42 @@ Imf::Int64 StreamIndexedIO::Index::write()
 	m_offset = indexStart;
 
 	MemoryStreamSink sink;
-	io::filtering_ostream compressingStream;
-	compressingStream.push( io::gzip_compressor() );
-	compressingStream.push( sink );
-	assert( compressingStream.is_complete() );
+	io::filtering_ostream uncompressedStream;
+	uncompressedStream.push( sink );
+	assert( uncompressedStream.is_complete() );
 
-	m_stringCache.write( compressingStream );
+	m_stringCache.write( uncompressedStream );
 
-	writeNode( m_root, compressingStream );
+	writeNode( m_root, uncompressedStream );
 
 	assert( m_freePagesOffset.size() == m_freePagesSize.size() );
 	Imf::Int64 numFreePages = m_freePagesSize.size();
 
 	// Write out number of free "pages"
-	writeLittleEndian( compressingStream, numFreePages);
+	writeLittleEndian( uncompressedStream, numFreePages);
 
 	/// Write out each free page
 	for ( FreePagesSizeMap::const_iterator it = m_freePagesSize.begin(); it != m_freePagesSize.end(); ++it)
 	{
-		writeLittleEndian( compressingStream, it->second->m_offset );
-		writeLittleEndian( compressingStream, it->second->m_size );
+		writeLittleEndian( uncompressedStream, it->second->m_offset );
+		writeLittleEndian( uncompressedStream, it->second->m_size );
 	}
 
 	/// To synchronize/close, etc.
-	compressingStream.pop();
-	compressingStream.pop();
+	uncompressedStream.pop();
 
-	char *data=0;
-	std::streamsize sz;
-	sink.get( data, sz );
-	assert( data );
-	assert( sz > 0 );
+	char *index=0;
+	std::streamsize indexSize;
+	sink.get( index, indexSize );
 
-	f.write( data, sz );
+	std::vector<char> data;
+	compressIndexData( index, indexSize, data );
+	assert( data.size() > 0 );
+
+	f.write( &data[0], data.size() );
 
 	writeLittleEndian( f, m_offset );
-	writeLittleEndian( f, g_currentVersion );
+	writeLittleEndian( f, m_version );
 	writeLittleEndian( f, g_versionedMagicNumber );
 
 	m_hasChanged = false;
@@ -1832,15 +1987,17 @@ void StreamIndexedIO::Index::addFreePage(  Imf::Int64 offset, Imf::Int64 sz )
 
 Imf::Int64 StreamIndexedIO::Index::writeUniqueData( const char *data, size_t size, bool prefixSize )
 {
-	m_hasChanged = true;
-
 	/// Find next writable location
 	Imf::Int64 loc;
 
-	// compute hash for the data
+	// compute hash for the data, before locking so that other threads can carry on writing
 	MurmurHash hash;
 	hash.append( data, size );
 
+	StreamFile::MutexLock lock( m_stream->mutex() );
+
+	m_hasChanged = true;
+
 	if ( size >= UINT32_MAX )
 	{
 		throw IOException( "StreamIndexedIO: Data size too long!" );
@@ -1879,6 +2036,70 @@ Imf::Int64 StreamIndexedIO::Index::writeUniqueData( const char *data, size_t siz
 	return loc;
 }
 
+Imf::Int64 StreamIndexedIO::Index::writeUniqueArrayData( const char *data, size_t size, size_t &storedSize, bool &compressed )
+{
+	if ( m_version >= 6 && m_dataCodec != StreamIndexedIO::Uncompressed && size >= g_minCompressedDataSize )
+	{
+		std::vector<char> block;
+		compressBlock( m_dataCodec, data, size, block );
+		// incompressible data is better left as it is
+		if ( block.size() < size )
+		{
+			storedSize = block.size();
+			compressed = true;
+			return writeUniqueData( &block[0], block.size() );
+		}
+	}
+
+	storedSize = size;
+	compressed = false;
+	return writeUniqueData( data, size );
+}
+
+void StreamIndexedIO::Index::readData( size_t offset, size_t size, bool compressed, char *buffer, size_t bufferSize ) const
+{
+	if ( !compressed )
+	{
+		m_stream->positionalRead( buffer, size, offset );
+		return;
+	}
+
+	boost::scoped_array<char> block( new char[size] );
+	m_stream->positionalRead( block.get(), size, offset );
+	decompressBlock( block.get(), size, buffer, bufferSize );
+}
+
+void StreamIndexedIO::Index::compressIndexData( const char *data, size_t size, std::vector<char> &result ) const
+{
+	if ( m_version >= 6 )
+	{
+		compressBlock( m_indexCodec, data, size, result );
+	}
+	else
+	{
+		gzipData( data, size, result );
+	}
+}
+
+void StreamIndexedIO::Index::indexStream( io::filtering_istream &stream, char *data, size_t size ) const
+{
+	MemoryStreamSource source( data, size, true /* takes ownership of data */ );
+
+	if ( m_version >= 6 )
+	{
+		Imf::Int64 indexSize = compressedBlockSize( data, size );
+		char *index = new char[indexSize];
+		MemoryStreamSource indexSource( index, indexSize, true /* takes ownership of index */ );
+		decompressBlock( data, size, index, indexSize );
+		stream.push( indexSource );
+	}
+	else
+	{
+		stream.push( io::gzip_decompressor() );
+		stream.push( source );
+	}
+}
+
 void StreamIndexedIO::Index::deallocateWalk( NodeBase* n )
 {
 	assert(n);
@@ -1912,61 +2133,113 @@ void StreamIndexedIO::Index::commitNodeToSubIndex( DirectoryNode *n )
 		return;
 	}
 
-	if ( n->subindex() == DirectoryNode::NoSubIndex )
+	MemoryStreamSink sink;
+
 	{
-		MemoryStreamSink sink;
-		io::filtering_ostream compressingStream;
-		compressingStream.push( io::gzip_compressor() );
-		compressingStream.push( sink );
-		assert( compressingStream.is_complete() );
+		/// the string cache may be changed by other threads writing to the file
+		StreamFile::MutexLock lock( m_stream->mutex() );
 
-		writeNodeChildren( n, compressingStream );
+		if ( n->subindex() != DirectoryNode::NoSubIndex )
+		{
+			return;
+		}
 
-		compressingStream.pop();
-		compressingStream.pop();
+		io::filtering_ostream subindexStream;
+		subindexStream.push( sink );
+		assert( subindexStream.is_complete() );
 
-		char *data=0;
-		std::streamsize sz;
-		sink.get( data, sz );
-		uint32_t subindexSize = sz;
+		writeNodeChildren( n, subindexStream );
 
-		// tell the Directory node that it's contents have been written as a subindex		
-		n->setSubIndexOffset( writeUniqueData( data, subindexSize, true ) );
+		subindexStream.pop();
 	}
+
+	/// compression happens outside the lock, so that other threads can keep writing
+	char *subindex=0;
+	std::streamsize subindexSize;
+	sink.get( subindex, subindexSize );
+
+	std::vector<char> data;
+	compressIndexData( subindex, subindexSize, data );
+
+	Imf::Int64 offset = writeUniqueData( &data[0], data.size(), true );
+
+	StreamFile::MutexLock lock( m_stream->mutex() );
+	// tell the Directory node that it's contents have been written as a subindex		
+	n->setSubIndexOffset( offset );
 }
 
 void StreamIndexedIO::Index::readNodeFromSubIndex( DirectoryNode *n )
 {
-	/// guarantees thread safe access to the file and also to the m_subindex variable
-	StreamFile::MutexLock lock( m_stream->mutex() );
-
-	if ( n->subindex() == DirectoryNode::LoadedSubIndex )
 	{
-		return;
+		/// the stream mutex guarantees thread safe access to the m_subindex variable
+		StreamFile::MutexLock lock( m_stream->mutex() );
+		if ( n->subindex() == DirectoryNode::LoadedSubIndex )
+		{
+			return;
+		}
 	}
 
-	m_stream->seekg( n->offset(), std::ios::beg );
-
+	/// The subindex is read and decompressed without holding any lock, so that
+	/// multiple threads can load different locations concurrently.
 	uint32_t subindexSize = 0;
-	readLittleEndian( *m_stream, subindexSize );
+	m_stream->positionalRead( (char *)&subindexSize, sizeof( subindexSize ), n->offset() );
+	if ( bigEndian() )
+	{
+		subindexSize = reverseBytes<>( subindexSize );
+	}
 
-	char *data = m_stream->ioBuffer(subindexSize);
-	m_stream->read( data, subindexSize );
+	char *data = new char[subindexSize];
+	try
+	{
+		m_stream->positionalRead( data, subindexSize, n->offset() + sizeof( subindexSize ) );
+	}
+	catch ( ... )
+	{
+		delete [] data;
+		throw;
+	}
 
 	io::filtering_istream decompressingStream;
-	MemoryStreamSource source( data, subindexSize, false );
-	decompressingStream.push( io::gzip_decompressor() );
-	decompressingStream.push( source );
+	indexStream( decompressingStream, data, subindexSize );
 	assert( decompressingStream.is_complete() );
 
 	uint32_t nodeCount = 0;
 
 	readLittleEndian( decompressingStream, nodeCount );
-	
-	for ( uint32_t i = 0; i < nodeCount; i++ )
+
+	std::vector< NodeBase * > children;
+	children.reserve( nodeCount );
+	try
+	{
+		for ( uint32_t i = 0; i < nodeCount; i++ )
+		{
+			children.push_back( readNode( decompressingStream ) );
+		}
+	}
+	catch ( ... )
+	{
+		for ( std::vector< NodeBase * >::const_iterator it = children.begin(); it != children.end(); ++it )
+		{
+			NodeBase::destroy( *it );
+		}
+		throw;
+	}
+
+	StreamFile::MutexLock lock( m_stream->mutex() );
+
+	if ( n->subindex() == DirectoryNode::LoadedSubIndex )
+	{
+		/// another thread loaded the same subindex while we were reading it.
+		for ( std::vector< NodeBase * >::const_iterator it = children.begin(); it != children.end(); ++it )
+		{
+			NodeBase::destroy( *it );
+		}
+		return;
+	}
+
+	for ( std::vector< NodeBase * >::const_iterator it = children.begin(); it != children.end(); ++it )
 	{
-		NodeBase *child = readNode( decompressingStream );
-		n->registerChild( child );
+		n->registerChild( *it );
 	}
 
 	/// make sure the children is sorted to avoid non-thread safe sorting happening later...
@@ -2000,7 +2273,7 @@ void StreamIndexedIO::Index::lockDirectory( MutexLock &lock, const DirectoryNode
 //
 ///////////////////////////////////////////////
 
-StreamIndexedIO::StreamFile::StreamFile( IndexedIO::OpenMode mode ) : m_openmode(mode), m_stream(0), m_ioBufferLen(0), m_ioBuffer(0)
+StreamIndexedIO::StreamFile::StreamFile( IndexedIO::OpenMode mode ) : m_openmode(mode), m_stream(0)
 {
 	IndexedIO::validateOpenMode(m_openmode);
 }
@@ -2011,10 +2284,6 @@ StreamIndexedIO::StreamFile::~StreamFile()
 	{
 		delete m_stream;
 	}
-	if ( m_ioBuffer )
-	{
-		delete [] m_ioBuffer;
-	}
 }
 
 IndexedIO::OpenMode StreamIndexedIO::StreamFile::openMode() const
@@ -2031,22 +2300,6 @@ void StreamIndexedIO::StreamFile::setStream( std::iostream *stream, bool emptyFi
 	}
 }
 
-char *StreamIndexedIO::StreamFile::ioBuffer( unsigned long size )
-{
-	if ( !m_ioBuffer )
-	{
-		m_ioBuffer = new char[size];
-		m_ioBufferLen = size;
-	}
-	else if ( size > m_ioBufferLen )
-	{
-		delete [] m_ioBuffer;
-		m_ioBuffer = new char[size];
-		m_ioBufferLen = size;
-	}
-	return m_ioBuffer;
-}
-
 StreamIndexedIO::StreamFile::Mutex & StreamIndexedIO::StreamFile::mutex()
 {
 	return m_mutex;
@@ -2103,6 +2356,13 @@ Imf::Int64 StreamIndexedIO::StreamFile::tellp()
 	return m_stream->tellp();
 }
 
+void StreamIndexedIO::StreamFile::positionalRead( char *buffer, size_t size, size_t pos )
+{
+	MutexLock lock( m_mutex );
+	m_stream->seekg( pos, std::ios::beg );
+	m_stream->read( buffer, size );
+}
+
 void StreamIndexedIO::StreamFile::read( char *buffer, size_t size )
 {
 	m_stream->read( buffer, size );
@@ -2125,6 +2385,27 @@ void StreamIndexedIO::StreamFile::write( const char *buffer, size_t size )
 //
 ///////////////////////////////////////////////
 
+void StreamIndexedIO::setCompression( Codec indexCodec, Codec dataCodec )
+{
+	if ( !codecAvailable( indexCodec ) || !codecAvailable( dataCodec ) )
+	{
+		throw InvalidArgumentException( "StreamIndexedIO::setCompression : Codec not available in this build." );
+	}
+	tbb::spin_mutex::scoped_lock lock( g_codecsMutex );
+	g_indexCodec = indexCodec;
+	g_dataCodec = dataCodec;
+}
+
+void StreamIndexedIO::getCompression( Codec &indexCodec, Codec &dataCodec )
+{
+	currentCodecs( indexCodec, dataCodec );
+}
+
+bool StreamIndexedIO::codecAvailable( Codec codec )
+{
+	return BlockCompression::available( (BlockCompression::Codec)codec );
+}
+
 StreamIndexedIO::StreamIndexedIO() : m_node(0)
 {
 }
@@ -2454,30 +2735,32 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const InternedString
 	writable(name);
 	remove(name, false);
 
-	Imf::Int64 *ids = new Imf::Int64[arrayLength];
-	const Imf::Int64 *constIds = ids;
+	boost::scoped_array<Imf::Int64> ids( new Imf::Int64[arrayLength] );
+	const Imf::Int64 *constIds = ids.get();
 	unsigned long size = IndexedIO::DataSizeTraits<Imf::Int64 *>::size(constIds, arrayLength);
 	IndexedIO::DataType dataType = IndexedIO::InternedStringArray;
 
-	char *data = streamFile().ioBuffer(size);
-	assert(data);
+	boost::scoped_array<char> data( new char[size] );
 
 	Index *index = m_node->m_idx.get();
 
 	StringCache &stringCache = index->stringCache();
 
-	for ( unsigned long i = 0; i < arrayLength; i++ )
 	{
-		ids[i] = stringCache.find( x[i], false /* create entry if missing */ );
+		StreamFile::MutexLock lock( streamFile().mutex() );
+		for ( unsigned long i = 0; i < arrayLength; i++ )
+		{
+			ids[i] = stringCache.find( x[i], false /* create entry if missing */ );
+		}
 	}
 
-	IndexedIO::DataFlattenTraits<Imf::Int64*>::flatten(constIds, arrayLength, data);
-
-	size_t offset = index->writeUniqueData( data, size );
+	IndexedIO::DataFlattenTraits<Imf::Int64*>::flatten(constIds, arrayLength, data.get());
 
-	m_node->addDataChild( name, dataType, arrayLength, offset, size );
+	size_t storedSize = size;
+	bool compressed = false;
+	size_t offset = index->writeUniqueArrayData( data.get(), size, storedSize, compressed );
 
-	delete [] ids;
+	m_node->addDataChild( name, dataType, arrayLength, offset, storedSize, compressed );
 }
 
 void StreamIndexedIO::read(const IndexedIO::EntryID &name, InternedString *&x, unsigned long arrayLength) const
@@ -2486,28 +2769,22 @@ void StreamIndexedIO::read(const IndexedIO::EntryID &name, InternedString *&x, u
 	readable(name);
 
 	Imf::Int64 dataOffset(0), dataSize(0);
+	bool compressed = false;
 
-	if ( !m_node->dataChildInfo( name, dataOffset, dataSize ) )
+	if ( !m_node->dataChildInfo( name, dataOffset, dataSize, compressed ) )
 	{
 		throw IOException( "StreamIndexedIO::read : Data entry not found '" + name.value() + "'" );
 	}
 
 	Imf::Int64 *ids = new Imf::Int64[arrayLength];
 
-	StreamIndexedIO::StreamFile &f = streamFile();
-	{
-		StreamFile::MutexLock lock( f.mutex() );
-		f.seekg( dataOffset, std::ios::beg );
-
 #ifdef IE_CORE_LITTLE_ENDIAN
-		// raw read
-		f.read( (char*)ids, dataSize );
-	}
+	// raw read
+	m_node->m_idx->readData( dataOffset, dataSize, compressed, (char*)ids, arrayLength * sizeof( Imf::Int64 ) );
 #else
-		char *data = f.ioBuffer(dataSize);
-		f.read( data, dataSize );
-	}
-	IndexedIO::DataFlattenTraits<Imf::Int64*>::unflatten( data, ids, arrayLength );
+	boost::scoped_array<char> data( new char[arrayLength * sizeof( Imf::Int64 )] );
+	m_node->m_idx->readData( dataOffset, dataSize, compressed, data.get(), arrayLength * sizeof( Imf::Int64 ) );
+	IndexedIO::DataFlattenTraits<Imf::Int64*>::unflatten( data.get(), ids, arrayLength );
 #endif
 
 	const StringCache &stringCache = m_node->m_idx->stringCache();
@@ -2532,13 +2809,22 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T *x, unsigned
 	unsigned long size = IndexedIO::DataSizeTraits<T*>::size(x, arrayLength);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T*>::type();
 
-	char *data = streamFile().ioBuffer(size);
-	assert(data);
-	IndexedIO::DataFlattenTraits<T*>::flatten(x, arrayLength, data);
+	boost::scoped_array<char> data( new char[size] );
+	IndexedIO::DataFlattenTraits<T*>::flatten(x, arrayLength, data.get());
 
-	Imf::Int64 offset = m_node->m_idx->writeUniqueData( data, size );
+	size_t storedSize = size;
+	bool compressed = false;
+	Imf::Int64 offset = 0;
+	if ( dataType == IndexedIO::StringArray )
+	{
+		offset = m_node->m_idx->writeUniqueData( data.get(), size );
+	}
+	else
+	{
+		offset = m_node->m_idx->writeUniqueArrayData( data.get(), size, storedSize, compressed );
+	}
 
-	m_node->addDataChild( name, dataType, arrayLength, offset, size );
+	m_node->addDataChild( name, dataType, arrayLength, offset, storedSize, compressed );
 }
 
 template<typename T>
@@ -2550,9 +2836,11 @@ void StreamIndexedIO::rawWrite(const IndexedIO::EntryID &name, const T *x, unsig
 	unsigned long size = IndexedIO::DataSizeTraits<T*>::size(x, arrayLength);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T*>::type();
 
-	Imf::Int64 offset =  m_node->m_idx->writeUniqueData( (char*)x, size );
+	size_t storedSize = size;
+	bool compressed = false;
+	Imf::Int64 offset =  m_node->m_idx->writeUniqueArrayData( (char*)x, size, storedSize, compressed );
 
-	m_node->addDataChild( name, dataType, arrayLength, offset, size );
+	m_node->addDataChild( name, dataType, arrayLength, offset, storedSize, compressed );
 }
 
 template<typename T>
@@ -2564,11 +2852,10 @@ void StreamIndexedIO::write(const IndexedIO::EntryID &name, const T &x)
 	unsigned long size = IndexedIO::DataSizeTraits<T>::size(x);
 	IndexedIO::DataType dataType = IndexedIO::DataTypeTraits<T>::type();
 
-	char *data = streamFile().ioBuffer(size);
-	assert(data);
-	IndexedIO::DataFlattenTraits<T>::flatten(x, data);
+	boost::scoped_array<char> data( new char[size] );
+	IndexedIO::DataFlattenTraits<T>::flatten(x, data.get());
 
-	Imf::Int64 offset =  m_node->m_idx->writeUniqueData( data, size );
+	Imf::Int64 offset =  m_node->m_idx->writeUniqueData( data.get(), size );
 
 	m_node->addDataChild( name, dataType, 0, offset, size );
 }
@@ -2594,20 +2881,18 @@ void StreamIndexedIO::read(const IndexedIO::EntryID &name, T *&x, unsigned long
 	readable(name);
 
 	Imf::Int64 dataOffset(0), dataSize(0);
+	bool compressed = false;
 
-	if ( !m_node->dataChildInfo( name, dataOffset, dataSize ) )
+	if ( !m_node->dataChildInfo( name, dataOffset, dataSize, compressed ) )
 	{
 		throw IOException( "StreamIndexedIO::read: Data entry not found '" + name.value() + "'" );
 	}
 
-	StreamIndexedIO::StreamFile &f = streamFile();
-	{
-		StreamFile::MutexLock lock( f.mutex() );
-		char *data = f.ioBuffer(dataSize);
-		f.seekg( dataOffset, std::ios::beg );
-		f.read( data, dataSize );
-		IndexedIO::DataFlattenTraits<T*>::unflatten( data, x, arrayLength );
-	}
+	// only numeric arrays are ever compressed, so we know their size when decompressed
+	const size_t bufferSize = compressed ? arrayLength * sizeof( T ) : dataSize;
+	boost::scoped_array<char> data( new char[bufferSize] );
+	m_node->m_idx->readData( dataOffset, dataSize, compressed, data.get(), bufferSize );
+	IndexedIO::DataFlattenTraits<T*>::unflatten( data.get(), x, arrayLength );
 }
 
 template<typename T>
@@ -2617,8 +2902,9 @@ void StreamIndexedIO::rawRead(const IndexedIO::EntryID &name, T *&x, unsigned lo
 	readable(name);
 
 	Imf::Int64 dataOffset(0), dataSize(0);
+	bool compressed = false;
 
-	if ( !m_node->dataChildInfo( name, dataOffset, dataSize ) )
+	if ( !m_node->dataChildInfo( name, dataOffset, dataSize, compressed ) )
 	{
 		throw IOException( "StreamIndexedIO::rawRead: Data entry not found '" + name.value() + "'" );
 	}
@@ -2628,12 +2914,7 @@ void StreamIndexedIO::rawRead(const IndexedIO::EntryID &name, T *&x, unsigned lo
 		x = new T[arrayLength];
 	}
 
-	StreamIndexedIO::StreamFile &f = streamFile();
-	{
-		StreamFile::MutexLock lock( f.mutex() );
-		f.seekg( dataOffset, std::ios::beg );
-		f.read( (char*)x, dataSize );
-	}
+	m_node->m_idx->readData( dataOffset, dataSize, compressed, (char*)x, arrayLength * sizeof( T ) );
 }
 
 template<typename T>
@@ -2643,20 +2924,16 @@ void StreamIndexedIO::read(const IndexedIO::EntryID &name, T &x) const
 	readable(name);
 
 	Imf::Int64 dataOffset(0), dataSize(0);
+	bool compressed = false;
 
-	if ( !m_node->dataChildInfo( name, dataOffset, dataSize ) )
+	if ( !m_node->dataChildInfo( name, dataOffset, dataSize, compressed ) )
 	{
 		throw IOException( "StreamIndexedIO::read Data entry not found '" + name.value() + "'" );
 	}
 
-	StreamIndexedIO::StreamFile &f = streamFile();
-	{
-		StreamFile::MutexLock lock( f.mutex() );
-		char *data = f.ioBuffer(dataSize);
-		f.seekg( dataOffset, std::ios::beg );
-		f.read( data, dataSize );
-		IndexedIO::DataFlattenTraits<T>::unflatten( data, x );
-	}
+	boost::scoped_array<char> data( new char[dataSize] );
+	streamFile().positionalRead( data.get(), dataSize, dataOffset );
+	IndexedIO::DataFlattenTraits<T>::unflatten( data.get(), x );
 }
 
 template<typename T>
@@ -2666,18 +2943,14 @@ void StreamIndexedIO::rawRead(const IndexedIO::EntryID &name, T &x) const
 	readable(name);
 
 	Imf::Int64 dataOffset(0), dataSize(0);
+	bool compressed = false;
 
-	if ( !m_node->dataChildInfo( name, dataOffset, dataSize ) )
+	if ( !m_node->dataChildInfo( name, dataOffset, dataSize, compressed ) )
 	{
 		throw IOException( "StreamIndexedIO::rawRead: Data entry not found '" + name.value() + "'" );
 	}
 
-	StreamIndexedIO::StreamFile &f = streamFile();
-	{
-		StreamFile::MutexLock lock( f.mutex() );
-		f.seekg( dataOffset, std::ios::beg );
-		f.read( (char*)&x, dataSize );
-	}
+	streamFile().positionalRead( (char*)&x, dataSize, dataOffset );
 }
 
 #ifdef IE_CORE_LITTLE_ENDIAN
@@ -96,6 +96,11 @@ struct SummedAreaOp::SumArea
 
 };
 
+bool SummedAreaOp::channelsAreIndependent() const
+{
+	return true;
+}
+
 void SummedAreaOp::modifyChannels( const Imath::Box2i &displayWindow, const Imath::Box2i &dataWindow, ChannelVector &channels )
 {
 	SumArea summer( dataWindow );
@@ -39,6 +39,7 @@
 #include <iterator>
 #include <sstream>
 
+#include "IECore/IECore.h"
 #include "IECore/TIFFImageReader.h"
 #include "IECore/SimpleTypedData.h"
 #include "IECore/VectorTypedData.h"
@@ -52,8 +53,13 @@
 
 #include "boost/static_assert.hpp"
 #include "boost/format.hpp"
+#include "boost/lexical_cast.hpp"
 #include "boost/algorithm/string/predicate.hpp"
 
+#include "tbb/enumerable_thread_specific.h"
+#include "tbb/parallel_for.h"
+#include "tbb/blocked_range2d.h"
+
 #include "tiffio.h"
 
 using namespace IECore;
@@ -66,21 +72,57 @@ IE_CORE_DEFINERUNTIMETYPED( TIFFImageReader );
 
 const Reader::ReaderDescription<TIFFImageReader> TIFFImageReader::m_readerDescription("tiff tif tdl tx");
 
+// libtiff handles can't be used by several threads at once, so
+// each thread decoding tiles opens its own.
+struct TIFFImageReader::DecodeHandles
+{
+
+	DecodeHandles()
+		:	handles( (TIFF *)NULL )
+	{
+	}
+
+	~DecodeHandles()
+	{
+		clear();
+	}
+
+	void clear()
+	{
+		for( Handles::iterator it = handles.begin(); it != handles.end(); ++it )
+		{
+			if( *it )
+			{
+				TIFFClose( *it );
+			}
+		}
+		handles.clear();
+	}
+
+	typedef tbb::enumerable_thread_specific<TIFF *> Handles;
+	Handles handles;
+
+};
+
 TIFFImageReader::TIFFImageReader()
 		:	ImageReader( "Reads Tagged Image File Format (TIFF) files" ),
-		m_tiffImage( 0 ), m_currentDirectoryIndex( 0 ), m_numDirectories( 1 ), m_haveDirectory( false )
+		m_tiffImage( 0 ), m_currentDirectoryIndex( 0 ), m_numDirectories( 1 ), m_haveDirectory( false ),
+		m_decodeHandles( new DecodeHandles )
 {
 }
 
 TIFFImageReader::TIFFImageReader( const string &fileName )
 		:	ImageReader( "Reads Tagged Image File Format (TIFF) files" ),
-		m_tiffImage( 0 ), m_currentDirectoryIndex( 0 ), m_numDirectories( 1 ), m_haveDirectory( false )
+		m_tiffImage( 0 ), m_currentDirectoryIndex( 0 ), m_numDirectories( 1 ), m_haveDirectory( false ),
+		m_decodeHandles( new DecodeHandles )
 {
 	m_fileNameParameter->setTypedValue(fileName);
 }
 
 TIFFImageReader::~TIFFImageReader()
 {
+	delete m_decodeHandles;
+
 	if ( m_tiffImage )
 	{
 		TIFFClose( m_tiffImage );
@@ -180,7 +222,14 @@ bool TIFFImageReader::isComplete()
 		/// compression methods support random access to the image data.
 		ScopedTIFFErrorHandler errorHandler;
 
-		readBuffer();
+		// we decode directly rather than via cachedTile(), so that tiles which
+		// produce errors from libtiff are always reported.
+		const std::string tileSet = lexical_cast<string>( m_currentDirectoryIndex );
+		const int n = numTiles();
+		for( int i = 0; i < n; ++i )
+		{
+			decodeTile( tileSet, i );
+		}
 
 		return !errorHandler.hasError();
 	}
@@ -279,6 +328,59 @@ T TIFFImageReader::tiffFieldDefaulted( unsigned int t )
 	return value;
 }
 
+// Decodes a range of tiles and copies the section of
+// each which intersects the window into the result.
+template<typename T, typename V>
+struct TIFFImageReader::ReadTiles
+{
+
+	ReadTiles( TIFFImageReader *reader, const std::string &tileSet, const V2i &tileSize, int tilesAcross, const Box2i &window, int channelOffset, V *data )
+		:	m_reader( reader ), m_tileSet( tileSet ), m_tileSize( tileSize ), m_tilesAcross( tilesAcross ), m_window( window ), m_channelOffset( channelOffset ), m_data( data )
+	{
+	}
+
+	void operator()( const tbb::blocked_range2d<int> &tiles ) const
+	{
+		ScaledDataConversion<T, V> converter;
+
+		const int samplesPerPixel = m_reader->m_samplesPerPixel;
+		const int dataWidth = 1 + m_window.size().x;
+
+		for ( int tileY = tiles.rows().begin(); tileY != tiles.rows().end(); ++tileY )
+		{
+			for ( int tileX = tiles.cols().begin(); tileX != tiles.cols().end(); ++tileX )
+			{
+				ConstCharVectorDataPtr tileData = m_reader->cachedTile( m_tileSet, tileY * m_tilesAcross + tileX );
+				const T *tile = reinterpret_cast< const T * >( &tileData->readable()[0] );
+
+				const V2i tileOrigin( tileX * m_tileSize.x, tileY * m_tileSize.y );
+				const Box2i region = boxIntersection( m_window, Box2i( tileOrigin, tileOrigin + m_tileSize - V2i( 1 ) ) );
+
+				for ( int y = region.min.y; y <= region.max.y; ++y )
+				{
+					const T *in = tile + samplesPerPixel * ( ( y - tileOrigin.y ) * m_tileSize.x + region.min.x - tileOrigin.x ) + m_channelOffset;
+					V *out = m_data + ( y - m_window.min.y ) * dataWidth + region.min.x - m_window.min.x;
+					for ( int x = region.min.x; x <= region.max.x; ++x, ++out, in += samplesPerPixel )
+					{
+						*out = converter( *in );
+					}
+				}
+			}
+		}
+	}
+
+	private :
+
+		TIFFImageReader *m_reader;
+		const std::string m_tileSet;
+		const V2i m_tileSize;
+		const int m_tilesAcross;
+		const Box2i m_window;
+		const int m_channelOffset;
+		V *m_data;
+
+};
+
 template<typename T, typename V>
 DataPtr TIFFImageReader::readTypedChannel( const std::string &name, const Box2i &dataWindow )
 {
@@ -310,28 +412,25 @@ DataPtr TIFFImageReader::readTypedChannel( const std::string &name, const Box2i
 	assert( area >= 0 );
 	data.resize( area );
 
-	int dataWidth = 1 + dataWindow.size().x;
-	int bufferDataWidth = 1 + m_dataWindow.size().x;
-
-	ScaledDataConversion<T, V> converter;
-
-	int dataY = 0;
-	for ( int y = dataWindow.min.y - m_dataWindow.min.y ; y <= dataWindow.max.y - m_dataWindow.min.y ; ++y, ++dataY )
-	{
-		int dataX = 0;
+	// \todo Currently, we only support PLANARCONFIG_CONTIG for TIFFTAG_PLANARCONFIG.
+	assert( m_planarConfig ==  PLANARCONFIG_CONTIG );
 
-		for ( int x = dataWindow.min.x - m_dataWindow.min.x;  x <= dataWindow.max.x - m_dataWindow.min.x ; ++x, ++dataX  )
-		{
-			const T* buf = reinterpret_cast< T* >( & m_buffer[0] );
-			assert( buf );
+	// the window to read, relative to the origin of the data in the file
+	const Box2i window( dataWindow.min - m_dataWindow.min, dataWindow.max - m_dataWindow.min );
 
-			// \todo Currently, we only support PLANARCONFIG_CONTIG for TIFFTAG_PLANARCONFIG.
-			assert( m_planarConfig ==  PLANARCONFIG_CONTIG );
-			typename TargetVector::ValueType::size_type dataOffset = dataY * dataWidth + dataX;
-			assert( dataOffset < data.size() );
+	const V2i tileSize = this->tileSize();
+	const int tilesAcross = ( m_dataWindow.size().x + tileSize.x ) / tileSize.x;
 
-			data[dataOffset] = converter( buf[ m_samplesPerPixel * ( y * bufferDataWidth + x ) + channelOffset ] );
-		}
+	// only decode the tiles which intersect the window
+	ReadTiles<T, V> readTiles( this, lexical_cast<string>( m_currentDirectoryIndex ), tileSize, tilesAcross, window, channelOffset, &data[0] );
+	tbb::blocked_range2d<int> tiles( window.min.y / tileSize.y, window.max.y / tileSize.y + 1, window.min.x / tileSize.x, window.max.x / tileSize.x + 1 );
+	if ( getImageIOThreads() > 1 )
+	{
+		tbb::parallel_for( tiles, readTiles );
+	}
+	else
+	{
+		readTiles( tiles );
 	}
 
 	return dataContainer;
@@ -341,11 +440,6 @@ DataPtr TIFFImageReader::readChannel( const std::string &name, const Imath::Box2
 {
 	readCurrentDirectory( true );
 
-	if ( m_buffer.size() == 0 )
-	{
-		readBuffer();
-	}
-
 	if ( m_sampleFormat == SAMPLEFORMAT_IEEEFP )
 	{
 		return readTypedChannel<float, float>( name, dataWindow );
@@ -408,27 +502,66 @@ DataPtr TIFFImageReader::readChannel( const std::string &name, const Imath::Box2
 	}
 }
 
-void TIFFImageReader::readBuffer()
+ConstCharVectorDataPtr TIFFImageReader::decodeTile( const std::string &tileSet, int tileIndex )
 {
+	// we're only called from readTypedChannel() and isComplete(), which
+	// both ensure that the requested directory is current.
 	assert( m_tiffImage );
 	assert( m_haveDirectory );
+	assert( tileSet == lexical_cast<string>( m_currentDirectoryIndex ) );
 
-	int width = boxSize( m_dataWindow ).x + 1;
-	int height = boxSize( m_dataWindow ).y + 1;
+	TIFF *tiffImage = decodeHandle();
 
-	// \todo Currently, we only support PLANARCONFIG_CONTIG for TIFFTAG_PLANARCONFIG.
-	assert( m_planarConfig ==  PLANARCONFIG_CONTIG );
-	std::vector<unsigned char>::size_type bufLineSize = (size_t)( (float)m_bitsPerSample / 8 * m_samplesPerPixel * width );
-	std::vector<unsigned char>::size_type bufSize = bufLineSize * height;
-	assert( bufSize );
-	m_buffer.resize( bufSize, 0 );
+	CharVectorDataPtr result = new CharVectorData;
+	std::vector<char> &buffer = result->writable();
 
-	if ( TIFFIsTiled( m_tiffImage ) )
+	if ( TIFFIsTiled( tiffImage ) )
+	{
+		buffer.resize( TIFFTileSize( tiffImage ), 0 );
+		if ( TIFFReadEncodedTile( tiffImage, tileIndex, &buffer[0], buffer.size() ) == -1 )
+		{
+			throw IOException( (boost::format( "TIFFImageReader: Error on tile number %d while reading %s") % tileIndex % fileName() ).str() );
+		}
+	}
+	else
+	{
+		buffer.resize( TIFFStripSize( tiffImage ), 0 );
+		if ( TIFFReadEncodedStrip( tiffImage, tileIndex, &buffer[0], buffer.size() ) == -1 )
+		{
+			throw IOException( (boost::format( "TIFFImageReader: Error on strip number %d while reading %s") % tileIndex % fileName() ).str() );
+		}
+	}
+
+	return result;
+}
+
+tiff *TIFFImageReader::decodeHandle()
+{
+	TIFF *&handle = m_decodeHandles->handles.local();
+	if ( !handle )
+	{
+		handle = TIFFOpen( m_tiffImageFileName.c_str(), "r" );
+		if ( !handle )
+		{
+			throw IOException( "TIFFImageReader: Could not open " + m_tiffImageFileName );
+		}
+	}
+
+	if ( TIFFCurrentDirectory( handle ) != m_currentDirectoryIndex && TIFFSetDirectory( handle, m_currentDirectoryIndex ) != 1 )
 	{
-		tsize_t tileSize = TIFFTileSize( m_tiffImage );
-		ttile_t numTiles = TIFFNumberOfTiles( m_tiffImage );
+		throw IOException( ( boost::format( "TIFFImageReader: Could not read directory %d of %s" ) % m_currentDirectoryIndex % m_tiffImageFileName ).str() );
+	}
+
+	return handle;
+}
+
+Imath::V2i TIFFImageReader::tileSize()
+{
+	assert( m_tiffImage );
+	assert( m_haveDirectory );
 
-		/// Create a buffer to hold an individual tile
+	if ( TIFFIsTiled( m_tiffImage ) )
+	{
 		int tileWidth = tiffField<uint32>( TIFFTAG_TILEWIDTH );
 		if ( tileWidth == 0 )
 		{
@@ -441,66 +574,23 @@ void TIFFImageReader::readBuffer()
 			throw IOException( ( boost::format("TIFFImageReader: Unsupported value (%d) for TIFFTAG_TILELENGTH while reading %s") % tileLength % fileName() ).str() );
 		}
 
-		std::vector<unsigned char>::size_type pixelSize = (size_t)( (float)m_bitsPerSample / 8 * m_samplesPerPixel );
-		std::vector<unsigned char>::size_type tileLineSize = pixelSize * tileWidth;
-		std::vector<unsigned char>::size_type tileBufSize = tileLineSize * tileLength;
-		std::vector<unsigned char> tileBuffer;
-		tileBuffer.resize( tileBufSize, 0 );
-
-		int x = 0;
-		int y = 0;
-
-		/// Read each tile
-		for ( ttile_t tile = 0; tile < numTiles; tile++ )
-		{
-			tsize_t imageOffset = y * bufLineSize + x * ( bufLineSize / width );
-			int result = TIFFReadEncodedTile( m_tiffImage, tile, &tileBuffer[0], tileSize );
-
-			if ( result == -1 )
-			{
-				throw IOException( (boost::format( "TIFFImageReader: Error on tile number %d while reading %s") % tile % fileName() ).str() );
-			}
-
-			/// Copy the tile into its rightful place in the image buffer.
-			/// We have to be careful here as the image might not be an exact
-			/// multiple of tiles, in which case we can't copy the tiles round the
-			/// edges in their entirety as that would give us buffer overruns.
-			int rowsToCopy = min( tileLength, height - y );
-			int columnsToCopy = min( (int)tileWidth, width - x );
-			tsize_t tileOffset = 0;
-			for ( int l = 0; l < rowsToCopy; l ++)
-			{
-				memcpy( &m_buffer[0] + imageOffset, &tileBuffer[0] + tileOffset, pixelSize * columnsToCopy );
-				imageOffset += bufLineSize;
-				tileOffset += tileLineSize;
-			}
-
-			x = x + tileWidth;
-
-			if ( x >= width )
-			{
-				x = 0;
-				y += tileLength;
-			}
-		}
+		return V2i( tileWidth, tileLength );
 	}
 	else
 	{
-		tsize_t stripSize = TIFFStripSize( m_tiffImage );
-		tsize_t imageOffset = 0;
-		tstrip_t numStrips = TIFFNumberOfStrips( m_tiffImage );
-		for ( tstrip_t strip = 0; strip < numStrips; strip++ )
-		{
-			tsize_t result = TIFFReadEncodedStrip( m_tiffImage, strip, &m_buffer[0] + imageOffset, stripSize );
+		// strips are just tiles which span the whole width of the image
+		uint32 height = m_dataWindow.size().y + 1;
+		uint32 rowsPerStrip = tiffFieldDefaulted<uint32>( TIFFTAG_ROWSPERSTRIP );
+		return V2i( m_dataWindow.size().x + 1, std::min( rowsPerStrip, height ) );
+	}
+}
 
-			if ( result == -1 )
-			{
-				throw IOException( (boost::format( "TIFFImageReader: Error on strip number %d while reading %s") % strip % fileName() ).str() );
-			}
+int TIFFImageReader::numTiles()
+{
+	assert( m_tiffImage );
+	assert( m_haveDirectory );
 
-			imageOffset += result;
-		}
-	}
+	return TIFFIsTiled( m_tiffImage ) ? TIFFNumberOfTiles( m_tiffImage ) : TIFFNumberOfStrips( m_tiffImage );
 }
 
 bool TIFFImageReader::open( bool throwOnFailure )
@@ -515,7 +605,7 @@ bool TIFFImageReader::open( bool throwOnFailure )
 		{
 			TIFFClose( m_tiffImage );
 			m_tiffImage = 0;
-			m_buffer.clear();
+			m_decodeHandles->clear();
 		}
 	}
 
@@ -602,8 +692,6 @@ bool TIFFImageReader::readCurrentDirectory( bool throwOnFailure )
 			}
 		}
 
-		m_buffer.clear();
-
 		int width = tiffField<uint32>( TIFFTAG_IMAGEWIDTH );
 		if ( width == 0 )
 		{
@@ -42,6 +42,7 @@
 #include "OpenEXR/ImathLimits.h"
 
 #include "IECore/TIFFImageWriter.h"
+#include "IECore/IECore.h"
 #include "IECore/MessageHandler.h"
 #include "IECore/VectorTypedData.h"
 #include "IECore/ByteOrder.h"
@@ -56,6 +57,8 @@
 #include "IECore/DespatchTypedData.h"
 #include "IECore/BoxOps.h"
 
+#include "tbb/parallel_for.h"
+
 #include "tiffio.h"
 
 using namespace IECore;
@@ -180,6 +183,67 @@ struct TIFFImageWriter::ChannelConverter
 	};
 };
 
+// Converts a range of channels to the output type and interleaves them
+// into the image buffer. Each channel writes only its own samples, so
+// separate ranges may be processed concurrently.
+template<typename T>
+struct TIFFImageWriter::InterleaveChannels
+{
+
+	InterleaveChannels( const ImagePrimitive *image, const vector<string> &names, const Imath::Box2i &dataWindow, T *imageBuffer )
+		:	m_image( image ), m_names( names ), m_dataWindow( dataWindow ), m_imageBuffer( imageBuffer )
+	{
+	}
+
+	void operator()( const tbb::blocked_range<size_t> &channels ) const
+	{
+		int width  = 1 + m_dataWindow.max.x - m_dataWindow.min.x;
+		int height = 1 + m_dataWindow.max.y - m_dataWindow.min.y;
+
+		int samplesPerPixel = m_names.size();
+
+		const Box2i imageDataWindow = m_image->getDataWindow();
+
+		for ( size_t channelOffset = channels.begin(); channelOffset != channels.end(); ++channelOffset )
+		{
+			const string &name = m_names[channelOffset];
+			DataPtr dataContainer = m_image->variables.find( name.c_str() )->second.data;
+			assert( dataContainer );
+
+			typedef TypedData< vector<T> > ChannelData;
+			ChannelConverter<ChannelData> converter( name );
+			typename ChannelData::Ptr channelData = despatchTypedData<
+				ChannelConverter<ChannelData>,
+				TypeTraits::IsNumericVectorTypedData,
+				typename ChannelConverter<ChannelData>::ErrorHandler
+			>( dataContainer.get(), converter );
+
+			typedef boost::multi_array_ref< const T, 2 > SourceArray2D;
+			typedef boost::multi_array_ref< T, 3 > TargetArray3D;
+
+			const SourceArray2D sourceData( &channelData->readable()[0], extents[ imageDataWindow.size().y + 1 ][ imageDataWindow.size().x + 1 ] );
+			TargetArray3D targetData( m_imageBuffer, extents[ height ][ width ][ samplesPerPixel ] );
+
+			for ( int y = m_dataWindow.min.y; y <= m_dataWindow.max.y ; y++ )
+			{
+				for ( int x = m_dataWindow.min.x; x <= m_dataWindow.max.x ; x++ )
+				{
+					targetData[ y - m_dataWindow.min.y ][ x - m_dataWindow.min.x ][ channelOffset ]
+						= sourceData[ y - imageDataWindow.min.y ][ x - imageDataWindow.min.x ];
+				}
+			}
+		}
+	}
+
+	private :
+
+		const ImagePrimitive *m_image;
+		const vector<string> &m_names;
+		const Imath::Box2i m_dataWindow;
+		T *m_imageBuffer;
+
+};
+
 template<typename T>
 void TIFFImageWriter::encodeChannels( const ImagePrimitive * image, const vector<string> &names, const Imath::Box2i &dataWindow, tiff *tiffImage, size_t bufSize, unsigned int numStrips ) const
 {
@@ -196,34 +260,15 @@ void TIFFImageWriter::encodeChannels( const ImagePrimitive * image, const vector
 	vector<T> imageBuffer( samplesPerPixel * area, 0 );
 
 	// Encode each individual channel into the buffer
-	int channelOffset = 0;
-	for ( vector<string>::const_iterator i = names.begin(); i != names.end(); ++i, ++channelOffset )
+	InterleaveChannels<T> interleaveChannels( image, names, dataWindow, &imageBuffer[0] );
+	tbb::blocked_range<size_t> channels( 0, names.size() );
+	if ( getImageIOThreads() > 1 )
 	{
-		DataPtr dataContainer = image->variables.find(i->c_str())->second.data;
-		assert( dataContainer );
-
-		typedef TypedData< vector<T> > ChannelData;
-		ChannelConverter<ChannelData> converter( *i );
-		typename ChannelData::Ptr channelData = despatchTypedData<
-			ChannelConverter<ChannelData>,
-			TypeTraits::IsNumericVectorTypedData,
-			typename ChannelConverter<ChannelData>::ErrorHandler
-		>( dataContainer.get(), converter );
-
-		typedef boost::multi_array_ref< const T, 2 > SourceArray2D;
-		typedef boost::multi_array_ref< T, 3 > TargetArray3D;
-
-		const SourceArray2D sourceData( &channelData->readable()[0], extents[ image->getDataWindow().size().y + 1 ][ image->getDataWindow().size().x + 1 ] );
-		TargetArray3D targetData( &imageBuffer[0], extents[ height ][ width ][ samplesPerPixel ] );
-
-		for ( int y = dataWindow.min.y; y <= dataWindow.max.y ; y++ )
-		{
-			for ( int x = dataWindow.min.x; x <= dataWindow.max.x ; x++ )
-			{
-				targetData[ y - dataWindow.min.y ][ x - dataWindow.min.x ][ channelOffset ]
-					= sourceData[ y - image->getDataWindow().min.y ][ x - image->getDataWindow().min.x ];
-			}
-		}
+		tbb::parallel_for( channels, interleaveChannels );
+	}
+	else
+	{
+		interleaveChannels( channels );
 	}
 
 	/// Write the image buffer to the TIFF file, strip by strip
@@ -343,6 +343,11 @@ struct TriangulateOp::TriangulateFn
         };
 };
 
+bool TriangulateOp::resultCacheable( const CompoundObject *operands ) const
+{
+	return copyParameter()->getTypedValue();
+}
+
 void TriangulateOp::modifyTypedPrimitive( MeshPrimitive * mesh, const CompoundObject * operands )
 {
 
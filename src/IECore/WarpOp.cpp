@@ -32,6 +32,10 @@
 //
 //////////////////////////////////////////////////////////////////////////
 
+#include "boost/shared_ptr.hpp"
+
+#include "tbb/parallel_for.h"
+
 #include "IECore/WarpOp.h"
 #include "IECore/Interpolator.h"
 #include "IECore/DespatchTypedData.h"
@@ -95,16 +99,14 @@ const IntParameter * WarpOp::filterParameter() const
 
 struct WarpOp::Warp
 {
-	typedef void ReturnType;
 
-	Warp( WarpOp * warp, WarpOp::FilterType filter, WarpOp::BoundMode boundMode, const Imath::Box2i &warpedDataWindow, const Imath::Box2i &originalDataWindow )
-		:	m_warpOp( warp ), m_filter( filter ), m_boundMode( boundMode ), m_outputDataWindow( warpedDataWindow ), m_inputDataWindow( originalDataWindow )
+	Warp( WarpOp::FilterType filter, WarpOp::BoundMode boundMode, const Imath::Box2i &warpedDataWindow, const Imath::Box2i &originalDataWindow )
+		:	m_filter( filter ), m_boundMode( boundMode ), m_outputDataWindow( warpedDataWindow ), m_inputDataWindow( originalDataWindow )
 	{
 	}
 
-	inline void computePixelCoordinates( float x, float y, int &x1, int &y1, int &x2, int &y2, float &ratioX, float &ratioY )
+	inline void computePixelCoordinates( const Imath::V2f &inPos, int &x1, int &y1, int &x2, int &y2, float &ratioX, float &ratioY ) const
 	{
-		Imath::V2f inPos = m_warpOp->warp( Imath::V2f( x, y ) );
 		x1 = int(inPos.x);
 		y1 = int(inPos.y);
 		if ( x1 > inPos.x )
@@ -152,65 +154,156 @@ struct WarpOp::Warp
 		return buffer[ x + y * width ];
 	}
 
+	// Filters rows of a single channel, given the warped positions
+	// of the pixels in those rows.
+	class Channel
+	{
+
+		public :
+
+			virtual ~Channel()
+			{
+			}
+
+			virtual void filterRows( const Warp &warp, const std::vector<Imath::V2f> &positions, int yBegin, int yEnd ) = 0;
+
+	};
+
+	typedef boost::shared_ptr<Channel> ChannelPtr;
+
 	template<typename T>
-	ReturnType operator()( T * data )
+	class TypedChannel : public Channel
 	{
-		typedef typename T::ValueType Container;
-		typedef typename Container::value_type V;
-		typename T::Ptr inData = data->copy();
-		const Container &inBuffer = inData->readable();
-		unsigned int outputWidth = m_outputDataWindow.size().x + 1;
-		unsigned int inputWidth = m_inputDataWindow.size().x + 1;
-		unsigned int inputHeight = m_inputDataWindow.size().y + 1;
-		Container &outBuffer = data->writable();
-		outBuffer.resize( outputWidth * (m_outputDataWindow.size().y + 1) );
-		int x1, x2, y1, y2;
-		float ratioX, ratioY;
-		unsigned pixelIndex=0;
-		double r1, r2, r;
-
-		switch( m_filter )
-		{
-		case WarpOp::None:
-			for( int y=m_outputDataWindow.min.y; y<=m_outputDataWindow.max.y; y++ )
+
+		public :
+
+			typedef typename T::ValueType Container;
+
+			// Keeps a copy of the input data, and resizes the channel
+			// to hold the output. This must be done before filtering
+			// starts, as writable() isn't threadsafe.
+			TypedChannel( T *data, size_t outputSize )
+				:	m_inData( data->copy() ), m_outBuffer( data->writable() )
 			{
-				for( int x=m_outputDataWindow.min.x; x<=m_outputDataWindow.max.x; x++, pixelIndex++ )
-				{
-					Imath::V2f inPos = m_warpOp->warp( Imath::V2f( x, y ) );
-					x1 = int(inPos.x) - m_inputDataWindow.min.x;
-					y1 = int(inPos.y) - m_inputDataWindow.min.y;
-					outBuffer[pixelIndex] = clampXY<V>( inBuffer, x1, y1, inputWidth, inputHeight);
-				}
+				m_outBuffer.resize( outputSize );
 			}
-			break;
 
-		case WarpOp::Bilinear:
-			for( int y=m_outputDataWindow.min.y; y<=m_outputDataWindow.max.y; y++ )
+			virtual void filterRows( const Warp &warp, const std::vector<Imath::V2f> &positions, int yBegin, int yEnd )
 			{
-				for( int x=m_outputDataWindow.min.x; x<=m_outputDataWindow.max.x; x++, pixelIndex++ )
+				typedef typename Container::value_type V;
+
+				const Container &inBuffer = m_inData->readable();
+				const Imath::Box2i &outputDataWindow = warp.m_outputDataWindow;
+				const Imath::Box2i &inputDataWindow = warp.m_inputDataWindow;
+				unsigned int outputWidth = outputDataWindow.size().x + 1;
+				unsigned int inputWidth = inputDataWindow.size().x + 1;
+				unsigned int inputHeight = inputDataWindow.size().y + 1;
+				int x1, x2, y1, y2;
+				float ratioX, ratioY;
+				double r1, r2, v;
+
+				const Imath::V2f *inPos = &positions[0];
+				unsigned pixelIndex = ( yBegin - outputDataWindow.min.y ) * outputWidth;
+				unsigned pixelEnd = ( yEnd - outputDataWindow.min.y ) * outputWidth;
+				switch( warp.m_filter )
 				{
-					computePixelCoordinates( x, y, x1, y1, x2, y2, ratioX, ratioY );
-					LinearInterpolator<double>()( (double)clampXY<V>( inBuffer, x1, y1, inputWidth, inputHeight ),
-												  (double)clampXY<V>( inBuffer, x2, y1, inputWidth, inputHeight ), ratioX, r1 );
-					LinearInterpolator<double>()( (double)clampXY<V>( inBuffer, x1, y2, inputWidth, inputHeight ),
-												  (double)clampXY<V>( inBuffer, x2, y2, inputWidth, inputHeight ), ratioX, r2 );
-					LinearInterpolator<double>()( r1, r2, ratioY, r );
-					outBuffer[pixelIndex] = (V)r;
+				case WarpOp::None:
+					for( ; pixelIndex < pixelEnd; pixelIndex++, inPos++ )
+					{
+						x1 = int(inPos->x) - inputDataWindow.min.x;
+						y1 = int(inPos->y) - inputDataWindow.min.y;
+						m_outBuffer[pixelIndex] = warp.clampXY<V>( inBuffer, x1, y1, inputWidth, inputHeight);
+					}
+					break;
+
+				case WarpOp::Bilinear:
+					for( ; pixelIndex < pixelEnd; pixelIndex++, inPos++ )
+					{
+						warp.computePixelCoordinates( *inPos, x1, y1, x2, y2, ratioX, ratioY );
+						LinearInterpolator<double>()( (double)warp.clampXY<V>( inBuffer, x1, y1, inputWidth, inputHeight ),
+													  (double)warp.clampXY<V>( inBuffer, x2, y1, inputWidth, inputHeight ), ratioX, r1 );
+						LinearInterpolator<double>()( (double)warp.clampXY<V>( inBuffer, x1, y2, inputWidth, inputHeight ),
+													  (double)warp.clampXY<V>( inBuffer, x2, y2, inputWidth, inputHeight ), ratioX, r2 );
+						LinearInterpolator<double>()( r1, r2, ratioY, v );
+						m_outBuffer[pixelIndex] = (V)v;
+					}
+					break;
+
+				default:
+					throw Exception("Invalid filter type!");
 				}
 			}
-			break;
 
-		default:
-			throw Exception("Invalid filter type!");
+		private :
+
+			typename T::ConstPtr m_inData;
+			Container &m_outBuffer;
+
+	};
+
+	// Creates a Channel for a piece of channel data, for use with despatchTypedData().
+	struct CreateChannel
+	{
+		typedef ChannelPtr ReturnType;
+
+		CreateChannel( size_t outputSize )
+			:	m_outputSize( outputSize )
+		{
+		}
+
+		template<typename T>
+		ReturnType operator()( T *data )
+		{
+			return ChannelPtr( new TypedChannel<T>( data, m_outputSize ) );
+		}
+
+		size_t m_outputSize;
+	};
+
+	WarpOp::FilterType m_filter;
+	WarpOp::BoundMode m_boundMode;
+	Imath::Box2i m_outputDataWindow;
+	Imath::Box2i m_inputDataWindow;
+};
+
+// Processes a range of rows, computing warp() for each pixel once and
+// then filtering every channel with the result. Positions are only held
+// for the rows in the range, so memory use doesn't scale with the image.
+struct WarpOp::WarpRows
+{
+
+	WarpRows( const WarpOp *warpOp, const Warp &warp, const std::vector<Warp::ChannelPtr> &channels )
+		:	m_warpOp( warpOp ), m_warp( warp ), m_channels( channels )
+	{
+	}
+
+	void operator()( const tbb::blocked_range<int> &r ) const
+	{
+		const Imath::Box2i &outputDataWindow = m_warp.m_outputDataWindow;
+		const int outputWidth = outputDataWindow.size().x + 1;
+
+		std::vector<Imath::V2f> positions( ( r.end() - r.begin() ) * outputWidth );
+		Imath::V2f *position = &positions[0];
+		for( int y = r.begin(); y != r.end(); ++y )
+		{
+			for( int x = outputDataWindow.min.x; x <= outputDataWindow.max.x; ++x, ++position )
+			{
+				*position = m_warpOp->warp( Imath::V2f( x, y ) );
+			}
+		}
+
+		for( std::vector<Warp::ChannelPtr>::const_iterator it = m_channels.begin(); it != m_channels.end(); ++it )
+		{
+			(*it)->filterRows( m_warp, positions, r.begin(), r.end() );
 		}
 	}
 
 	private :
-		WarpOp * m_warpOp;
-		WarpOp::FilterType m_filter;
-		WarpOp::BoundMode m_boundMode;
-		Imath::Box2i m_outputDataWindow;
-		Imath::Box2i m_inputDataWindow;
+
+		const WarpOp *m_warpOp;
+		const Warp &m_warp;
+		const std::vector<Warp::ChannelPtr> &m_channels;
+
 };
 
 void WarpOp::modifyTypedPrimitive( ImagePrimitive * image, const CompoundObject * operands )
@@ -219,8 +312,10 @@ void WarpOp::modifyTypedPrimitive( ImagePrimitive * image, const CompoundObject
 
 	begin( operands );
 	Imath::Box2i newDataWindow = warpedDataWindow( originalDataWindow );
+	const size_t outputSize = ( newDataWindow.size().x + 1 ) * ( newDataWindow.size().y + 1 );
+
 	std::string error;
-	Warp w( this, (FilterType)m_filterParameter->getNumericValue(), (BoundMode)m_boundModeParameter->getNumericValue(), newDataWindow, originalDataWindow );
+	std::vector<Warp::ChannelPtr> channels;
 	for( PrimitiveVariableMap::iterator it = image->variables.begin(); it != image->variables.end(); it++ )
 	{
 		if( it->second.interpolation!=PrimitiveVariable::Vertex &&
@@ -234,8 +329,18 @@ void WarpOp::modifyTypedPrimitive( ImagePrimitive * image, const CompoundObject
 		{
 			throw Exception( error );
 		}
-		despatchTypedData<Warp, TypeTraits::IsNumericVectorTypedData>( it->second.data.get(), w );
+		channels.push_back( despatchTypedData<Warp::CreateChannel, TypeTraits::IsNumericVectorTypedData>( it->second.data.get(), Warp::CreateChannel( outputSize ) ) );
 	}
+
+	// Rows are processed in small blocks, to bound the memory used
+	// to hold the warped positions.
+	Warp w( (FilterType)m_filterParameter->getNumericValue(), (BoundMode)m_boundModeParameter->getNumericValue(), newDataWindow, originalDataWindow );
+	tbb::parallel_for(
+		tbb::blocked_range<int>( newDataWindow.min.y, newDataWindow.max.y + 1, 16 ),
+		WarpRows( this, w, channels ),
+		tbb::simple_partitioner()
+	);
+
 	end();
 	image->setDataWindow( newDataWindow );
 }
@@ -45,6 +45,7 @@
 #include "IECore/VectorTypedData.h"
 
 #include "IECorePython/BoundedKDTreeBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 using namespace boost::python;
 using namespace IECore;
@@ -75,6 +76,7 @@ struct BoundedKDTreeWrapper
 
 	BoundedKDTreeWrapper(BoundDataPtr bounds)
 	{
+		ScopedGILRelease gilRelease;
 		m_bounds = bounds->copy();
 		m_tree = new T(m_bounds->readable().begin(), m_bounds->readable().end());
 	}
@@ -89,6 +91,7 @@ struct BoundedKDTreeWrapper
 	IntVectorDataPtr intersectingBounds(const S &b)
 	{
 		assert(m_tree);
+		ScopedGILRelease gilRelease;
 
 		typedef std::vector<typename T::Iterator> BoundArray;
 
@@ -0,0 +1,226 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+#include "boost/python.hpp" // this include /must/ come first!
+
+#include "boost/format.hpp"
+#include "boost/python/suite/indexing/container_utils.hpp"
+
+#include "IECore/DeepImage.h"
+#include "IECorePython/DeepImageBinding.h"
+#include "IECorePython/RefCountedBinding.h"
+
+using namespace boost::python;
+using namespace IECore;
+
+namespace IECorePython
+{
+
+struct DeepImageHelper
+{
+	static DeepImagePtr Constructor( object names, const Imath::Box2i &window )
+	{
+		extract<ConstStringVectorDataPtr> extractor( names );
+		if ( extractor.check() )
+		{
+			return new DeepImage( extractor(), window );
+		}
+		
+		StringVectorDataPtr channelNames = new StringVectorData;
+		container_utils::extend_container( channelNames->writable(), names );
+		
+		return new DeepImage( channelNames, window );
+	}
+	
+	static tuple channelNames( ConstDeepImagePtr image )
+	{
+		list result;
+		
+		const std::vector<std::string> &names = image->channelNames();
+		for ( std::vector<std::string>::const_iterator it=names.begin(); it != names.end(); ++it )
+		{
+			result.append( *it );
+		}
+
+		return tuple( result );
+	}
+	
+	static size_t pixelIndex( ConstDeepImagePtr image, int x, int y )
+	{
+		if ( !image->window().intersects( Imath::V2i( x, y ) ) )
+		{
+			PyErr_SetString( PyExc_IndexError, "Pixel not within window" );
+			throw_error_already_set();
+		}
+		
+		return image->pixelIndex( x, y );
+	}
+	
+	static size_t adjustPixelIndex( ConstDeepImagePtr image, long index )
+	{
+		const long numPixels = image->numPixels();
+		
+		if ( index < 0 )
+		{
+			index += numPixels;
+		}
+		
+		if ( index < 0 || index >= numPixels )
+		{
+			PyErr_SetString( PyExc_IndexError, "Index out of range" );
+			throw_error_already_set();
+		}
+		
+		return index;
+	}
+	
+	static unsigned numSamples( ConstDeepImagePtr image, long pixelIndex )
+	{
+		return image->numSamples( adjustPixelIndex( image, pixelIndex ) );
+	}
+	
+	static size_t sampleOffset( ConstDeepImagePtr image, long pixelIndex )
+	{
+		return image->sampleOffset( adjustPixelIndex( image, pixelIndex ) );
+	}
+	
+	static void setSampleCounts( DeepImagePtr image, object counts )
+	{
+		std::vector<unsigned> c;
+		container_utils::extend_container( c, counts );
+		
+		if ( c.size() != image->numPixels() )
+		{
+			PyErr_SetString( PyExc_ValueError, ( boost::format( "Sample counts must contain %d values" ) % image->numPixels() ).str().c_str() );
+			throw_error_already_set();
+		}
+		
+		image->setSampleCounts( c.size() ? &c[0] : 0 );
+	}
+	
+	static list composite( ConstDeepImagePtr image, long pixelIndex )
+	{
+		std::vector<float> data( image->numChannels() );
+		image->composite( adjustPixelIndex( image, pixelIndex ), data.size() ? &data[0] : 0 );
+		
+		list result;
+		for ( std::vector<float>::const_iterator it = data.begin(); it != data.end(); ++it )
+		{
+			result.append( *it );
+		}
+		
+		return result;
+	}
+	
+	static DeepImagePtr merge( object images )
+	{
+		std::vector<const DeepImage *> imageVector;
+		container_utils::extend_container( imageVector, images );
+		
+		return DeepImage::merge( imageVector );
+	}
+	
+	static unsigned checkedChannelIndex( ConstDeepImagePtr image, long index )
+	{
+		if ( index < 0 || index >= (long)image->numChannels() )
+		{
+			PyErr_SetString( PyExc_IndexError, "Channel index out of range" );
+			throw_error_already_set();
+		}
+		
+		return index;
+	}
+	
+	static FloatVectorDataPtr depths( ConstDeepImagePtr image )
+	{
+		const float *d = image->depths();
+		return new FloatVectorData( std::vector<float>( d, d + image->numSamples() ) );
+	}
+	
+	static void setDepths( DeepImagePtr image, ConstFloatVectorDataPtr depths )
+	{
+		copySamples( depths.get(), image->numSamples(), image->depths() );
+	}
+	
+	static FloatVectorDataPtr channelData( ConstDeepImagePtr image, long index )
+	{
+		const float *d = image->channelData( checkedChannelIndex( image, index ) );
+		return new FloatVectorData( std::vector<float>( d, d + image->numSamples() ) );
+	}
+	
+	static void setChannelData( DeepImagePtr image, long index, ConstFloatVectorDataPtr data )
+	{
+		copySamples( data.get(), image->numSamples(), image->channelData( checkedChannelIndex( image, index ) ) );
+	}
+	
+	static void copySamples( const FloatVectorData *data, size_t numSamples, float *destination )
+	{
+		const std::vector<float> &d = data->readable();
+		if ( d.size() != numSamples )
+		{
+			PyErr_SetString( PyExc_ValueError, ( boost::format( "Data must contain %d values" ) % numSamples ).str().c_str() );
+			throw_error_already_set();
+		}
+		
+		std::copy( d.begin(), d.end(), destination );
+	}
+};
+
+void bindDeepImage()
+{
+	RefCountedClass<DeepImage, RefCounted>( "DeepImage" )
+		.def( "__init__", make_constructor( &DeepImageHelper::Constructor, default_call_policies(), ( boost::python::arg_( "channelNames" ), boost::python::arg_( "window" ) ) ) )
+		.def( "channelNames", &DeepImageHelper::channelNames )
+		.def( "numChannels", &DeepImage::numChannels )
+		.def( "channelIndex", &DeepImage::channelIndex )
+		.def( "window", &DeepImage::window, return_value_policy<copy_const_reference>() )
+		.def( "numPixels", &DeepImage::numPixels )
+		.def( "pixelIndex", &DeepImageHelper::pixelIndex )
+		.def( "numSamples", (size_t (DeepImage::*)() const)&DeepImage::numSamples )
+		.def( "numSamples", &DeepImageHelper::numSamples )
+		.def( "sampleOffset", &DeepImageHelper::sampleOffset )
+		.def( "setSampleCounts", &DeepImageHelper::setSampleCounts )
+		.def( "sortSamples", &DeepImage::sortSamples )
+		.def( "depths", &DeepImageHelper::depths )
+		.def( "setDepths", &DeepImageHelper::setDepths )
+		.def( "channelData", &DeepImageHelper::channelData )
+		.def( "setChannelData", &DeepImageHelper::setChannelData )
+		.def( "pixel", &DeepImage::pixel )
+		.def( "crop", &DeepImage::crop )
+		.def( "composite", &DeepImageHelper::composite )
+		.def( "merge", &DeepImageHelper::merge ).staticmethod( "merge" )
+	;
+}
+
+} // namespace IECorePython
@@ -62,6 +62,7 @@ void bindDeepImageReader()
 		.def( "worldToCameraMatrix", &DeepImageReader::worldToCameraMatrix )
 		.def( "worldToNDCMatrix", &DeepImageReader::worldToNDCMatrix )
 		.def( "readPixel", &DeepImageReader::readPixel, ( arg_( "x" ), arg_( "y" ) ) )
+		.def( "readRegion", &DeepImageReader::readRegion, ( arg_( "region" ) ) )
 	;
 }
 
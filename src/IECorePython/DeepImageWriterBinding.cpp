@@ -75,6 +75,7 @@ void bindDeepImageWriter()
 {
 	RunTimeTypedClass<DeepImageWriter>()
 		.def( "writePixel", &DeepImageWriter::writePixel, ( arg_( "x" ), arg_( "y" ), arg_( "pixel" ) ) )
+		.def( "writeRegion", &DeepImageWriter::writeRegion, ( arg_( "image" ) ) )
 		.def( "create", &DeepImageWriter::create ).staticmethod( "create" )
 		.def( "supportedExtensions", ( list(*)( ) )&supportedExtensions )
 		.def( "supportedExtensions", ( list(*)( TypeId ) )&supportedExtensions )
@@ -0,0 +1,73 @@
+//////////////////////////////////////////////////////////////////////////
+//
+//  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+//
+//  Redistribution and use in source and binary forms, with or without
+//  modification, are permitted provided that the following conditions are
+//  met:
+//
+//     * Redistributions of source code must retain the above copyright
+//       notice, this list of conditions and the following disclaimer.
+//
+//     * Redistributions in binary form must reproduce the above copyright
+//       notice, this list of conditions and the following disclaimer in the
+//       documentation and/or other materials provided with the distribution.
+//
+//     * Neither the name of Image Engine Design nor the names of any
+//       other contributors to this software may be used to endorse or
+//       promote products derived from this software without specific prior
+//       written permission.
+//
+//  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+//  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+//  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+//  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+//  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+//  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+//  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+//  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+//  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+//  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+//  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+//
+//////////////////////////////////////////////////////////////////////////
+
+// This include needs to be the very first to prevent problems with warnings
+// regarding redefinition of _POSIX_C_SOURCE
+#include "boost/python.hpp"
+
+#include "IECore/DiskObjectCache.h"
+
+#include "IECorePython/DiskObjectCacheBinding.h"
+#include "IECorePython/RefCountedBinding.h"
+
+using namespace boost::python;
+using namespace IECore;
+
+namespace IECorePython
+{
+
+static ObjectPtr retrieve( const DiskObjectCache &cache, const MurmurHash &hash )
+{
+	// the object has just been loaded from disk, so
+	// there's no need to copy it to protect the cache.
+	return const_cast< Object * >( cache.retrieve( hash ).get() );
+}
+
+void bindDiskObjectCache()
+{
+	RefCountedClass<DiskObjectCache, RefCounted>( "DiskObjectCache" )
+		.def( init<const std::string &, size_t>( ( arg( "directory" ), arg( "maxDiskUsage" ) ) ) )
+		.def( "directory", &DiskObjectCache::directory, return_value_policy<copy_const_reference>() )
+		.def( "retrieve", &retrieve )
+		.def( "store", &DiskObjectCache::store )
+		.def( "contains", &DiskObjectCache::contains )
+		.def( "erase", &DiskObjectCache::erase )
+		.def( "clear", &DiskObjectCache::clear )
+		.def( "diskUsage", &DiskObjectCache::diskUsage )
+		.def( "getMaxDiskUsage", &DiskObjectCache::getMaxDiskUsage )
+		.def( "setMaxDiskUsage", &DiskObjectCache::setMaxDiskUsage )
+	;
+}
+
+}
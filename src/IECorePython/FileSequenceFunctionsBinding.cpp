@@ -43,6 +43,7 @@
 #include "IECore/FileSequenceFunctions.h"
 
 #include "IECorePython/IECoreBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 #include "IECorePython/FileSequenceFunctionsBinding.h"
 
 using namespace boost::python;
@@ -79,7 +80,7 @@ struct FileSequenceFunctionsHelper
 		return result;
 	}
 
-	static object ls( const std::string &path, size_t minSequenceSize = 2 )
+	static object ls( const std::string &path, size_t minSequenceSize, bool recurse, bool followLinks, size_t maxDepth )
 	{
 		if ( boost::regex_match( path, FileSequence::fileNameValidator() ) )
 		{
@@ -95,7 +96,10 @@ struct FileSequenceFunctionsHelper
 		{
 			list result;
 			std::vector< FileSequencePtr > sequences;
-			IECore::ls( path, sequences, minSequenceSize );
+			{
+				IECorePython::ScopedGILRelease gilRelease;
+				IECore::ls( path, sequences, minSequenceSize, recurse, followLinks, maxDepth );
+			}
 			for ( std::vector< FileSequencePtr >::const_iterator it = sequences.begin(); it != sequences.end(); ++it )
 			{
 				result.append( *it );
@@ -129,7 +133,19 @@ struct FileSequenceFunctionsHelper
 void bindFileSequenceFunctions()
 {
 	def( "findSequences", &FileSequenceFunctionsHelper::findSequences, ( arg_("namesList"), arg_( "minSequenceSize" ) = 2 ) );
-	def( "ls", &FileSequenceFunctionsHelper::ls, ( arg_("path"), arg_( "minSequenceSize" ) = 2 ) );
+	def(
+		"ls", &FileSequenceFunctionsHelper::ls,
+		(
+			arg_( "path" ),
+			arg_( "minSequenceSize" ) = 2,
+			arg_( "recurse" ) = false,
+			arg_( "followLinks" ) = false,
+			arg_( "maxDepth" ) = std::numeric_limits<size_t>::max()
+		)
+	);
+	def( "getLsCacheLimit", &getLsCacheLimit );
+	def( "setLsCacheLimit", &setLsCacheLimit );
+	def( "clearLsCache", &clearLsCache );
 	def( "frameListFromList", &FileSequenceFunctionsHelper::frameListFromList );
 }
 
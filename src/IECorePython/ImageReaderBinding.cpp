@@ -64,6 +64,10 @@ void bindImageReader()
 		.def( "displayWindow", &ImageReader::displayWindow )
 		.def( "readChannel", (DataPtr (ImageReader::*)( const std::string &, bool ))&ImageReader::readChannel, ( arg_("name"), arg_( "raw" ) = false ) )
 		.def( "sourceColorSpace", &ImageReader::sourceColorSpace )
+		.def( "getTileCacheMemoryLimit", &ImageReader::getTileCacheMemoryLimit ).staticmethod( "getTileCacheMemoryLimit" )
+		.def( "setTileCacheMemoryLimit", &ImageReader::setTileCacheMemoryLimit ).staticmethod( "setTileCacheMemoryLimit" )
+		.def( "tileCacheMemoryUsage", &ImageReader::tileCacheMemoryUsage ).staticmethod( "tileCacheMemoryUsage" )
+		.def( "clearTileCache", &ImageReader::clearTileCache ).staticmethod( "clearTileCache" )
 	;
 
 }
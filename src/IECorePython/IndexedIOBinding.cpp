@@ -48,6 +48,7 @@
 #include "IECorePython/IndexedIOBinding.h"
 #include "IECorePython/RunTimeTypedBinding.h"
 #include "IECorePython/IECoreBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 using namespace boost::python;
 using namespace IECore;
@@ -94,6 +95,7 @@ struct IndexedIOHelper
 	template< typename T, typename P >
 	static typename T::Ptr constructorAtRoot( P firstParam, IndexedIO::OpenMode mode )
 	{
+		IECorePython::ScopedGILRelease gilRelease;
 		return new T( firstParam, IndexedIO::rootPath, mode );
 	}
 
@@ -102,11 +104,13 @@ struct IndexedIOHelper
 	{
 		IndexedIO::EntryIDList rootPath;
 		IndexedIOHelper::listToEntryIds( root, rootPath );
+		IECorePython::ScopedGILRelease gilRelease;
 		return new T( firstParam, rootPath, mode );
 	}
 
 	static IndexedIOPtr createAtRoot( const std::string &path, IndexedIO::OpenMode mode)
 	{
+		IECorePython::ScopedGILRelease gilRelease;
 		return IndexedIO::create( path, IndexedIO::rootPath, mode );
 	}
 
@@ -114,6 +118,7 @@ struct IndexedIOHelper
 	{
 		IndexedIO::EntryIDList rootPath;
 		IndexedIOHelper::listToEntryIds( root, rootPath );
+		IECorePython::ScopedGILRelease gilRelease;
 		return IndexedIO::create( path, rootPath, mode );
 	}
 
@@ -128,6 +133,7 @@ struct IndexedIOHelper
 	{
 		IndexedIO::EntryIDList path;
 		IndexedIOHelper::listToEntryIds( l, path );
+		IECorePython::ScopedGILRelease gilRelease;
 		return p->directory(path, missingBehaviour);
 	}
 
@@ -167,6 +173,7 @@ struct IndexedIOHelper
 		assert(p);
 
 		const typename T::value_type *data = &(x->readable())[0];
+		IECorePython::ScopedGILRelease gilRelease;
 		p->write( name, data, (unsigned long)x->readable().size() );
 	}
 
@@ -174,7 +181,10 @@ struct IndexedIOHelper
 	static typename TypedData<T>::Ptr readSingle(IndexedIOPtr p, const IndexedIO::EntryID &name, const IndexedIO::Entry &entry)
 	{
 		T data;
-		p->read(name, data);
+		{
+			IECorePython::ScopedGILRelease gilRelease;
+			p->read(name, data);
+		}
 		return new TypedData<T>( data );
 	}
 
@@ -185,7 +195,10 @@ struct IndexedIOHelper
 		typename TypedData<std::vector<T> >::Ptr x = new TypedData<std::vector<T> > ();
 		x->writable().resize( entry.arrayLength() );
 		T *data = &(x->writable()[0]);
-		p->read(name, data, count);
+		{
+			IECorePython::ScopedGILRelease gilRelease;
+			p->read(name, data, count);
+		}
 
 		return x;
 	}
@@ -406,9 +419,33 @@ void bindIndexedIOBase()
 
 }
 
+static tuple getCompression()
+{
+	StreamIndexedIO::Codec indexCodec, dataCodec;
+	StreamIndexedIO::getCompression( indexCodec, dataCodec );
+	return make_tuple( indexCodec, dataCodec );
+}
+
 void bindStreamIndexedIO()
 {
-	IECorePython::RunTimeTypedClass<StreamIndexedIO>();
+	IECorePython::RunTimeTypedClass<StreamIndexedIO> streamIndexedIOClass;
+
+	{
+		scope s( streamIndexedIOClass );
+
+		enum_< StreamIndexedIO::Codec > ("Codec")
+			.value("Uncompressed", StreamIndexedIO::Uncompressed)
+			.value("Gzip", StreamIndexedIO::Gzip)
+			.value("LZ4", StreamIndexedIO::LZ4)
+			.value("Zstd", StreamIndexedIO::Zstd)
+			.export_values()
+		;
+	}
+
+	streamIndexedIOClass.def("setCompression", &StreamIndexedIO::setCompression, ( arg( "indexCodec" ), arg( "dataCodec" ) ) ).staticmethod("setCompression")
+		.def("getCompression", &getCompression ).staticmethod("getCompression")
+		.def("codecAvailable", &StreamIndexedIO::codecAvailable ).staticmethod("codecAvailable")
+	;
 }
 
 void bindFileIndexedIO()
@@ -46,6 +46,7 @@
 #include "IECore/VectorTypedData.h"
 
 #include "IECorePython/KDTreeBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 using namespace boost::python;
 using namespace IECore;
@@ -77,6 +78,7 @@ struct KDTreeWrapper
 
 	KDTreeWrapper(PointDataPtr points)
 	{
+		ScopedGILRelease gilRelease;
 		m_points = points->copy();
 		m_tree = new T(m_points->readable().begin(), m_points->readable().end());
 	}
@@ -90,6 +92,7 @@ struct KDTreeWrapper
 	long nearestNeighbour( const typename T::Point &p)
 	{
 		assert(m_tree);
+		ScopedGILRelease gilRelease;
 
 		typename T::Iterator it = m_tree->nearestNeighbour(p);
 
@@ -99,6 +102,7 @@ struct KDTreeWrapper
 	IntVectorDataPtr nearestNeighbours(const typename T::Point &p, typename T::Point::BaseType r)
 	{
 		assert(m_tree);
+		ScopedGILRelease gilRelease;
 
 		typedef std::vector<typename T::Iterator> PointArray;
 
@@ -122,6 +126,7 @@ struct KDTreeWrapper
 	IntVectorDataPtr nearestNNeighbours(const typename T::Point &p, unsigned int numNeighbours)
 	{
 		assert(m_tree);
+		ScopedGILRelease gilRelease;
 
 		typedef std::vector<typename T::Neighbour> NeighbourArray;
 
@@ -144,6 +149,7 @@ struct KDTreeWrapper
 	
 	IntVectorDataPtr enclosedPoints( const Box &bound )
 	{
+		ScopedGILRelease gilRelease;
 		typedef std::vector<typename T::Iterator> PointArray;
 
 		PointArray points;
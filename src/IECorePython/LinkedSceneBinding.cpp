@@ -38,6 +38,7 @@
 
 #include "IECore/LinkedScene.h"
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "IECorePython/LinkedSceneBinding.h"
 
@@ -49,11 +50,13 @@ namespace IECorePython
 
 static LinkedScenePtr constructor( const std::string &fileName, IndexedIO::OpenMode mode )
 {
+	ScopedGILRelease gilRelease;
 	return new LinkedScene( fileName, mode );
 }
 
 static LinkedScenePtr constructor2( IECore::SceneInterfacePtr scn )
 {
+	ScopedGILRelease gilRelease;
 	return new LinkedScene( scn );
 }
 
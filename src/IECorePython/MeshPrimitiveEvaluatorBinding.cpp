@@ -38,6 +38,7 @@
 #include "IECorePython/MeshPrimitiveEvaluatorBinding.h"
 #include "IECorePython/RunTimeTypedBinding.h"
 #include "IECorePython/RefCountedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 using namespace IECore;
 using namespace boost::python;
@@ -46,6 +47,12 @@ using namespace IECore;
 namespace IECorePython
 {
 
+static MeshPrimitiveEvaluatorPtr constructor( MeshPrimitivePtr mesh, MeshPrimitiveEvaluator::IntersectionAccelerator intersectionAccelerator )
+{
+	ScopedGILRelease gilRelease;
+	return new MeshPrimitiveEvaluator( mesh, intersectionAccelerator );
+}
+
 static bool barycentricPosition( const MeshPrimitiveEvaluator &e, unsigned int t, const Imath::V3f &b, PrimitiveEvaluator::Result *r )
 {
 	e.validateResult( r );
@@ -54,15 +61,17 @@ static bool barycentricPosition( const MeshPrimitiveEvaluator &e, unsigned int t
 
 void bindMeshPrimitiveEvaluator()
 {
-	object m = RunTimeTypedClass<MeshPrimitiveEvaluator>()
-		.def( init< MeshPrimitivePtr > () )
-		.def( "barycentricPosition", &barycentricPosition )
-		.def( "uvBound", &MeshPrimitiveEvaluator::uvBound )	
-	;
+	RunTimeTypedClass<MeshPrimitiveEvaluator> m;
 
 	{
 		scope ms( m );
 
+		// define enums first, because they are needed for default argument definitions
+		enum_<MeshPrimitiveEvaluator::IntersectionAccelerator>( "IntersectionAccelerator" )
+			.value( "KDTreeAccelerator", MeshPrimitiveEvaluator::KDTreeAccelerator )
+			.value( "BVHAccelerator", MeshPrimitiveEvaluator::BVHAccelerator )
+		;
+
 		RefCountedClass<MeshPrimitiveEvaluator::Result, PrimitiveEvaluator::Result>( "Result" )
 			.def( "triangleIndex", &MeshPrimitiveEvaluator::Result::triangleIndex )
 			.def( "barycentricCoordinates", &MeshPrimitiveEvaluator::Result::barycentricCoordinates, return_value_policy<copy_const_reference>() )
@@ -70,6 +79,21 @@ void bindMeshPrimitiveEvaluator()
 		;
 
 	}
+
+	m.def(
+			"__init__",
+			make_constructor(
+				&constructor, default_call_policies(),
+				(
+					boost::python::arg_( "mesh" ),
+					boost::python::arg_( "intersectionAccelerator" ) = MeshPrimitiveEvaluator::KDTreeAccelerator
+				)
+			)
+		)
+		.def( "barycentricPosition", &barycentricPosition )
+		.def( "uvBound", &MeshPrimitiveEvaluator::uvBound )	
+		.def( "intersectionAccelerator", &MeshPrimitiveEvaluator::intersectionAccelerator )
+	;
 }
 
 }
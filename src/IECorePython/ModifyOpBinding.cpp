@@ -65,12 +65,28 @@ class ModifyOpWrap : public ModifyOp, public Wrapper<ModifyOp>
 			this->get_override( "modify" )( ObjectPtr( object ), CompoundObjectPtr( const_cast<CompoundObject *>( operands ) ) );
 		};
 
+		virtual bool resultCacheable( const CompoundObject *operands ) const
+		{
+			ScopedGILLock gilLock;
+			override o = this->get_override( "resultCacheable" );
+			if( o )
+			{
+				return o( CompoundObjectPtr( const_cast<CompoundObject *>( operands ) ) );
+			}
+			return ModifyOp::resultCacheable( operands );
+		};
+
+		// so that the type name of the python subclass can
+		// distinguish its cached results from those of other ops.
+		IECOREPYTHON_RUNTIMETYPEDWRAPPERFNS( ModifyOp );
+
 };
 
 void bindModifyOp()
 {
 	RunTimeTypedClass<ModifyOp, ModifyOpWrap>()
 		.def( init< const std::string &, ParameterPtr, ParameterPtr >() )
+		.def( "bytesCopied", &ModifyOp::bytesCopied )
 	;
 }
 
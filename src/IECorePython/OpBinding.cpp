@@ -79,6 +79,17 @@ class OpWrap : public Op, public Wrapper<Op>
 			}
 		};
 
+		virtual bool resultCacheable( const CompoundObject *operands ) const
+		{
+			ScopedGILLock gilLock;
+			override o = this->get_override( "resultCacheable" );
+			if( o )
+			{
+				return o( CompoundObjectPtr( const_cast<CompoundObject *>( operands ) ) );
+			}
+			return Op::resultCacheable( operands );
+		};
+
 		IECOREPYTHON_RUNTIMETYPEDWRAPPERFNS( Op );
 		
 };
@@ -114,6 +125,9 @@ void bindOp()
 		.def( "operate", &operateWithArgs )
 		.def( "__call__", &operate )
 		.def( "__call__", &operateWithArgs )
+		.def( "getResultCacheLimit", &Op::getResultCacheLimit ).staticmethod( "getResultCacheLimit" )
+		.def( "setResultCacheLimit", &Op::setResultCacheLimit ).staticmethod( "setResultCacheLimit" )
+		.def( "clearResultCache", &Op::clearResultCache ).staticmethod( "clearResultCache" )
 	;
 
 }
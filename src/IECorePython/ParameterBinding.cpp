@@ -160,6 +160,8 @@ void bindParameter()
 		.def( "getValue", &getValue )
 		.def( "getValidatedValue", &getValidatedValue )
 		.def( "getCurrentPresetName", &Parameter::getCurrentPresetName )
+		.def( "hash", (MurmurHash (Parameter::*)() const)&Parameter::hash )
+		.def( "hash", (void (Parameter::*)( MurmurHash & ) const)&Parameter::hash )
 		.IECOREPYTHON_DEFPARAMETERWRAPPERFNS( Parameter )
 		.def( "validate", (void (Parameter::*)() const)&Parameter::validate )
 		.def( "validate", &validate )
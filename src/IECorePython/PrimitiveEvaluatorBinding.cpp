@@ -37,6 +37,7 @@
 #include "IECore/PrimitiveEvaluator.h"
 #include "IECorePython/PrimitiveEvaluatorBinding.h"
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 using namespace IECore;
 using namespace boost::python;
@@ -54,6 +55,7 @@ struct PrimitiveEvaluatorHelper
 			PyErr_SetString( PyExc_ValueError, "Null primitive" );
 			throw_error_already_set();
 		}
+		ScopedGILRelease gilRelease;
 		return PrimitiveEvaluator::create( primitive );
 	}
 
@@ -61,6 +63,7 @@ struct PrimitiveEvaluatorHelper
 	{
 
 		float distance = 0.0;
+		ScopedGILRelease gilRelease;
 		bool success = evaluator.signedDistance( p, distance );
 
 		if ( !success )
@@ -74,6 +77,7 @@ struct PrimitiveEvaluatorHelper
 	{
 		evaluator.validateResult( result );
 
+		ScopedGILRelease gilRelease;
 		return evaluator.closestPoint( p, result );
 	}
 
@@ -81,6 +85,7 @@ struct PrimitiveEvaluatorHelper
 	{
 		evaluator.validateResult( result );
 
+		ScopedGILRelease gilRelease;
 		return evaluator.pointAtUV( uv, result );
 	}
 
@@ -88,6 +93,7 @@ struct PrimitiveEvaluatorHelper
 	{
 		evaluator.validateResult( result );
 
+		ScopedGILRelease gilRelease;
 		return evaluator.intersectionPoint( origin, direction, result );
 	}
 
@@ -95,13 +101,17 @@ struct PrimitiveEvaluatorHelper
 	{
 		evaluator.validateResult( result );
 
+		ScopedGILRelease gilRelease;
 		return evaluator.intersectionPoint( origin, direction, result, maxDist );
 	}
 
 	static list intersectionPoints( PrimitiveEvaluator& evaluator, const Imath::V3f &origin, const Imath::V3f &direction )
 	{
 		std::vector< PrimitiveEvaluator::ResultPtr > results;
-		evaluator.intersectionPoints( origin, direction, results );
+		{
+			ScopedGILRelease gilRelease;
+			evaluator.intersectionPoints( origin, direction, results );
+		}
 
 		list result;
 
@@ -116,7 +126,10 @@ struct PrimitiveEvaluatorHelper
 	static list intersectionPoints( PrimitiveEvaluator& evaluator, const Imath::V3f &origin, const Imath::V3f &direction, float maxDistance )
 	{
 		std::vector< PrimitiveEvaluator::ResultPtr > results;
-		evaluator.intersectionPoints( origin, direction, results, maxDistance );
+		{
+			ScopedGILRelease gilRelease;
+			evaluator.intersectionPoints( origin, direction, results, maxDistance );
+		}
 
 		list result;
 
@@ -128,6 +141,24 @@ struct PrimitiveEvaluatorHelper
 		return result;
 	}
 
+	static CompoundDataPtr closestPoints( PrimitiveEvaluator &evaluator, const V3fVectorData &points )
+	{
+		ScopedGILRelease gilRelease;
+		return evaluator.closestPoints( &points );
+	}
+
+	static CompoundDataPtr pointsAtUV( PrimitiveEvaluator &evaluator, const V2fVectorData &uvs )
+	{
+		ScopedGILRelease gilRelease;
+		return evaluator.pointsAtUV( &uvs );
+	}
+
+	static CompoundDataPtr closestIntersectionPoints( PrimitiveEvaluator &evaluator, const V3fVectorData &origins, const V3fVectorData &directions, float maxDistance )
+	{
+		ScopedGILRelease gilRelease;
+		return evaluator.closestIntersectionPoints( &origins, &directions, maxDistance );
+	}
+
 	static PrimitivePtr primitive( PrimitiveEvaluator &evaluator )
 	{
 		return evaluator.primitive()->copy();
@@ -181,6 +212,9 @@ void bindPrimitiveEvaluator()
 		.def( "intersectionPoint", intersectionPointMaxDist )
 		.def( "intersectionPoints", intersectionPoints )
 		.def( "intersectionPoints", intersectionPointsMaxDist )
+		.def( "closestPoints", &PrimitiveEvaluatorHelper::closestPoints )
+		.def( "pointsAtUV", &PrimitiveEvaluatorHelper::pointsAtUV )
+		.def( "closestIntersectionPoints", &PrimitiveEvaluatorHelper::closestIntersectionPoints, ( arg( "origins" ), arg( "directions" ), arg( "maxDistance" ) = Imath::limits<float>::max() ) )
 		.def( "primitive", &PrimitiveEvaluatorHelper::primitive )
 		.def( "volume", &PrimitiveEvaluator::volume )
 		.def( "centerOfGravity", &PrimitiveEvaluator::centerOfGravity )
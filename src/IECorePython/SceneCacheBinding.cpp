@@ -38,6 +38,7 @@
 
 #include "IECore/SceneCache.h"
 #include "IECorePython/RunTimeTypedBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "IECorePython/SceneCacheBinding.h"
 
@@ -49,19 +50,29 @@ namespace IECorePython
 
 static SceneCachePtr constructor( const std::string &fileName, IndexedIO::OpenMode mode )
 {
+	ScopedGILRelease gilRelease;
 	return new SceneCache( fileName, mode );
 }
 
 static SceneCachePtr constructor2( IECore::IndexedIOPtr indexedIO )
 {
+	ScopedGILRelease gilRelease;
 	return new SceneCache( indexedIO );
 }
 
+static CompoundDataPtr readHierarchy( const SceneCache &s, double time )
+{
+	ScopedGILRelease gilRelease;
+	return s.readHierarchy( time );
+}
+
 void bindSceneCache()
 {
 	RunTimeTypedClass<SceneCache>()
 		.def( "__init__", make_constructor( &constructor ), "Opens a scene file for read or write." )
 		.def( "__init__", make_constructor( &constructor2 ), "Opens a scene from a previously opened file handle." )
+		.def( "readHierarchy", &readHierarchy, ( arg( "time" ) ), "Returns the paths, parent indices, bounds and transforms for this location and all its descendants." )
+		.def( "prefetch", &SceneCache::prefetch, ( arg( "startTime" ), arg( "endTime" ) ), "Loads the samples for this location and its descendants in the time range in the background." )
 	;
 }
 
@@ -38,6 +38,7 @@
 #include "IECore/SharedSceneInterfaces.h"
 #include "IECorePython/RunTimeTypedBinding.h"
 #include "IECorePython/IECoreBinding.h"
+#include "IECorePython/ScopedGILRelease.h"
 
 #include "IECorePython/SceneInterfaceBinding.h"
 
@@ -60,7 +61,10 @@ inline list arrayToList( std::vector<IndexedIO::EntryID> &ids )
 static list childNames( const SceneInterface &m )
 {
 	SceneInterface::NameList n;
-	m.childNames( n );
+	{
+		ScopedGILRelease gilRelease;
+		m.childNames( n );
+	}
 	return arrayToList( n );
 }
 
@@ -107,13 +111,23 @@ static SceneInterfacePtr nonConstScene( SceneInterface &m, list l, SceneInterfac
 {
 	SceneInterface::Path p;
 	listToSceneInterfaceNameList( l, p );
+	ScopedGILRelease gilRelease;
 	return m.scene( p, b );
 }
 
+static SceneInterfacePtr nonConstChild( SceneInterface &m, const SceneInterface::Name &name, SceneInterface::MissingBehaviour b )
+{
+	ScopedGILRelease gilRelease;
+	return m.child( name, b );
+}
+
 static list attributeNames( const SceneInterface &m )
 {
 	SceneInterface::NameList a;
-	m.attributeNames( a );
+	{
+		ScopedGILRelease gilRelease;
+		m.attributeNames( a );
+	}
 	return arrayToList( a );
 }
 
@@ -149,7 +163,11 @@ static dict readObjectPrimitiveVariables( const SceneInterface &m, list varNameL
 	SceneInterface::NameList v;
 	listToSceneInterfaceNameList( varNameList, v );
 
-	PrimitiveVariableMap varMap = m.readObjectPrimitiveVariables( v, time );
+	PrimitiveVariableMap varMap;
+	{
+		ScopedGILRelease gilRelease;
+		varMap = m.readObjectPrimitiveVariables( v, time );
+	}
 	dict result;
 	for ( PrimitiveVariableMap::const_iterator it = varMap.begin(); it != varMap.end(); it++ )
 	{
@@ -161,7 +179,10 @@ static dict readObjectPrimitiveVariables( const SceneInterface &m, list varNameL
 list readTags( const SceneInterface &m, int filter )
 {
 	SceneInterface::NameList tags;
-	m.readTags( tags, filter );
+	{
+		ScopedGILRelease gilRelease;
+		m.readTags( tags, filter );
+	}
 	list result;
 	for ( SceneInterface::NameList::const_iterator it = tags.begin(); it != tags.end(); it++ )
 	{
@@ -177,8 +198,21 @@ void writeTags( SceneInterface &m, list tagList )
 	m.writeTags(v);	
 }
 
+static Imath::Box3d readBound( const SceneInterface &m, double time )
+{
+	ScopedGILRelease gilRelease;
+	return m.readBound( time );
+}
+
+static Imath::M44d readTransformAsMatrix( const SceneInterface &m, double time )
+{
+	ScopedGILRelease gilRelease;
+	return m.readTransformAsMatrix( time );
+}
+
 DataPtr readTransform( SceneInterface &m, double time )
 {
+	ScopedGILRelease gilRelease;
 	ConstDataPtr t = m.readTransform(time);
 	if ( t )
 	{
@@ -189,6 +223,7 @@ DataPtr readTransform( SceneInterface &m, double time )
 
 ObjectPtr readAttribute( SceneInterface &m, const SceneInterface::Name &name, double time )
 {
+	ScopedGILRelease gilRelease;
 	ConstObjectPtr o = m.readAttribute(name,time);
 	if ( o )
 	{
@@ -199,6 +234,7 @@ ObjectPtr readAttribute( SceneInterface &m, const SceneInterface::Name &name, do
 
 ObjectPtr readObject( SceneInterface &m, double time )
 {
+	ScopedGILRelease gilRelease;
 	ConstObjectPtr o = m.readObject(time);
 	if ( o )
 	{
@@ -210,14 +246,13 @@ ObjectPtr readObject( SceneInterface &m, double time )
 static MurmurHash sceneHash( SceneInterface &m, SceneInterface::HashType hashType, double time )
 {
 	MurmurHash h;
+	ScopedGILRelease gilRelease;
 	m.hash( hashType, time, h );
 	return h;
 }
 
 void bindSceneInterface()
 {
-	SceneInterfacePtr (SceneInterface::*nonConstChild)(const SceneInterface::Name &, SceneInterface::MissingBehaviour) = &SceneInterface::child;
-	
 	// make the SceneInterface class first
 	IECorePython::RunTimeTypedClass<SceneInterface> sceneInterfaceClass;
 	
@@ -260,10 +295,10 @@ void bindSceneInterface()
 		.def( "fileName", &SceneInterface::fileName )
 		.def( "pathAsString", pathAsString )
 		.def( "name", &SceneInterface::name )
-		.def( "readBound", &SceneInterface::readBound )
+		.def( "readBound", &readBound )
 		.def( "writeBound", &SceneInterface::writeBound )
 		.def( "readTransform", &readTransform )
-		.def( "readTransformAsMatrix", &SceneInterface::readTransformAsMatrix )
+		.def( "readTransformAsMatrix", &readTransformAsMatrix )
 		.def( "writeTransform", &SceneInterface::writeTransform )
 		.def( "hasAttribute", &SceneInterface::hasAttribute )
 		.def( "attributeNames", attributeNames )
@@ -278,7 +313,7 @@ void bindSceneInterface()
 		.def( "hasObject", &SceneInterface::hasObject )
 		.def( "hasChild", &SceneInterface::hasChild )
 		.def( "childNames", &childNames )
-		.def( "child", nonConstChild, ( arg( "name" ), arg( "missingBehaviour" ) = SceneInterface::ThrowIfMissing ) )
+		.def( "child", &nonConstChild, ( arg( "name" ), arg( "missingBehaviour" ) = SceneInterface::ThrowIfMissing ) )
 		.def( "createChild", &SceneInterface::createChild )
 		.def( "scene", &nonConstScene, ( arg( "path" ), arg( "missingBehaviour" ) = SceneInterface::ThrowIfMissing ) )
 		.def( "hash", &sceneHash )
@@ -470,6 +470,7 @@ void bindTypeId()
 		.value( "EXRDeepImageReader", EXRDeepImageReaderTypeId )
 		.value( "EXRDeepImageWriter", EXRDeepImageWriterTypeId )
 		.value( "ExternalProcedural", ExternalProceduralTypeId )
+		.value( "DeepImageMergeOp", DeepImageMergeOpTypeId )
 	;
 	
 	converter::registry::push_back(
@@ -275,9 +275,11 @@
 #include "IECorePython/DataConvertOpBinding.h"
 #include "IECorePython/PNGImageReaderBinding.h"
 #include "IECorePython/DeepPixelBinding.h"
+#include "IECorePython/DeepImageBinding.h"
 #include "IECorePython/DeepImageReaderBinding.h"
 #include "IECorePython/DeepImageWriterBinding.h"
 #include "IECorePython/DeepImageConverterBinding.h"
+#include "IECorePython/DeepImageMergeOpBinding.h"
 #include "IECorePython/MurmurHashBinding.h"
 #include "IECorePython/DiskPrimitiveBinding.h"
 #include "IECorePython/ClampOpBinding.h"
@@ -296,6 +298,7 @@
 #include "IECorePython/StandardRadialLensModelBinding.h"
 #include "IECorePython/LensDistortOpBinding.h"
 #include "IECorePython/ObjectPoolBinding.h"
+#include "IECorePython/DiskObjectCacheBinding.h"
 #include "IECorePython/EXRDeepImageReaderBinding.h"
 #include "IECorePython/EXRDeepImageWriterBinding.h"
 #include "IECorePython/ExternalProceduralBinding.h"
@@ -573,9 +576,11 @@ BOOST_PYTHON_MODULE(_IECore)
 #endif
 	
 	bindDeepPixel();
+	bindDeepImage();
 	bindDeepImageReader();
 	bindDeepImageWriter();
 	bindDeepImageConverter();
+	bindDeepImageMergeOp();
 	bindMurmurHash();
 	bindDiskPrimitive();
 	bindClampOp();
@@ -594,6 +599,7 @@ BOOST_PYTHON_MODULE(_IECore)
 	bindStandardRadialLensModel();
 	bindLensDistortOp();
 	bindObjectPool();
+	bindDiskObjectCache();
 	bindExternalProcedural();
 	bindClippingPlane();
 	bindDataAlgo();
@@ -619,6 +625,8 @@ BOOST_PYTHON_MODULE(_IECore)
 	def( "withPNG", &IECore::withPNG );
 	def( "initThreads", &PyEval_InitThreads );
 	def( "hardwareConcurrency", &tbb::tbb_thread::hardware_concurrency );
+	def( "getImageIOThreads", &IECore::getImageIOThreads );
+	def( "setImageIOThreads", &IECore::setImageIOThreads );
 
 }
 
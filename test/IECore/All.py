@@ -233,6 +233,7 @@ from LRUCacheTest import LRUCacheTest
 from DataInterleaveOpTest import DataInterleaveOpTest
 from DataConvertOpTest import DataConvertOpTest
 from DeepPixelTest import DeepPixelTest
+from DeepImageTest import DeepImageTest
 from ConfigLoaderTest import ConfigLoaderTest
 from MurmurHashTest import MurmurHashTest
 from BoolVectorData import BoolVectorDataTest
@@ -250,16 +251,20 @@ from LinkedSceneTest import LinkedSceneTest
 from StandardRadialLensModelTest import StandardRadialLensModelTest
 from LensDistortOpTest import LensDistortOpTest
 from ObjectPoolTest import ObjectPoolTest
+from DiskObjectCacheTest import DiskObjectCacheTest
 from RefCountedTest import RefCountedTest
 from ExternalProceduralTest import ExternalProceduralTest
 from ClippingPlaneTest import ClippingPlaneTest
 from DataAlgoTest import DataAlgoTest
 from MeshAlgoTest import *
 from DisplayDriverServerTest import DisplayDriverServerTest
+from ImageIOThreadsTest import ImageIOThreadsTest
 
 if IECore.withDeepEXR() :
 	from EXRDeepImageReaderTest import EXRDeepImageReaderTest
 	from EXRDeepImageWriterTest import EXRDeepImageWriterTest
+	from DeepImageConverterTest import DeepImageConverterTest
+	from DeepImageMergeOpTest import DeepImageMergeOpTest
 
 if IECore.withASIO() :
 	from DisplayDriverTest import *
@@ -70,6 +70,17 @@ class TestBoundedKDTree:
 
 		self.assertEqual( len( bIdxArray ), numBounds )
 
+	def testLargeTree( self ) :
+
+		# large enough for the tree to be built in parallel
+		numBounds = 50000
+		self.makeRandomTree( numBounds )
+
+		for j in range( 0, 10 ) :
+
+			bound = self.makeRandomBound()
+			expected = [ i for i in range( 0, numBounds ) if self.bounds[i].intersects( bound ) ]
+			self.assertEqual( sorted( self.tree.intersectingBounds( bound ) ), expected )
 
 
 class TestBoundedKDTreeBox3f(unittest.TestCase, TestBoundedKDTree):
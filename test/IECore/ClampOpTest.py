@@ -129,7 +129,23 @@ class ClampOpTest( unittest.TestCase ) :
 				intermediateValues = True
 				
 		self.failIf( intermediateValues )	
-				
+
+	def testManyChannels( self ) :
+
+		image = IECore.Reader.create( "test/IECore/data/exrFiles/ramp.exr" ).read()
+		channelNames = [ "c%d" % i for i in range( 0, 10 ) ]
+		for i, n in enumerate( channelNames ) :
+			image[n] = IECore.PrimitiveVariable( IECore.PrimitiveVariable.Interpolation.Vertex, IECore.FloatVectorData( [ v * i for v in image["R"].data ] ) )
+
+		image2 = IECore.ClampOp()( input=image, min=0.25, max=0.5, channels=IECore.StringVectorData( channelNames ) )
+
+		for n in channelNames :
+			expected = IECore.FloatVectorData( [ min( max( v, 0.25 ), 0.5 ) for v in image[n].data ] )
+			self.assertEqual( image2[n].data, expected )
+
+		# channels which weren't requested are left alone
+		self.assertEqual( image2["R"].data, image["R"].data )
+
 if __name__ == "__main__":
 	unittest.main()
 
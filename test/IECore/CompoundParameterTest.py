@@ -698,5 +698,31 @@ class CompoundParameterTest( unittest.TestCase ) :
 		
 		self.assertEqual( c.parameterPath( c["d"]["i"] ), [ "d", "i" ] )
 
+	def testHash( self ) :
+
+		def build() :
+
+			c = CompoundParameter()
+			c.addParameter( IntParameter( "i", "", 1 ) )
+			c.addParameter( StringParameter( "s", "", "a" ) )
+			c.addParameter( CompoundParameter( "c", "", [ FloatParameter( "f", "", 2 ) ] ) )
+			return c
+
+		c1 = build()
+		c2 = build()
+
+		self.assertEqual( c1.hash(), c1.getValue().hash() )
+		self.assertEqual( c1["c"].hash(), c1["c"].getValue().hash() )
+		self.assertEqual( c1["i"].hash(), IntData( 1 ).hash() )
+		self.assertEqual( c1.hash(), c2.hash() )
+
+		c2["c"]["f"].setNumericValue( 3 )
+		self.assertNotEqual( c1.hash(), c2.hash() )
+		self.assertEqual( c2.hash(), c2.getValue().hash() )
+
+		h = MurmurHash()
+		c1.hash( h )
+		self.assertEqual( h, c1.hash() )
+
 if __name__ == "__main__":
 	unittest.main()
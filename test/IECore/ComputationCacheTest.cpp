@@ -36,6 +36,8 @@
 
 #include "tbb/tbb.h"
 
+#include "boost/filesystem.hpp"
+
 #include "IECore/ComputationCache.h"
 #include "IECore/SimpleTypedData.h"
 
@@ -209,9 +211,147 @@ struct ComputationCacheTest
 		BOOST_CHECK_EQUAL( size_t(500), cache.cachedComputations() );
 	}
 
+	void testDiskCache()
+	{
+		const std::string directory = "test/IECore/computationCacheDisk";
+		boost::filesystem::remove_all( directory );
+
+		{
+			Cache cache( get, hash, 1000, new ObjectPool( 10000 ), new DiskObjectCache( directory, 1024 * 1024 ) );
+			BOOST_CHECK( cache.diskCache() );
+
+			int c1 = ComputationCacheTest::getCount;
+			ConstObjectPtr r = cache.get( ComputationParams( 7 ) );
+			BOOST_CHECK_EQUAL( 7, static_cast< const IntData * >( r.get() )->readable() );
+			BOOST_CHECK_EQUAL( c1 + 1, ComputationCacheTest::getCount );
+		}
+
+		{
+			// a new cache, with an empty object pool, should
+			// load the result from disk rather than computing it.
+			Cache cache( get, hash, 1000, new ObjectPool( 10000 ), new DiskObjectCache( directory, 1024 * 1024 ) );
+
+			int c1 = ComputationCacheTest::getCount;
+			ConstObjectPtr r = cache.get( ComputationParams( 7 ) );
+			BOOST_CHECK_EQUAL( 7, static_cast< const IntData * >( r.get() )->readable() );
+			BOOST_CHECK_EQUAL( c1, ComputationCacheTest::getCount );
+
+			// but new computations must still be computed.
+			r = cache.get( ComputationParams( 8 ) );
+			BOOST_CHECK_EQUAL( 8, static_cast< const IntData * >( r.get() )->readable() );
+			BOOST_CHECK_EQUAL( c1 + 1, ComputationCacheTest::getCount );
+		}
+
+		boost::filesystem::remove_all( directory );
+	}
+
+	static tbb::atomic<int> slowGetCount;
+
+	static IntDataPtr slowGet( const ComputationParams &params )
+	{
+		slowGetCount++;
+		this_tbb_thread::sleep( tick_count::interval_t( 0.1 ) );
+		if( params < 0 )
+		{
+			throw Exception( "Negative parameters not supported" );
+		}
+		return new IntData( params );
+	}
+
+	struct GetSameFromCache
+	{
+		public :
+		
+			GetSameFromCache( Cache &cache, ComputationParams params, tbb::atomic<int> &numErrors )
+				:	m_cache( cache ), m_params( params ), m_numErrors( numErrors )
+			{
+			}
+				
+			void operator()( const blocked_range<size_t> &r ) const
+			{
+				for( size_t i=r.begin(); i!=r.end(); ++i )
+				{
+					try
+					{
+						ConstObjectPtr r = m_cache.get( m_params );
+						ConstIntDataPtr k = runTimeCast< const IntData >(r);
+						// can't use boost unit test assertions from threads
+						assert( k.get() );
+						assert( k->readable() == m_params );
+					}
+					catch( ... )
+					{
+						m_numErrors++;
+					}
+				}
+			}
+			
+		private :
+		
+			Cache &m_cache;
+			ComputationParams m_params;
+			tbb::atomic<int> &m_numErrors;
+			
+	};
+
+	void testConcurrentMissesComputeOnce()
+	{
+		Cache cache( slowGet, hash, 10000, new ObjectPool(10000) );
+
+		tbb::atomic<int> numErrors;
+		numErrors = 0;
+		slowGetCount = 0;
+		parallel_for( blocked_range<size_t>( 0, 100, 1 ), GetSameFromCache( cache, 10, numErrors ) );
+
+		BOOST_CHECK_EQUAL( slowGetCount, 1 );
+		BOOST_CHECK_EQUAL( numErrors, 0 );
+	}
+
+	struct Sleep
+	{
+		void operator()( const blocked_range<size_t> &r ) const
+		{
+			this_tbb_thread::sleep( tick_count::interval_t( 0.001 ) );
+		}
+	};
+
+	static IntDataPtr parallelGet( const ComputationParams &params )
+	{
+		// while waiting for these tasks, the calling thread must not
+		// steal one of the tasks which are waiting for this same computation.
+		parallel_for( blocked_range<size_t>( 0, 100, 1 ), Sleep() );
+		return new IntData( params );
+	}
+
+	void testComputeUsingTBB()
+	{
+		Cache cache( parallelGet, hash, 10000, new ObjectPool(10000) );
+
+		tbb::atomic<int> numErrors;
+		numErrors = 0;
+		parallel_for( blocked_range<size_t>( 0, 1000, 1 ), GetSameFromCache( cache, 10, numErrors ) );
+
+		BOOST_CHECK_EQUAL( numErrors, 0 );
+	}
+
+	void testConcurrentFailures()
+	{
+		Cache cache( slowGet, hash, 10000, new ObjectPool(10000) );
+
+		tbb::atomic<int> numErrors;
+		numErrors = 0;
+		slowGetCount = 0;
+		parallel_for( blocked_range<size_t>( 0, task_scheduler_init::default_num_threads(), 1 ), GetSameFromCache( cache, -1, numErrors ) );
+
+		// failures aren't cached, so subsequent callers may try again,
+		// but every caller must see the error.
+		BOOST_CHECK_EQUAL( numErrors, task_scheduler_init::default_num_threads() );
+	}
+
 };
 
 int ComputationCacheTest::getCount(0);
+tbb::atomic<int> ComputationCacheTest::slowGetCount;
 
 struct ComputationCacheTestSuite : public boost::unit_test::test_suite
 {
@@ -222,6 +362,10 @@ struct ComputationCacheTestSuite : public boost::unit_test::test_suite
 
 		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::test, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testThreadedGet, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testConcurrentMissesComputeOnce, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testConcurrentFailures, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testComputeUsingTBB, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &ComputationCacheTest::testDiskCache, instance ) );
 	}
 };
 
@@ -1221,6 +1221,29 @@ class CurvesPrimitiveEvaluatorTest( unittest.TestCase ) :
 						self.failUnless( abs( (p2 - p).length() ) < 0.05 )
 						self.assertEqual( c2, c )
 
+	def testBatchClosestPoints( self ) :
+
+		# enough curves for the tree to be built in parallel, which
+		# must not deadlock with the parallel batch query.
+		rand = IECore.Rand48()
+		numCurves = 12000
+		p = IECore.V3fVectorData()
+		for i in range( 0, numCurves ) :
+			p.append( rand.solidSpheref() * 10 )
+			p.append( p[-1] + rand.solidSpheref() )
+
+		curves = IECore.CurvesPrimitive( IECore.IntVectorData( [ 2 ] * numCurves ), IECore.CubicBasisf.linear(), False, p )
+		queries = IECore.V3fVectorData( [ rand.solidSpheref() * 10 for i in range( 0, 1000 ) ] )
+
+		e = IECore.CurvesPrimitiveEvaluator( curves )
+		c = e.closestPoints( queries )
+		self.assertEqual( set( c.keys() ), set( [ "P", "uv", "success" ] ) )
+
+		r = e.createResult()
+		for i, q in enumerate( queries ) :
+			self.assertEqual( c["success"][i], e.closestPoint( q, r ) )
+			self.failUnless( c["P"][i].equalWithAbsError( r.point(), 0.00001 ) )
+
 	def testTopologyMethods( self ) :
 	
 		c = IECore.CurvesPrimitive( IECore.IntVectorData( [ 6, 6 ] ), IECore.CubicBasisf.linear(), False, IECore.V3fVectorData( [ IECore.V3f( 0 ) ] * 12 ) )
@@ -0,0 +1,90 @@
+##########################################################################
+#
+#  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import shutil
+import unittest
+
+import IECore
+
+class DeepImageConverterTest( unittest.TestCase ) :
+
+	__directory = "test/IECore/deepImageConverter"
+
+	def setUp( self ) :
+
+		if not os.path.isdir( self.__directory ) :
+			os.makedirs( self.__directory )
+
+	def testConvert( self ) :
+
+		# an image taller than a single block of scanlines, with
+		# samples which aren't sorted by depth.
+		image = IECore.DeepImage( [ "R", "A" ], IECore.Box2i( IECore.V2i( 0 ), IECore.V2i( 2, 39 ) ) )
+		image.setSampleCounts( [ i % 3 for i in range( 0, image.numPixels() ) ] )
+		image.setDepths( IECore.FloatVectorData( [ 10 - ( i % 10 ) for i in range( 0, image.numSamples() ) ] ) )
+		image.setChannelData( 0, IECore.FloatVectorData( [ 0.5 ] * image.numSamples() ) )
+		image.setChannelData( 1, IECore.FloatVectorData( [ 0.25 ] * image.numSamples() ) )
+
+		inputFile = self.__directory + "/input.exr"
+		writer = IECore.EXRDeepImageWriter( inputFile )
+		writer.parameters()["channelNames"].setValue( IECore.StringVectorData( [ "R", "A" ] ) )
+		writer.parameters()["resolution"].setTypedValue( IECore.V2i( 3, 40 ) )
+		writer.writeRegion( image )
+		del writer
+
+		for threads in ( 1, 4 ) :
+
+			IECore.setImageIOThreads( threads )
+
+			outputFile = "%s/output%d.exr" % ( self.__directory, threads )
+			result = IECore.DeepImageConverter()( inputFile = inputFile, outputFile = outputFile )
+			self.assertEqual( result.value, outputFile )
+
+			converted = IECore.EXRDeepImageReader( outputFile ).readRegion( image.window() )
+			self.assertEqual( [ converted.numSamples( i ) for i in range( 0, converted.numPixels() ) ], [ image.numSamples( i ) for i in range( 0, image.numPixels() ) ] )
+
+			expected = image.crop( image.window() )
+			expected.sortSamples()
+			self.assertEqual( converted.depths(), expected.depths() )
+
+	def tearDown( self ) :
+
+		IECore.setImageIOThreads( 0 )
+
+		if os.path.isdir( self.__directory ) :
+			shutil.rmtree( self.__directory )
+
+if __name__ == "__main__":
+	unittest.main()
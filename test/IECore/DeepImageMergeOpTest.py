@@ -0,0 +1,168 @@
+##########################################################################
+#
+#  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import random
+import shutil
+import unittest
+
+import IECore
+
+class DeepImageMergeOpTest( unittest.TestCase ) :
+
+	__directory = "test/IECore/deepImageMerge"
+
+	def setUp( self ) :
+
+		if not os.path.isdir( self.__directory ) :
+			os.makedirs( self.__directory )
+
+	def testConstruction( self ) :
+
+		op = IECore.DeepImageMergeOp()
+		self.failUnless( isinstance( op, IECore.DeepImageMergeOp ) )
+		self.assertEqual( op.typeId(), IECore.TypeId.DeepImageMergeOp )
+
+	def testMerge( self ) :
+
+		inputFiles = [ self.__writeDeepImage( "input%d" % i, 40, 35, i, 4 ) for i in range( 0, 3 ) ]
+		outputFile = self.__directory + "/merged.exr"
+
+		for threads in ( 1, 4 ) :
+
+			IECore.setImageIOThreads( threads )
+			result = IECore.DeepImageMergeOp()( inputFiles = IECore.StringVectorData( inputFiles ), outputFile = outputFile )
+
+			self.failUnless( isinstance( result, IECore.ImagePrimitive ) )
+			self.assertEqual( result.dataWindow, IECore.Box2i( IECore.V2i( 0 ), IECore.V2i( 39, 34 ) ) )
+			self.assertEqual( set( result.channelNames() ), set( [ "R", "G", "B", "A" ] ) )
+
+			readers = [ IECore.EXRDeepImageReader( f ) for f in inputFiles ]
+			merged = IECore.EXRDeepImageReader( outputFile )
+
+			i = 0
+			for y in range( 0, 35 ) :
+				for x in range( 0, 40 ) :
+
+					expected = None
+					for reader in readers :
+						pixel = reader.readPixel( x, y )
+						if pixel is None :
+							continue
+						if expected is None :
+							expected = pixel
+						else :
+							expected.merge( pixel )
+
+					mergedPixel = merged.readPixel( x, y )
+					if expected is None :
+						self.failUnless( mergedPixel is None )
+						for c in "RGBA" :
+							self.assertEqual( result[c].data[i], 0 )
+					else :
+						self.assertEqual( mergedPixel.numSamples(), expected.numSamples() )
+						for s in range( 0, expected.numSamples() ) :
+							self.assertEqual( mergedPixel.getDepth( s ), expected.getDepth( s ) )
+
+						composite = expected.composite()
+						for c, name in enumerate( expected.channelNames() ) :
+							self.assertAlmostEqual( result[name].data[i], composite[c], 5 )
+
+					i += 1
+
+	def testNoOutputFile( self ) :
+
+		inputFiles = [ self.__writeDeepImage( "input%d" % i, 10, 10, i, 2 ) for i in range( 0, 2 ) ]
+
+		result = IECore.DeepImageMergeOp()( inputFiles = IECore.StringVectorData( inputFiles ) )
+		self.failUnless( isinstance( result, IECore.ImagePrimitive ) )
+		self.failIf( os.path.exists( self.__directory + "/merged.exr" ) )
+
+	def testErrors( self ) :
+
+		inputFiles = [ self.__writeDeepImage( "small", 10, 10, 0, 2 ), self.__writeDeepImage( "large", 20, 10, 1, 2 ) ]
+
+		op = IECore.DeepImageMergeOp()
+		self.assertRaises( Exception, op, inputFiles = IECore.StringVectorData() )
+		self.assertRaises( Exception, op, inputFiles = IECore.StringVectorData( inputFiles ) )
+		self.assertRaises( Exception, op, inputFiles = IECore.StringVectorData( inputFiles[:1] ), outputFile = inputFiles[0] )
+
+	def testThreadedMatchesSerial( self ) :
+
+		inputFiles = [ self.__writeDeepImage( "input%d" % i, 64, 64, i, 6 ) for i in range( 0, 3 ) ]
+
+		IECore.setImageIOThreads( 1 )
+		serial = IECore.DeepImageMergeOp()( inputFiles = IECore.StringVectorData( inputFiles ), outputFile = self.__directory + "/serial.exr" )
+
+		IECore.setImageIOThreads( 4 )
+		threaded = IECore.DeepImageMergeOp()( inputFiles = IECore.StringVectorData( inputFiles ), outputFile = self.__directory + "/threaded.exr" )
+
+		self.assertEqual( serial, threaded )
+
+		serialReader = IECore.EXRDeepImageReader( self.__directory + "/serial.exr" )
+		threadedReader = IECore.EXRDeepImageReader( self.__directory + "/threaded.exr" )
+		window = IECore.Box2i( IECore.V2i( 0 ), IECore.V2i( 63 ) )
+		self.assertEqual( serialReader.readRegion( window ).depths(), threadedReader.readRegion( window ).depths() )
+
+	def __writeDeepImage( self, name, width, height, seed, maxSamples ) :
+
+		# write a deep image with random, unsorted samples
+		r = random.Random( seed )
+
+		image = IECore.DeepImage( [ "R", "G", "B", "A" ], IECore.Box2i( IECore.V2i( 0 ), IECore.V2i( width - 1, height - 1 ) ) )
+		image.setSampleCounts( [ r.randint( 0, maxSamples ) for i in range( 0, width * height ) ] )
+
+		numSamples = image.numSamples()
+		image.setDepths( IECore.FloatVectorData( [ r.uniform( 1, 100 ) for i in range( 0, numSamples ) ] ) )
+		for c in range( 0, 4 ) :
+			image.setChannelData( c, IECore.FloatVectorData( [ r.uniform( 0, 1 ) for i in range( 0, numSamples ) ] ) )
+
+		fileName = "%s/%s.exr" % ( self.__directory, name )
+		writer = IECore.EXRDeepImageWriter( fileName )
+		writer.parameters()["channelNames"].setValue( IECore.StringVectorData( [ "R", "G", "B", "A" ] ) )
+		writer.parameters()["resolution"].setTypedValue( IECore.V2i( width, height ) )
+		writer.writeRegion( image )
+		del writer
+
+		return fileName
+
+	def tearDown( self ) :
+
+		IECore.setImageIOThreads( 0 )
+
+		if os.path.isdir( self.__directory ) :
+			shutil.rmtree( self.__directory )
+
+if __name__ == "__main__":
+	unittest.main()
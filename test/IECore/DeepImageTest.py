@@ -0,0 +1,190 @@
+##########################################################################
+#
+#  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import unittest
+
+from IECore import *
+
+class DeepImageTest( unittest.TestCase ) :
+
+	def __image( self ) :
+
+		# a 3x2 image with samples in three of its pixels
+		image = DeepImage( [ "R", "A" ], Box2i( V2i( 10, 20 ), V2i( 12, 21 ) ) )
+		image.setSampleCounts( [ 1, 0, 2, 0, 3, 0 ] )
+		image.setDepths( FloatVectorData( [ 1, 2, 3, 4, 5, 6 ] ) )
+		image.setChannelData( 0, FloatVectorData( [ 0.1, 0.2, 0.3, 0.4, 0.5, 0.6 ] ) )
+		image.setChannelData( 1, FloatVectorData( [ 1, 0.5, 0.25, 1, 0.5, 0.25 ] ) )
+
+		return image
+
+	def testConstructor( self ) :
+
+		image = DeepImage( [ "R", "G", "B", "A" ], Box2i( V2i( 0 ), V2i( 3, 1 ) ) )
+		self.assertEqual( image.channelNames(), ( "R", "G", "B", "A" ) )
+		self.assertEqual( image.numChannels(), 4 )
+		self.assertEqual( image.channelIndex( "B" ), 2 )
+		self.assertEqual( image.channelIndex( "Z" ), -1 )
+		self.assertEqual( image.window(), Box2i( V2i( 0 ), V2i( 3, 1 ) ) )
+		self.assertEqual( image.numPixels(), 8 )
+		self.assertEqual( image.numSamples(), 0 )
+		self.failUnless( image.pixel( 1, 1 ) is None )
+
+	def testSharedChannelNames( self ) :
+
+		names = StringVectorData( [ "R", "G", "B" ] )
+		image1 = DeepImage( names, Box2i( V2i( 0 ), V2i( 1 ) ) )
+		image2 = DeepImage( names, Box2i( V2i( 0 ), V2i( 3 ) ) )
+		self.assertEqual( image1.channelNames(), ( "R", "G", "B" ) )
+		self.assertEqual( image2.channelNames(), ( "R", "G", "B" ) )
+
+	def testSamples( self ) :
+
+		image = self.__image()
+
+		self.assertEqual( image.numSamples(), 6 )
+		self.assertEqual( [ image.numSamples( i ) for i in range( 0, 6 ) ], [ 1, 0, 2, 0, 3, 0 ] )
+		self.assertEqual( [ image.sampleOffset( i ) for i in range( 0, 6 ) ], [ 0, 1, 1, 3, 3, 6 ] )
+		self.assertEqual( image.pixelIndex( 12, 20 ), 2 )
+		self.assertEqual( image.depths(), FloatVectorData( [ 1, 2, 3, 4, 5, 6 ] ) )
+		self.assertEqual( image.channelData( 1 ), FloatVectorData( [ 1, 0.5, 0.25, 1, 0.5, 0.25 ] ) )
+
+		self.assertRaises( ValueError, image.setDepths, FloatVectorData( [ 1 ] ) )
+		self.assertRaises( IndexError, image.channelData, 2 )
+		self.assertRaises( IndexError, image.numSamples, 6 )
+
+	def testPixel( self ) :
+
+		image = self.__image()
+
+		self.failUnless( image.pixel( 11, 20 ) is None )
+
+		p = image.pixel( 12, 20 )
+		self.assertEqual( p.channelNames(), ( "R", "A" ) )
+		self.assertEqual( p.numSamples(), 2 )
+		self.assertEqual( p.getDepth( 0 ), 2 )
+		self.assertEqual( p.getDepth( 1 ), 3 )
+		self.assertAlmostEqual( p[0][0], 0.2, 6 )
+		self.assertAlmostEqual( p[1][1], 0.25, 6 )
+
+		self.assertRaises( Exception, image.pixel, 13, 20 )
+
+	def testCrop( self ) :
+
+		image = self.__image()
+
+		cropped = image.crop( Box2i( V2i( 11, 20 ), V2i( 12, 21 ) ) )
+		self.assertEqual( cropped.window(), Box2i( V2i( 11, 20 ), V2i( 12, 21 ) ) )
+		self.assertEqual( cropped.numPixels(), 4 )
+		self.assertEqual( [ cropped.numSamples( i ) for i in range( 0, 4 ) ], [ 0, 2, 3, 0 ] )
+		self.assertEqual( cropped.depths(), FloatVectorData( [ 2, 3, 4, 5, 6 ] ) )
+		self.assertEqual( cropped.channelData( 1 ), FloatVectorData( [ 0.5, 0.25, 1, 0.5, 0.25 ] ) )
+
+		for y in range( 20, 22 ) :
+			for x in range( 11, 13 ) :
+				p1 = image.pixel( x, y )
+				p2 = cropped.pixel( x, y )
+				if p1 is None :
+					self.failUnless( p2 is None )
+				else :
+					self.assertEqual( p1.numSamples(), p2.numSamples() )
+					for i in range( 0, p1.numSamples() ) :
+						self.assertEqual( p1.getDepth( i ), p2.getDepth( i ) )
+						self.assertEqual( p1[i], p2[i] )
+
+		self.assertRaises( Exception, image.crop, Box2i( V2i( 0 ), V2i( 11, 20 ) ) )
+
+	def testSortSamples( self ) :
+
+		image = DeepImage( [ "R", "A" ], Box2i( V2i( 0 ), V2i( 2, 0 ) ) )
+		image.setSampleCounts( [ 3, 0, 2 ] )
+		image.setDepths( FloatVectorData( [ 3, 1, 2, 5, 4 ] ) )
+		image.setChannelData( 0, FloatVectorData( [ 0.3, 0.1, 0.2, 0.5, 0.4 ] ) )
+		image.setChannelData( 1, FloatVectorData( [ 1, 0.5, 0.25, 1, 0.75 ] ) )
+
+		image.sortSamples()
+		self.assertEqual( [ image.numSamples( i ) for i in range( 0, 3 ) ], [ 3, 0, 2 ] )
+		self.assertEqual( image.depths(), FloatVectorData( [ 1, 2, 3, 4, 5 ] ) )
+		self.assertEqual( image.channelData( 0 ), FloatVectorData( [ 0.1, 0.2, 0.3, 0.4, 0.5 ] ) )
+		self.assertEqual( image.channelData( 1 ), FloatVectorData( [ 0.5, 0.25, 1, 0.75, 1 ] ) )
+
+	def testComposite( self ) :
+
+		image = self.__image()
+		image.sortSamples()
+
+		self.assertEqual( image.composite( 1 ), [ 0, 0 ] )
+
+		for y in range( 20, 22 ) :
+			for x in range( 10, 13 ) :
+				p = image.pixel( x, y )
+				if p is None :
+					continue
+				expected = p.composite()
+				result = image.composite( image.pixelIndex( x, y ) )
+				for c in range( 0, 2 ) :
+					self.assertAlmostEqual( result[c], expected[c], 6 )
+
+		# without an alpha channel, the nearest sample is used
+		image = DeepImage( [ "R" ], Box2i( V2i( 0 ), V2i( 0 ) ) )
+		image.setSampleCounts( [ 2 ] )
+		image.setDepths( FloatVectorData( [ 2, 1 ] ) )
+		image.setChannelData( 0, FloatVectorData( [ 0.2, 0.1 ] ) )
+		image.sortSamples()
+		self.assertAlmostEqual( image.composite( 0 )[0], 0.1, 6 )
+
+	def testMerge( self ) :
+
+		image1 = self.__image()
+
+		image2 = DeepImage( [ "A", "G" ], image1.window() )
+		image2.setSampleCounts( [ 1, 1, 1, 0, 0, 0 ] )
+		image2.setDepths( FloatVectorData( [ 0.5, 1, 2.5 ] ) )
+		image2.setChannelData( 0, FloatVectorData( [ 0.5, 0.5, 0.5 ] ) )
+		image2.setChannelData( 1, FloatVectorData( [ 0.7, 0.8, 0.9 ] ) )
+
+		merged = DeepImage.merge( [ image1, image2 ] )
+		self.assertEqual( merged.channelNames(), ( "R", "A", "G" ) )
+		self.assertEqual( merged.window(), image1.window() )
+		self.assertEqual( [ merged.numSamples( i ) for i in range( 0, 6 ) ], [ 2, 1, 3, 0, 3, 0 ] )
+		self.assertEqual( merged.depths(), FloatVectorData( [ 0.5, 1, 1, 2, 2.5, 3, 4, 5, 6 ] ) )
+		self.assertEqual( merged.channelData( 0 ), FloatVectorData( [ 0, 0.1, 0, 0.2, 0, 0.3, 0.4, 0.5, 0.6 ] ) )
+		self.assertEqual( merged.channelData( 1 ), FloatVectorData( [ 0.5, 1, 0.5, 0.5, 0.5, 0.25, 1, 0.5, 0.25 ] ) )
+		self.assertEqual( merged.channelData( 2 ), FloatVectorData( [ 0.7, 0, 0.8, 0, 0.9, 0, 0, 0, 0 ] ) )
+
+		self.assertRaises( Exception, DeepImage.merge, [] )
+		self.assertRaises( Exception, DeepImage.merge, [ image1, DeepImage( [ "R" ], Box2i( V2i( 0 ), V2i( 1 ) ) ) ] )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,134 @@
+##########################################################################
+#
+#  Copyright (c) 2014, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+
+import os
+import shutil
+import unittest
+
+import IECore
+
+class DiskObjectCacheTest( unittest.TestCase ) :
+
+	__directory = "test/IECore/diskObjectCache"
+
+	def testConstructor( self ) :
+
+		c = IECore.DiskObjectCache( self.__directory, 1024 * 1024 )
+		self.assertEqual( c.directory(), self.__directory )
+		self.assertEqual( c.getMaxDiskUsage(), 1024 * 1024 )
+		self.assertEqual( c.diskUsage(), 0 )
+		self.failUnless( os.path.isdir( self.__directory ) )
+
+	def testStoreAndRetrieve( self ) :
+
+		c = IECore.DiskObjectCache( self.__directory, 1024 * 1024 )
+
+		m = IECore.MeshPrimitive.createPlane( IECore.Box2f( IECore.V2f( -1 ), IECore.V2f( 1 ) ) )
+		h = IECore.MurmurHash()
+		h.append( "plane" )
+
+		self.assertFalse( c.contains( h ) )
+		self.assertEqual( c.retrieve( h ), None )
+
+		c.store( h, m )
+		self.assertTrue( c.contains( h ) )
+		self.assertEqual( c.retrieve( h ), m )
+		self.assertTrue( c.diskUsage() > 0 )
+
+		# a new cache using the same directory should find the object
+		c2 = IECore.DiskObjectCache( self.__directory, 1024 * 1024 )
+		self.assertEqual( c2.retrieve( h ), m )
+
+		self.assertTrue( c.erase( h ) )
+		self.assertFalse( c.contains( h ) )
+		self.assertFalse( c2.contains( h ) )
+		self.assertFalse( c.erase( h ) )
+		self.assertEqual( c.diskUsage(), 0 )
+
+	def testClear( self ) :
+
+		c = IECore.DiskObjectCache( self.__directory, 1024 * 1024 )
+
+		hashes = []
+		for i in range( 0, 10 ) :
+			h = IECore.MurmurHash()
+			h.append( i )
+			c.store( h, IECore.IntData( i ) )
+			hashes.append( h )
+
+		for h in hashes :
+			self.assertTrue( c.contains( h ) )
+
+		c.clear()
+		self.assertEqual( c.diskUsage(), 0 )
+		for h in hashes :
+			self.assertFalse( c.contains( h ) )
+
+	def testMaxDiskUsage( self ) :
+
+		c = IECore.DiskObjectCache( self.__directory, 1024 * 1024 )
+
+		hashes = []
+		for i in range( 0, 10 ) :
+			h = IECore.MurmurHash()
+			h.append( i )
+			c.store( h, IECore.IntVectorData( range( i * 1000, ( i + 1 ) * 1000 ) ) )
+			hashes.append( h )
+			# make sure the modification times differ, so the eviction order is well defined
+			os.utime( os.path.join( self.__directory, h.toString()[:2], h.toString() + ".fio" ), ( i, i ) )
+
+		# the most recently used item should be kept
+		self.assertEqual( c.retrieve( hashes[0] ), IECore.IntVectorData( range( 0, 1000 ) ) )
+
+		usage = c.diskUsage()
+		c.setMaxDiskUsage( usage / 2 )
+		self.assertTrue( c.diskUsage() <= usage / 2 )
+
+		self.assertTrue( c.contains( hashes[0] ) )
+		self.assertFalse( c.contains( hashes[1] ) )
+		self.assertTrue( c.contains( hashes[9] ) )
+
+	def setUp( self ) :
+
+		if os.path.exists( self.__directory ) :
+			shutil.rmtree( self.__directory )
+
+	def tearDown( self ) :
+
+		if os.path.exists( self.__directory ) :
+			shutil.rmtree( self.__directory )
+
+if __name__ == "__main__":
+	unittest.main()
@@ -259,6 +259,60 @@ class TestClientServerDisplayDriver(unittest.TestCase):
 		i = ImageDisplayDriver.removeStoredImage( "myHandle" )
 		self.assertEqual( i["Y"].data, y )
 
+	def testHalfImageData( self ) :
+
+		window = Box2i( V2i( 0 ), V2i( 63 ) )
+
+		parameters = CompoundData( {
+			"displayHost" : "localhost",
+			"displayPort" : "1559",
+			"remoteDisplayType" : "ImageDisplayDriver",
+			"handle" : "myHandle",
+			"imageDataFormat" : "half",
+		} )
+
+		dd = ClientDisplayDriver( window, window, [ "Y" ], parameters )
+
+		row = FloatVectorData( [ x / 64.0 for x in range( 0, 64 ) ] )
+		for i in range( 0, 64 ) :
+			dd.imageData( Box2i( V2i( 0, i ), V2i( 63, i ) ), row )
+
+		dd.imageClose()
+
+		# these values are all exactly representable as halfs
+		i = ImageDisplayDriver.removeStoredImage( "myHandle" )
+		self.assertEqual( i["Y"].data, FloatVectorData( list( row ) * 64 ) )
+
+		parameters["imageDataFormat"] = StringData( "notAFormat" )
+		self.assertRaises( RuntimeError, ClientDisplayDriver, window, window, [ "Y" ], parameters )
+
+	def testCompressedImageData( self ) :
+
+		window = Box2i( V2i( 0 ), V2i( 63 ) )
+		row = FloatVectorData( [ x / 64.0 for x in range( 0, 64 ) ] )
+
+		for imageDataFormat in ( "float", "half" ) :
+
+			parameters = CompoundData( {
+				"displayHost" : "localhost",
+				"displayPort" : "1559",
+				"remoteDisplayType" : "ImageDisplayDriver",
+				"handle" : "myHandle",
+				"imageDataFormat" : imageDataFormat,
+				"imageDataCompression" : "gzip",
+			} )
+
+			dd = ClientDisplayDriver( window, window, [ "Y" ], parameters )
+			for i in range( 0, 64 ) :
+				dd.imageData( Box2i( V2i( 0, i ), V2i( 63, i ) ), row )
+			dd.imageClose()
+
+			i = ImageDisplayDriver.removeStoredImage( "myHandle" )
+			self.assertEqual( i["Y"].data, FloatVectorData( list( row ) * 64 ) )
+
+		parameters["imageDataCompression"] = StringData( "notACompression" )
+		self.assertRaises( RuntimeError, ClientDisplayDriver, window, window, [ "Y" ], parameters )
+
 	def tearDown( self ):
 
 		self.server = None
@@ -113,6 +113,35 @@ class EXRDeepImageReaderTest(unittest.TestCase):
 		self.assertEqual( d.getDepth(7), 9.751317024230957 )
 		self.assertEqual( d.getDepth(8), 9.7521572113037109 )
 
+	def testReadRegion( self ) :
+
+		reader = DeepImageReader.create( "test/IECoreRI/data/exr/primitives.exr" )
+
+		for region in [
+			Box2i( V2i( 150, 280 ), V2i( 160, 290 ) ),
+			Box2i( V2i( 0, 284 ), V2i( 511, 286 ) ),
+		] :
+
+			image = reader.readRegion( region )
+			self.assertEqual( image.window(), region )
+			self.assertEqual( image.channelNames(), tuple( reader.channelNames() ) )
+
+			for y in range( region.min.y, region.max.y + 1 ) :
+				for x in range( region.min.x, region.max.x + 1 ) :
+
+					p1 = reader.readPixel( x, y )
+					p2 = image.pixel( x, y )
+					if p1 is None :
+						self.failUnless( p2 is None )
+						continue
+
+					self.assertEqual( p1.numSamples(), p2.numSamples() )
+					for i in range( 0, p1.numSamples() ) :
+						self.assertEqual( p1.getDepth( i ), p2.getDepth( i ) )
+						self.assertEqual( p1[i], p2[i] )
+
+		self.assertRaises( Exception, reader.readRegion, Box2i( V2i( 500 ), V2i( 512 ) ) )
+
 if __name__ == "__main__":
 	unittest.main()
 
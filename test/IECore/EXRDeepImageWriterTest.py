@@ -129,6 +129,52 @@ class EXRDeepImageWriterTest(unittest.TestCase):
 		self.assertEqual( dict( zip( rp3.channelNames(), rp3[1] ) ), { "R" : 0.0625,  "G" : 0.25, "A" : 0.0625 } )
 		self.failUnless( reader.readPixel( 1, 0 ) is None )
 	
+	def testWriteRegion( self ) :
+
+		image = DeepImage( [ "R", "G", "A" ], Box2i( V2i( 0, 1 ), V2i( 2, 2 ) ) )
+		image.setSampleCounts( [ 1, 0, 2, 0, 3, 1 ] )
+		image.setDepths( FloatVectorData( [ 1, 2, 3, 4, 5, 6, 7 ] ) )
+		image.setChannelData( 0, FloatVectorData( [ 0.25, 0.5, 0.125, 0.25, 0.5, 0.125, 1 ] ) )
+		image.setChannelData( 1, FloatVectorData( [ 0.0625, 0.25, 0.5, 0.125, 0.5, 0.25, 1 ] ) )
+		image.setChannelData( 2, FloatVectorData( [ 1, 0.5, 0.25, 1, 0.5, 0.25, 1 ] ) )
+
+		p = DeepPixel( [ "R", "G", "A" ] )
+		p.addSample( 0.5, [ 0.25, 0.25, 0.5 ] )
+
+		writer = EXRDeepImageWriter( EXRDeepImageWriterTest.__output )
+		writer.parameters()['channelNames'].setValue( StringVectorData( [ "R", "G", "A" ] ) )
+		writer.parameters()['halfPrecisionChannels'].setValue( StringVectorData( [ "R", "A" ] ) )
+		writer.parameters()['resolution'].setTypedValue( V2i( 3, 4 ) )
+		writer.writePixel( 1, 0, p )
+		writer.writeRegion( image )
+		writer.writePixel( 2, 3, p )
+		self.assertRaises( Exception, writer.writeRegion, image )
+		del writer
+
+		reader = EXRDeepImageReader( EXRDeepImageWriterTest.__output )
+		readImage = reader.readRegion( reader.dataWindow() )
+		self.assertEqual( readImage.numSamples(), 9 )
+
+		for y in range( 0, 4 ) :
+			for x in range( 0, 3 ) :
+
+				if image.window().intersects( V2i( x, y ) ) :
+					expected = image.pixel( x, y )
+				elif ( x, y ) in [ ( 1, 0 ), ( 2, 3 ) ] :
+					expected = p
+				else :
+					expected = None
+
+				result = readImage.pixel( x, y )
+				if expected is None :
+					self.failUnless( result is None )
+					continue
+
+				self.assertEqual( result.numSamples(), expected.numSamples() )
+				for i in range( 0, expected.numSamples() ) :
+					self.assertEqual( result.getDepth( i ), expected.getDepth( i ) )
+					self.assertEqual( dict( zip( result.channelNames(), result[i] ) ), dict( zip( expected.channelNames(), expected[i] ) ) )
+
 	def tearDown( self ) :
 		
 		if os.path.isfile( EXRDeepImageWriterTest.__output ) :
@@ -324,6 +324,14 @@ class TestEXRReader(unittest.TestCase):
 		self.assertEqual( m.messages[1].level, Msg.Level.Warning )
 		self.assertEqual( m.messages[2].level, Msg.Level.Warning )
 
+		# the missing data is remembered by the tile cache, so a second
+		# read gives the same result, with the same warnings.
+		with CapturingMessageHandler() as m :
+			i2 = EXRImageReader( "test/IECore/data/exrFiles/incomplete.exr" ).read()
+
+		self.assertEqual( i2, i )
+		self.assertEqual( len( m.messages ), 3 )
+
 	def testHeaderToBlindData( self ) :
 
 		dictHeader = {
@@ -373,6 +381,23 @@ class TestEXRReader(unittest.TestCase):
 		if os.path.isfile( "test/IECore/data/exrFiles/testTimeCode.exr" ) :
 			os.remove( "test/IECore/data/exrFiles/testTimeCode.exr" )
 
+	def testRewrittenFileIsReread( self ) :
+
+		fileName = "test/IECore/data/exrFiles/testRewritten.exr"
+		for size in ( 64, 32 ) :
+
+			# the files are written within the same second, so the tile
+			# cache must notice the change in size to reread the file.
+			window = Box2i( V2i( 0 ), V2i( size - 1 ) )
+			i = ImagePrimitive.createRGBFloat( Color3f( size / 64.0 ), window, window )
+			Writer.create( i, fileName ).write()
+
+			i2 = Reader.create( fileName ).read()
+			self.assertEqual( i2.dataWindow, window )
+			self.assertEqual( i2["R"].data, i["R"].data )
+
+		os.remove( fileName )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -458,6 +458,79 @@ class testLs( unittest.TestCase ) :
 		l = ls( "test/sequences/lsTest/a.###.tif" )
 		self.assertFalse( l )
 
+	def testFrameNumbersInExtensions( self ) :
+
+		l = findSequences( [ "a.0001.mp3", "a.0002.mp3", "b.mp3", "b.mp4", "c1d.mp3", "c2d.mp3" ] )
+		self.assertEqual( len( l ), 3 )
+		self.assertTrue( FileSequence( "a.####.mp3", FrameRange( 1, 2 ) ) in l )
+		self.assertTrue( FileSequence( "b.mp#", FrameRange( 3, 4 ) ) in l )
+		self.assertTrue( FileSequence( "c#d.mp3", FrameRange( 1, 2 ) ) in l )
+
+		self.assertEqual( findSequences( [ "a.#.0001.tif", "a.#.0002.tif" ] ), [] )
+
+	def testNegativeMixedPadding( self ) :
+
+		l = findSequences( [ "a.-01.tif", "a.-02.tif", "a.-10.tif", "a.10.tif", "b.-10.tif", "b.-11.tif", "b.01.tif" ] )
+		self.assertEqual( len( l ), 3 )
+
+		self.assertEqual( l[0].fileName, "a.##.tif" )
+		self.assertEqual( l[0].frameList.asList(), [ -10, -2, -1, 10 ] )
+
+		self.assertEqual( l[1].fileName, "b.#.tif" )
+		self.assertEqual( l[1].frameList.asList(), [ -11, -10 ] )
+
+		self.assertEqual( l[2].fileName, "b.##.tif" )
+		self.assertEqual( l[2].frameList.asList(), [ 1 ] )
+
+	def testRecurse( self ) :
+
+		self.tearDown()
+
+		s1 = FileSequence( "a.#.tif", FrameRange( 1, 10 ) )
+		s2 = FileSequence( "b/c.##.exr", FrameRange( 1, 5 ) )
+		s3 = FileSequence( "b/d/e.####.dpx", FrameRange( 20, 30 ) )
+
+		for sequence in [ s1, s2, s3 ] :
+			os.system( "mkdir -p " + os.path.dirname( "test/sequences/lsTest/" + sequence.fileName ) )
+			for f in sequence.fileNames() :
+				os.system( "touch 'test/sequences/lsTest/" + f + "'" )
+
+		self.assertEqual( ls( "test/sequences/lsTest" ), [ s1 ] )
+		self.assertEqual( ls( "test/sequences/lsTest", recurse = True ), [ s1, s2, s3 ] )
+		self.assertEqual( ls( "test/sequences/lsTest", recurse = True, maxDepth = 1 ), [ s1, s2 ] )
+		self.assertEqual( ls( "test/sequences/lsTest", 11, recurse = True ), [ s3 ] )
+
+	def testLsCache( self ) :
+
+		self.tearDown()
+		os.system( "mkdir -p test/sequences/lsTest" )
+
+		limit = getLsCacheLimit()
+		setLsCacheLimit( 1000 )
+		try :
+
+			s = FileSequence( "a.#.tif", FrameRange( 1, 10 ) )
+			for f in s.fileNames() :
+				os.system( "touch 'test/sequences/lsTest/" + f + "'" )
+
+			self.assertEqual( ls( "test/sequences/lsTest" ), [ s ] )
+			self.assertEqual( ls( "test/sequences/lsTest" ), [ s ] )
+			self.assertEqual( ls( "test/sequences/lsTest/a.#.tif" ).frameList.asList(), s.frameList.asList() )
+
+			# changes to the directory must be seen, even
+			# if they're made immediately after caching.
+			s = FileSequence( "a.#.tif", FrameRange( 1, 20 ) )
+			for f in s.fileNames() :
+				os.system( "touch 'test/sequences/lsTest/" + f + "'" )
+
+			self.assertEqual( ls( "test/sequences/lsTest" ), [ s ] )
+			self.assertEqual( ls( "test/sequences/lsTest/a.#.tif" ).frameList.asList(), s.frameList.asList() )
+
+		finally :
+
+			clearLsCache()
+			setLsCacheLimit( limit )
+
 	def tearDown( self ) :
 
 		if os.path.exists( "test/sequences" ) :
@@ -0,0 +1,114 @@
+##########################################################################
+#
+#  Copyright (c) 2007-2010, Image Engine Design Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are
+#  met:
+#
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#
+#     * Neither the name of Image Engine Design nor the names of any
+#       other contributors to this software may be used to endorse or
+#       promote products derived from this software without specific prior
+#       written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS
+#  IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+#  THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+#  PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR
+#  CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+#  EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+#  PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR
+#  PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+#  LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+#  NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+##########################################################################
+
+import os
+import shutil
+import unittest
+
+import IECore
+
+class ImageIOThreadsTest( unittest.TestCase ) :
+
+	__directory = "test/IECore/imageIOThreads"
+
+	def testSetThreads( self ) :
+
+		IECore.setImageIOThreads( 1 )
+		self.assertEqual( IECore.getImageIOThreads(), 1 )
+
+		IECore.setImageIOThreads( 3 )
+		self.assertEqual( IECore.getImageIOThreads(), 3 )
+
+		self.assertRaises( Exception, IECore.setImageIOThreads, -1 )
+		self.assertEqual( IECore.getImageIOThreads(), 3 )
+
+		# 0 restores the default.
+		IECore.setImageIOThreads( 0 )
+		if "IECORE_IMAGEIO_THREADS" in os.environ :
+			self.assertEqual( IECore.getImageIOThreads(), int( os.environ["IECORE_IMAGEIO_THREADS"] ) )
+		else :
+			self.assertGreaterEqual( IECore.getImageIOThreads(), 1 )
+
+	def testThreadedResultsMatchSerial( self ) :
+
+		image = IECore.Reader.create( "test/IECore/data/exrFiles/gradedRamp.exr" ).read()
+
+		for extension in self.__extensions() :
+
+			IECore.setImageIOThreads( 1 )
+			serial = self.__writeAndRead( image, "serial", extension, 3 )
+
+			IECore.setImageIOThreads( max( 4, IECore.hardwareConcurrency() ) )
+			threaded = self.__writeAndRead( image, "threaded", extension, 3 )
+
+			self.assertEqual( len( serial ), len( threaded ) )
+			for s, t in zip( serial, threaded ) :
+				self.assertEqual( s, t )
+
+	def __extensions( self ) :
+
+		result = [ "exr", "dpx" ]
+		if IECore.withTIFF() :
+			result.append( "tif" )
+
+		return result
+
+	def __writeSequence( self, image, name, extension, numFrames ) :
+
+		sequence = IECore.FileSequence( "%s/%s.####.%s 1-%d" % ( self.__directory, name, extension, numFrames ) )
+		if not os.path.isdir( self.__directory ) :
+			os.makedirs( self.__directory )
+
+		for fileName in sequence.fileNames() :
+			IECore.Writer.create( image, fileName ).write()
+
+		return sequence
+
+	def __writeAndRead( self, image, name, extension, numFrames ) :
+
+		sequence = self.__writeSequence( image, name, extension, numFrames )
+
+		IECore.ImageReader.clearTileCache()
+		return [ IECore.Reader.create( f ).read() for f in sequence.fileNames() ]
+
+	def tearDown( self ) :
+
+		IECore.setImageIOThreads( 0 )
+		IECore.ImageReader.clearTileCache()
+
+		if os.path.isdir( self.__directory ) :
+			shutil.rmtree( self.__directory )
+
+if __name__ == "__main__":
+	unittest.main()
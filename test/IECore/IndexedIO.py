@@ -573,6 +573,54 @@ class TestFileIndexedIO(unittest.TestCase):
 		self.failIf(fv is gv)
 		self.assertEqual(fv, gv)
 
+	def testCompression(self):
+		"""Test FileIndexedIO round trips with all the available codecs"""
+
+		self.assertEqual( StreamIndexedIO.getCompression(), ( StreamIndexedIO.Codec.Gzip, StreamIndexedIO.Codec.Uncompressed ) )
+		self.failUnless( StreamIndexedIO.codecAvailable( StreamIndexedIO.Codec.Uncompressed ) )
+		self.failUnless( StreamIndexedIO.codecAvailable( StreamIndexedIO.Codec.Gzip ) )
+
+		codecs = [ c for c in StreamIndexedIO.Codec.values.values() if StreamIndexedIO.codecAvailable( c ) ]
+		for c in StreamIndexedIO.Codec.values.values() :
+			if c not in codecs :
+				self.assertRaises( Exception, StreamIndexedIO.setCompression, c, c )
+
+		iv = IntVectorData( [ n % 10 for n in range( 0, 100000 ) ] )
+		fv = FloatVectorData( [ n * 0.5 for n in range( 0, 10000 ) ] )
+		sv = StringVectorData( [ "a" ] * 10000 )
+
+		try :
+			for indexCodec in codecs :
+				for dataCodec in codecs :
+
+					StreamIndexedIO.setCompression( indexCodec, dataCodec )
+					self.assertEqual( StreamIndexedIO.getCompression(), ( indexCodec, dataCodec ) )
+
+					f = FileIndexedIO("./test/FileIndexedIO.fio", [], IndexedIO.OpenMode.Write)
+					for i in range( 0, 10 ) :
+						g = f.subdirectory( "sub%d" % i, IndexedIO.MissingBehaviour.CreateIfMissing )
+						g.write( "myIntVector", iv )
+						g.write( "myFloatVector", fv )
+						g.write( "myStringVector", sv )
+						g.write( "myInt", i )
+						g.commit()
+					del f, g
+
+					f = FileIndexedIO("./test/FileIndexedIO.fio", [], IndexedIO.OpenMode.Read)
+					for i in range( 0, 10 ) :
+						g = f.subdirectory( "sub%d" % i )
+						self.assertEqual( g.read( "myIntVector" ), iv )
+						self.assertEqual( g.read( "myFloatVector" ), fv )
+						self.assertEqual( g.read( "myStringVector" ), sv )
+						self.assertEqual( g.read( "myInt" ), IntData( i ) )
+						self.assertEqual( g.entry( "myIntVector" ).dataType(), IndexedIO.DataType.IntArray )
+						self.assertEqual( g.entry( "myIntVector" ).arrayLength(), len( iv ) )
+					del f, g
+
+					os.remove( "./test/FileIndexedIO.fio" )
+		finally :
+			StreamIndexedIO.setCompression( StreamIndexedIO.Codec.Gzip, StreamIndexedIO.Codec.Uncompressed )
+
 	def setUp( self ):
 
 		if os.path.isfile("./test/FileIndexedIO.fio") :
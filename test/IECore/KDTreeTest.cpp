@@ -41,6 +41,8 @@ void addKDTreeTest(boost::unit_test::test_suite* test)
 {
 	test->add( new KDTreeTestSuite<10>() );
 	test->add( new KDTreeTestSuite<1500>() );
+	// large enough for the tree to be built in parallel
+	test->add( new KDTreeTestSuite<50000>() );
 }
 
 }
@@ -60,6 +60,7 @@ class KDTreeTest
 		void testNearestNeighour();
 		void testNearestNeighours();
 		void testNearestNNeighours();
+		void testStructure();
 
 	private:
 
@@ -76,6 +77,7 @@ class KDTreeTest
 		unsigned int m_numPoints;
 
 		typename  Tree::Iterator randomPoint();
+		void checkNode( typename Tree::NodeIndex nodeIndex, const T &min, const T &max, typename Tree::Iterator *&permEnd, unsigned int &numPoints );
 
 };
 
@@ -99,6 +101,7 @@ struct KDTreeTestSuite : public boost::unit_test::test_suite
 		add( BOOST_CLASS_TEST_CASE( &KDTreeTest<T>::testNearestNeighour, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &KDTreeTest<T>::testNearestNeighours, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &KDTreeTest<T>::testNearestNNeighours, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &KDTreeTest<T>::testStructure, instance ) );
 	}
 };
 
@@ -192,4 +192,58 @@ void KDTreeTest<T>::testNearestNNeighours()
 
 }
 
+template<typename T>
+void KDTreeTest<T>::checkNode( typename Tree::NodeIndex nodeIndex, const T &min, const T &max, typename Tree::Iterator *&permEnd, unsigned int &numPoints )
+{
+	BOOST_REQUIRE( nodeIndex < m_tree->numNodes() );
+	const typename Tree::Node &node = m_tree->node( nodeIndex );
+
+	if( node.isLeaf() )
+	{
+		// leaves should hold consecutive sections of the permutation,
+		// each containing only points within the region of the leaf.
+		BOOST_CHECK( node.permLast() - node.permFirst() <= 16 );
+		if( permEnd )
+		{
+			BOOST_CHECK( node.permFirst() == permEnd );
+		}
+		for( typename Tree::Iterator *perm = node.permFirst(); perm != node.permLast(); perm++ )
+		{
+			for( unsigned int i = 0; i < VectorTraits<T>::dimensions(); i++ )
+			{
+				BOOST_CHECK( (**perm)[i] >= min[i] );
+				BOOST_CHECK( (**perm)[i] <= max[i] );
+			}
+		}
+		permEnd = node.permLast();
+		numPoints += node.permLast() - node.permFirst();
+	}
+	else
+	{
+		T lowMax = max;
+		lowMax[node.cutAxis()] = node.cutValue();
+		checkNode( m_tree->lowChildIndex( nodeIndex ), min, lowMax, permEnd, numPoints );
+
+		T highMin = min;
+		highMin[node.cutAxis()] = node.cutValue();
+		checkNode( m_tree->highChildIndex( nodeIndex ), highMin, max, permEnd, numPoints );
+	}
+}
+
+template<typename T>
+void KDTreeTest<T>::testStructure()
+{
+	T min, max;
+	for( unsigned int i = 0; i < VectorTraits<T>::dimensions(); i++ )
+	{
+		min[i] = Imath::limits<typename T::BaseType>::min();
+		max[i] = Imath::limits<typename T::BaseType>::max();
+	}
+
+	typename Tree::Iterator *permEnd = 0;
+	unsigned int numPoints = 0;
+	checkNode( m_tree->rootIndex(), min, max, permEnd, numPoints );
+	BOOST_CHECK_EQUAL( numPoints, m_numPoints );
+}
+
 }
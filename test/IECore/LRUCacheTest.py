@@ -245,6 +245,35 @@ class LRUCacheTest( unittest.TestCase ) :
 		for i in range( 1, 8 ) :
 			self.failUnless( i in keys )
 	
+	def testRecentlyUsedItemsAreKept( self ) :
+	
+		def getter( key ) :
+		
+			return ( key * 2, 1 )
+		
+		removed = []
+		def removalCallback( key, value ) :
+		
+			removed.append( ( key, value ) )
+		
+		c = IECore.LRUCache( getter, removalCallback, 5 )
+		
+		for i in range( 1, 6 ) :
+			self.assertEqual( c.get( i ), i * 2 )
+		
+		# accessing 1 again should mean that 2 is
+		# now the least recently used item.
+		self.assertEqual( c.get( 1 ), 2 )
+		self.assertEqual( removed, [] )
+		
+		self.assertEqual( c.get( 6 ), 12 )
+		self.assertEqual( removed, [ ( 2, 4 ) ] )
+		
+		self.assertEqual( c.get( 7 ), 14 )
+		self.assertEqual( removed, [ ( 2, 4 ), ( 3, 6 ) ] )
+		
+		self.failUnless( c.cached( 1 ) )
+		
 	def testSet( self ) :
 	
 		def getter( key ) :
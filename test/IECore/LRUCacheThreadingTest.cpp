@@ -76,6 +76,33 @@ struct LRUCacheThreadingTest
 			
 	};
 
+	struct GetRepeatedlyFromCache
+	{
+		public :
+		
+			GetRepeatedlyFromCache( LRUCache<int, IntDataPtr> &cache, int numValues )
+				:	m_cache( cache ), m_numValues( numValues )
+			{
+			}
+			
+			void operator()( const blocked_range<size_t> &r ) const
+			{
+				for( size_t i=r.begin(); i!=r.end(); ++i )
+				{
+					int key = i % m_numValues;
+					IntDataPtr k = m_cache.get( key );
+					// can't use boost unit test assertions from threads
+					assert( k->readable() == key );
+				}
+			}
+			
+		private :
+		
+			LRUCache<int, IntDataPtr> &m_cache;
+			int m_numValues;
+			
+	};
+
 	static IntDataPtr get( int key, size_t &cost )
 	{
 		cost = 10;
@@ -88,8 +115,135 @@ struct LRUCacheThreadingTest
 		
 		parallel_for( blocked_range<size_t>( 0, 10000 ), GetFromCache( cache ) );
 	}
+
+	void testHits()
+	{
+		// all values fit in the cache, so almost every
+		// get() is a hit, and threads should not contend.
+		LRUCache<int, IntDataPtr> cache( get, 1000 );
+		
+		parallel_for( blocked_range<size_t>( 0, 1000000 ), GetRepeatedlyFromCache( cache, 100 ) );
+		
+		BOOST_CHECK_EQUAL( cache.currentCost(), (size_t)1000 );
+	}
+
+	static tbb::atomic<int> slowGetCount;
+
+	static IntDataPtr slowGet( int key, size_t &cost )
+	{
+		slowGetCount++;
+		this_tbb_thread::sleep( tick_count::interval_t( 0.1 ) );
+		if( key < 0 )
+		{
+			throw Exception( "Negative keys not supported" );
+		}
+		cost = 1;
+		return new IntData( key );
+	}
+
+	struct GetSameFromCache
+	{
+		public :
+		
+			GetSameFromCache( LRUCache<int, IntDataPtr> &cache, int key, tbb::atomic<int> &numErrors )
+				:	m_cache( cache ), m_key( key ), m_numErrors( numErrors )
+			{
+			}
+			
+			void operator()( const blocked_range<size_t> &r ) const
+			{
+				for( size_t i=r.begin(); i!=r.end(); ++i )
+				{
+					try
+					{
+						IntDataPtr k = m_cache.get( m_key );
+						// can't use boost unit test assertions from threads
+						assert( k->readable() == m_key );
+					}
+					catch( ... )
+					{
+						m_numErrors++;
+					}
+				}
+			}
+			
+		private :
+		
+			LRUCache<int, IntDataPtr> &m_cache;
+			int m_key;
+			tbb::atomic<int> &m_numErrors;
+			
+	};
+
+	void testConcurrentMissesGetOnce()
+	{
+		LRUCache<int, IntDataPtr> cache( slowGet, 1000 );
+		
+		tbb::atomic<int> numErrors;
+		numErrors = 0;
+		slowGetCount = 0;
+		parallel_for( blocked_range<size_t>( 0, 100, 1 ), GetSameFromCache( cache, 10, numErrors ) );
+		
+		BOOST_CHECK_EQUAL( slowGetCount, 1 );
+		BOOST_CHECK_EQUAL( numErrors, 0 );
+	}
+
+	void testConcurrentFailures()
+	{
+		LRUCache<int, IntDataPtr> cache( slowGet, 1000 );
+		
+		tbb::atomic<int> numErrors;
+		numErrors = 0;
+		slowGetCount = 0;
+		parallel_for( blocked_range<size_t>( 0, 100, 1 ), GetSameFromCache( cache, -1, numErrors ) );
+		
+		// the failure is remembered, so every caller should see
+		// an error, but only one should have called the getter.
+		BOOST_CHECK_EQUAL( slowGetCount, 1 );
+		BOOST_CHECK_EQUAL( numErrors, 100 );
+	}
+
+	struct Sleep
+	{
+		void operator()( const blocked_range<size_t> &r ) const
+		{
+			this_tbb_thread::sleep( tick_count::interval_t( 0.001 ) );
+		}
+	};
+
+	static IntDataPtr parallelGet( int key, size_t &cost )
+	{
+		// while waiting for these tasks, the calling thread must not
+		// steal one of the tasks which are waiting for this same key.
+		parallel_for( blocked_range<size_t>( 0, 100, 1 ), Sleep() );
+		cost = 1;
+		return new IntData( key );
+	}
+
+	void testGetterUsingTBB()
+	{
+		LRUCache<int, IntDataPtr> cache( parallelGet, 1000 );
+
+		tbb::atomic<int> numErrors;
+		numErrors = 0;
+		parallel_for( blocked_range<size_t>( 0, 1000, 1 ), GetSameFromCache( cache, 10, numErrors ) );
+
+		BOOST_CHECK_EQUAL( numErrors, 0 );
+	}
+
+	void testHitsAndEvictions()
+	{
+		// the cache is not quite big enough, so hits
+		// are interleaved with evictions.
+		LRUCache<int, IntDataPtr> cache( get, 900 );
+		
+		parallel_for( blocked_range<size_t>( 0, 1000000 ), GetRepeatedlyFromCache( cache, 100 ) );
+		
+		BOOST_CHECK( cache.currentCost() <= (size_t)900 );
+	}
 };
 
+tbb::atomic<int> LRUCacheThreadingTest::slowGetCount;
 
 struct LRUCacheThreadingTestSuite : public boost::unit_test::test_suite
 {
@@ -99,6 +253,11 @@ struct LRUCacheThreadingTestSuite : public boost::unit_test::test_suite
 		boost::shared_ptr<LRUCacheThreadingTest> instance( new LRUCacheThreadingTest() );
 
 		add( BOOST_CLASS_TEST_CASE( &LRUCacheThreadingTest::test, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &LRUCacheThreadingTest::testHits, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &LRUCacheThreadingTest::testHitsAndEvictions, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &LRUCacheThreadingTest::testConcurrentMissesGetOnce, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &LRUCacheThreadingTest::testConcurrentFailures, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &LRUCacheThreadingTest::testGetterUsingTBB, instance ) );
 	}
 };
 
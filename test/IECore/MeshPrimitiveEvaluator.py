@@ -374,6 +374,108 @@ class TestMeshPrimitiveEvaluator( unittest.TestCase ) :
 					hits = mpe.intersectionPoints( origin, direction )
 					self.failIf( hits )
 
+	def testBatchQueries( self ) :
+
+		m = Reader.create( "test/IECore/data/cobFiles/pSphereShape1.cob" ).read()
+		mpe = PrimitiveEvaluator.create( m )
+		r = mpe.createResult()
+
+		rand = Rand48()
+
+		points = V3fVectorData()
+		for i in range( 0, 500 ) :
+			points.append( rand.solidSpheref() * 3 )
+
+		c = mpe.closestPoints( points )
+		self.assertEqual( set( c.keys() ), set( [ "P", "N", "uv", "triangleIndex", "barycentricCoordinates", "success" ] ) )
+		for i, p in enumerate( points ) :
+			self.assertEqual( c["success"][i], mpe.closestPoint( p, r ) )
+			self.failUnless( c["P"][i].equalWithAbsError( r.point(), 0.00001 ) )
+			self.failUnless( c["N"][i].equalWithAbsError( r.normal(), 0.00001 ) )
+			self.failUnless( c["uv"][i].equalWithAbsError( r.uv(), 0.00001 ) )
+			self.assertEqual( c["triangleIndex"][i], r.triangleIndex() )
+			self.failUnless( c["barycentricCoordinates"][i].equalWithAbsError( r.barycentricCoordinates(), 0.00001 ) )
+
+		origins = V3fVectorData()
+		directions = V3fVectorData()
+		for i in range( 0, 500 ) :
+			origins.append( rand.solidSpheref() * 3 )
+			directions.append( rand.hollowSpheref() )
+
+		c = mpe.closestIntersectionPoints( origins, directions )
+		self.failUnless( False in list( c["success"] ) )
+		self.failUnless( True in list( c["success"] ) )
+		for i in range( 0, len( origins ) ) :
+			hit = mpe.intersectionPoint( origins[i], directions[i], r )
+			self.assertEqual( c["success"][i], hit )
+			if hit :
+				self.failUnless( c["P"][i].equalWithAbsError( r.point(), 0.00001 ) )
+				self.assertEqual( c["triangleIndex"][i], r.triangleIndex() )
+
+		# a single direction is shared by all origins
+		c = mpe.closestIntersectionPoints( origins, V3fVectorData( [ V3f( 0, 1, 0 ) ] ), maxDistance = 1 )
+		for i in range( 0, len( origins ) ) :
+			self.assertEqual( c["success"][i], mpe.intersectionPoint( origins[i], V3f( 0, 1, 0 ), r, 1 ) )
+
+		self.assertRaises( Exception, mpe.closestIntersectionPoints, origins, V3fVectorData( [ V3f( 0, 1, 0 ) ] * 2 ) )
+
+		uvs = V2fVectorData()
+		for i in range( 0, 100 ) :
+			uvs.append( V2f( rand.nextf(), rand.nextf() ) )
+
+		c = mpe.pointsAtUV( uvs )
+		for i, uv in enumerate( uvs ) :
+			self.assertEqual( c["success"][i], mpe.pointAtUV( uv, r ) )
+			if c["success"][i] :
+				self.failUnless( c["P"][i].equalWithAbsError( r.point(), 0.00001 ) )
+
+	def testBVHAccelerator( self ) :
+
+		m = Reader.create( "test/IECore/data/cobFiles/pSphereShape1.cob" ).read()
+
+		kdTree = MeshPrimitiveEvaluator( m )
+		self.assertEqual( kdTree.intersectionAccelerator(), MeshPrimitiveEvaluator.IntersectionAccelerator.KDTreeAccelerator )
+
+		bvh = MeshPrimitiveEvaluator( m, MeshPrimitiveEvaluator.IntersectionAccelerator.BVHAccelerator )
+		self.assertEqual( bvh.intersectionAccelerator(), MeshPrimitiveEvaluator.IntersectionAccelerator.BVHAccelerator )
+
+		r1 = kdTree.createResult()
+		r2 = bvh.createResult()
+
+		rand = Rand48()
+		numHits = 0
+		for i in range( 0, 1000 ) :
+
+			origin = rand.solidSpheref() * 3
+			direction = rand.hollowSpheref()
+			maxDistance = 10 if i % 2 else 1.5
+
+			hit = kdTree.intersectionPoint( origin, direction, r1, maxDistance )
+			self.assertEqual( bvh.intersectionPoint( origin, direction, r2, maxDistance ), hit )
+			if hit :
+				numHits += 1
+				self.assertEqual( r1.triangleIndex(), r2.triangleIndex() )
+				self.failUnless( r1.point().equalWithAbsError( r2.point(), 0.0001 ) )
+				self.failUnless( r1.normal().equalWithAbsError( r2.normal(), 0.0001 ) )
+				self.failUnless( r1.uv().equalWithAbsError( r2.uv(), 0.0001 ) )
+				self.failUnless( r1.barycentricCoordinates().equalWithAbsError( r2.barycentricCoordinates(), 0.0001 ) )
+
+			hits1 = kdTree.intersectionPoints( origin, direction, maxDistance )
+			hits2 = bvh.intersectionPoints( origin, direction, maxDistance )
+			self.assertEqual(
+				sorted( [ h.triangleIndex() for h in hits1 ] ),
+				sorted( [ h.triangleIndex() for h in hits2 ] ),
+			)
+
+		self.failUnless( numHits > 100 )
+
+		# empty meshes are fine too
+		m = MeshPrimitive()
+		m["P"] = PrimitiveVariable( PrimitiveVariable.Interpolation.Vertex, V3fVectorData() )
+		empty = MeshPrimitiveEvaluator( m, MeshPrimitiveEvaluator.IntersectionAccelerator.BVHAccelerator )
+		self.failIf( empty.intersectionPoint( V3f( 0 ), V3f( 0, 1, 0 ), empty.createResult() ) )
+		self.failIf( empty.intersectionPoints( V3f( 0 ), V3f( 0, 1, 0 ) ) )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -111,5 +111,48 @@ class ObjectPoolTest( unittest.TestCase ) :
 		self.assertFalse( p.contains(a.hash()) )
 		self.assertTrue( p.contains(b.hash()) )
 		
+	def testSharedData( self ) :
+
+		p = ObjectPool( 1024 * 1024 )
+
+		d = V3fVectorData( [ V3f( i ) for i in range( 0, 10000 ) ] )
+		a = CompoundObject( { "P" : d } )
+		b = CompoundObject( { "P" : d.copy(), "N" : IntData( 1 ) } )
+
+		p.store( a, ObjectPool.StoreReference )
+		self.assertEqual( p.memoryUsage(), a.memoryUsage() )
+
+		# the vector data is shared by the two objects, so shouldn't be counted twice
+		p.store( b, ObjectPool.StoreReference )
+		self.assertTrue( p.memoryUsage() < a.memoryUsage() + b.memoryUsage() - 10000 * 12 )
+
+		# the shared data is still in use by b, so must still be counted
+		p.erase( a.hash() )
+		self.assertEqual( p.memoryUsage(), b.memoryUsage() )
+
+		p.store( a, ObjectPool.StoreReference )
+		self.assertTrue( p.memoryUsage() < a.memoryUsage() + b.memoryUsage() - 10000 * 12 )
+
+		p.erase( b.hash() )
+		self.assertEqual( p.memoryUsage(), a.memoryUsage() )
+
+		p.clear()
+		self.assertEqual( p.memoryUsage(), 0 )
+
+	def testSharedDataIncreasesCapacity( self ) :
+
+		d = V3fVectorData( [ V3f( i ) for i in range( 0, 10000 ) ] )
+		objects = [ CompoundObject( { "P" : d.copy(), "id" : IntData( i ) } ) for i in range( 0, 10 ) ]
+
+		# room for only a couple of the objects if the data wasn't shared
+		p = ObjectPool( objects[0].memoryUsage() * 2 )
+		for o in objects :
+			p.store( o, ObjectPool.StoreReference )
+
+		for o in objects :
+			self.assertTrue( p.contains( o.hash() ) )
+
+		self.assertTrue( p.memoryUsage() <= p.getMaxMemoryUsage() )
+
 if __name__ == "__main__":
     unittest.main()
@@ -48,8 +48,36 @@ class PythonOp( Op ) :
 
 registerRunTimeTyped( PythonOp )
 
+class CacheablePythonOp( Op ) :
+
+	def __init__( self ) :
+
+		Op.__init__( self, "opDescription", StringParameter( name = "result", description = "", defaultValue = "" ) )
+		self.parameters().addParameter( StringParameter( name = "name", description = "", defaultValue = "john" ) )
+		self.numOperations = 0
+
+	def resultCacheable( self, operands ) :
+
+		return True
+
+	def doOperation( self, operands ) :
+
+		self.numOperations += 1
+		return StringData( operands['name'].value )
+
+registerRunTimeTyped( CacheablePythonOp )
+
 class TestPythonOp( unittest.TestCase ) :
 
+	def setUp( self ) :
+
+		self.__resultCacheLimit = Op.getResultCacheLimit()
+
+	def tearDown( self ) :
+
+		Op.setResultCacheLimit( self.__resultCacheLimit )
+		Op.clearResultCache()
+
 	def testNewOp( self ) :
 
 		o = PythonOp()
@@ -148,6 +176,66 @@ class TestPythonOp( unittest.TestCase ) :
 		# make sure the last call did not affect the contents of the Op's parameters.
 		self.assertEqual( op.parameters()['name'].getTypedValue(), "john" )
 
+	def testResultCache( self ) :
+
+		Op.setResultCacheLimit( 0 )
+		Op.clearResultCache()
+
+		op = CacheablePythonOp()
+		self.assertEqual( op( name = "jim" ), StringData( "jim" ) )
+		self.assertEqual( op( name = "jim" ), StringData( "jim" ) )
+		self.assertEqual( op.numOperations, 2 )
+
+		Op.setResultCacheLimit( 10 )
+		self.assertEqual( Op.getResultCacheLimit(), 10 )
+
+		r1 = op( name = "bob" )
+		r2 = op( name = "bob" )
+		self.assertEqual( op.numOperations, 3 )
+		self.assertEqual( r1, StringData( "bob" ) )
+		self.assertEqual( r2, StringData( "bob" ) )
+
+		# results are copies, so they may be modified freely
+		r1.value = "fred"
+		self.assertEqual( op( name = "bob" ), StringData( "bob" ) )
+		self.assertEqual( op.resultParameter().getValue(), StringData( "bob" ) )
+		self.assertEqual( op.numOperations, 3 )
+
+		# different operands need a new operation
+		self.assertEqual( op( name = "jim" ), StringData( "jim" ) )
+		self.assertEqual( op.numOperations, 4 )
+
+		# the cache is shared between instances
+		op2 = CacheablePythonOp()
+		self.assertEqual( op2( name = "bob" ), StringData( "bob" ) )
+		self.assertEqual( op2.numOperations, 0 )
+
+		# but not between different types of op
+		op3 = PythonOp()
+		self.assertEqual( op3( name = "bob" ), StringData( "bob" ) )
+
+		Op.clearResultCache()
+		self.assertEqual( op( name = "bob" ), StringData( "bob" ) )
+		self.assertEqual( op.numOperations, 5 )
+
+	def testModifyOpResultCache( self ) :
+
+		Op.setResultCacheLimit( 10 )
+		Op.clearResultCache()
+
+		m = MeshPrimitive.createPlane( Box2f( V2f( 0 ), V2f( 1 ) ), V2i( 4 ) )
+
+		n1 = MeshNormalsOp()( input = m )
+		n2 = MeshNormalsOp()( input = m )
+		self.failUnless( "N" in n1 )
+		self.assertEqual( n1, n2 )
+		self.failIf( n1.isSame( n2 ) )
+		self.failIf( "N" in m )
+
+		# when modifying in place, the input must still be modified
+		MeshNormalsOp()( input = m, copyInput = False )
+		self.failUnless( "N" in m )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -75,6 +75,25 @@ class PointsPrimitiveEvaluatorTest( unittest.TestCase ) :
 		self.assertEqual( r.colorPrimVar( p["Cs"] ), IECore.Color3f( 5, 0, 0 ) )
 		self.assertEqual( r.stringPrimVar( p["names"] ), "a" )		
 
+	def testBatchClosestPoints( self ) :
+
+		# enough points for the tree to be built in parallel, which
+		# must not deadlock with the parallel batch query.
+		rand = IECore.Rand48()
+		p = IECore.V3fVectorData( [ rand.solidSpheref() for i in range( 0, 20000 ) ] )
+		points = IECore.PointsPrimitive( p )
+
+		queries = IECore.V3fVectorData( [ rand.solidSpheref() for i in range( 0, 1000 ) ] )
+
+		e = IECore.PointsPrimitiveEvaluator( points )
+		c = e.closestPoints( queries )
+		self.assertEqual( set( c.keys() ), set( [ "P", "success" ] ) )
+
+		r = e.createResult()
+		for i, q in enumerate( queries ) :
+			self.assertEqual( c["success"][i], e.closestPoint( q, r ) )
+			self.assertEqual( c["P"][i], r.point() )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -36,6 +36,7 @@ import gc
 import sys
 import math
 import unittest
+import threading
 
 import IECore
 
@@ -221,6 +222,113 @@ class SceneCacheTest( unittest.TestCase ) :
 		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
 		readWalk( m, IECore.Box3d() )
 								
+	def testReadHierarchy( self ) :
+
+		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		self.assertRaises( RuntimeError, m.readHierarchy, 0 )
+		for i in range( 0, 5 ) :
+			c = m.createChild( str( i ) )
+			c.writeTransform( IECore.M44dData( IECore.M44d.createTranslated( IECore.V3d( i, 0, 0 ) ) ), 0 )
+			c.writeTransform( IECore.M44dData( IECore.M44d.createTranslated( IECore.V3d( i, 2, 0 ) ) ), 1 )
+			for j in range( 0, i ) :
+				g = c.createChild( str( j ) )
+				g.writeObject( IECore.SpherePrimitive( j + 1 ), 0 )
+		del m, c, g
+
+		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+
+		def walk( s, time, result ) :
+			path = IECore.SceneInterface.pathToString( s.path() )
+			result.append( ( path, s.readBound( time ), s.readTransformAsMatrix( time ) ) )
+			for n in s.childNames() :
+				walk( s.child( n ), time, result )
+
+		for time in ( 0, 0.5, 1 ) :
+			for location in ( m, m.child( "3" ), m.scene( [ "4", "2" ] ) ) :
+
+				h = location.readHierarchy( time )
+				self.assertEqual( set( h.keys() ), set( [ "paths", "parentIndices", "bounds", "transforms" ] ) )
+				self.failUnless( isinstance( h["paths"], IECore.StringVectorData ) )
+				self.failUnless( isinstance( h["parentIndices"], IECore.IntVectorData ) )
+				self.failUnless( isinstance( h["bounds"], IECore.Box3dVectorData ) )
+				self.failUnless( isinstance( h["transforms"], IECore.M44dVectorData ) )
+
+				expected = []
+				walk( location, time, expected )
+
+				self.assertEqual( len( h["paths"] ), len( expected ) )
+				self.assertEqual( h["parentIndices"][0], -1 )
+				for i, ( path, bound, transform ) in enumerate( expected ) :
+					self.assertEqual( h["paths"][i], path )
+					self.assertEqual( h["bounds"][i], bound )
+					self.assertEqual( h["transforms"][i], transform )
+					if i :
+						parentPath = h["paths"][h["parentIndices"][i]]
+						self.assertEqual( IECore.SceneInterface.stringToPath( parentPath ), IECore.SceneInterface.stringToPath( path )[:-1] )
+
+	def testPrefetch( self ) :
+
+		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		self.assertRaises( RuntimeError, m.prefetch, 0, 1 )
+		for i in range( 0, 10 ) :
+			c = m.createChild( str( i ) )
+			for t in range( 0, 5 ) :
+				c.writeTransform( IECore.M44dData( IECore.M44d.createTranslated( IECore.V3d( i, t, 0 ) ) ), t )
+				c.writeObject( IECore.SpherePrimitive( i + t + 1 ), t )
+		del m, c
+
+		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		m.prefetch( 1, 2.5 )
+		# reads must give the same results whether or not the
+		# prefetching has completed.
+		for i in range( 0, 10 ) :
+			c = m.child( str( i ) )
+			for t in ( 1, 2, 3 ) :
+				self.assertEqual( c.readObject( t ), IECore.SpherePrimitive( i + t + 1 ) )
+			for t in ( 1, 2, 2.5, 3 ) :
+				self.assertEqual( c.readTransformAsMatrix( t ), IECore.M44d.createTranslated( IECore.V3d( i, t, 0 ) ) )
+
+		# prefetching a single location, and times outside the sampled range
+		c = m.child( "3" )
+		c.prefetch( -10, 10 )
+		self.assertEqual( c.readObject( 0 ), IECore.SpherePrimitive( 4 ) )
+		self.assertEqual( c.readObject( 4 ), IECore.SpherePrimitive( 8 ) )
+
+	def testManySiblings( self ) :
+
+		# sibling locations are flushed in parallel, so we write
+		# plenty of them to make sure the results are consistent.
+
+		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
+		for i in range( 0, 50 ) :
+			c = m.createChild( "c%d" % i )
+			c.writeTags( [ "tag%d" % i ] )
+			c.writeTransform( IECore.M44dData( IECore.M44d.createTranslated( IECore.V3d( i, 0, 0 ) ) ), 0.0 )
+			c.writeTransform( IECore.M44dData( IECore.M44d.createTranslated( IECore.V3d( i, 1, 0 ) ) ), 1.0 )
+			for j in range( 0, 20 ) :
+				g = c.createChild( "g%d" % j )
+				g.writeObject( IECore.SpherePrimitive( j + 1 ), 0.0 )
+				g.writeObject( IECore.SpherePrimitive( j + 2 ), 1.0 )
+		del m, c, g
+
+		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Read )
+		self.assertEqual( len( m.childNames() ), 50 )
+		self.assertEqual( m.numBoundSamples(), 2 )
+		self.assertEqual( set( m.readTags( IECore.SceneInterface.TagFilter.DescendantTag ) ), set( [ IECore.InternedString( "tag%d" % i ) for i in range( 0, 50 ) ] + [ IECore.InternedString( "ObjectType:SpherePrimitive" ) ] ) )
+		self.failUnless( SceneCacheTest.compareBBox( m.readBoundAtSample( 0 ), IECore.Box3d( IECore.V3d( -20, -20, -20 ), IECore.V3d( 69, 20, 20 ) ) ) )
+		self.failUnless( SceneCacheTest.compareBBox( m.readBoundAtSample( 1 ), IECore.Box3d( IECore.V3d( -21, -20, -21 ), IECore.V3d( 70, 22, 21 ) ) ) )
+
+		for i in range( 0, 50 ) :
+			c = m.child( "c%d" % i )
+			self.assertEqual( len( c.childNames() ), 20 )
+			self.assertEqual( c.readTags( IECore.SceneInterface.TagFilter.LocalTag ), [ IECore.InternedString( "tag%d" % i ) ] )
+			self.failUnless( SceneCacheTest.compareBBox( c.readBoundAtSample( 1 ), IECore.Box3d( IECore.V3d( -21 ), IECore.V3d( 21 ) ) ) )
+			for j in range( 0, 20 ) :
+				g = c.child( "g%d" % j )
+				self.assertEqual( g.readTags( IECore.SceneInterface.TagFilter.AncestorTag ), [ IECore.InternedString( "tag%d" % i ) ] )
+				self.assertEqual( g.readObject( 1.0 ), IECore.SpherePrimitive( j + 2 ) )
+				self.assertEqual( g.numObjectSamples(), 2 )
+
 	def testMissingReadableChild( self ) :
 	
 		m = IECore.SceneCache( "/tmp/test.scc", IECore.IndexedIO.OpenMode.Write )
@@ -874,8 +982,46 @@ class SceneCacheTest( unittest.TestCase ) :
 		t0 = checkHash( IECore.SceneInterface.HashType.HierarchyHash, m, 0 )
 		t1 = checkHash( IECore.SceneInterface.HashType.HierarchyHash, m, 1 )
 		self.assertEqual( t0[0] + t1[0], len(t0[1].union(t1[1])) )		# all locations differ
-	
-	
+
+	def testConcurrentReads( self ) :
+
+		m = IECore.SceneCache( "test/IECore/data/sccFiles/animatedSpheres.scc", IECore.IndexedIO.OpenMode.Read )
+
+		def walk( scene, time, result ) :
+			result.append( (
+				scene.pathAsString(),
+				scene.readBound( time ),
+				scene.readTransformAsMatrix( time ),
+				scene.readObject( time ) if scene.hasObject() else None,
+			) )
+			for n in scene.childNames() :
+				walk( scene.child( n ), time, result )
+
+		times = ( 0, 0.5, 1, 1.5 )
+		expected = {}
+		for time in times :
+			expected[time] = []
+			walk( m, time, expected[time] )
+
+		# the bindings release the GIL while reading, so these threads
+		# really do read from the file concurrently.
+		results = []
+		def read() :
+			for time in times :
+				result = []
+				walk( m, time, result )
+				results.append( ( time, result ) )
+
+		threads = [ threading.Thread( target = read ) for i in range( 0, 8 ) ]
+		for t in threads :
+			t.start()
+		for t in threads :
+			t.join()
+
+		self.assertEqual( len( results ), len( threads ) * len( times ) )
+		for time, result in results :
+			self.assertEqual( result, expected[time] )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -37,7 +37,11 @@
 
 #include "tbb/tbb.h"
 
+#include "boost/lexical_cast.hpp"
+
 #include "IECore/SharedSceneInterfaces.h"
+#include "IECore/SceneCache.h"
+#include "IECore/VectorTypedData.h"
 
 #include "SceneCacheThreadingTest.h"
 
@@ -103,6 +107,55 @@ struct SceneCacheThreadingTest
 			SceneInterface::Name m_attribute;
 	};
 
+	struct TestObjectRead
+	{
+		public :
+
+			TestObjectRead( ConstSceneInterfacePtr scene, size_t numLocations ) : m_errors( 0 ), m_scene( scene ), m_numLocations( numLocations )
+			{
+			}
+
+			TestObjectRead( TestObjectRead &that, tbb::split ) : m_errors( 0 ), m_scene( that.m_scene ), m_numLocations( that.m_numLocations )
+			{
+			}
+
+			void operator()( const blocked_range<size_t> &r ) const
+			{
+				for ( size_t i = r.begin(); i != r.end(); ++i )
+				{
+					size_t location = i % m_numLocations;
+					SceneInterface::Path path;
+					path.push_back( locationName( location ) );
+
+					ConstIntVectorDataPtr data = runTimeCast<const IntVectorData>( m_scene->scene( path )->readObject( 0 ) );
+					if ( !data || data->readable().size() != location + 1 || data->readable()[location] != (int)location )
+					{
+						m_errors++;
+					}
+				}
+			}
+
+			void join( const TestObjectRead &that )
+			{
+				m_errors += that.m_errors;
+			}
+
+			size_t errors() const
+			{
+				return m_errors;
+			}
+
+			static SceneInterface::Name locationName( size_t location )
+			{
+				return boost::lexical_cast<std::string>( location );
+			}
+
+		private :
+			mutable size_t m_errors;
+			ConstSceneInterfacePtr m_scene;
+			size_t m_numLocations;
+	};
+
 	void testAttributeRead()
 	{
 		task_scheduler_init scheduler( 100 );
@@ -123,6 +176,33 @@ struct SceneCacheThreadingTest
  		BOOST_CHECK( task.errors() == 100000 );
 	}
 
+	void testObjectRead()
+	{
+		const size_t numLocations = 1000;
+		const std::string fileName = "/tmp/sceneCacheThreadingTest.scc";
+
+		{
+			SceneCachePtr scene = new SceneCache( fileName, IndexedIO::Write );
+			for ( size_t i = 0; i < numLocations; ++i )
+			{
+				IntVectorDataPtr data = new IntVectorData;
+				data->writable().resize( i + 1, 0 );
+				data->writable()[i] = i;
+				scene->createChild( TestObjectRead::locationName( i ) )->writeObject( data.get(), 0 );
+			}
+		}
+
+		task_scheduler_init scheduler( 100 );
+
+		// every object is read concurrently by many threads through a single file,
+		// exercising the lock-free positional reads in the StreamIndexedIO.
+		ConstSceneInterfacePtr scene = new SceneCache( fileName, IndexedIO::Read );
+		TestObjectRead task( scene, numLocations );
+
+		parallel_reduce( blocked_range<size_t>( 0, numLocations * 100 ), task );
+		BOOST_CHECK( task.errors() == 0 );
+	}
+
 };
 
 struct SceneCacheThreadingTestSuite : public boost::unit_test::test_suite
@@ -134,6 +214,7 @@ struct SceneCacheThreadingTestSuite : public boost::unit_test::test_suite
 
 		add( BOOST_CLASS_TEST_CASE( &SceneCacheThreadingTest::testAttributeRead, instance ) );
 		add( BOOST_CLASS_TEST_CASE( &SceneCacheThreadingTest::testFakeAttributeRead, instance ) );
+		add( BOOST_CLASS_TEST_CASE( &SceneCacheThreadingTest::testObjectRead, instance ) );
 	}
 };
 
@@ -73,6 +73,42 @@ class SequenceLsOpTest( unittest.TestCase ) :
 		self.assertEqual( str( sequences[0] ), "test/IECore/sequences/sequenceLsTest/s.#.tif 1-10" )
 
 
+	def testRecurse( self ) :
+
+		for s in [
+			FileSequence( "test/IECore/sequences/sequenceLsTest/s.#.tif", FrameRange( 1, 10 ) ),
+			FileSequence( "test/IECore/sequences/sequenceLsTest/a/t.##.exr", FrameRange( 1, 5 ) ),
+			FileSequence( "test/IECore/sequences/sequenceLsTest/a/b/u.###.dpx", FrameRange( 1, 3 ) ),
+		] :
+			os.system( "mkdir -p " + os.path.dirname( s.fileName ) )
+			for f in s.fileNames() :
+				os.system( "touch '" + f + "'" )
+
+		op = SequenceLsOp()
+		op['dir'] = StringData( "test/IECore/sequences/sequenceLsTest/" )
+		op['resultType'] = StringData( "stringVector" )
+
+		self.assertEqual( list( op() ), [ "test/IECore/sequences/sequenceLsTest/s.#.tif 1-10" ] )
+
+		op['recurse'] = True
+		self.assertEqual(
+			list( op() ),
+			[
+				"test/IECore/sequences/sequenceLsTest/s.#.tif 1-10",
+				"test/IECore/sequences/sequenceLsTest/a/t.##.exr 1-5",
+				"test/IECore/sequences/sequenceLsTest/a/b/u.###.dpx 1-3",
+			]
+		)
+
+		op['maxDepth'] = 1
+		self.assertEqual(
+			list( op() ),
+			[
+				"test/IECore/sequences/sequenceLsTest/s.#.tif 1-10",
+				"test/IECore/sequences/sequenceLsTest/a/t.##.exr 1-5",
+			]
+		)
+
 	def setUp( self ) :
 
 		if os.path.exists( "test/IECore/sequences/sequenceLsTest" ) :
@@ -405,7 +405,57 @@ class TestTIFFReader(unittest.TestCase):
 		)
 
 		self.failIf( res.value )
-		
+
+	def testPartialReads( self ) :
+
+		# read sections of tiled and stripped images, checking them
+		# against the equivalent section of the whole image.
+		for fileName in [ "test/IECore/data/tiff/tilesWithLeftovers.tif", "test/IECore/data/tiff/uvMap.512x256.8bit.tif" ] :
+
+			r = TIFFImageReader( fileName )
+			full = r.read()
+			fullWindow = full.dataWindow
+			fullWidth = fullWindow.size().x + 1
+
+			windows = [
+				Box2i( fullWindow.min, fullWindow.min ),
+				Box2i( fullWindow.max, fullWindow.max ),
+				Box2i( fullWindow.min + V2i( 3, 5 ), fullWindow.min + V2i( 60, 45 ) ),
+				Box2i( fullWindow.min + V2i( 10, 0 ), V2i( fullWindow.min.x + 20, fullWindow.max.y ) ),
+			]
+
+			for memoryLimit in [ ImageReader.getTileCacheMemoryLimit(), 0 ] :
+
+				oldMemoryLimit = ImageReader.getTileCacheMemoryLimit()
+				ImageReader.setTileCacheMemoryLimit( memoryLimit )
+				ImageReader.clearTileCache()
+
+				try :
+
+					for window in windows :
+
+						r["dataWindow"].setValue( Box2iData( window ) )
+						partial = r.read()
+						self.assertEqual( partial.dataWindow, window )
+
+						width = window.size().x + 1
+						for name in full.keys() :
+							fullData = full[name].data
+							partialData = partial[name].data
+							for y in range( window.min.y, window.max.y + 1 ) :
+								for x in range( window.min.x, window.max.x + 1 ) :
+									self.assertEqual(
+										partialData[(y-window.min.y)*width + x - window.min.x],
+										fullData[(y-fullWindow.min.y)*fullWidth + x - fullWindow.min.x]
+									)
+
+					self.failUnless( ImageReader.tileCacheMemoryUsage() <= memoryLimit )
+
+				finally :
+
+					ImageReader.setTileCacheMemoryLimit( oldMemoryLimit )
+					r["dataWindow"].setValue( Box2iData() )
+
 	def testReadWithIncorrectExtension( self ) :
 	
 		shutil.copyfile( "test/IECore/data/tiff/uvMap.512x256.8bit.tif", "test/IECore/data/tiff/uvMap.512x256.8bit.dpx" )
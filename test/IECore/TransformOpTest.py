@@ -120,6 +120,29 @@ class TestTransformOp( unittest.TestCase ) :
 		self.assertNotEqual( ms["vel"].data, ms["otherVel"].data )
 		self.assertEqual( ms["otherVel"].data, m["otherVel"].data )
 
+	def testBytesCopied( self ) :
+
+		m = MeshPrimitive.createPlane( Box2f( V2f( -1 ), V2f( 1 ) ), V2i( 100 ) )
+		m["Cs"] = PrimitiveVariable( PrimitiveVariable.Interpolation.Vertex, V3fVectorData( [ V3f( 0.5 ) ] * len( m["P"].data ) ) )
+		pBytes = m["P"].data.memoryUsage()
+
+		# a real transformation must copy P
+		o = TransformOp()
+		o( input=m, primVarsToModify = StringVectorData( [ "P" ] ), matrix = M44fData( M44f.createTranslated( V3f( 1 ) ) ) )
+		self.failUnless( o.bytesCopied() >= pBytes )
+
+		# but an identity transformation, or one on data with no
+		# geometric interpretation, should leave the data shared.
+		o( input=m, primVarsToModify = StringVectorData( [ "P" ] ), matrix = M44fData( M44f() ) )
+		self.failUnless( o.bytesCopied() < pBytes / 10 )
+
+		o( input=m, primVarsToModify = StringVectorData( [ "Cs" ] ), matrix = M44fData( M44f.createTranslated( V3f( 1 ) ) ) )
+		self.failUnless( o.bytesCopied() < pBytes / 10 )
+
+		# and nothing is copied when operating in place
+		o( input=m, primVarsToModify = StringVectorData( [ "Cs" ] ), matrix = M44fData( M44f.createTranslated( V3f( 1 ) ) ), copyInput = False )
+		self.assertEqual( o.bytesCopied(), 0 )
+
 if __name__ == "__main__":
 	unittest.main()
 
@@ -34,7 +34,9 @@
 
 """Unit test for VectorData binding"""
 
+import io
 import math
+import ctypes
 import unittest
 
 from IECore import *
@@ -1206,6 +1208,93 @@ class TestVectorDataToString( unittest.TestCase ) :
 		for i in range( 0, 255 ) :
 			self.assertEqual( s[i], chr( i ) )
 
+class TestVectorDataBuffer( unittest.TestCase ) :
+
+	def testMemoryView( self ) :
+
+		d = FloatVectorData( [ 1, 2, 3 ] )
+		m = memoryview( d )
+		self.assertEqual( m.format, "f" )
+		self.assertEqual( m.itemsize, 4 )
+		self.assertEqual( m.ndim, 1 )
+		self.assertEqual( m.shape, ( 3, ) )
+		self.assertEqual( m.readonly, True )
+		self.assertEqual( m.tobytes(), d.toString() )
+
+		d = V3fVectorData( [ V3f( 1, 2, 3 ), V3f( 4, 5, 6 ) ] )
+		m = memoryview( d )
+		self.assertEqual( m.format, "f" )
+		self.assertEqual( m.shape, ( 2, 3 ) )
+		self.assertEqual( m.strides, ( 12, 4 ) )
+		self.assertEqual( m.tobytes(), d.toString() )
+
+		d = M44dVectorData( [ M44d(), M44d() ] )
+		m = memoryview( d )
+		self.assertEqual( m.format, "d" )
+		self.assertEqual( m.shape, ( 2, 4, 4 ) )
+		self.assertEqual( m.strides, ( 128, 32, 8 ) )
+
+		d = Box3fVectorData( [ Box3f( V3f( 0 ), V3f( 1 ) ) ] )
+		self.assertEqual( memoryview( d ).shape, ( 1, 2, 3 ) )
+
+		d = Color4fVectorData()
+		m = memoryview( d )
+		self.assertEqual( m.shape, ( 0, 4 ) )
+		self.assertEqual( m.tobytes(), "" )
+
+		self.assertRaises( TypeError, memoryview, StringVectorData( [ "a" ] ) )
+		self.assertRaises( TypeError, memoryview, InternedStringVectorData( [ "a" ] ) )
+		self.assertRaises( TypeError, memoryview, BoolVectorData( [ True ] ) )
+
+	def testViewsDontCopy( self ) :
+
+		d = IntVectorData( [ 1, 2, 3 ] )
+		m = memoryview( d )
+		d[1] = 20
+		self.assertEqual( m.tobytes(), IntVectorData( [ 1, 20, 3 ] ).toString() )
+
+	def testWritableViewsRespectCopyOnWrite( self ) :
+
+		d = V3fVectorData( [ V3f( 1, 2, 3 ), V3f( 4, 5, 6 ) ] )
+		d2 = d.copy()
+
+		expected = V3fVectorData( [ V3f( 10, 2, 3 ), V3f( 4, 5, 60 ) ] )
+		io.BytesIO( expected.toString() ).readinto( d )
+
+		self.assertEqual( d, expected )
+		self.assertEqual( d2, V3fVectorData( [ V3f( 1, 2, 3 ), V3f( 4, 5, 6 ) ] ) )
+
+	def testWritableViewsInvalidateHash( self ) :
+
+		d = FloatVectorData( [ 1, 2, 3 ] )
+		h = d.hash()
+
+		expected = FloatVectorData( [ 1, 20, 3 ] )
+		io.BytesIO( expected.toString() ).readinto( d )
+
+		self.assertEqual( d, expected )
+		self.assertNotEqual( d.hash(), h )
+		self.assertEqual( d.hash(), expected.hash() )
+
+	def testNoOldStyleWritableBuffers( self ) :
+
+		d = FloatVectorData( [ 1, 2, 3 ] )
+		self.assertRaises( TypeError, ( ctypes.c_float * 3 ).from_buffer, d )
+
+	def testConstructFromBuffer( self ) :
+
+		d = V3fVectorData( [ V3f( 1, 2, 3 ), V3f( 4, 5, 6 ) ] )
+		self.assertEqual( V3fVectorData( memoryview( d ) ), d )
+
+		d = M44fVectorData( [ M44f.createTranslated( V3f( 1, 2, 3 ) ), M44f() ] )
+		self.assertEqual( M44fVectorData( memoryview( d ) ), d )
+
+		d = Int64VectorData( [ 1, -2, 3 ] )
+		self.assertEqual( Int64VectorData( memoryview( d ) ), d )
+
+		# mismatched types fall back to elementwise conversion
+		self.assertEqual( FloatVectorData( IntVectorData( [ 1, 2 ] ) ), FloatVectorData( [ 1, 2 ] ) )
+
 class TestVectorDataHashOptimisation( unittest.TestCase ) :
 
 	def test( self ) :